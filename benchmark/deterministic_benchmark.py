@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the physics step time with and without the deterministic mode.
+Dynamic spheres are piled on the floor and some of them are removed in each episode,
+so that the pairs and the contacts are reordered.
+
+    $ python3 benchmark/deterministic_benchmark.py --object_size 500
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.getcwd())
+import rodentia
+
+
+def measure(args, deterministic):
+    env = rodentia.Environment(width=84, height=84)
+    env.set_deterministic(deterministic)
+
+    # Floor
+    env.add_box(texture_path="",
+                half_extent=[20.0, 1.0, 20.0],
+                pos=[0.0, -1.0, 0.0],
+                rot=0.0,
+                detect_collision=False)
+    rng = np.random.RandomState(0)
+    pos = rng.uniform(-5.0, 5.0, size=(args.object_size, 3)).astype(np.float32)
+    pos[:,1] = rng.uniform(0.5, 5.0, size=args.object_size)
+    ids = env.add_spheres(radiuses=0.5, pos=pos, mass=1.0)
+    handle = env.save_state()
+
+    elapsed = 0.0
+    for i in range(args.episode_size):
+        env.restore_state(handle)
+        env.remove_objs(rng.permutation(ids)[:args.object_size // 10].tolist())
+        start = time.perf_counter()
+        for j in range(args.step_size):
+            env.step([0, 0, 0], render=False)
+        elapsed += time.perf_counter() - start
+    env.close()
+    return elapsed / (args.episode_size * args.step_size) * 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--object_size", type=int, default=500)
+    parser.add_argument("--episode_size", type=int, default=10)
+    parser.add_argument("--step_size", type=int, default=100)
+    args = parser.parse_args()
+
+    default_time = measure(args, False)
+    deterministic_time = measure(args, True)
+
+    print("{:>10} {:>12} {:>18}".format("objects", "default[ms]", "deterministic[ms]"))
+    print("{:>10} {:>12.4f} {:>18.4f}".format(
+        args.object_size, default_time, deterministic_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of environment startup time and memory usage for each GL backend.
+
+Each backend is measured in a separate process, because GL libraries stay loaded
+once initialized.
+
+    $ python3 benchmark/gl_backend_benchmark.py --env_size 8
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+import resource
+
+sys.path.insert(0, os.getcwd())
+import rodentia
+
+
+def get_rss_mb():
+    """ Current resident set size of this process in MB """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024.0
+    except IOError:
+        pass
+    # Max RSS is used when /proc is not available. (bytes on MacOSX)
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return max_rss / (1024.0 * 1024.0)
+    return max_rss / 1024.0
+
+
+def measure(gl_backend, env_size, width, height, step_size, queue):
+    base_rss = get_rss_mb()
+    
+    envs = []
+    start_times = []
+    for i in range(env_size):
+        start = time.perf_counter()
+        env = rodentia.Environment(width=width, height=height,
+                                   gl_backend=gl_backend)
+        env.add_box(texture_path="",
+                    half_extent=[10.0, 1.0, 10.0],
+                    pos=[0.0, -1.0, 0.0],
+                    rot=0.0,
+                    detect_collision=False)
+        # First step includes shader compilation and buffer allocation.
+        env.step([0, 0, 0])
+        start_times.append(time.perf_counter() - start)
+        envs.append(env)
+
+    total_rss = get_rss_mb()
+
+    start = time.perf_counter()
+    for i in range(step_size):
+        for env in envs:
+            env.step([0, 0, 1])
+    step_time = time.perf_counter() - start
+    
+    for env in envs:
+        env.close()
+
+    queue.put({
+        "first_startup": start_times[0],
+        "mean_startup": sum(start_times[1:]) / max(len(start_times) - 1, 1),
+        "rss_per_env": (total_rss - base_rss) / env_size,
+        "total_rss": total_rss,
+        "steps_per_sec": step_size * env_size / step_time,
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--backends", default="glx,egl")
+    parser.add_argument("--env_size", type=int, default=8)
+    parser.add_argument("--width", type=int, default=84)
+    parser.add_argument("--height", type=int, default=84)
+    parser.add_argument("--step_size", type=int, default=200)
+    args = parser.parse_args()
+
+    ctx = multiprocessing.get_context("spawn")
+    
+    print("{:>8} {:>16} {:>16} {:>14} {:>14} {:>12}".format(
+        "backend", "first start[ms]", "next start[ms]", "RSS/env[MB]", "total RSS[MB]",
+        "steps/sec"))
+    for gl_backend in args.backends.split(","):
+        queue = ctx.Queue()
+        proc = ctx.Process(target=measure,
+                           args=(gl_backend, args.env_size, args.width, args.height,
+                                 args.step_size, queue))
+        proc.start()
+        proc.join()
+        if proc.exitcode != 0 or queue.empty():
+            print("{:>8} failed".format(gl_backend))
+            continue
+        result = queue.get()
+        print("{:>8} {:>16.1f} {:>16.1f} {:>14.1f} {:>14.1f} {:>12.1f}".format(
+            gl_backend,
+            result["first_startup"] * 1000.0,
+            result["mean_startup"] * 1000.0,
+            result["rss_per_env"],
+            result["total_rss"],
+            result["steps_per_sec"]))
+
+
+if __name__ == '__main__':
+    main()
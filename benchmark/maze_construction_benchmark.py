@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of constructing and resetting a maze with the per-object calls
+(add_box, locate_object, remove_obj) vs the batched calls (add_boxes,
+locate_objects, remove_objs).
+
+    $ python3 benchmark/maze_construction_benchmark.py --object_size 1000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.getcwd())
+import rodentia
+
+
+def create_maze(args):
+    # Random maze walls on a grid
+    rng = np.random.RandomState(0)
+    size = args.object_size
+    grid = int(np.ceil(np.sqrt(size)))
+    pos = np.zeros((size, 3), dtype=np.float32)
+    pos[:,0] = (np.arange(size) % grid) * 2.0 - grid
+    pos[:,1] = 1.0
+    pos[:,2] = (np.arange(size) // grid) * 2.0 - grid
+    horizontal = rng.randint(0, 2, size=size).astype(bool)
+    half_extents = np.where(horizontal[:,np.newaxis],
+                            [1.0, 1.0, 0.1], [0.1, 1.0, 1.0]).astype(np.float32)
+    colors = rng.uniform(0.0, 1.0, size=(size, 3)).astype(np.float32)
+    return pos, half_extents, colors
+
+
+def measure_single(env, pos, half_extents, colors):
+    start = time.perf_counter()
+    ids = [env.add_box(half_extent=half_extents[i], pos=pos[i], color=colors[i])
+           for i in range(len(pos))]
+    construct_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i, id in enumerate(ids):
+        env.locate_object(id, pos[i] + 0.5, rot=0.0)
+    for id in ids:
+        env.remove_obj(id)
+    reset_time = time.perf_counter() - start
+    return construct_time, reset_time
+
+
+def measure_batch(env, pos, half_extents, colors):
+    start = time.perf_counter()
+    ids = env.add_boxes(half_extents=half_extents, pos=pos, color=colors)
+    construct_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    env.locate_objects(ids, pos + 0.5, rot=0.0)
+    env.remove_objs(ids)
+    reset_time = time.perf_counter() - start
+    return construct_time, reset_time
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--object_size", type=int, default=1000)
+    parser.add_argument("--trial_size", type=int, default=5)
+    args = parser.parse_args()
+
+    pos, half_extents, colors = create_maze(args)
+
+    results = {}
+    for name, measure in [("single", measure_single), ("batch", measure_batch)]:
+        construct_times = []
+        reset_times = []
+        for i in range(args.trial_size):
+            env = rodentia.Environment(width=84, height=84)
+            construct_time, reset_time = measure(env, pos, half_extents, colors)
+            construct_times.append(construct_time * 1000.0)
+            reset_times.append(reset_time * 1000.0)
+            env.close()
+        results[name] = (np.median(construct_times), np.median(reset_times))
+
+    print("{:>16} {:>12} {:>12} {:>8}".format(
+        "", "single[ms]", "batch[ms]", "speedup"))
+    for index, label in enumerate(["construction", "relocate+remove"]):
+        single_time = results["single"][index]
+        batch_time = results["batch"][index]
+        print("{:>16} {:>12.3f} {:>12.3f} {:>8.2f}".format(
+            label, single_time, batch_time, single_time / batch_time))
+
+
+if __name__ == '__main__':
+    main()
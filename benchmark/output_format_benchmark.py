@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of frame time of the grayscale and supersampled observations converted
+with numpy and on GPU.
+
+    $ python3 benchmark/output_format_benchmark.py --frame_size 500
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.getcwd())
+import rodentia
+
+
+WIDTH = 84
+HEIGHT = 84
+GRAY_WEIGHTS = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+def create_env(args, width, height, **kwargs):
+    env = rodentia.Environment(width=width, height=height, **kwargs)
+
+    # Floor
+    env.add_box(texture_path="",
+                half_extent=[20.0, 1.0, 20.0],
+                pos=[0.0, -1.0, 0.0],
+                rot=0.0,
+                detect_collision=False)
+
+    # Boxes with random sizes
+    rng = np.random.RandomState(0)
+    for i in range(args.object_size):
+        pos = [rng.uniform(-18.0, 18.0), 1.0, rng.uniform(-18.0, 18.0)]
+        half_extent = [rng.randint(1, 3), 1.0, rng.randint(1, 3)]
+        env.add_box(texture_path="",
+                    color=rng.uniform(0.0, 1.0, size=3).tolist(),
+                    half_extent=half_extent,
+                    pos=pos,
+                    rot=rng.uniform(0.0, np.pi),
+                    detect_collision=False)
+    return env
+
+
+def to_gray(screen):
+    return (screen.astype(np.float32) @ GRAY_WEIGHTS).astype(np.uint8)
+
+
+def downsample(screen, factor):
+    h, w, c = screen.shape
+    return screen.reshape(h // factor, factor, w // factor, factor, c).mean(
+        axis=(1, 3)).astype(np.uint8)
+
+
+def measure(env, frame_size, convert):
+    start = time.perf_counter()
+    for i in range(frame_size):
+        screen = env.render(env.main_camera_id, [0.0, 1.0, 0.0], i * 0.01)["screen"]
+        convert(screen)
+    return (time.perf_counter() - start) / frame_size * 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--object_size", type=int, default=100)
+    parser.add_argument("--frame_size", type=int, default=500)
+    args = parser.parse_args()
+
+    # (name, numpy conversion, rendering size factor, GPU output options)
+    cases = [
+        ("gray", to_gray, 1,
+         dict(output_format="gray")),
+        ("2x supersampling", lambda s: downsample(s, 2), 2,
+         dict(supersampling=2)),
+        ("2x supersampling gray", lambda s: to_gray(downsample(s, 2)), 2,
+         dict(supersampling=2, output_format="gray")),
+    ]
+
+    print("{:>24} {:>12} {:>12} {:>8}".format("case", "numpy[ms]", "gpu[ms]", "speedup"))
+    for name, convert, factor, options in cases:
+        env = create_env(args, WIDTH * factor, HEIGHT * factor)
+        numpy_time = measure(env, args.frame_size, convert)
+        env.close()
+
+        env = create_env(args, WIDTH, HEIGHT, **options)
+        gpu_time = measure(env, args.frame_size, lambda s: s)
+        env.close()
+
+        print("{:>24} {:>12.3f} {:>12.3f} {:>8.2f}".format(
+            name, numpy_time, gpu_time, numpy_time / gpu_time))
+
+
+if __name__ == '__main__':
+    main()
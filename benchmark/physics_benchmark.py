@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of steps/sec with each physics time step setting.
+
+    $ python3 benchmark/physics_benchmark.py --object_size 100
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.getcwd())
+import rodentia
+
+
+# (name, time_step, max_sub_steps, fixed_time_step)
+SETTINGS = [
+    ("30Hz",           1.0 / 30.0, 1, 1.0 / 30.0),
+    ("60Hz (default)", 1.0 / 60.0, 1, 1.0 / 60.0),
+    ("60Hz x4 sub",    1.0 / 60.0, 4, 1.0 / 240.0),
+    ("60Hz x8 sub",    1.0 / 60.0, 8, 1.0 / 480.0),
+]
+
+
+def create_env(args, setting):
+    name, time_step, max_sub_steps, fixed_time_step = setting
+    env = rodentia.Environment(width=args.width, height=args.height)
+    env.set_physics(time_step=time_step,
+                    max_sub_steps=max_sub_steps,
+                    fixed_time_step=fixed_time_step)
+
+    # Floor and walls
+    env.add_box(texture_path="",
+                half_extent=[20.0, 1.0, 20.0],
+                pos=[0.0, -1.0, 0.0],
+                rot=0.0,
+                detect_collision=False)
+    for pos, half_extent in [([20.0, 1.0, 0.0], [1.0, 2.0, 20.0]),
+                             ([-20.0, 1.0, 0.0], [1.0, 2.0, 20.0]),
+                             ([0.0, 1.0, 20.0], [20.0, 2.0, 1.0]),
+                             ([0.0, 1.0, -20.0], [20.0, 2.0, 1.0])]:
+        env.add_box(texture_path="",
+                    half_extent=half_extent,
+                    pos=pos,
+                    rot=0.0,
+                    detect_collision=False)
+
+    # Dynamic objects
+    rng = np.random.RandomState(0)
+    for i in range(args.object_size):
+        pos = [rng.uniform(-18.0, 18.0), rng.uniform(1.0, 10.0), rng.uniform(-18.0, 18.0)]
+        env.add_sphere(texture_path="",
+                       radius=0.5,
+                       pos=pos,
+                       rot=0.0,
+                       mass=1.0,
+                       detect_collision=False)
+    return env
+
+
+def measure(step_func, step_size):
+    start = time.perf_counter()
+    for i in range(step_size):
+        step_func()
+    return step_size / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--object_size", type=int, default=100)
+    parser.add_argument("--width", type=int, default=84)
+    parser.add_argument("--height", type=int, default=84)
+    parser.add_argument("--step_size", type=int, default=500)
+    args = parser.parse_args()
+
+    action = np.array([0, 0, 1], dtype=np.int32)
+
+    print("{:>16} {:>10} {:>12} {:>16} {:>16}".format(
+        "setting", "dt[ms]", "fixed dt[ms]", "physics steps/s", "full steps/s"))
+    for setting in SETTINGS:
+        name, time_step, max_sub_steps, fixed_time_step = setting
+
+        # Physics only
+        env = create_env(args, setting)
+        physics_steps = measure(lambda: env.env.step(), args.step_size)
+        env.close()
+
+        # Physics and rendering
+        env = create_env(args, setting)
+        full_steps = measure(lambda: env.step(action), args.step_size)
+        env.close()
+
+        print("{:>16} {:>10.2f} {:>12.2f} {:>16.1f} {:>16.1f}".format(
+            name, time_step * 1000.0, fixed_time_step * 1000.0,
+            physics_steps, full_steps))
+
+
+if __name__ == '__main__':
+    main()
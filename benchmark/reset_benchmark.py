@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of episode reset by removing and adding the objects again vs
+restore_state() to the saved state.
+
+    $ python3 benchmark/reset_benchmark.py --object_size 100
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.getcwd())
+import rodentia
+
+
+def create_env():
+    env = rodentia.Environment(width=84, height=84)
+
+    # Floor
+    env.add_box(texture_path="",
+                half_extent=[20.0, 1.0, 20.0],
+                pos=[0.0, -1.0, 0.0],
+                rot=0.0,
+                detect_collision=False)
+    return env
+
+
+def get_reward_positions(args):
+    rng = np.random.RandomState(0)
+    pos = rng.uniform(-18.0, 18.0, size=(args.object_size, 3)).astype(np.float32)
+    pos[:,1] = 0.5
+    return pos
+
+
+def measure_re_add(args):
+    # Reset like the examples. Remove the remaining objects, add them again and
+    # locate the agent.
+    env = create_env()
+    pos = get_reward_positions(args)
+    ids = []
+    start = time.perf_counter()
+    for i in range(args.reset_size):
+        for id in ids:
+            env.remove_obj(id)
+        ids = [env.add_sphere(radius=0.5, pos=p, color=[1, 0, 0], detect_collision=True)
+               for p in pos]
+        env.locate_agent([0.0, 1.0, 0.0], rot_y=0.0)
+        env.step([0, 0, 0], render=False)
+    elapsed = time.perf_counter() - start
+    env.close()
+    return elapsed / args.reset_size * 1000.0
+
+
+def measure_restore(args):
+    env = create_env()
+    pos = get_reward_positions(args)
+    ids = env.add_spheres(radiuses=0.5, pos=pos, color=[1, 0, 0],
+                          detect_collision=True)
+    env.locate_agent([0.0, 1.0, 0.0], rot_y=0.0)
+    handle = env.save_state()
+    start = time.perf_counter()
+    for i in range(args.reset_size):
+        # Rewards collected in the episode are added back by the restore.
+        env.remove_objs(ids[:args.collect_size])
+        env.restore_state(handle)
+        env.step([0, 0, 0], render=False)
+    elapsed = time.perf_counter() - start
+    env.close()
+    return elapsed / args.reset_size * 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--object_size", type=int, default=100)
+    parser.add_argument("--reset_size", type=int, default=200)
+    parser.add_argument("--collect_size", type=int, default=10)
+    args = parser.parse_args()
+
+    re_add_time = measure_re_add(args)
+    restore_time = measure_restore(args)
+
+    print("{:>10} {:>14} {:>14} {:>8}".format(
+        "objects", "re-add[ms]", "restore[ms]", "speedup"))
+    print("{:>10} {:>14.3f} {:>14.3f} {:>8.2f}".format(
+        args.object_size, re_add_time, restore_time, re_add_time / restore_time))
+
+
+if __name__ == '__main__':
+    main()
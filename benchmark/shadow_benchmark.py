@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of frame time with and without shadows.
+
+    $ python3 benchmark/shadow_benchmark.py --object_size 100
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.getcwd())
+import rodentia
+
+
+# (width, height)
+RESOLUTIONS = [
+    (84, 84),
+    (256, 256),
+]
+
+
+def create_env(args, width, height, shadow):
+    env = rodentia.Environment(width=width, height=height, shadow=shadow)
+
+    # Floor
+    env.add_box(texture_path="",
+                half_extent=[20.0, 1.0, 20.0],
+                pos=[0.0, -1.0, 0.0],
+                rot=0.0,
+                detect_collision=False)
+
+    # Boxes with random sizes
+    rng = np.random.RandomState(0)
+    for i in range(args.object_size):
+        pos = [rng.uniform(-18.0, 18.0), 1.0, rng.uniform(-18.0, 18.0)]
+        half_extent = [rng.randint(1, 3), 1.0, rng.randint(1, 3)]
+        env.add_box(texture_path="",
+                    color=rng.uniform(0.0, 1.0, size=3).tolist(),
+                    half_extent=half_extent,
+                    pos=pos,
+                    rot=rng.uniform(0.0, np.pi),
+                    detect_collision=False)
+    return env
+
+
+def measure(env, frame_size):
+    # Camera turns every frame, so that the shadow depth is not reused.
+    start = time.perf_counter()
+    for i in range(frame_size):
+        env.render(env.main_camera_id, [0.0, 1.0, 0.0], i * 0.01)
+    return (time.perf_counter() - start) / frame_size * 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--object_size", type=int, default=100)
+    parser.add_argument("--frame_size", type=int, default=500)
+    args = parser.parse_args()
+
+    print("{:>10} {:>16} {:>16} {:>8}".format(
+        "size", "shadow[ms]", "no shadow[ms]", "speedup"))
+    for width, height in RESOLUTIONS:
+        env = create_env(args, width, height, shadow=True)
+        shadow_time = measure(env, args.frame_size)
+        env.close()
+
+        env = create_env(args, width, height, shadow=False)
+        no_shadow_time = measure(env, args.frame_size)
+        env.close()
+
+        print("{:>10} {:>16.3f} {:>16.3f} {:>8.2f}".format(
+            "{}x{}".format(width, height), shadow_time, no_shadow_time,
+            shadow_time / no_shadow_time))
+
+
+if __name__ == '__main__':
+    main()
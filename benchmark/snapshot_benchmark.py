@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the serialized snapshots on the seekavoid arena. The snapshot is
+serialized in one environment, loaded in another environment built with the
+same stage (as another process would do), and the simulations after the
+restore are compared.
+
+    $ python3 benchmark/snapshot_benchmark.py --repeat_size 1000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.getcwd())
+sys.path.insert(0, os.path.join(os.getcwd(), "examples", "01_seekavoid_arena"))
+from seekavoid_environment import SeekAvoidEnvironment
+
+
+def measure(func, repeat_size):
+    start = time.perf_counter()
+    for i in range(repeat_size):
+        func()
+    return (time.perf_counter() - start) / repeat_size * 1000.0
+
+
+def run_steps(env, actions):
+    screens = []
+    for action in actions:
+        obs = env.step(SeekAvoidEnvironment.ACTION_LIST[action])
+        screens.append(obs["screen"].copy())
+    return np.array(screens)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--width", type=int, default=84)
+    parser.add_argument("--height", type=int, default=84)
+    parser.add_argument("--repeat_size", type=int, default=1000)
+    parser.add_argument("--step_size", type=int, default=100)
+    args = parser.parse_args()
+
+    rng = np.random.RandomState(0)
+    source = SeekAvoidEnvironment(width=args.width, height=args.height)
+    target = SeekAvoidEnvironment(width=args.width, height=args.height)
+
+    # Advance the source to the middle of the episode.
+    for action in rng.randint(6, size=args.step_size):
+        source.step(action)
+    handle = source.env.save_state()
+    data = source.env.serialize_state(handle)
+
+    save_time = measure(lambda: source.env.release_state(source.env.save_state()),
+                        args.repeat_size)
+    serialize_time = measure(lambda: source.env.serialize_state(handle),
+                             args.repeat_size)
+    load_time = measure(lambda: target.env.release_state(target.env.load_state(data)),
+                        args.repeat_size)
+    target_handle = target.env.load_state(data)
+    restore_time = measure(lambda: target.env.restore_state(target_handle),
+                           args.repeat_size)
+
+    # Rollouts from the restored states are identical.
+    actions = rng.randint(6, size=args.step_size)
+    source.env.restore_state(handle)
+    target.env.restore_state(target_handle)
+    identical = np.array_equal(run_steps(source.env, actions),
+                               run_steps(target.env, actions))
+
+    # 20 bytes header and 88 bytes for each object
+    object_size = (len(data) - 20) // 88
+    print("{:>10} {:>12} {:>10} {:>14} {:>10} {:>12} {:>10}".format(
+        "objects", "size[bytes]", "save[ms]", "serialize[ms]", "load[ms]",
+        "restore[ms]", "identical"))
+    print("{:>10} {:>12} {:>10.4f} {:>14.4f} {:>10.4f} {:>12.4f} {:>10}".format(
+        object_size, len(data), save_time, serialize_time,
+        load_time, restore_time, str(identical)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of stepping environments on worker processes, pickling the observations
+through pipes vs SubprocEnvPool with the shared memory.
+
+    $ python3 benchmark/subproc_env_pool_benchmark.py --num_envs 4
+"""
+import argparse
+import os
+import sys
+import time
+from multiprocessing import Process, Pipe
+
+import numpy as np
+
+sys.path.insert(0, os.getcwd())
+import rodentia
+from rodentia.vector import SubprocEnvPool
+
+
+# (width, height)
+RESOLUTIONS = [
+    (84, 84),
+    (256, 256),
+]
+
+
+class EnvFactory:
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+
+    def __call__(self):
+        env = rodentia.Environment(width=self.width, height=self.height)
+
+        # Floor
+        env.add_box(texture_path="",
+                    half_extent=[20.0, 1.0, 20.0],
+                    pos=[0.0, -1.0, 0.0],
+                    rot=0.0,
+                    detect_collision=False)
+
+        # Boxes with random sizes
+        rng = np.random.RandomState(0)
+        for i in range(20):
+            pos = [rng.uniform(-18.0, 18.0), 1.0, rng.uniform(-18.0, 18.0)]
+            env.add_box(texture_path="",
+                        color=rng.uniform(0.0, 1.0, size=3).tolist(),
+                        half_extent=[1.0, 1.0, 1.0],
+                        pos=pos,
+                        rot=rng.uniform(0.0, np.pi),
+                        detect_collision=False)
+        return env
+
+
+def pipe_worker(env_fn, conn):
+    env = env_fn()
+    conn.send(0)
+    while True:
+        action = conn.recv()
+        if action is None:
+            break
+        conn.send(env.step(action))
+    env.close()
+
+
+def measure_pipe(env_fn, num_envs, step_size):
+    conns = []
+    procs = []
+    for i in range(num_envs):
+        conn, child_conn = Pipe()
+        proc = Process(target=pipe_worker, args=(env_fn, child_conn))
+        proc.start()
+        conn.recv()
+        conns.append(conn)
+        procs.append(proc)
+
+    actions = np.zeros((num_envs, 3), dtype=np.int32)
+    actions[:,0] = 1
+    start = time.perf_counter()
+    for i in range(step_size):
+        for conn, action in zip(conns, actions):
+            conn.send(action)
+        screens = np.stack([conn.recv()["screen"] for conn in conns])
+    elapsed = time.perf_counter() - start
+
+    for conn, proc in zip(conns, procs):
+        conn.send(None)
+        proc.join()
+    return step_size * num_envs / elapsed
+
+
+def measure_pool(env_fn, num_envs, step_size):
+    actions = np.zeros((num_envs, 3), dtype=np.int32)
+    actions[:,0] = 1
+    with SubprocEnvPool(env_fn, num_envs) as pool:
+        start = time.perf_counter()
+        for i in range(step_size):
+            screens = pool.step(actions)["screen"]
+        elapsed = time.perf_counter() - start
+    return step_size * num_envs / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num_envs", type=int, default=4)
+    parser.add_argument("--step_size", type=int, default=500)
+    args = parser.parse_args()
+
+    print("{:>10} {:>16} {:>16} {:>8}".format(
+        "size", "pipe[steps/s]", "pool[steps/s]", "speedup"))
+    for width, height in RESOLUTIONS:
+        env_fn = EnvFactory(width, height)
+        pipe_fps = measure_pipe(env_fn, args.num_envs, args.step_size)
+        pool_fps = measure_pool(env_fn, args.num_envs, args.step_size)
+
+        print("{:>10} {:>16.1f} {:>16.1f} {:>8.2f}".format(
+            "{}x{}".format(width, height), pipe_fps, pool_fps,
+            pool_fps / pipe_fps))
+
+
+if __name__ == '__main__':
+    main()
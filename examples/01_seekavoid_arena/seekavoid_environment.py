@@ -167,10 +167,9 @@ class SeekAvoidEnvironment(object):
         # Get action value to set to environment
         real_action = SeekAvoidEnvironment.ACTION_LIST[action]
 
-        obs = self.env.step(action=real_action)
+        obs = self.env.step(action=real_action, render=False)
         self.step_num += 1
 
-        screen = obs["screen"]
         collided = obs["collided"]
 
         # Check collision
@@ -183,16 +182,24 @@ class SeekAvoidEnvironment(object):
                 elif id in self.minus_obj_ids_set:
                     reward -= 1
                     self.minus_obj_ids_set.remove(id)
-                # Remove reward object from environment
-                self.env.remove_obj(id)
 
         # Check if all positive rewards are taken
         is_empty = len(self.plus_obj_ids_set) == 0
 
         # Episode ends when step size exceeds MAX_STEP_NUM
         terminal = self.step_num >= MAX_STEP_NUM
+        reset = (not terminal) and is_empty
+
+        # The screen still shows the collided objects. It is not rendered when
+        # the stage is reset.
+        if not reset:
+            screen = self.env.observe()["screen"]
+
+        # Remove reward objects from environment
+        for id in collided:
+            self.env.remove_obj(id)
 
-        if (not terminal) and is_empty:
+        if reset:
             screen = self._reset_sub()
 
         return screen, reward, terminal
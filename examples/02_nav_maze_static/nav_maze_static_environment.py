@@ -334,14 +334,14 @@ class NavMazeStaticEnvironment(object):
         #  real_action = NavMazeStaticEnvironment.ACTION_LIST[action]
         real_action = NavMazeStaticEnvironment.ACTION_LIST[action]
 
-        obs = self.env.step(action=real_action)
+        obs = self.env.step(action=real_action, render=False)
         self.step_num += 1
 
-        screen = obs["screen"]
         collided = obs["collided"]  # ids for collided objects
 
         reward = 0
         goal_arrived = False
+        taken_ids = []
 
         # Check collision
         if len(collided) != 0:
@@ -349,9 +349,8 @@ class NavMazeStaticEnvironment(object):
                 if id in self.reward_obj_ids_set:
                     # If collided with reward object
                     reward += 1
-                    # Remove reward object
                     self.reward_obj_ids_set.remove(id)
-                    self.env.remove_obj(id)
+                    taken_ids.append(id)
                 elif id == self.goal_obj_id:
                     # If collided with goal object
                     reward += 10
@@ -359,8 +358,18 @@ class NavMazeStaticEnvironment(object):
 
         # Episode ends when step size exceeds MAX_STEP_NUM
         terminal = self.step_num >= MAX_STEP_NUM
+        reset = (not terminal) and goal_arrived
+
+        # The taken rewards are still in the screen, and the screen is skipped
+        # when the maze is reset.
+        if not reset:
+            screen = self.env.observe()["screen"]
+
+        # Remove reward objects
+        for id in taken_ids:
+            self.env.remove_obj(id)
 
-        if (not terminal) and goal_arrived:
+        if reset:
             # Reset rewards and locate agent to random position
             screen = self._reset_sub()
 
@@ -147,20 +147,18 @@ class BilliardEnvironment(object):
         self.ball_obj_id_list = []
 
     def _check_balls_in_pockets(self):
-        """ Check wheter balls are fallen in the pocket. """
-        reward = 0
+        """ Check wheter balls are fallen in the pocket. Returns ids of the fallen balls. """
+        fallen_ids = []
 
         for id in self.ball_obj_id_list[:]:
             info = self.env.get_obj_info(id)
             pos = info["pos"]
             if pos[1] < -1.0:
                 # If the ball is fallen in the packet.
-                # Remove ball obj from env.
-                self.env.remove_obj(id)
                 # Remove ball's id from id list.
                 self.ball_obj_id_list.remove(id)
-                reward += 1
-        return reward
+                fallen_ids.append(id)
+        return fallen_ids
 
     def _check_agent_in_pockets(self):
         """ Check whether agent is fallen in the packet or not. """
@@ -170,13 +168,12 @@ class BilliardEnvironment(object):
         return pos[1] < 0.0
 
     def step(self, real_action):
-        obs = self.env.step(action=real_action)
+        self.env.step(action=real_action, render=False)
         self.step_num += 1
 
-        screen = obs["screen"]
-
         # Check if balls are fallen in the pocket
-        reward = self._check_balls_in_pockets()
+        fallen_ids = self._check_balls_in_pockets()
+        reward = len(fallen_ids)
 
         # Check if all positive rewards are taken
         is_empty = len(self.ball_obj_id_list) == 0
@@ -185,8 +182,18 @@ class BilliardEnvironment(object):
 
         # Episode ends when step size exceeds MAX_STEP_NUM
         terminal = self.step_num >= MAX_STEP_NUM or agent_fallen
+        reset = (not terminal) and is_empty
+
+        # Fallen balls are removed after rendering. No screen is needed when the
+        # balls are racked again.
+        if not reset:
+            screen = self.env.observe()["screen"]
+
+        # Remove ball objs from env.
+        for id in fallen_ids:
+            self.env.remove_obj(id)
 
-        if (not terminal) and is_empty:
+        if reset:
             screen = self._reset_sub()
 
         return screen, reward, terminal
@@ -187,20 +187,16 @@ class AAIEnvironment(object):
         return self._reset_sub()
 
     def _clear_objects(self):
-        # Create reward objects
-        for id in self.plus_obj_ids_set:
-            self.env.remove_obj(id)
-        for id in self.minus_obj_ids_set:
-            self.env.remove_obj(id)
+        # Remove reward objects
+        self.env.remove_objs(list(self.plus_obj_ids_set | self.minus_obj_ids_set))
 
         self.plus_obj_ids_set = set()
         self.minus_obj_ids_set = set()
 
     def step(self, real_action):
-        obs = self.env.step(action=real_action)
+        obs = self.env.step(action=real_action, render=False)
         self.step_num += 1
 
-        screen = obs["screen"]
         collided = obs["collided"]
 
         # Check collision
@@ -213,16 +209,24 @@ class AAIEnvironment(object):
                 elif id in self.minus_obj_ids_set:
                     reward -= 1
                     self.minus_obj_ids_set.remove(id)
-                # Remove reward object from environment
-                self.env.remove_obj(id)
 
         # Check if all positive rewards are taken
         is_empty = len(self.plus_obj_ids_set) == 0
 
         # Episode ends when step size exceeds MAX_STEP_NUM
         terminal = self.step_num >= MAX_STEP_NUM
+        reset = (not terminal) and is_empty
+
+        # Render before removing the collided objects, unless the arena is
+        # reset.
+        if not reset:
+            screen = self.env.observe()["screen"]
+
+        # Remove reward objects from environment
+        for id in collided:
+            self.env.remove_obj(id)
 
-        if (not terminal) and is_empty:
+        if reset:
             screen = self._reset_sub()
 
         return screen, reward, terminal
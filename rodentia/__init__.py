@@ -1,4 +1,4 @@
-from rodentia.core import Environment, MultiAgentEnvironment, BaseEnvironment
+from rodentia.core import Environment, MultiAgentEnvironment, BaseEnvironment, BatchEnvironment
 from rodentia.__version__ import __version__
 
-__all__ = ["Environment", "MultiAgentEnvironment", "BaseEnvironment"]
+__all__ = ["Environment", "MultiAgentEnvironment", "BaseEnvironment", "BatchEnvironment"]
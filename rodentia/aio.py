@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AsyncEnvironment:
+    """
+    asyncio wrapper of the environment.
+
+    The environment is created and used on its own dedicated thread, because its GL
+    context is bound to the thread which created it. The calls are queued to the
+    thread in order, and awaited without blocking the event loop. The GIL is
+    released during physics simulation and rendering, so the environments of the
+    different AsyncEnvironments run in parallel.
+
+    Any method of the environment can be awaited, e.g.
+        env = AsyncEnvironment(lambda: rodentia.Environment(width=84, height=84))
+        await env.add_box(...)
+        obs = await env.step(action)
+    """
+
+    def __init__(self, env_fn):
+        """Start the thread and create the environment on it.
+        Args:
+          env_fn: Callable which creates the environment (e.g. rodentia.Environment)
+                  Called on the dedicated thread.
+        """
+        self.executor = ThreadPoolExecutor(max_workers=1,
+                                           thread_name_prefix="rodentia")
+        # Calls submitted later wait for the environment to be created.
+        self.env_future = self.executor.submit(env_fn)
+
+    def _call(self, func, *args, **kwargs):
+        env = self.env_future.result()
+        return func(env, *args, **kwargs)
+
+    def run(self, func, *args, **kwargs):
+        """Run func(env, *args, **kwargs) on the thread of the environment.
+        Returns:
+          Awaitable of the return value of func.
+        """
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(
+            self.executor, functools.partial(self._call, func, *args, **kwargs))
+
+    def step(self, action, **kwargs):
+        """Step environment process on the thread of the environment.
+        Args:
+          action, kwargs: Same as Environment.step()
+        Returns:
+          Awaitable of the result of Environment.step()
+        """
+        return self.run(lambda env: env.step(action, **kwargs))
+
+    def render(self, camera_id, pos, rot, **kwargs):
+        """Render the camera view on the thread of the environment.
+        Args:
+          camera_id, pos, rot, kwargs: Same as Environment.render()
+        Returns:
+          Awaitable of the result of Environment.render()
+        """
+        return self.run(lambda env: env.render(camera_id, pos, rot, **kwargs))
+
+    def __getattr__(self, name):
+        # Other methods of the environment
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        def method(*args, **kwargs):
+            return self.run(lambda env: getattr(env, name)(*args, **kwargs))
+        return method
+
+    async def close(self):
+        """ Release environment and stop the thread. """
+        await self.run(lambda env: env.close())
+        self.executor.shutdown(wait=False)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, tb):
+        await self.close()
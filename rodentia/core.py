@@ -23,6 +23,27 @@ def to_nd_float_array_for_rot(value):
     return to_nd_float_array(value)
 
 
+def to_nd_float_array_for_rots(value, size):
+    """ Convert rotations of the objects to numpy float ndarray with shape (size,4).
+    A float or 1-dimensional values are treated as Y rotation values, and
+    2-dimensional values are treated as quaternions. """
+    value = np.asarray(value)
+    if value.ndim <= 1:
+        angle = np.broadcast_to(value.astype(np.float64), (size,))
+        zeros = np.zeros((size,))
+        value = np.stack([zeros, np.sin(angle * 0.5), zeros, np.cos(angle * 0.5)], axis=1)
+    return to_nd_float_matrix(value, size, 4)
+
+
+def to_nd_float_matrix(value, size, width):
+    """ Convert values to C-contiguous numpy float ndarray with shape (size,width).
+    Values with one row are broadcasted to all the rows. If width is 0, the shape
+    is (size,). """
+    shape = (size, width) if width > 0 else (size,)
+    value = np.broadcast_to(np.asarray(value, dtype=np.float32), shape)
+    return np.ascontiguousarray(value)
+
+
 def to_nd_int_array(list_obj):
     """ Convert list to numpy int ndarray """
     if isinstance(list_obj, np.ndarray):
@@ -31,11 +52,54 @@ def to_nd_int_array(list_obj):
         return np.array(list_obj, dtype=np.int32)
 
 
+# Depth output types of the camera view (RenderTarget::DepthType)
+_DEPTH_TYPES = {
+    None: 0,
+    "float32": 1,
+    "uint16": 2,
+}
+
+
+def to_depth_type(depth):
+    """ Convert depth output type name to the int value for rodentia_module """
+    if depth not in _DEPTH_TYPES:
+        raise ValueError("depth must be None, 'float32' or 'uint16': {}".format(depth))
+    return _DEPTH_TYPES[depth]
+
+
+# Screen output formats of the camera view (RenderTarget::OutputFormat)
+_OUTPUT_FORMATS = {
+    "rgb": 0,
+    "gray": 1,
+    "rgba": 2,
+}
+
+
+def to_output_format(output_format):
+    """ Convert screen output format name to the int value for rodentia_module """
+    if output_format not in _OUTPUT_FORMATS:
+        raise ValueError(
+            "output_format must be 'rgb', 'gray' or 'rgba': {}".format(output_format))
+    return _OUTPUT_FORMATS[output_format]
+
+
+# Number of the screen channels for each output format
+_OUTPUT_CHANNELS = {
+    "rgb": 3,
+    "gray": 1,
+    "rgba": 4,
+}
+
 
 class BaseEnvironment:
     """
     Common super class for the plain Environment and MultiAgentEnvironment.
     BaseEnvironment wraps rodentia_module.Env class.
+
+    The GIL is released during physics simulation and rendering, so that
+    environments on different threads can run in parallel. The environment
+    has to be created and used on the same thread, because its GL context is
+    bound to the thread which created it.
     """
     
     def __init__(self,
@@ -45,7 +109,13 @@ class BaseEnvironment:
                  near=0.05,
                  far=80.0,
                  focal_length=50.0,
-                 shadow_buffer_width=0):
+                 shadow_buffer_width=0,
+                 gl_backend=None,
+                 shadow=True,
+                 depth=None,
+                 segmentation=False,
+                 output_format="rgb",
+                 supersampling=1):
         """Create environment.
         Args:
           width: Screen width
@@ -56,15 +126,32 @@ class BaseEnvironment:
           focal_length: Focal length (default 50.0)
           shadow_buffer_width: Shadow depth buffer width. (If 0 calculated automatically )
                                (default 0)
+          gl_backend: GL context backend on Linux, "glx" or "egl". "egl" runs without
+                      X server. If None, RODENTIA_GL_BACKEND environment variable is
+                      used, or "egl" is selected when DISPLAY is not set. (default None)
+          shadow: If False, the shadow depth rendering is skipped and the view is drawn
+                  without shadow. (default True)
+          depth: Depth output type of the main camera view, None, "float32" or
+                 "uint16". (default None)
+          segmentation: Whether the main camera view outputs the object ids.
+                        (default False)
+          output_format: Screen format of the main camera view, "rgb", "gray" or
+                         "rgba". (default "rgb")
+          supersampling: Supersampling factor of the main camera view. (default 1)
         """
-        self.env = rodentia_module.Env()
+        self.env = rodentia_module.Env(gl_backend=gl_backend)
         self.main_camera_id = self.add_camera_view(width,
                                                    height,
                                                    bg_color,
                                                    near,
                                                    far,
                                                    focal_length,
-                                                   shadow_buffer_width)
+                                                   shadow_buffer_width,
+                                                   shadow,
+                                                   depth,
+                                                   segmentation,
+                                                   output_format,
+                                                   supersampling)
 
     def add_camera_view(self,
                         width,
@@ -73,7 +160,12 @@ class BaseEnvironment:
                         near=0.05,
                         far=80.0,
                         focal_length=50.0,
-                        shadow_buffer_width=0):
+                        shadow_buffer_width=0,
+                        shadow=True,
+                        depth=None,
+                        segmentation=False,
+                        output_format="rgb",
+                        supersampling=1):
         """Add camera view.
         Args:
           width: Screen width
@@ -84,13 +176,33 @@ class BaseEnvironment:
           focal_length: Focal length (default 50.0)
           shadow_buffer_width: Shadow depth buffer width. (If 0 calculated automatically )
                                (default 0)
+          shadow: If False, the shadow depth rendering is skipped and the view is drawn
+                  without shadow. (default True)
+          depth: Depth output type of render(). None (no depth), "float32" (distance
+                 from the camera plane) or "uint16" (distance scaled from near (0) to
+                 far (65535)). Pixels without objects have the far distance.
+                 (default None)
+          segmentation: If True, render() also outputs the object id of each pixel.
+                        (-1 for pixels without objects) (default False)
+          output_format: Screen format, "rgb" (3 channels), "gray" (1 channel) or
+                         "rgba" (4 channels, alpha is always 255). Gray is converted
+                         on GPU. (default "rgb")
+          supersampling: Int factor to render the view larger and average the pixels
+                         on GPU before the readback, for antialiasing. Depth and
+                         segmentation take the nearest sample. (default 1)
+          Views with "gray" or supersampling can't be used with render_agents().
         Returns:
           Int value for the camera id.
         """
         return self.env.add_camera_view(width=width, height=height,
                                         bg_color=to_nd_float_array(bg_color),
                                         near=near, far=far, focal_length=focal_length,
-                                        shadow_buffer_width=shadow_buffer_width)
+                                        shadow_buffer_width=shadow_buffer_width,
+                                        shadow=shadow,
+                                        depth=to_depth_type(depth),
+                                        segmentation=segmentation,
+                                        output_format=to_output_format(output_format),
+                                        supersampling=supersampling)
 
     def add_box(self,
                 half_extent,
@@ -165,6 +277,78 @@ class BaseEnvironment:
             detect_collision=detect_collision,
             visible=visible)
 
+    def add_boxes(self,
+                  half_extents,
+                  pos,
+                  rot=0.0,
+                  mass=0.0,
+                  texture_path="",
+                  color=[1,1,1],
+                  detect_collision=False,
+                  visible=True):
+        """Add box objects in one call.
+        Args:
+          half_extents: (N,3) float values for half extent sizes of the boxes, or
+                        (x,y,z) for all the boxes.
+          pos: (N,3) float values for the centers of the boxes.
+          rot: A float value or (N) float values for head angles (rot_y) or (N,4)
+               float values as the rotation quaternions of the objects (in radian)
+          mass: A float value for mass of the objects.
+          texture_path: Path for the texture (.png file) of all the boxes.
+          color: (N,3) or (r,g,b) color values when texture_path was not specified.
+          detect_collision: Whether the objects are included for collision check result.
+          visible: Visibility of the objects. If false, only collision will take effect.
+        Returns:
+          numpy nd_array of (N,) (int32) for the object ids.
+        """
+        pos = np.ascontiguousarray(pos, dtype=np.float32).reshape(-1, 3)
+        size = len(pos)
+        return self.env.add_boxes(
+            texture_path=texture_path,
+            colors=to_nd_float_matrix(color, size, 3),
+            half_extents=to_nd_float_matrix(half_extents, size, 3),
+            pos=pos,
+            rot=to_nd_float_array_for_rots(rot, size),
+            mass=mass,
+            detect_collision=detect_collision,
+            visible=visible)
+
+    def add_spheres(self,
+                    radiuses,
+                    pos,
+                    rot=0.0,
+                    mass=0.0,
+                    texture_path="",
+                    color=[1,1,1],
+                    detect_collision=False,
+                    visible=True):
+        """Add sphere objects in one call.
+        Args:
+          radiuses: (N) float values for the radiuses of the spheres, or a float
+                    value for all the spheres.
+          pos: (N,3) float values for the centers of the spheres.
+          rot: A float value or (N) float values for head angles (rot_y) or (N,4)
+               float values as the rotation quaternions of the objects (in radian)
+          mass: A float value for mass of the objects.
+          texture_path: Path for the texture (.png file) of all the spheres.
+          color: (N,3) or (r,g,b) color values when texture_path was not specified.
+          detect_collision: Whether the objects are included for collision check result.
+          visible: Visibility of the objects. If false, only collision will take effect.
+        Returns:
+          numpy nd_array of (N,) (int32) for the object ids.
+        """
+        pos = np.ascontiguousarray(pos, dtype=np.float32).reshape(-1, 3)
+        size = len(pos)
+        return self.env.add_spheres(
+            texture_path=texture_path,
+            colors=to_nd_float_matrix(color, size, 3),
+            radiuses=to_nd_float_matrix(radiuses, size, 0),
+            pos=pos,
+            rot=to_nd_float_array_for_rots(rot, size),
+            mass=mass,
+            detect_collision=detect_collision,
+            visible=visible)
+
     def add_model(self,
                   path,
                   scale,
@@ -227,6 +411,20 @@ class BaseEnvironment:
             pos=to_nd_float_array(pos),
             rot=to_nd_float_array_for_rot(rot))
 
+    def locate_objects(self, ids, pos, rot=0.0):
+        """Locate objects to given positions and orientataions in one call.
+        Args:
+          ids: Int list of the object ids
+          pos: (N,3) float values for the locations.
+          rot: A float value or (N) float values for head angles (rot_y) or (N,4)
+               float values as the rotation quaternions of the objects (in radian)
+        """
+        ids = np.ascontiguousarray(ids, dtype=np.int32)
+        self.env.locate_objects(
+            ids=ids,
+            pos=to_nd_float_matrix(pos, len(ids), 3),
+            rot=to_nd_float_array_for_rots(rot, len(ids)))
+
     def set_light(self,
                   dir=[-0.5, -1.0, -0.4],
                   color=[1.0, 1.0, 1.0],
@@ -245,6 +443,38 @@ class BaseEnvironment:
             ambient_color=to_nd_float_array(ambient_color),
             shadow_rate=shadow_rate)
 
+    def set_physics(self,
+                    time_step=1.0/60.0,
+                    max_sub_steps=1,
+                    fixed_time_step=1.0/60.0):
+        """Set time step parameters of the physics simulation.
+        Each step advances time_step seconds with at most max_sub_steps internal steps
+        of fixed_time_step seconds, and the remaining time is carried over to the next
+        step. (e.g. time_step=1/30, max_sub_steps=1, fixed_time_step=1/30 for coarse
+        navigation tasks, or time_step=1/60, max_sub_steps=4, fixed_time_step=1/240
+        for precise collisions)
+        Args:
+          time_step: a float, time advanced by one step in seconds. (default 1/60)
+          max_sub_steps: an int, max number of internal steps in one step. If 0,
+                         time_step is simulated with one variable internal step.
+                         (default 1)
+          fixed_time_step: a float, internal time step in seconds. (default 1/60)
+        """
+        self.env.set_physics(time_step=time_step,
+                             max_sub_steps=max_sub_steps,
+                             fixed_time_step=fixed_time_step)
+
+    def set_deterministic(self, enabled=True):
+        """Enable or disable the deterministic mode of the physics simulation.
+        In the deterministic mode, the bodies, the collision pairs and the contacts
+        are processed in a fixed order in each step, so that the same actions from the
+        same state give the same states regardless of the objects added or removed
+        before. (e.g. to replay the action log with rodentia.replay)
+        Args:
+          enabled: Boolean, whether to enable the deterministic mode. (default True)
+        """
+        self.env.set_deterministic(enabled=enabled)
+
     def remove_obj(self, id):
         """Remove object from environment.
         Args:
@@ -252,6 +482,13 @@ class BaseEnvironment:
         """
         self.env.remove_obj(id=id)
 
+    def remove_objs(self, ids):
+        """Remove objects from environment in one call.
+        Args:
+          ids: Int list of the deleting objects' ids
+        """
+        self.env.remove_objs(ids=np.ascontiguousarray(ids, dtype=np.int32))
+
     def apply_impulse(self, id, impulse):
         """Apply impulse to the  object.
         Args:
@@ -272,6 +509,53 @@ class BaseEnvironment:
         """
         return self.env.get_obj_info(id=id)
 
+    def get_objs_info(self, ids):
+        """Get information of the objects in one call.
+        Args:
+          ids: Int list of the object ids
+        Returns:
+          Dictionary which contains the objects' current state info.
+            "ids": numpy nd_array of (N,) (int32)
+            "pos": numpy nd_array of (N,3) (float32)
+            "velocity" numpy nd_array of (N,3) (float32)
+            "rot" numpy nd_array of (N,4) (float32)
+          Rows of the ids not found are filled with NaN.
+        """
+        ids = np.ascontiguousarray(ids, dtype=np.int32)
+        return self.env.get_objs_info(ids=ids)
+
+    def get_dynamic_objs_info(self):
+        """Get information of all the dynamic objects (agents and objects with mass)
+        in one call.
+        Returns:
+          Same as get_objs_info() for the dynamic objects in the ascending id order.
+        """
+        return self.env.get_objs_info()
+
+    def get_render_stats(self):
+        """Get statistics of the last rendering.
+        Objects outside of the camera frustum are culled in the color rendering, and
+        objects outside of the light frustum are culled in the shadow depth rendering.
+        Objects sharing the same mesh and texture are drawn with one instanced draw call,
+        and draw calls are sorted by shader, texture and mesh to reduce state changes.
+        The shadow depth of the previous rendering is reused when the camera pose, the
+        light direction and the poses of all the objects are unchanged.
+        Returns:
+          Dictionary which contains the object counts.
+            "drawn": Int, objects drawn in the color rendering
+            "culled": Int, objects culled in the color rendering
+            "shadow_drawn": Int, objects drawn in the shadow depth rendering
+            "shadow_culled": Int, objects culled in the shadow depth rendering
+            "draw_calls": Int, draw calls in the color rendering
+            "shadow_draw_calls": Int, draw calls in the shadow depth rendering
+            "state_changes": Int, shader, texture and vertex array binds in the
+                             rendering (redundant binds are skipped)
+            "shadow_cached": Int, shadow depth renderings skipped because the camera,
+                             the light and the objects were unchanged since the
+                             previous rendering of the camera
+        """
+        return self.env.get_render_stats()
+
     def replace_obj_texture(self, id, texture_path):
         """Replace object texture(s).
            If object is consist of multiple meshes, textures of these meshes can be replaced 
@@ -285,7 +569,75 @@ class BaseEnvironment:
         else:
             self.env.replace_obj_texture(id, [texture_path])
 
-    def render(self, camera_id, pos, rot, ignore_ids=[]):
+    def bake_static(self):
+        """Merge meshes of the static objects to draw them with a few draw calls.
+           Visible objects with zero mass (except agents) are merged into pre-transformed
+           meshes for each texture. Baked objects are drawn even if their ids are in
+           ignore_ids of render(). Locating, removing or replacing textures of a baked
+           object discards the merged meshes, and the objects are drawn individually
+           until bake_static() is called again. Objects added after the call are drawn
+           individually.
+        Returns:
+          Int value for the number of baked objects.
+        """
+        return self.env.bake_static()
+
+    def save_state(self):
+        """Save the object set and the states of all the objects (transforms, velocities
+        and head angles of the agents) to restore them later with restore_state().
+        Objects removed after the call are kept detached from the physics world
+        until the state is released with release_state().
+        Returns:
+          Int value for the snapshot handle.
+        """
+        return self.env.save_state()
+
+    def restore_state(self, handle):
+        """Restore the state saved with save_state(). Objects added after save_state()
+        are removed, and objects removed after save_state() are added again with the
+        same ids. The simulation after the restore is reproducible with the same actions.
+        Args:
+          handle: Int value for the snapshot handle returned by save_state().
+        """
+        self.env.restore_state(snapshot_id=handle)
+
+    def release_state(self, handle):
+        """Release the state saved with save_state().
+        Args:
+          handle: Int value for the snapshot handle returned by save_state().
+        """
+        self.env.release_state(snapshot_id=handle)
+
+    def serialize_state(self, handle):
+        """Serialize the state saved with save_state() into the compact binary, which
+        can be sent to another process and loaded there with load_state().
+        Args:
+          handle: Int value for the snapshot handle returned by save_state().
+        Returns:
+          bytes of the object ids and the states of the objects.
+        """
+        return self.env.serialize_state(snapshot_id=handle)
+
+    def load_state(self, data):
+        """Load the state serialized with serialize_state() to restore it with
+        restore_state(). The environment has to be built with the same stage as the
+        serialized one, so that all the objects in the state exist. The simulation after
+        the restore is the same as in the serialized environment.
+        Args:
+          data: bytes returned by serialize_state()
+        Returns:
+          Int value for the snapshot handle in this environment.
+        """
+        return self.env.load_state(data=data)
+
+    def get_state_hash(self):
+        """Get the hash of the current object set and rigid body states.
+        Returns:
+          Int value of the 64 bit hash. Equal hashes mean that the states are the same.
+        """
+        return self.env.get_state_hash()
+
+    def render(self, camera_id, pos, rot, ignore_ids=[], out=None):
         """Step environment process and returns result.
         Args:
           camera_id: Int array with 3 elements.
@@ -293,23 +645,102 @@ class BaseEnvironment:
           rot: A float value for head angle (rot_y) or list (rx,ry,rz,rw) as 
                the rotation quaternion of the camera
           ignore_ids: Int list, oject id list to skip drawing
+          out: (Optional) Writeable C-contiguous uint8 nd_array with
+               width * height * channels elements. Pixels are read into it directly
+               without allocating a new array.
           
         Returns:
           Dictionary which contains the result of this step calculation.
-            "screen": numpy nd_array of width * height * 3 (uint8)
+            "screen": numpy nd_array of width * height * channels (uint8)
+                      (channels is 3 for "rgb", 1 for "gray" and 4 for "rgba")
+                      (out itself if specified)
+            "depth": numpy nd_array of width * height (float32 or uint16)
+                     (only when depth is enabled for the camera view)
+            "segmentation": numpy nd_array of width * height (int32)
+                            (only when segmentation is enabled for the camera view)
+          Depth and segmentation are read from the same rendering as the screen.
         """
         return self.env.render(
+            camera_id=camera_id,
+            pos=to_nd_float_array(pos),
+            rot=to_nd_float_array_for_rot(rot),
+            ignore_ids=to_nd_int_array(ignore_ids),
+            out=out
+        )
+
+    def render_async(self, camera_id, pos, rot, ignore_ids=[]):
+        """Render the camera view without waiting for the pixels to be read back.
+        The pixels are obtained later with fetch(), so that the next frame can be
+        simulated and rendered while the pixels are transferred.
+        Up to 3 results can be pending for each camera. Only the screen is read, so
+        the camera view with depth or segmentation can't be rendered asynchronously.
+        Args:
+          camera_id: Int value for the camera id.
+          pos: (x,y,z) Position of the camera
+          rot: A float value for head angle (rot_y) or list (rx,ry,rz,rw) as 
+               the rotation quaternion of the camera
+          ignore_ids: Int list, oject id list to skip drawing
+        """
+        self.env.render_async(
             camera_id=camera_id,
             pos=to_nd_float_array(pos),
             rot=to_nd_float_array_for_rot(rot),
             ignore_ids=to_nd_int_array(ignore_ids)
         )
 
+    def fetch(self, camera_id, out=None):
+        """Fetch the screen of the oldest pending render_async() call.
+        Args:
+          camera_id: Int value for the camera id.
+          out: (Optional) Writeable C-contiguous uint8 nd_array with
+               width * height * channels elements to copy the screen into.
+        Returns:
+          Dictionary which contains the result of the rendering.
+            "screen": numpy nd_array of width * height * channels (uint8)
+                      (out itself if specified)
+          Depth and segmentation are not included. (render_async() is not available
+          for the camera view with them)
+        """
+        return self.env.fetch(camera_id=camera_id, out=out)
+
     def close(self):
         """ Release environment """
         self.env.release()
 
 
+class _FrameStack:
+    """
+    Ring buffer of the last k screens.
+    The frames are stored twice in a (2k, ...) array, so that the last k frames are
+    always a contiguous slice and can be returned as a view without concatenation.
+    """
+
+    def __init__(self, k, frame_shape):
+        self.k = k
+        self.buffer = np.zeros((2 * k,) + tuple(frame_shape), dtype=np.uint8)
+        self.reset()
+
+    def reset(self):
+        """ Forget the stacked frames. The next frame fills the whole stack. """
+        self.index = -1
+
+    def next_frame(self):
+        """ Get the array to render the next frame into. """
+        return self.buffer[(self.index + 1) % self.k + self.k]
+
+    def push(self):
+        """ Commit the frame rendered into next_frame() and return the stack view. """
+        k = self.k
+        if self.index < 0:
+            # Fill the stack with the first frame.
+            self.index = 0
+            self.buffer[:] = self.buffer[k]
+        else:
+            self.index = (self.index + 1) % k
+            self.buffer[self.index] = self.buffer[self.index + k]
+        return self.buffer[self.index + 1:self.index + 1 + k]
+
+
 class Environment(BaseEnvironment):
     """
     Single agent environment.
@@ -323,7 +754,14 @@ class Environment(BaseEnvironment):
                  far=80.0,
                  focal_length=50.0,
                  shadow_buffer_width=0,
-                 agent_radius=1.0):
+                 agent_radius=1.0,
+                 gl_backend=None,
+                 shadow=True,
+                 depth=None,
+                 segmentation=False,
+                 output_format="rgb",
+                 supersampling=1,
+                 frame_stack=1):
         """Create environment.
         Args:
           width: Screen width
@@ -335,6 +773,21 @@ class Environment(BaseEnvironment):
           shadow_buffer_width: Shadow depth buffer width. (If 0 calculated automatically )
                                (default 0)
           agent_radius: Radius of the agent sphere
+          gl_backend: GL context backend on Linux, "glx" or "egl". "egl" runs without
+                      X server. If None, RODENTIA_GL_BACKEND environment variable is
+                      used, or "egl" is selected when DISPLAY is not set. (default None)
+          shadow: If False, the shadow depth rendering is skipped and the view is drawn
+                  without shadow. (default True)
+          depth: Depth output type of the agent view, None, "float32" or "uint16".
+                 (default None)
+          segmentation: Whether the agent view outputs the object ids. (default False)
+          output_format: Screen format of the agent view, "rgb", "gray" or "rgba".
+                         (default "rgb")
+          supersampling: Supersampling factor of the agent view. (default 1)
+          frame_stack: Number of the last screens returned as "screen" by step() and
+                       observe(). If more than 1, the screens are stacked in place into
+                       a preallocated (frame_stack, width, height, channels) buffer.
+                       (default 1)
         """
         super().__init__(width,
                          height,
@@ -342,13 +795,26 @@ class Environment(BaseEnvironment):
                          near,
                          far,
                          focal_length,
-                         shadow_buffer_width)
+                         shadow_buffer_width,
+                         gl_backend,
+                         shadow,
+                         depth,
+                         segmentation,
+                         output_format,
+                         supersampling)
         self.agent_id = self.env.add_agent(radius=agent_radius,
                                            pos=to_nd_float_array([0,0,0]),
                                            rot_y=0.0,
                                            mass=1.0,
                                            detect_collision=False,
                                            color=to_nd_float_array([0,0,1]))
+        # Depth and segmentation can't be rendered asynchronously.
+        self._async_available = depth is None and not segmentation
+        if frame_stack > 1:
+            self.frame_stack = _FrameStack(
+                frame_stack, (width, height, _OUTPUT_CHANNELS[output_format]))
+        else:
+            self.frame_stack = None
 
     def locate_agent(self, pos, rot_y=0.0):
         """Locate agenet to given position and orientataion.
@@ -358,30 +824,128 @@ class Environment(BaseEnvironment):
         """
         self.env.locate_agent(id=self.agent_id, pos=to_nd_float_array(pos), rot_y=rot_y)
 
-    def step(self, action):
+    def step(self, action, out=None, repeat=1, render=True):
         """Step environment process and returns result.
         Args:
           action: Int array with 3 elements.
+          out: (Optional) Writeable C-contiguous uint8 nd_array with
+               width * height * channels elements to read the screen into.
+               (Not available with frame_stack)
+          repeat: Number of physics steps to advance with the same action (action
+                  repeat). Only the last frame is rendered, and collisions in all the
+                  steps are reported. (default 1)
+          render: Whether to render the agent view. If False, only the physics is
+                  advanced and "screen" is not included in the result. The screen
+                  can be obtained later with observe(). (default True)
         Returns:
           Dictionary which contains the result of this step calculation.
             "collided" Int list of object ids that collided with the agent.
-            "screen": numpy nd_array of width * height * 3 (uint8)
+            "screen": numpy nd_array of width * height * channels (uint8)
+                      (out itself if specified)
+                      With frame_stack, the view of the last frame_stack screens
+                      (oldest first), which is overwritten by the next step.
+            "depth", "segmentation": Same as render() when enabled.
+        """
+        ret = self._step_physics(action, repeat)
+        if render:
+            ret.update(self.observe(out=out))
+        return ret
+
+    def observe(self, out=None):
+        """Render the agent view at the current state without advancing the environment.
+        Args:
+          out: (Optional) Writeable C-contiguous uint8 nd_array with
+               width * height * channels elements to read the screen into.
+               (Not available with frame_stack)
+        Returns:
+          Dictionary which contains the result of the rendering.
+            "screen": numpy nd_array of width * height * channels (uint8)
+                      (out itself if specified)
+                      With frame_stack, the view of the last frame_stack screens
+                      (oldest first), which is overwritten by the next step.
+            "depth", "segmentation": Same as render() when enabled.
+        """
+        if self.frame_stack is not None:
+            if out is not None:
+                raise ValueError("out can't be specified with frame_stack")
+            out = self.frame_stack.next_frame()
+        agent_info = self.get_agent_info()
+        ret = self.render(self.main_camera_id,
+                          pos=agent_info["pos"],
+                          rot=agent_info["rot"],
+                          ignore_ids=[self.agent_id],
+                          out=out)
+        if self.frame_stack is not None:
+            ret["screen"] = self.frame_stack.push()
+        return ret
+
+    def restore_state(self, handle):
+        """Restore the state saved with save_state(). The stacked screens are cleared.
+        Args:
+          handle: Int value for the snapshot handle returned by save_state().
+        """
+        super().restore_state(handle)
+        self.reset_frame_stack()
+
+    def reset_frame_stack(self):
+        """Clear the stacked screens (e.g. at the start of an episode).
+        The next screen fills the whole stack.
         """
+        if self.frame_stack is not None:
+            self.frame_stack.reset()
+
+    def step_async(self, action, repeat=1):
+        """Step environment process and start rendering the agent view without
+        waiting for the pixels. The screen is obtained later with
+        fetch(main_camera_id). Not available with depth or segmentation.
+        With frame_stack, the fetched screen is pushed to the stack as in step().
+        Args:
+          action: Int array with 3 elements.
+          repeat: Number of physics steps to advance with the same action (action
+                  repeat). Only the last frame is rendered, and collisions in all the
+                  steps are reported. (default 1)
+        Returns:
+          Dictionary which contains the result of this step calculation.
+            "collided" Int list of object ids that collided with the agent.
+        """
+        if not self._async_available:
+            raise ValueError("step_async() is not available with depth or segmentation")
+        ret = self._step_physics(action, repeat)
+        agent_info = self.get_agent_info()
+        self.render_async(self.main_camera_id,
+                          pos=agent_info["pos"],
+                          rot=agent_info["rot"],
+                          ignore_ids=[self.agent_id])
+        return ret
+
+    def fetch(self, camera_id, out=None):
+        """Fetch the screen of the oldest pending render_async() call.
+        Args:
+          camera_id: Int value for the camera id.
+          out: Same as BaseEnvironment.fetch() (Not available for the main camera
+               view with frame_stack)
+        Returns:
+          Same as BaseEnvironment.fetch(). With frame_stack, the screen of the main
+          camera view is pushed to the stack, and "screen" is the view of the last
+          frame_stack screens as in step().
+        """
+        if self.frame_stack is None or camera_id != self.main_camera_id:
+            return super().fetch(camera_id, out=out)
+        if out is not None:
+            raise ValueError("out can't be specified with frame_stack")
+        ret = super().fetch(camera_id, out=self.frame_stack.next_frame())
+        ret["screen"] = self.frame_stack.push()
+        return ret
+
+    def _step_physics(self, action, repeat):
         self.env.control(id=self.agent_id, action=to_nd_int_array(action))
-        collision_ids = self.env.step()
+        collision_ids = self.env.step(repeat=repeat)
         
         ret = {}
         if self.agent_id in collision_ids:
             ret["collided"] = collision_ids[self.agent_id]
         else:
             ret["collided"] = []
-            
-        agent_info = self.get_agent_info()
-        ret_render = self.render(self.main_camera_id,
-                                 pos=agent_info["pos"],
-                                 rot=agent_info["rot"],
-                                 ignore_ids=[self.agent_id])
-        ret["screen"] = ret_render["screen"]
         return ret
 
     def get_agent_info(self):
@@ -414,8 +978,10 @@ class MultiAgentEnvironment(BaseEnvironment):
                  near=0.05,
                  far=80.0,
                  focal_length=50.0,
-                 shadow_buffer_width=0,                 
-                 agent_radius=1.0):
+                 shadow_buffer_width=0,
+                 agent_radius=1.0,
+                 gl_backend=None,
+                 shadow=True):
         """Create environment.
         Args:
           width: Screen width
@@ -427,6 +993,11 @@ class MultiAgentEnvironment(BaseEnvironment):
           shadow_buffer_width: Shadow depth buffer width. (If 0 calculated automatically )
                                (default 0)
           agent_radius: Radius of the agent sphere
+          gl_backend: GL context backend on Linux, "glx" or "egl". "egl" runs without
+                      X server. If None, RODENTIA_GL_BACKEND environment variable is
+                      used, or "egl" is selected when DISPLAY is not set. (default None)
+          shadow: If False, the shadow depth rendering is skipped and the view is drawn
+                  without shadow. (default True)
         """
         super().__init__(width,
                          height,
@@ -434,7 +1005,9 @@ class MultiAgentEnvironment(BaseEnvironment):
                          near,
                          far,
                          focal_length,
-                         shadow_buffer_width)
+                         shadow_buffer_width,
+                         gl_backend,
+                         shadow)
         self.agent_ids = []
 
         for i in range(agent_size):
@@ -455,20 +1028,29 @@ class MultiAgentEnvironment(BaseEnvironment):
         agent_id = self.agent_ids[agent_index]
         self.env.locate_agent(id=agent_id, pos=to_nd_float_array(pos), rot_y=rot_y)
 
-    def step(self, action):
+    def step(self, action, out=None, repeat=1, render=True):
         """Step environment process and returns result.
         Args:
           action: Double Int array. Each array has 3 elements as the action.
+          out: (Optional) Writeable C-contiguous uint8 nd_array with
+               agent_size * width * height * 3 elements to read the screens into.
+          repeat: Number of physics steps to advance with the same action (action
+                  repeat). Only the last frame is rendered, and collisions in all the
+                  steps are reported. (default 1)
+          render: Whether to render the agent views. If False, only the physics is
+                  advanced and "screen" is not included in the result. The screens
+                  can be obtained later with observe(). (default True)
 
         Returns:
           Dictionary which contains the result of this step calculation.
             "collided" Int list of object ids that collided with the agent. # TODO:
             "screen": numpy nd_array of agent_size * width * height * 3 (uint8)
+                      (screen[i] has the same layout as render())
         """
 
         for i, agent_id in enumerate(self.agent_ids):
             self.env.control(id=agent_id, action=to_nd_int_array(action[i]))
-        collision_ids = self.env.step()
+        collision_ids = self.env.step(repeat=repeat)
 
         ret = {}
         collided = []
@@ -480,19 +1062,39 @@ class MultiAgentEnvironment(BaseEnvironment):
                 collided.append([])
 
         ret["collided"] = collided
-        
-        screen = []
-        for agent_index, agent_id in enumerate(self.agent_ids):
-            agent_info = self.get_agent_info(agent_index)
-            ret_render = self.render(self.main_camera_id,
-                                     pos=agent_info["pos"],
-                                     rot=agent_info["rot"],
-                                     ignore_ids=[agent_id])
-            screen.append(ret_render["screen"])
-        
-        ret["screen"] = screen
+        if render:
+            ret["screen"] = self.render_agents(out=out)["screen"]
         return ret
 
+    def observe(self, out=None):
+        """Render the views of all the agents at the current state without advancing
+        the environment. (Same as render_agents())
+        Args:
+          out: (Optional) Writeable C-contiguous uint8 nd_array with
+               agent_size * width * height * 3 elements to read the screens into.
+        Returns:
+          Dictionary which contains the result of the rendering.
+            "screen": numpy nd_array of agent_size * width * height * 3 (uint8)
+                      (screen[i] has the same layout as render())
+                      (out itself if specified)
+        """
+        return self.render_agents(out=out)
+
+    def render_agents(self, out=None):
+        """Render the views of all the agents with one readback.
+        Args:
+          out: (Optional) Writeable C-contiguous uint8 nd_array with
+               agent_size * width * height * 3 elements to read the screens into.
+        Returns:
+          Dictionary which contains the result of the rendering.
+            "screen": numpy nd_array of agent_size * width * height * 3 (uint8)
+                      (screen[i] has the same layout as render())
+                      (out itself if specified)
+        """
+        return self.env.render_agents(camera_id=self.main_camera_id,
+                                      agent_ids=to_nd_int_array(self.agent_ids),
+                                      out=out)
+
     def get_agent_info(self, agent_index):
         """Get agent information.
         Returns:
@@ -509,3 +1111,382 @@ class MultiAgentEnvironment(BaseEnvironment):
         rot_y = np.arctan2(rot[1], rot[3]) * 2.0
         ret["rot_y"] = rot_y
         return ret
+
+
+class _EnvBroadcaster:
+    """
+    Dispatch rodentia_module.Env method calls to all the environments in the batch.
+    """
+
+    def __init__(self, envs):
+        self.envs = envs
+
+    def __getattr__(self, name):
+        methods = [getattr(env, name) for env in self.envs]
+
+        def broadcast(*args, **kwargs):
+            results = [method(*args, **kwargs) for method in methods]
+            # All the environments are built with the same calls, so object ids and
+            # camera ids are identical among them.
+            return results[0]
+        return broadcast
+
+
+class BatchEnvironment(BaseEnvironment):
+    """
+    Batch of single agent environments with the same stage.
+    All the environments share one GL context and mesh, texture caches, and are stepped
+    with one call.
+    Stage setup methods (add_box(), set_light() etc.) are applied to all the environments.
+    """
+    
+    def __init__(self,
+                 env_size,
+                 width,
+                 height,
+                 bg_color=[0.0, 0.0, 0.0],
+                 near=0.05,
+                 far=80.0,
+                 focal_length=50.0,
+                 shadow_buffer_width=0,
+                 agent_radius=1.0,
+                 gl_backend=None,
+                 shadow=True,
+                 output_format="rgb",
+                 supersampling=1):
+        """Create batch environment.
+        Args:
+          env_size: Number of environments
+          width: Screen width
+          height: Screen height
+          bg_color: Background color (RGB value with 0.0 ~ 1.0)
+          near: Near clip distane (default 0.05)
+          far: Far clip distane (default 80.0)
+          focal_length: Focal length (default 50.0)
+          shadow_buffer_width: Shadow depth buffer width. (If 0 calculated automatically )
+                               (default 0)
+          agent_radius: Radius of the agent sphere
+          gl_backend: GL context backend on Linux, "glx" or "egl". "egl" runs without
+                      X server. If None, RODENTIA_GL_BACKEND environment variable is
+                      used, or "egl" is selected when DISPLAY is not set. (default None)
+          shadow: If False, the shadow depth rendering is skipped and the view is drawn
+                  without shadow. (default True)
+          output_format: Screen format of the agent views, "rgb", "gray" or "rgba".
+                         (default "rgb")
+          supersampling: Supersampling factor of the agent views. (default 1)
+        """
+        self.env_size = env_size
+        self.batch_env = rodentia_module.BatchEnv(env_size=env_size,
+                                                 gl_backend=gl_backend)
+        self.envs = [self.batch_env.get_env(i) for i in range(env_size)]
+        self.env = _EnvBroadcaster(self.envs)
+        
+        self.main_camera_id = self.add_camera_view(width,
+                                                   height,
+                                                   bg_color,
+                                                   near,
+                                                   far,
+                                                   focal_length,
+                                                   shadow_buffer_width,
+                                                   shadow,
+                                                   output_format=output_format,
+                                                   supersampling=supersampling)
+        self.agent_id = self.env.add_agent(radius=agent_radius,
+                                           pos=to_nd_float_array([0,0,0]),
+                                           rot_y=0.0,
+                                           mass=1.0,
+                                           detect_collision=False,
+                                           color=to_nd_float_array([0,0,1]))
+
+    def _target_env(self, env_index):
+        """ Get Env object for the env_index, or broadcaster for all if env_index is None """
+        if env_index is None:
+            return self.env
+        else:
+            return self.envs[env_index]
+
+    def locate_agent(self, env_index, pos, rot_y=0.0):
+        """Locate agenet to given position and orientataion.
+        Args:
+          env_index: Int value for the environment index
+          pos: (x,y,z) float values for agent's location.
+          rot_y: A float value for head angle of the model (in radian)
+        """
+        self.envs[env_index].locate_agent(id=self.agent_id,
+                                          pos=to_nd_float_array(pos),
+                                          rot_y=rot_y)
+
+    def locate_object(self, id, pos, rot=0.0, env_index=None):
+        """Locate object to given position and orientataion.
+        Args:
+          id: Int value for object's id
+          pos: (x,y,z) float values for agent's location.
+          rot: A float value for head (rot_y) angle or list (rx,ry,rz,rw) as the rotation 
+               quaternion of the object (in radian)
+          env_index: Int value for the environment index. If None, the object is located
+                     in all the environments.
+        """
+        self._target_env(env_index).locate_object(
+            id=id,
+            pos=to_nd_float_array(pos),
+            rot=to_nd_float_array_for_rot(rot))
+
+    def locate_objects(self, ids, pos, rot=0.0, env_index=None):
+        """Locate objects to given positions and orientataions in one call.
+        Args:
+          ids: Int list of the object ids
+          pos: (N,3) float values for the locations.
+          rot: A float value or (N) float values for head angles (rot_y) or (N,4)
+               float values as the rotation quaternions of the objects (in radian)
+          env_index: Int value for the environment index. If None, the objects are
+                     located in all the environments.
+        """
+        ids = np.ascontiguousarray(ids, dtype=np.int32)
+        self._target_env(env_index).locate_objects(
+            ids=ids,
+            pos=to_nd_float_matrix(pos, len(ids), 3),
+            rot=to_nd_float_array_for_rots(rot, len(ids)))
+
+    def remove_obj(self, id, env_index=None):
+        """Remove object from environment.
+        Args:
+          id: Int value for deleting object's id
+          env_index: Int value for the environment index. If None, the object is removed
+                     from all the environments.
+        """
+        self._target_env(env_index).remove_obj(id=id)
+
+    def remove_objs(self, ids, env_index=None):
+        """Remove objects from environment in one call.
+        Args:
+          ids: Int list of the deleting objects' ids
+          env_index: Int value for the environment index. If None, the objects are
+                     removed from all the environments.
+        """
+        self._target_env(env_index).remove_objs(
+            ids=np.ascontiguousarray(ids, dtype=np.int32))
+
+    def restore_state(self, handle, env_index=None):
+        """Restore the state saved with save_state().
+        Args:
+          handle: Int value for the snapshot handle returned by save_state().
+          env_index: Int value for the environment index. If None, all the environments
+                     are restored.
+        """
+        self._target_env(env_index).restore_state(snapshot_id=handle)
+
+    def serialize_state(self, handle, env_index=0):
+        """Serialize the state saved with save_state() into the compact binary.
+        Args:
+          handle: Int value for the snapshot handle returned by save_state().
+          env_index: Int value for the environment index (default 0)
+        Returns:
+          bytes of the object ids and the states of the objects.
+        """
+        return self.envs[env_index].serialize_state(snapshot_id=handle)
+
+    def load_state(self, data, env_index=None):
+        """Load the state serialized with serialize_state() to restore it with
+        restore_state().
+        Args:
+          data: bytes returned by serialize_state()
+          env_index: Int value for the environment index. If None, the state is loaded
+                     to all the environments.
+        Returns:
+          Int value for the snapshot handle in the environment.
+        """
+        return self._target_env(env_index).load_state(data=data)
+
+    def get_state_hash(self, env_index=0):
+        """Get the hash of the current object set and rigid body states.
+        Args:
+          env_index: Int value for the environment index (default 0)
+        Returns:
+          Int value of the 64 bit hash.
+        """
+        return self.envs[env_index].get_state_hash()
+
+    def apply_impulse(self, id, impulse, env_index=None):
+        """Apply impulse to the  object.
+        Args:
+          id: Int value for object's id
+          impulse: (x,y,z) float values of the impulse
+          env_index: Int value for the environment index. If None, the impulse is applied
+                     in all the environments.
+        """
+        self._target_env(env_index).apply_impulse(id=id, impulse=to_nd_float_array(impulse))
+
+    def get_obj_info(self, id, env_index=0):
+        """Get object information.
+        Args:
+          id: Int value for object's id
+          env_index: Int value for the environment index
+        Returns:
+          Dictionary which contains the object's current state info.
+            "pos": numpy nd_array (float32)
+            "velocity" numpy nd_array (float32)
+            "rot" numpy nd_array (float32)
+        """
+        return self.envs[env_index].get_obj_info(id=id)
+
+    def get_objs_info(self, ids, env_index=0):
+        """Get information of the objects in one call.
+        Args:
+          ids: Int list of the object ids
+          env_index: Int value for the environment index
+        Returns:
+          Same as BaseEnvironment.get_objs_info()
+        """
+        ids = np.ascontiguousarray(ids, dtype=np.int32)
+        return self.envs[env_index].get_objs_info(ids=ids)
+
+    def get_dynamic_objs_info(self, env_index=0):
+        """Get information of all the dynamic objects in one call.
+        Args:
+          env_index: Int value for the environment index
+        Returns:
+          Same as BaseEnvironment.get_dynamic_objs_info()
+        """
+        return self.envs[env_index].get_objs_info()
+
+    def get_render_stats(self, env_index=0):
+        """Get statistics of the last rendering.
+        Args:
+          env_index: Int value for the environment index
+        Returns:
+          Dictionary which contains the object counts.
+            "drawn": Int, objects drawn in the color rendering
+            "culled": Int, objects culled in the color rendering
+            "shadow_drawn": Int, objects drawn in the shadow depth rendering
+            "shadow_culled": Int, objects culled in the shadow depth rendering
+            "draw_calls": Int, draw calls in the color rendering
+            "shadow_draw_calls": Int, draw calls in the shadow depth rendering
+            "state_changes": Int, shader, texture and vertex array binds in the
+                             rendering (redundant binds are skipped)
+            "shadow_cached": Int, shadow depth renderings skipped because the camera,
+                             the light and the objects were unchanged since the
+                             previous rendering of the camera
+        """
+        return self.envs[env_index].get_render_stats()
+
+    def get_agent_info(self, env_index):
+        """Get agent information.
+        Args:
+          env_index: Int value for the environment index
+        Returns:
+          Dictionary which contains the agent's current state info.
+            "pos": numpy nd_array (float32)
+            "velocity" numpy nd_array (float32)
+            "rot" numpy nd_array (float32)
+            "rot_y" float
+        """
+        ret = self.envs[env_index].get_obj_info(self.agent_id)
+        rot = ret["rot"]
+        # Calculate rotation around Y-axis
+        rot_y = np.arctan2(rot[1], rot[3]) * 2.0
+        ret["rot_y"] = rot_y
+        return ret
+
+    def render(self, camera_id, pos, rot, ignore_ids=[], env_index=0, out=None):
+        """Render the environment with the camera.
+        Args:
+          camera_id: Int array with 3 elements.
+          pos: (x,y,z) Position of the camera
+          rot: A float value for head angle (rot_y) or list (rx,ry,rz,rw) as 
+               the rotation quaternion of the camera
+          ignore_ids: Int list, oject id list to skip drawing
+          env_index: Int value for the environment index
+          out: (Optional) Writeable C-contiguous uint8 nd_array with
+               width * height * channels elements to read the screen into.
+          
+        Returns:
+          Dictionary which contains the result of this step calculation.
+            "screen": numpy nd_array of width * height * channels (uint8)
+                      (out itself if specified)
+        """
+        return self.envs[env_index].render(
+            camera_id=camera_id,
+            pos=to_nd_float_array(pos),
+            rot=to_nd_float_array_for_rot(rot),
+            ignore_ids=to_nd_int_array(ignore_ids),
+            out=out
+        )
+
+    def render_async(self, camera_id, pos, rot, ignore_ids=[], env_index=0):
+        """Render the camera view of one environment without waiting for the pixels
+        to be read back. The pixels are obtained later with fetch() with the same
+        env_index.
+        Args:
+          camera_id: Int value for the camera id.
+          pos: (x,y,z) Position of the camera
+          rot: A float value for head angle (rot_y) or list (rx,ry,rz,rw) as 
+               the rotation quaternion of the camera
+          ignore_ids: Int list, oject id list to skip drawing
+          env_index: Int value for the environment index (default 0)
+        """
+        self.envs[env_index].render_async(
+            camera_id=camera_id,
+            pos=to_nd_float_array(pos),
+            rot=to_nd_float_array_for_rot(rot),
+            ignore_ids=to_nd_int_array(ignore_ids)
+        )
+
+    def fetch(self, camera_id, env_index=0, out=None):
+        """Fetch the screen of the oldest pending render_async() call of one
+        environment.
+        Args:
+          camera_id: Int value for the camera id.
+          env_index: Int value for the environment index (default 0)
+          out: Same as BaseEnvironment.fetch()
+        Returns:
+          Same as BaseEnvironment.fetch()
+        """
+        return self.envs[env_index].fetch(camera_id=camera_id, out=out)
+
+    def step(self, actions, out=None, repeat=1, render=True):
+        """Step all the environments and returns result.
+        Args:
+          actions: Int array with shape (env_size, 3).
+          out: (Optional) Writeable C-contiguous uint8 nd_array with
+               env_size * width * height * channels elements to read the screens into.
+          repeat: Number of physics steps to advance with the same action (action
+                  repeat). Only the last frame is rendered, and collisions in all the
+                  steps are reported. (default 1)
+          render: Whether to render the agent views. If False, only the physics is
+                  advanced and "screen" is not included in the result. The screens
+                  can be obtained later with observe(). (default True)
+        Returns:
+          Dictionary which contains the result of this step calculation.
+            "collided" Int nd_array of env_size * max_collided_size (int32)
+                       Object ids that collided with the agent in each environment,
+                       padded with -1.
+            "screen": numpy nd_array of env_size * width * height * channels (uint8)
+                      (screen[i] has the same layout as Environment.step())
+                      (out itself if specified)
+        """
+        return self.batch_env.step(agent_id=self.agent_id,
+                                   camera_id=self.main_camera_id,
+                                   actions=to_nd_int_array(actions),
+                                   out=out,
+                                   repeat=repeat,
+                                   render=render)
+
+    def observe(self, out=None):
+        """Render the agent views of all the environments at the current state without
+        advancing the environments.
+        Args:
+          out: (Optional) Writeable C-contiguous uint8 nd_array with
+               env_size * width * height * channels elements to read the screens into.
+        Returns:
+          Dictionary which contains the result of the rendering.
+            "screen": numpy nd_array of env_size * width * height * channels (uint8)
+                      (screen[i] has the same layout as Environment.step())
+                      (out itself if specified)
+        """
+        return self.batch_env.observe(agent_id=self.agent_id,
+                                      camera_id=self.main_camera_id,
+                                      out=out)
+
+    def close(self):
+        """ Release environment """
+        self.batch_env.release()
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+Action log replay to check the reproducibility of the simulation.
+
+The actions are recorded with the state hash after each step, and replayed later
+(e.g. after restoring a snapshot, or in another process with a serialized state)
+to find the first step where the simulation diverges. The environment should be in
+the deterministic mode (set_deterministic()) in both runs.
+
+    env.set_deterministic(True)
+    handle = env.save_state()
+    hashes = record(env, actions)
+    ...
+    env.restore_state(handle)
+    assert replay(env, actions, hashes) is None
+"""
+import numpy as np
+
+
+def record(env, actions, repeat=1):
+    """Step the environment with the actions and record the state hashes.
+    Args:
+      env: Environment to step
+      actions: Sequence of the actions passed to env.step() in order
+      repeat: Int value for the repeat count of each step (default 1)
+    Returns:
+      uint64 nd_array of the state hashes after each step.
+    """
+    hashes = np.zeros(len(actions), dtype=np.uint64)
+    for i, action in enumerate(actions):
+        env.step(action, repeat=repeat, render=False)
+        hashes[i] = env.get_state_hash()
+    return hashes
+
+
+def replay(env, actions, hashes, repeat=1):
+    """Step the environment with the recorded actions and compare the state hashes.
+    Args:
+      env: Environment in the same state as when the actions were recorded
+      actions: Sequence of the recorded actions
+      hashes: State hashes returned by record()
+      repeat: Int value for the repeat count of each step (default 1)
+    Returns:
+      Int index of the first step whose state differs from the recorded one, or None
+      if all the states are the same.
+    """
+    if len(actions) != len(hashes):
+        raise ValueError("actions and hashes must have the same length")
+    for i, action in enumerate(actions):
+        env.step(action, repeat=repeat, render=False)
+        if env.get_state_hash() != int(hashes[i]):
+            return i
+    return None
+
+
+def save_log(path, actions, hashes, repeat=1):
+    """Save the action log to the .npz file.
+    Args:
+      path: File path
+      actions: Sequence of the recorded actions
+      hashes: State hashes returned by record()
+      repeat: Int value for the repeat count of each step (default 1)
+    """
+    np.savez(path,
+             actions=np.asarray(actions, dtype=np.int32),
+             hashes=np.asarray(hashes, dtype=np.uint64),
+             repeat=np.int32(repeat))
+
+
+def load_log(path):
+    """Load the action log saved with save_log().
+    Args:
+      path: File path
+    Returns:
+      Tuple of the actions, the state hashes and the repeat count.
+    """
+    with np.load(path) as data:
+        return data["actions"], data["hashes"], int(data["repeat"])
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+import unittest
+import numpy as np
+import os, sys
+sys.path.insert(0, os.getcwd())
+import rodentia
+from rodentia.test import stage
+
+
+class ActionRepeatTest(unittest.TestCase):
+  def create_env(self):
+      env = stage.create_env()
+      sphere_id = stage.add_sphere(env, pos=[0.0, 1.0, -3.0])
+      env.locate_agent(pos=[0.0, 1.0, 0.0], rot_y=0.0)
+      return env, sphere_id
+
+  def testRepeatMatchesSteps(self):
+      action = [1, 0, 1]
+      
+      env0, _ = self.create_env()
+      for i in range(4):
+          env0.step(action)
+      info0 = env0.get_agent_info()
+      
+      env1, _ = self.create_env()
+      obs = env1.step(action, repeat=4)
+      info1 = env1.get_agent_info()
+      self.assertEqual( (84, 84, 3), obs["screen"].shape )
+
+      # The action is re-applied in every sub-step.
+      self.assertTrue( np.allclose(info0["pos"], info1["pos"], atol=1e-4) )
+      self.assertAlmostEqual( info0["rot_y"], info1["rot_y"], places=4 )
+      
+      env0.close()
+      env1.close()
+
+  def testCollisionAccumulated(self):
+      env, sphere_id = self.create_env()
+      
+      # Run into the sphere with repeated steps.
+      collided_any = False
+      for i in range(10):
+          obs = env.step([0, 0, 1], repeat=4)
+          if sphere_id in obs["collided"]:
+              collided_any = True
+              break
+      self.assertTrue( collided_any )
+
+      with self.assertRaises(ValueError):
+          env.step([0, 0, 0], repeat=0)
+      env.close()
+      
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+import unittest
+import asyncio
+import threading
+import numpy as np
+import os, sys
+sys.path.insert(0, os.getcwd())
+import rodentia
+from rodentia.aio import AsyncEnvironment
+from rodentia.test import stage
+
+
+def create_env():
+    return stage.create_env(floor_size=10.0)
+
+
+class AsyncEnvironmentTest(unittest.TestCase):
+  async def run_steps(self, env, action, step_size):
+      # Queue all the steps at once.
+      results = await asyncio.gather(*[env.step(action) for i in range(step_size)])
+      return results[-1]["screen"]
+
+  def testStep(self):
+      async def main():
+          envs = [AsyncEnvironment(create_env) for i in range(4)]
+          # Methods of the environment can be awaited.
+          sphere_ids = await asyncio.gather(*[
+              stage.add_sphere(env, detect_collision=False) for env in envs])
+          self.assertEqual(1, len(set(sphere_ids)))
+
+          actions = [[1, 0, 0], [0, 0, 1], [0, 0, 0], [1, 0, 0]]
+          screens = await asyncio.gather(*[
+              self.run_steps(env, action, 50) for env, action in zip(envs, actions)])
+
+          # The environment runs on its own thread.
+          thread_ids = await asyncio.gather(*[
+              env.run(lambda e: threading.get_ident()) for env in envs])
+          self.assertEqual(4, len(set(thread_ids)))
+          self.assertNotIn(threading.get_ident(), thread_ids)
+
+          camera_id = await envs[0].run(lambda e: e.main_camera_id)
+          obs = await envs[2].render(camera_id, [0.0, 0.0, 0.0], 0.0)
+          await asyncio.gather(*[env.close() for env in envs])
+          return screens, obs
+
+      screens, obs = asyncio.run(main())
+      self.assertEqual((84, 84, 3), screens[0].shape)
+      self.assertTrue(np.array_equal(screens[0], screens[3]))
+      self.assertFalse(np.array_equal(screens[0], screens[1]))
+      self.assertEqual((84, 84, 3), obs["screen"].shape)
+
+  def testCreateError(self):
+      async def main():
+          env = AsyncEnvironment(lambda: rodentia.Environment(width=-1, height=84))
+          with self.assertRaises(Exception):
+              await env.step([0, 0, 0])
+          env.executor.shutdown()
+
+      asyncio.run(main())
+
+
+if __name__ == '__main__':
+  unittest.main()
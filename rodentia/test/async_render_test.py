@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+import unittest
+import numpy as np
+import os, sys
+sys.path.insert(0, os.getcwd())
+import rodentia
+from rodentia.test import stage
+
+
+class AsyncRenderTest(unittest.TestCase):
+  def create_env(self):
+      env = stage.create_env(floor_size=10.0)
+      stage.add_sphere(env)
+      return env
+
+  def testRenderAsync(self):
+      env = self.create_env()
+      camera_id = env.main_camera_id
+
+      # Render from 3 different angles before fetching.
+      rot_ys = [0.0, 0.5, 1.0]
+      expected = []
+      for rot_y in rot_ys:
+          expected.append(env.render(camera_id, pos=[0.0, 1.0, 0.0], rot=rot_y)["screen"])
+      self.assertFalse( np.array_equal(expected[0], expected[1]) )
+      
+      for rot_y in rot_ys:
+          env.render_async(camera_id, pos=[0.0, 1.0, 0.0], rot=rot_y)
+
+      # All the pixel buffers are pending.
+      with self.assertRaises(RuntimeError):
+          env.render_async(camera_id, pos=[0.0, 1.0, 0.0], rot=0.0)
+
+      # Results are fetched in order.
+      for i in range(len(rot_ys)):
+          if i == 0:
+              out = np.zeros((84, 84, 3), dtype=np.uint8)
+              screen = env.fetch(camera_id, out=out)["screen"]
+              self.assertIs( out, screen )
+          else:
+              screen = env.fetch(camera_id)["screen"]
+          self.assertEqual( (84, 84, 3), screen.shape )
+          self.assertTrue( np.array_equal(expected[i], screen) )
+
+      # Nothing to fetch
+      with self.assertRaises(RuntimeError):
+          env.fetch(camera_id)
+      env.close()
+
+  def testStepAsync(self):
+      env = self.create_env()
+      action = np.array([0, 0, 1], dtype=np.int32)
+
+      env.step_async(action)
+      for i in range(10):
+          # Simulate and render the next frame while reading back the previous one.
+          ret = env.step_async(action)
+          self.assertTrue( "collided" in ret )
+          screen = env.fetch(env.main_camera_id)["screen"]
+          self.assertEqual( (84, 84, 3), screen.shape )
+          
+      env.fetch(env.main_camera_id)
+      env.close()
+      
+
+if __name__ == '__main__':
+  unittest.main()
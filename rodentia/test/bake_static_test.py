@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+import unittest
+import numpy as np
+import os, sys
+sys.path.insert(0, os.getcwd())
+import rodentia
+from rodentia.test import stage
+
+
+class BakeStaticTest(unittest.TestCase):
+  def create_env(self):
+      env = stage.create_env()
+
+      # Add static boxes with different sizes and alternating colors.
+      colors = [[1.0, 0.0, 0.0], [0.0, 0.0, 1.0]]
+      box_ids = []
+      for i in range(6):
+          box_id = env.add_box(texture_path="",
+                               color=colors[i % 2],
+                               half_extent=[0.5, 0.5, 1.0 + i],
+                               pos=[i * 2.0 - 5.0, 0.5, -15.0],
+                               rot=0.3 * i,
+                               detect_collision=False)
+          box_ids.append(box_id)
+
+      # Add dynamic sphere
+      env.add_sphere(texture_path="",
+                     color=[0.0, 1.0, 0.0],
+                     radius=1.0,
+                     pos=[0.0, 1.0, -8.0],
+                     rot=0.0,
+                     mass=1.0,
+                     detect_collision=False)
+      env.locate_agent(pos=[0.0, 1.0, 0.0], rot_y=0.0)
+      return env, box_ids
+
+  def get_screen_and_stats(self, env):
+      obs = env.step([0, 0, 0])
+      stats = env.get_render_stats()
+      draw_calls = stats["draw_calls"] + stats["shadow_draw_calls"]
+      return obs["screen"].astype(np.int32), draw_calls
+
+  def testBake(self):
+      env, box_ids = self.create_env()
+      screen0, draw_calls0 = self.get_screen_and_stats(env)
+      
+      baked_size = env.bake_static()
+      # Floor and boxes are baked, and the sphere is not.
+      self.assertEqual(7, baked_size)
+
+      screen1, draw_calls1 = self.get_screen_and_stats(env)
+      # Boxes are merged for each color, and the sphere is drawn individually.
+      # (3 meshes and 1 sphere in color and shadow path)
+      self.assertEqual(8, draw_calls1)
+      self.assertLess(draw_calls1, draw_calls0)
+
+      # Pre-transformed vertices may differ slightly in precision at the edges.
+      diff = np.abs(screen0 - screen1)
+      self.assertLess(np.mean(diff), 1.0)
+      env.close()
+
+  def testLargeBake(self):
+      env = rodentia.Environment(width=84, height=84)
+
+      # Merged spheres have more vertices than 16bit indices can refer.
+      for i in range(200):
+          env.add_sphere(texture_path="",
+                         color=[1.0, 0.0, 0.0],
+                         radius=0.2,
+                         pos=[(i % 20) * 0.5 - 5.0, (i // 20) * 0.5, -12.0],
+                         rot=0.0,
+                         mass=0.0,
+                         detect_collision=False)
+      env.locate_agent(pos=[0.0, 2.0, 0.0], rot_y=0.0)
+      
+      screen0, draw_calls0 = self.get_screen_and_stats(env)
+      self.assertEqual(200, env.bake_static())
+      screen1, draw_calls1 = self.get_screen_and_stats(env)
+      self.assertEqual(2, draw_calls1)
+
+      diff = np.abs(screen0 - screen1)
+      self.assertLess(np.mean(diff), 2.0)
+      env.close()
+
+  def testUnbake(self):
+      env, box_ids = self.create_env()
+      screen0, draw_calls0 = self.get_screen_and_stats(env)
+      env.bake_static()
+
+      # Locating baked object discards the baked meshes.
+      env.locate_object(box_ids[0], pos=[-5.0, 0.5, -15.0], rot=0.0)
+      screen1, draw_calls1 = self.get_screen_and_stats(env)
+      self.assertEqual(draw_calls0, draw_calls1)
+
+      # Removed object is not drawn after baking again.
+      self.assertEqual(7, env.bake_static())
+      env.remove_obj(box_ids[1])
+      self.assertEqual(6, env.bake_static())
+      env.close()
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+import unittest
+import numpy as np
+import os, sys
+sys.path.insert(0, os.getcwd())
+import rodentia
+from rodentia.test import stage
+
+
+class BatchEnvironmentTest(unittest.TestCase):
+  def testStep(self):
+      env_size = 4
+      width  = 84
+      height = 84
+      
+      env = rodentia.BatchEnvironment(env_size=env_size,
+                                      width=width, height=height,
+                                      bg_color=[0.0, 0.0, 0.0])
+
+      stage.add_floor(env, 10.0)
+      sphere_id = stage.add_sphere(env)
+
+      for i in range(env_size):
+          env.locate_agent(i, pos=[0.0, 1.0, 0.0], rot_y=0.0)
+
+      # Move only the sphere in the first environment to the agent's position.
+      env.locate_object(sphere_id, pos=[0.0, 1.0, -1.5], env_index=0)
+      
+      actions = np.zeros((env_size, 3), dtype=np.int32)
+      obs = env.step(actions)
+
+      screen = obs["screen"]
+      self.assertEqual( (env_size, width, height, 3), screen.shape )
+      self.assertEqual( np.uint8, screen.dtype )
+
+      # All environments render the same stage except for the sphere position.
+      self.assertTrue( np.array_equal(screen[1], screen[2]) )
+      self.assertFalse( np.array_equal(screen[0], screen[1]) )
+
+      collided = obs["collided"]
+      self.assertEqual( np.int32, collided.dtype )
+      self.assertEqual( env_size, collided.shape[0] )
+      self.assertEqual( sphere_id, collided[0][0] )
+      # Padded with -1
+      for i in range(1, env_size):
+          self.assertTrue( np.all(collided[i] == -1) )
+
+      # Each environment has its own agent.
+      agent_info0 = env.get_agent_info(0)
+      agent_info1 = env.get_agent_info(1)
+      self.assertEqual( (3,), agent_info0["pos"].shape )
+      self.assertEqual( (3,), agent_info1["pos"].shape )
+
+      env.close()
+
+  def testScreenLayout(self):
+      # Non square view
+      env = rodentia.BatchEnvironment(env_size=2, width=64, height=32)
+      stage.add_sphere(env, pos=[1.0, 1.0, -5.0], detect_collision=False)
+      env.locate_agent(1, pos=[1.0, 1.0, 0.0], rot_y=0.3)
+
+      screen = env.observe()["screen"]
+      self.assertEqual( (2, 64, 32, 3), screen.shape )
+      # Same as the screens of the single environments
+      expected = []
+      for i in range(2):
+          info = env.get_agent_info(i)
+          expected.append(env.render(env.main_camera_id, info["pos"], info["rot"],
+                                     ignore_ids=[env.agent_id], env_index=i)["screen"])
+      self.assertTrue( np.array_equal(np.stack(expected), screen) )
+      env.close()
+
+  def testRenderAsync(self):
+      env = rodentia.BatchEnvironment(env_size=2, width=84, height=84)
+      stage.add_floor(env, 10.0)
+      sphere_id = stage.add_sphere(env)
+      env.locate_object(sphere_id, pos=[0.0, 1.0, -2.0], env_index=1)
+
+      camera_id = env.main_camera_id
+      expected = [env.render(camera_id, pos=[0.0, 1.0, 0.0], rot=0.0,
+                             env_index=i)["screen"] for i in range(2)]
+      self.assertFalse( np.array_equal(expected[0], expected[1]) )
+
+      # Only the environment of env_index is rendered.
+      env.render_async(camera_id, pos=[0.0, 1.0, 0.0], rot=0.0, env_index=1)
+      with self.assertRaises(RuntimeError):
+          env.fetch(camera_id, env_index=0)
+      screen = env.fetch(camera_id, env_index=1)["screen"]
+      self.assertTrue( np.array_equal(expected[1], screen) )
+
+      for i in range(2):
+          env.render_async(camera_id, pos=[0.0, 1.0, 0.0], rot=0.0, env_index=i)
+      for i in range(2):
+          screen = env.fetch(camera_id, env_index=i)["screen"]
+          self.assertTrue( np.array_equal(expected[i], screen) )
+      env.close()
+      
+
+if __name__ == '__main__':
+  unittest.main()
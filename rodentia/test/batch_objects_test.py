@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+import unittest
+import numpy as np
+import os, sys
+sys.path.insert(0, os.getcwd())
+import rodentia
+from rodentia.test import stage
+
+
+class BatchObjectsTest(unittest.TestCase):
+  def render(self, env):
+      return env.render(env.main_camera_id, [0.0, 0.5, 4.0], 0.0,
+                        ignore_ids=[env.agent_id])["screen"]
+
+  def testAddBoxes(self):
+      rng = np.random.RandomState(0)
+      pos = rng.uniform(-3.0, 3.0, size=(10, 3)).astype(np.float32)
+      pos[:,1] = 0.5
+      half_extents = rng.uniform(0.1, 0.5, size=(10, 3)).astype(np.float32)
+      colors = rng.uniform(0.0, 1.0, size=(10, 3)).astype(np.float32)
+      rots = rng.uniform(0.0, np.pi, size=10)
+
+      env0 = stage.create_env(shadow=False)
+      ids0 = [env0.add_box(half_extent=half_extents[i], pos=pos[i], rot=float(rots[i]),
+                           color=colors[i]) for i in range(10)]
+      env1 = stage.create_env(shadow=False)
+      ids1 = env1.add_boxes(half_extents=half_extents, pos=pos, rot=rots, color=colors)
+
+      self.assertEqual(np.int32, ids1.dtype)
+      self.assertEqual(ids0, ids1.tolist())
+      self.assertTrue(np.array_equal(env0.get_objs_info(ids0)["pos"],
+                                     env1.get_objs_info(ids1)["pos"]))
+      self.assertTrue(np.array_equal(env0.get_objs_info(ids0)["rot"],
+                                     env1.get_objs_info(ids1)["rot"]))
+      self.assertTrue(np.array_equal(self.render(env0), self.render(env1)))
+
+      # Broadcasted size and color, quaternion rotations
+      quats = np.tile([0.0, 0.0, 0.0, 1.0], (3, 1))
+      ids = env1.add_boxes(half_extents=[0.5, 0.5, 0.5], pos=pos[:3], rot=quats,
+                           color=[1, 0, 0], mass=1.0)
+      self.assertEqual(3, len(ids))
+      self.assertEqual(3, len(env1.get_dynamic_objs_info()["ids"]) - 1)
+      env0.close()
+      env1.close()
+
+  def testAddSpheres(self):
+      env0 = stage.create_env(shadow=False)
+      env1 = stage.create_env(shadow=False)
+      pos = [[-1.0, 0.5, 0.0], [1.0, 0.5, 0.0]]
+      ids0 = [env0.add_sphere(radius=0.5, pos=p, color=[0, 1, 0]) for p in pos]
+      ids1 = env1.add_spheres(radiuses=0.5, pos=pos, color=[0, 1, 0])
+      self.assertEqual(ids0, ids1.tolist())
+      self.assertTrue(np.array_equal(self.render(env0), self.render(env1)))
+
+      ids = env1.add_spheres(radiuses=[0.2, 0.3], pos=pos, visible=False)
+      self.assertEqual(2, len(ids))
+      self.assertTrue(np.array_equal(self.render(env0), self.render(env1)))
+      env0.close()
+      env1.close()
+
+  def testLocateRemoveObjects(self):
+      env = stage.create_env(shadow=False)
+      ids = env.add_spheres(radiuses=0.5, pos=np.zeros((5, 3)), mass=1.0)
+
+      new_pos = np.arange(15, dtype=np.float32).reshape(5, 3)
+      env.locate_objects(ids, new_pos, rot=0.5)
+      info = env.get_objs_info(ids)
+      self.assertTrue(np.allclose(new_pos, info["pos"]))
+      self.assertTrue(np.allclose([0.0, np.sin(0.25), 0.0, np.cos(0.25)], info["rot"]))
+
+      env.remove_objs(ids[1:3])
+      info = env.get_objs_info(ids)
+      self.assertTrue(np.all(np.isnan(info["pos"][1:3])))
+      self.assertFalse(np.any(np.isnan(info["pos"][[0, 3, 4]])))
+
+      with self.assertRaises(ValueError):
+          env.env.locate_objects(ids=ids, pos=new_pos[:2], rot=np.zeros((5, 4), np.float32))
+      env.close()
+
+  def testBakedStatic(self):
+      env = stage.create_env(shadow=False)
+      ids = env.add_boxes(half_extents=[0.5, 0.5, 0.5], pos=[[0, 0.5, 0], [2, 0.5, 0]])
+      env.bake_static()
+      screen0 = self.render(env)
+      env.locate_objects(ids, [[-2, 0.5, 0], [0, 0.5, 0]])
+      self.assertFalse(np.array_equal(screen0, self.render(env)))
+      env.remove_objs(ids)
+      self.render(env)
+      # Only the floor is drawn.
+      self.assertEqual(1, env.get_render_stats()["drawn"])
+      env.close()
+
+
+if __name__ == '__main__':
+  unittest.main()
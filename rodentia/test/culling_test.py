@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+import unittest
+import numpy as np
+import os, sys
+sys.path.insert(0, os.getcwd())
+import rodentia
+from rodentia.test import stage
+
+
+class CullingTest(unittest.TestCase):
+  def create_env(self, add_hidden_boxes):
+      env = stage.create_env()
+
+      # Add box in front of the agent
+      env.add_box(texture_path="",
+                  color=[1.0, 0.0, 0.0],
+                  half_extent=[1.0, 1.0, 1.0],
+                  pos=[0.0, 1.0, -5.0],
+                  rot=0.0,
+                  detect_collision=False)
+
+      if add_hidden_boxes:
+          # Add boxes behind the agent
+          for i in range(5):
+              env.add_box(texture_path="",
+                          color=[0.0, 1.0, 0.0],
+                          half_extent=[0.5, 0.5, 0.5],
+                          pos=[i * 2.0 - 4.0, 0.5, 15.0],
+                          rot=0.0,
+                          detect_collision=False)
+
+      env.locate_agent(pos=[0.0, 1.0, 0.0], rot_y=0.0)
+      return env
+
+  def testCulling(self):
+      env0 = self.create_env(False)
+      env1 = self.create_env(True)
+
+      screen0 = env0.step([0, 0, 0])["screen"]
+      screen1 = env1.step([0, 0, 0])["screen"]
+
+      # Culled objects don't change the screen.
+      self.assertTrue( np.array_equal(screen0, screen1) )
+
+      stats0 = env0.get_render_stats()
+      stats1 = env1.get_render_stats()
+
+      # Floor and the box in front are drawn. (The agent is not drawn in its view.)
+      self.assertEqual( 2, stats0["drawn"] )
+      self.assertEqual( 0, stats0["culled"] )
+      self.assertEqual( 2, stats1["drawn"] )
+      self.assertEqual( 5, stats1["culled"] )
+
+      self.assertEqual( 7, stats1["shadow_drawn"] + stats1["shadow_culled"] )
+      self.assertTrue( stats1["shadow_drawn"] >= 2 )
+      
+      env0.close()
+      env1.close()
+
+
+if __name__ == '__main__':
+  unittest.main()
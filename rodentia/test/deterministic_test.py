@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+import unittest
+import numpy as np
+import os, sys
+import tempfile
+sys.path.insert(0, os.getcwd())
+import rodentia
+from rodentia import replay
+from rodentia.test import stage
+
+
+class DeterministicTest(unittest.TestCase):
+  def create_env(self, deterministic=True):
+      env = stage.create_env()
+      env.set_deterministic(deterministic)
+
+      # Overlapping spheres pushing each other
+      self.sphere_ids = env.add_spheres(radiuses=0.3,
+                                        pos=[[x * 0.55 - 1.5, 0.3 + y * 0.6, z * 0.55 + 2.0]
+                                             for x in range(4) for y in range(3)
+                                             for z in range(4)],
+                                        mass=1.0)
+      return env
+
+  def create_actions(self, step_size=30):
+      rng = np.random.RandomState(1)
+      return [[rng.randint(-20, 20), rng.randint(-1, 2), rng.randint(-1, 2)]
+              for i in range(step_size)]
+
+  def record_after_removal(self, deterministic, reverse):
+      env = self.create_env(deterministic)
+      for i in range(10):
+          env.step([0, 0, 0], render=False)
+      # Same objects removed in the different order
+      removed_ids = list(self.sphere_ids[1::3])
+      if reverse:
+          removed_ids.reverse()
+      env.remove_objs(removed_ids)
+      hash0 = env.get_state_hash()
+      hashes = replay.record(env, self.create_actions())
+      env.close()
+      return hash0, hashes
+
+  def testHistoryIndependent(self):
+      hash0, hashes0 = self.record_after_removal(True, False)
+      hash1, hashes1 = self.record_after_removal(True, True)
+      self.assertEqual(hash0, hash1)
+      self.assertTrue(np.array_equal(hashes0, hashes1))
+
+  def testStateHash(self):
+      env = self.create_env()
+      hash0 = env.get_state_hash()
+      self.assertIsInstance(hash0, int)
+      self.assertEqual(hash0, env.get_state_hash())
+
+      handle = env.save_state()
+      env.step([0, 0, 0], render=False)
+      hash1 = env.get_state_hash()
+      self.assertNotEqual(hash0, hash1)
+      env.restore_state(handle)
+      self.assertEqual(hash0, env.get_state_hash())
+
+      env.remove_obj(self.sphere_ids[0])
+      self.assertNotEqual(hash0, env.get_state_hash())
+      env.close()
+
+  def testReplay(self):
+      env = self.create_env()
+      handle = env.save_state()
+      actions = self.create_actions()
+      hashes = replay.record(env, actions, repeat=2)
+      self.assertEqual((len(actions),), hashes.shape)
+      self.assertEqual(np.uint64, hashes.dtype)
+
+      env.restore_state(handle)
+      self.assertIsNone(replay.replay(env, actions, hashes, repeat=2))
+
+      # Diverged from the 6th step
+      env.restore_state(handle)
+      actions[5] = [actions[5][0] + 10, actions[5][1], actions[5][2]]
+      self.assertEqual(5, replay.replay(env, actions, hashes, repeat=2))
+
+      with self.assertRaises(ValueError):
+          replay.replay(env, actions[:-1], hashes)
+      env.close()
+
+  def testSaveLog(self):
+      env = self.create_env()
+      handle = env.save_state()
+      actions = self.create_actions()
+      hashes = replay.record(env, actions)
+
+      with tempfile.TemporaryDirectory() as dir_path:
+          path = os.path.join(dir_path, "log.npz")
+          replay.save_log(path, actions, hashes)
+          loaded_actions, loaded_hashes, repeat = replay.load_log(path)
+      self.assertEqual(actions, loaded_actions.tolist())
+      self.assertTrue(np.array_equal(hashes, loaded_hashes))
+      self.assertEqual(1, repeat)
+
+      env.restore_state(handle)
+      self.assertIsNone(replay.replay(env, loaded_actions, loaded_hashes, repeat))
+      env.close()
+
+
+if __name__ == '__main__':
+  unittest.main()
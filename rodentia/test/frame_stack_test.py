@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+import unittest
+import numpy as np
+import os, sys
+sys.path.insert(0, os.getcwd())
+import rodentia
+from rodentia.test import stage
+
+
+class FrameStackTest(unittest.TestCase):
+  def create_env(self, **kwargs):
+      env = stage.create_env(floor_size=10.0, **kwargs)
+      stage.add_sphere(env, detect_collision=False)
+      return env
+
+  def testFrameStack(self):
+      env = self.create_env()
+      stack_env = self.create_env(frame_stack=4)
+      # Turn left every step to get different screens.
+      action = [1, 0, 0]
+
+      screens = []
+      obs = stack_env.observe()
+      screens.append(env.observe()["screen"])
+      # The first screen fills the stack.
+      self.assertEqual((4, 84, 84, 3), obs["screen"].shape)
+      for i in range(4):
+          self.assertTrue(np.array_equal(screens[0], obs["screen"][i]))
+
+      for i in range(6):
+          obs = stack_env.step(action)
+          screens.append(env.step(action)["screen"])
+          expected = np.stack(([screens[0]] * 4 + screens)[-4:])
+          self.assertTrue(np.array_equal(expected, obs["screen"]))
+          self.assertFalse(obs["screen"].flags.owndata)
+      self.assertFalse(np.array_equal(screens[-1], screens[-2]))
+
+      # Stack starts again after reset.
+      stack_env.reset_frame_stack()
+      obs = stack_env.observe()
+      for i in range(4):
+          self.assertTrue(np.array_equal(screens[-1], obs["screen"][i]))
+
+      with self.assertRaises(ValueError):
+          stack_env.step(action, out=np.zeros((84, 84, 3), dtype=np.uint8))
+      env.close()
+      stack_env.close()
+
+  def testStepAsync(self):
+      env = self.create_env()
+      stack_env = self.create_env(frame_stack=3)
+      action = [1, 0, 0]
+
+      # step_async() and step() push to the same stack.
+      screens = [env.observe()["screen"]]
+      stack_env.observe()
+      for i in range(4):
+          screens.append(env.step(action)["screen"])
+          if i % 2 == 0:
+              stack_env.step_async(action)
+              obs = stack_env.fetch(stack_env.main_camera_id)
+          else:
+              obs = stack_env.step(action)
+          expected = np.stack(([screens[0]] * 3 + screens)[-3:])
+          self.assertTrue(np.array_equal(expected, obs["screen"]))
+
+      stack_env.step_async(action)
+      with self.assertRaises(ValueError):
+          stack_env.fetch(stack_env.main_camera_id,
+                          out=np.zeros((84, 84, 3), dtype=np.uint8))
+      env.close()
+      stack_env.close()
+
+  def testFrameStackGray(self):
+      env = self.create_env(frame_stack=2, output_format="gray")
+      obs = env.step([0, 0, 0])
+      self.assertEqual((2, 84, 84, 1), obs["screen"].shape)
+      # Physics only step doesn't push the frame.
+      env.step([0, 0, 0], render=False)
+      obs = env.step([0, 0, 0])
+      self.assertEqual((2, 84, 84, 1), obs["screen"].shape)
+      env.close()
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+import unittest
+import numpy as np
+import os, sys
+sys.path.insert(0, os.getcwd())
+import rodentia
+from rodentia.test import stage
+
+
+BOX_POSITIONS = [[-3.0, 1.0, -8.0], [0.0, 1.0, -8.0], [3.0, 1.0, -8.0]]
+
+
+class InstancingTest(unittest.TestCase):
+  def create_env(self, box_indices):
+      env = stage.create_env()
+
+      # Add boxes sharing the same mesh and texture
+      for i in box_indices:
+          env.add_box(texture_path="",
+                      color=[1.0, 0.0, 0.0],
+                      half_extent=[0.5, 0.5, 0.5],
+                      pos=BOX_POSITIONS[i],
+                      rot=0.3,
+                      detect_collision=False)
+
+      env.locate_agent(pos=[0.0, 1.0, 0.0], rot_y=0.0)
+      return env
+
+  def render(self, box_indices):
+      env = self.create_env(box_indices)
+      screen = env.step([0, 0, 0])["screen"]
+      stats = env.get_render_stats()
+      env.close()
+      return screen.astype(np.int32), stats
+
+  def testInstancedDraw(self):
+      base_screen, base_stats = self.render([])
+      
+      # Each box drawn with its own draw call
+      single_screens = []
+      for i in range(len(BOX_POSITIONS)):
+          screen, stats = self.render([i])
+          self.assertEqual( base_stats["draw_calls"] + 1, stats["draw_calls"] )
+          single_screens.append(screen)
+
+      # All the boxes drawn with one instanced draw call
+      screen, stats = self.render(range(len(BOX_POSITIONS)))
+      self.assertEqual( base_stats["draw_calls"] + 1, stats["draw_calls"] )
+      self.assertEqual( base_stats["shadow_draw_calls"] + 1, stats["shadow_draw_calls"] )
+      self.assertEqual( base_stats["drawn"] + len(BOX_POSITIONS), stats["drawn"] )
+
+      # Compose the single box screens. (The boxes and their shadows don't overlap.)
+      composed_screen = base_screen.copy()
+      for single_screen in single_screens:
+          mask = single_screen != base_screen
+          composed_screen[mask] = single_screen[mask]
+
+      # Allow slight rasterization differences with the model matrix applied in the shader.
+      diff = np.abs(screen - composed_screen)
+      self.assertLess( np.mean(diff > 8), 0.001 )
+
+
+if __name__ == '__main__':
+  unittest.main()
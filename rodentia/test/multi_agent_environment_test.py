@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+import unittest
+import numpy as np
+import os, sys
+sys.path.insert(0, os.getcwd())
+import rodentia
+from rodentia.test import stage
+
+
+class MultiAgentEnvironmentTest(unittest.TestCase):
+  def testRenderAgents(self):
+      agent_size = 3
+      # Non square view
+      width  = 84
+      height = 60
+      
+      env = rodentia.MultiAgentEnvironment(agent_size=agent_size,
+                                           width=width, height=height,
+                                           bg_color=[0.0, 0.0, 0.0])
+
+      stage.add_floor(env, 10.0)
+      stage.add_sphere(env, detect_collision=False)
+
+      for i in range(agent_size):
+          env.locate_agent(i, pos=[i * 2.0, 1.0, 0.0], rot_y=i * 0.5)
+
+      actions = np.zeros((agent_size, 3), dtype=np.int32)
+      obs = env.step(actions)
+      screen = obs["screen"]
+      self.assertEqual( (agent_size, width, height, 3), screen.shape )
+      self.assertEqual( np.uint8, screen.dtype )
+
+      # Same as rendering each agent view separately. (Allowing rasterization
+      # differences at a few edge pixels caused by the viewport offset)
+      for i in range(agent_size):
+          agent_info = env.get_agent_info(i)
+          expected = env.render(env.main_camera_id,
+                                pos=agent_info["pos"],
+                                rot=agent_info["rot"],
+                                ignore_ids=[env.agent_ids[i]])["screen"]
+          self.assertEqual( expected.shape, screen[i].shape )
+          diff = np.abs(expected.astype(np.int32) - screen[i].astype(np.int32))
+          self.assertLess( np.mean(diff > 0), 0.001 )
+      self.assertFalse( np.array_equal(screen[0], screen[1]) )
+
+      # Read into given array
+      out = np.zeros((agent_size, width, height, 3), dtype=np.uint8)
+      ret = env.render_agents(out=out)
+      self.assertIs( out, ret["screen"] )
+      self.assertTrue( np.array_equal(screen, out) )
+      
+      env.close()
+      
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+import unittest
+import numpy as np
+import os, sys
+sys.path.insert(0, os.getcwd())
+import rodentia
+from rodentia.test import stage
+
+
+class NoShadowTest(unittest.TestCase):
+  def create_env(self, shadow):
+      env = stage.create_env(shadow=shadow)
+
+      # Add boxes sharing the same mesh and color
+      for i in range(4):
+          env.add_box(texture_path="",
+                      color=[1.0, 0.0, 0.0],
+                      half_extent=[1.0, 1.0, 1.0],
+                      pos=[i * 3.0 - 4.5, 1.0, -8.0],
+                      rot=0.0,
+                      detect_collision=False)
+      env.locate_agent(pos=[0.0, 1.0, 0.0], rot_y=0.0)
+      return env
+
+  def testNoShadow(self):
+      env = self.create_env(shadow=False)
+      obs = env.step([0, 0, 0])
+      stats = env.get_render_stats()
+
+      self.assertEqual(0, stats["shadow_drawn"])
+      self.assertEqual(0, stats["shadow_draw_calls"])
+      # Boxes are drawn with the instanced diffuse shader. (floor and boxes)
+      self.assertEqual(2, stats["draw_calls"])
+      self.assertGreater(np.max(obs["screen"]), 0)
+      env.close()
+
+  def testSameAsUnshadowed(self):
+      # Shadow color rate 1.0 makes shadowed color same as lit color.
+      env0 = self.create_env(shadow=True)
+      env0.set_light(shadow_rate=1.0)
+      env1 = self.create_env(shadow=False)
+      env1.set_light(shadow_rate=1.0)
+
+      screen0 = env0.step([0, 0, 0])["screen"].astype(np.int32)
+      screen1 = env1.step([0, 0, 0])["screen"].astype(np.int32)
+      self.assertLessEqual(np.max(np.abs(screen0 - screen1)), 1)
+
+      # Light color is applied without shadow.
+      env1.set_light(color=[0.5, 0.5, 0.5], shadow_rate=1.0)
+      screen2 = env1.step([0, 0, 0])["screen"].astype(np.int32)
+      self.assertLess(np.sum(screen2), np.sum(screen1))
+      env0.close()
+      env1.close()
+
+  def testCameraViews(self):
+      env = self.create_env(shadow=True)
+      camera_id = env.add_camera_view(84, 84, shadow=False)
+
+      # Shadow is drawn only in the main camera view.
+      env.render(env.main_camera_id, [0.0, 1.0, 0.0], 0.0, ignore_ids=[env.agent_id])
+      self.assertGreater(env.get_render_stats()["shadow_draw_calls"], 0)
+      env.render(camera_id, [0.0, 1.0, 0.0], 0.0, ignore_ids=[env.agent_id])
+      self.assertEqual(0, env.get_render_stats()["shadow_draw_calls"])
+      env.close()
+
+
+if __name__ == '__main__':
+  unittest.main()
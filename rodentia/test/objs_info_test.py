@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+import unittest
+import numpy as np
+import os, sys
+sys.path.insert(0, os.getcwd())
+import rodentia
+from rodentia.test import stage
+
+
+class ObjsInfoTest(unittest.TestCase):
+  def create_env(self):
+      env = rodentia.Environment(width=84, height=84)
+      self.floor_id = stage.add_floor(env)
+
+      # Add falling spheres and boxes
+      self.obj_ids = []
+      for i in range(4):
+          obj_id = env.add_sphere(texture_path="",
+                                  radius=0.5,
+                                  pos=[i * 2.0, 3.0 + i, -4.0],
+                                  rot=0.0,
+                                  mass=1.0,
+                                  detect_collision=False)
+          self.obj_ids.append(obj_id)
+          obj_id = env.add_box(texture_path="",
+                               half_extent=[0.5, 0.5, 0.5],
+                               pos=[i * 2.0, 2.0, -8.0],
+                               rot=0.3 * i,
+                               mass=1.0,
+                               detect_collision=False)
+          self.obj_ids.append(obj_id)
+      return env
+
+  def check_info(self, env, ids, info):
+      for i, id in enumerate(ids):
+          expected = env.get_obj_info(id)
+          for key in ["pos", "rot", "velocity"]:
+              self.assertTrue(np.array_equal(expected[key], info[key][i]))
+
+  def testGetObjsInfo(self):
+      env = self.create_env()
+      for i in range(5):
+          env.step([0, 0, 0])
+
+      ids = self.obj_ids[::-2] + [self.floor_id]
+      info = env.get_objs_info(ids)
+      self.assertEqual(np.float32, info["pos"].dtype)
+      self.assertEqual((5, 3), info["pos"].shape)
+      self.assertEqual((5, 4), info["rot"].shape)
+      self.assertEqual((5, 3), info["velocity"].shape)
+      self.assertEqual(ids, info["ids"].tolist())
+      self.check_info(env, ids, info)
+      # Falling objects have velocity
+      self.assertLess(info["velocity"][0, 1], 0.0)
+
+      # Strided id array
+      id_array = np.array(self.obj_ids, dtype=np.int64)[::2]
+      info = env.get_objs_info(id_array)
+      self.check_info(env, id_array, info)
+
+      # Object not found
+      info = env.get_objs_info([self.obj_ids[0], 1000])
+      self.assertFalse(np.any(np.isnan(info["pos"][0])))
+      self.assertTrue(np.all(np.isnan(info["pos"][1])))
+      self.assertTrue(np.all(np.isnan(info["rot"][1])))
+
+      info = env.get_objs_info([])
+      self.assertEqual((0, 3), info["pos"].shape)
+      env.close()
+
+  def testGetDynamicObjsInfo(self):
+      env = self.create_env()
+      env.step([0, 0, 0])
+      info = env.get_dynamic_objs_info()
+      # Agent and the objects with mass, except the static floor.
+      expected_ids = sorted(self.obj_ids + [env.agent_id])
+      self.assertEqual(expected_ids, info["ids"].tolist())
+      self.check_info(env, expected_ids, info)
+
+      env.remove_obj(self.obj_ids[0])
+      info = env.get_dynamic_objs_info()
+      self.assertNotIn(self.obj_ids[0], info["ids"].tolist())
+      env.close()
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+import unittest
+import numpy as np
+import os, sys
+sys.path.insert(0, os.getcwd())
+import rodentia
+from rodentia.test import stage
+
+
+class ObservationChannelsTest(unittest.TestCase):
+  def create_env(self, depth=None, segmentation=False):
+      env = rodentia.Environment(width=84, height=84, near=0.05, far=80.0,
+                                 depth=depth, segmentation=segmentation)
+      self.floor_id = stage.add_floor(env)
+
+      # Add boxes sharing the same mesh (drawn with the instanced draw call)
+      self.box_ids = []
+      for i in range(3):
+          box_id = env.add_box(texture_path="",
+                               color=[1.0, 0.0, 0.0],
+                               half_extent=[0.5, 0.5, 0.5],
+                               pos=[i * 1.5 - 1.5, 0.5, -4.0],
+                               rot=0.0,
+                               detect_collision=False)
+          self.box_ids.append(box_id)
+      return env
+
+  def render(self, env):
+      return env.render(env.main_camera_id, [0.0, 0.5, 0.0], 0.0,
+                        ignore_ids=[env.agent_id])
+
+  def testNoChannels(self):
+      env = self.create_env()
+      obs = env.step([0, 0, 0])
+      self.assertNotIn("depth", obs)
+      self.assertNotIn("segmentation", obs)
+      env.close()
+
+  def testDepth(self):
+      env = self.create_env(depth="float32")
+      obs = self.render(env)
+      depth = obs["depth"]
+      self.assertEqual(np.float32, depth.dtype)
+      self.assertEqual((84, 84), depth.shape)
+
+      # Front face of the center box is 3.5 away from the camera.
+      self.assertAlmostEqual(3.5, depth[42, 42], places=2)
+      # Background has the far clip distance.
+      self.assertAlmostEqual(80.0, depth[0, 0], places=2)
+      self.assertGreater(np.min(depth), 0.05)
+      env.close()
+
+  def testDepthUint16(self):
+      env = self.create_env(depth="uint16")
+      depth = self.render(env)["depth"]
+      self.assertEqual(np.uint16, depth.dtype)
+      self.assertEqual(65535, depth[0, 0])
+      expected = (3.5 - 0.05) / (80.0 - 0.05) * 65535
+      self.assertLessEqual(abs(int(depth[42, 42]) - expected), 2)
+      env.close()
+
+  def testSegmentation(self):
+      env = self.create_env(segmentation=True)
+      obs = self.render(env)
+      segmentation = obs["segmentation"]
+      self.assertEqual(np.int32, segmentation.dtype)
+      self.assertEqual((84, 84), segmentation.shape)
+
+      self.assertEqual(-1, segmentation[0, 0])
+      self.assertEqual(self.box_ids[1], segmentation[42, 42])
+      self.assertEqual(self.floor_id, segmentation[83, 42])
+      # Instanced boxes have their own ids.
+      ids = set(np.unique(segmentation))
+      self.assertEqual(set([-1, self.floor_id] + self.box_ids), ids)
+      # Agent is not drawn in its own view.
+      self.assertNotIn(env.agent_id, ids)
+      env.close()
+
+  def testSegmentationBaked(self):
+      env = self.create_env(depth="float32", segmentation=True)
+      obs0 = self.render(env)
+      env.bake_static()
+      obs1 = self.render(env)
+
+      # Merged static objects keep their object ids. (one draw call for each color)
+      self.assertEqual(2, env.get_render_stats()["draw_calls"])
+      diff = np.mean(obs0["segmentation"] != obs1["segmentation"])
+      self.assertLess(diff, 0.01)
+      self.assertLess(np.mean(np.abs(obs0["depth"] - obs1["depth"])), 0.1)
+      env.close()
+
+  def testCameraViews(self):
+      env = self.create_env()
+      camera_id = env.add_camera_view(84, 84, depth="float32", segmentation=True)
+      obs = env.render(camera_id, [0.0, 0.5, 0.0], 0.0, ignore_ids=[env.agent_id])
+      self.assertIn("depth", obs)
+      self.assertIn("segmentation", obs)
+      self.assertNotIn("depth", self.render(env))
+
+      with self.assertRaises(ValueError):
+          env.add_camera_view(84, 84, depth="float64")
+      env.close()
+
+  def testRenderAsync(self):
+      env = self.create_env(segmentation=True)
+      # Depth and segmentation are not read by the async rendering.
+      hash0 = env.get_state_hash()
+      with self.assertRaises(ValueError):
+          env.step_async([0, 0, 0])
+      # Not advanced
+      self.assertEqual(hash0, env.get_state_hash())
+      camera_id = env.add_camera_view(84, 84, depth="uint16")
+      with self.assertRaises(ValueError):
+          env.render_async(camera_id, [0.0, 0.5, 0.0], 0.0)
+
+      # Available for the view only with the screen
+      camera_id = env.add_camera_view(84, 84)
+      env.render_async(camera_id, [0.0, 0.5, 0.0], 0.0)
+      self.assertEqual(["screen"], list(env.fetch(camera_id).keys()))
+      env.close()
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+import unittest
+import numpy as np
+import os, sys
+sys.path.insert(0, os.getcwd())
+import rodentia
+from rodentia.test import stage
+
+
+class OutputBufferTest(unittest.TestCase):
+  def create_env(self, width, height):
+      env = stage.create_env(width, height, floor_size=10.0)
+      stage.add_sphere(env)
+      return env
+
+  def testStepOut(self):
+      env = self.create_env(84, 84)
+      action = np.array([0, 0, 0], dtype=np.int32)
+
+      # Reading into a slice of a larger rollout buffer
+      rollout = np.zeros((4, 84, 84, 3), dtype=np.uint8)
+      for i in range(4):
+          obs = env.step(action, out=rollout[i])
+          self.assertIs( rollout[i].base, obs["screen"].base )
+
+      # Rendering the same view again gives the same pixels.
+      agent_info = env.get_agent_info()
+      expected = env.render(env.main_camera_id,
+                            pos=agent_info["pos"],
+                            rot=agent_info["rot"],
+                            ignore_ids=[env.agent_id])["screen"]
+      self.assertTrue( np.array_equal(expected, rollout[3]) )
+      self.assertGreater( np.sum(rollout[3]), 0 )
+      env.close()
+
+  def testRenderOutOddWidth(self):
+      # Row size is not a multiple of 4.
+      width  = 85
+      height = 61
+      env = self.create_env(width, height)
+      out = np.zeros((height, width, 3), dtype=np.uint8)
+      agent_info = env.get_agent_info()
+      ret = env.render(env.main_camera_id,
+                       pos=agent_info["pos"],
+                       rot=agent_info["rot"],
+                       out=out)
+      self.assertIs( out, ret["screen"] )
+      expected = env.render(env.main_camera_id,
+                            pos=agent_info["pos"],
+                            rot=agent_info["rot"])["screen"]
+      self.assertTrue( np.array_equal(expected.reshape(out.shape), out) )
+      env.close()
+
+  def testInvalidOut(self):
+      env = self.create_env(84, 84)
+      action = np.array([0, 0, 0], dtype=np.int32)
+
+      # Wrong dtype
+      with self.assertRaises(ValueError):
+          env.step(action, out=np.zeros((84, 84, 3), dtype=np.float32))
+      # Wrong size
+      with self.assertRaises(ValueError):
+          env.step(action, out=np.zeros((84, 83, 3), dtype=np.uint8))
+      # Not contiguous
+      with self.assertRaises(ValueError):
+          env.step(action, out=np.zeros((84, 84, 6), dtype=np.uint8)[:,:,:3])
+      # Not writeable
+      out = np.zeros((84, 84, 3), dtype=np.uint8)
+      out.setflags(write=False)
+      with self.assertRaises(ValueError):
+          env.step(action, out=out)
+      env.close()
+
+  def testBatchStepOut(self):
+      env_size = 3
+      env = rodentia.BatchEnvironment(env_size=env_size,
+                                      width=84, height=84,
+                                      bg_color=[0.0, 0.0, 0.0])
+      stage.add_floor(env, 10.0)
+      actions = np.zeros((env_size, 3), dtype=np.int32)
+      out = np.zeros((env_size, 84, 84, 3), dtype=np.uint8)
+      obs = env.step(actions, out=out)
+      self.assertIs( out, obs["screen"] )
+      for i in range(env_size):
+          agent_info = env.get_agent_info(i)
+          expected = env.render(env.main_camera_id,
+                                pos=agent_info["pos"],
+                                rot=agent_info["rot"],
+                                ignore_ids=[env.agent_id],
+                                env_index=i)["screen"]
+          self.assertTrue( np.array_equal(expected, out[i]) )
+      env.close()
+      
+
+if __name__ == '__main__':
+  unittest.main()
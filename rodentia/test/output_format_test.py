@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+import unittest
+import numpy as np
+import os, sys
+sys.path.insert(0, os.getcwd())
+import rodentia
+from rodentia.test import stage
+
+
+class OutputFormatTest(unittest.TestCase):
+  def create_env(self, width=84, height=84, **kwargs):
+      env = stage.create_env(width, height, shadow=False, **kwargs)
+
+      # Add boxes
+      for i in range(3):
+          env.add_box(texture_path="",
+                      color=[1.0, 0.2 * i, 0.1],
+                      half_extent=[0.5, 0.5, 0.5],
+                      pos=[i * 1.5 - 1.5, 0.5, -4.0],
+                      rot=0.3,
+                      detect_collision=False)
+      return env
+
+  def render(self, env):
+      return env.render(env.main_camera_id, [0.0, 0.5, 0.0], 0.0,
+                        ignore_ids=[env.agent_id])
+
+  def testGray(self):
+      screen = self.render(self.create_env())["screen"]
+      env = self.create_env(output_format="gray")
+      gray = self.render(env)["screen"]
+      self.assertEqual((84, 84, 1), gray.shape)
+      self.assertEqual(np.uint8, gray.dtype)
+
+      expected = screen.astype(np.float32) @ np.array([0.299, 0.587, 0.114])
+      self.assertLessEqual(np.max(np.abs(expected - gray[:,:,0])), 1.0)
+
+      # Step and out array use the same format.
+      out = np.zeros((84, 84, 1), dtype=np.uint8)
+      obs = env.step([0, 0, 0], out=out)
+      self.assertIs(out, obs["screen"])
+      env.close()
+
+  def testRGBA(self):
+      screen = self.render(self.create_env())["screen"]
+      rgba = self.render(self.create_env(output_format="rgba"))["screen"]
+      self.assertEqual((84, 84, 4), rgba.shape)
+      self.assertTrue(np.array_equal(screen, rgba[:,:,:3]))
+      self.assertTrue(np.all(rgba[:,:,3] == 255))
+
+  def testSupersampling(self):
+      large = self.render(self.create_env(width=168, height=168))["screen"]
+      expected = large.astype(np.float32).reshape(84, 2, 84, 2, 3).mean(axis=(1, 3))
+
+      env = self.create_env(supersampling=2, depth="float32", segmentation=True)
+      obs = self.render(env)
+      screen = obs["screen"]
+      self.assertEqual((84, 84, 3), screen.shape)
+      self.assertLess(np.mean(np.abs(expected - screen)), 1.0)
+
+      # Depth and object ids take the nearest sample.
+      self.assertEqual((84, 84), obs["depth"].shape)
+      self.assertEqual((84, 84), obs["segmentation"].shape)
+      self.assertAlmostEqual(3.5, obs["depth"][42, 42], places=1)
+      self.assertGreater(obs["segmentation"][42, 42], 0)
+      env.close()
+
+  def testInvalidFormat(self):
+      env = self.create_env()
+      with self.assertRaises(ValueError):
+          env.add_camera_view(84, 84, output_format="bgr")
+      with self.assertRaises(ValueError):
+          env.add_camera_view(84, 84, supersampling=0)
+
+      # Atlas rendering doesn't support the gray output.
+      camera_id = env.add_camera_view(84, 84, output_format="gray")
+      with self.assertRaises(RuntimeError):
+          env.env.render_agents(camera_id=camera_id,
+                                agent_ids=rodentia.core.to_nd_int_array([env.agent_id]))
+      env.close()
+
+
+if __name__ == '__main__':
+  unittest.main()
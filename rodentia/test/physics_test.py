@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+import unittest
+import numpy as np
+import os, sys
+sys.path.insert(0, os.getcwd())
+import rodentia
+
+
+class PhysicsTest(unittest.TestCase):
+  def fall(self, step_size, **physics):
+      env = rodentia.Environment(width=32, height=32)
+      if physics:
+          env.set_physics(**physics)
+      sphere_id = env.add_sphere(texture_path="",
+                                 radius=0.5,
+                                 pos=[0.0, 100.0, -5.0],
+                                 rot=0.0,
+                                 mass=1.0,
+                                 detect_collision=False)
+      for i in range(step_size):
+          env.env.step()
+      pos = env.get_obj_info(sphere_id)["pos"]
+      env.close()
+      return pos[1]
+
+  def testTimeStep(self):
+      # 30 steps of 1/30 sec falls as far as 60 steps of 1/60 sec.
+      y_default = self.fall(60)
+      y_coarse  = self.fall(30, time_step=1.0/30.0, max_sub_steps=1,
+                            fixed_time_step=1.0/30.0)
+      self.assertAlmostEqual( 100.0 - 0.5 * 9.8, y_default, delta=0.5 )
+      self.assertAlmostEqual( y_default, y_coarse, delta=0.5 )
+
+      # Fine internal steps advancing the same time per step
+      y_fine = self.fall(60, time_step=1.0/60.0, max_sub_steps=4,
+                         fixed_time_step=1.0/240.0)
+      self.assertAlmostEqual( y_default, y_fine, delta=0.5 )
+
+  def testInvalidParams(self):
+      env = rodentia.Environment(width=32, height=32)
+      with self.assertRaises(ValueError):
+          env.set_physics(time_step=0.0)
+      with self.assertRaises(ValueError):
+          env.set_physics(max_sub_steps=-1)
+      env.close()
+      
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+import unittest
+import numpy as np
+import os, sys
+sys.path.insert(0, os.getcwd())
+import rodentia
+from rodentia.test import stage
+
+
+class RenderQueueTest(unittest.TestCase):
+  def testStateChanges(self):
+      env = stage.create_env()
+
+      # Add boxes with different sizes (= different meshes) and alternating colors.
+      colors = [[1.0, 0.0, 0.0], [0.0, 0.0, 1.0]]
+      box_size = 6
+      for i in range(box_size):
+          env.add_box(texture_path="",
+                      color=colors[i % 2],
+                      half_extent=[0.5, 0.5, 1.0 + i],
+                      pos=[i * 2.0 - 5.0, 0.5, -15.0],
+                      rot=0.0,
+                      detect_collision=False)
+
+      env.locate_agent(pos=[0.0, 1.0, 0.0], rot_y=0.0)
+      env.step([0, 0, 0])
+      stats = env.get_render_stats()
+
+      draw_calls = stats["draw_calls"] + stats["shadow_draw_calls"]
+      self.assertEqual( (box_size + 1) * 2, draw_calls )
+
+      # Each draw binds its own vertex array, but shader and texture binds are shared
+      # among the draws sorted by shader and texture.
+      # (color path: 1 shader + 3 textures, shadow path: 1 shader + 1 texture disabling)
+      self.assertEqual( draw_calls + 6, stats["state_changes"] )
+      env.close()
+      
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+import unittest
+import numpy as np
+import os, sys
+sys.path.insert(0, os.getcwd())
+import rodentia
+from rodentia.test import stage
+
+
+class RenderSkipTest(unittest.TestCase):
+  def setup_stage(self, env):
+      stage.add_floor(env)
+      stage.add_sphere(env)
+
+  def testStepWithoutRender(self):
+      action = [1, 0, 1]
+
+      env0 = rodentia.Environment(width=84, height=84)
+      self.setup_stage(env0)
+      env0.locate_agent(pos=[0.0, 1.0, 0.0], rot_y=0.0)
+
+      env1 = rodentia.Environment(width=84, height=84)
+      self.setup_stage(env1)
+      env1.locate_agent(pos=[0.0, 1.0, 0.0], rot_y=0.0)
+
+      for i in range(3):
+          obs0 = env0.step(action)
+          obs1 = env1.step(action, render=False)
+          self.assertTrue( "collided" in obs1 )
+          self.assertFalse( "screen" in obs1 )
+
+      # Physics is not affected by skipping rendering.
+      info0 = env0.get_agent_info()
+      info1 = env1.get_agent_info()
+      self.assertTrue( np.allclose(info0["pos"], info1["pos"]) )
+
+      # observe() renders the same screen as step().
+      screen = env1.observe()["screen"]
+      self.assertEqual( (84, 84, 3), screen.shape )
+      self.assertTrue( np.array_equal(obs0["screen"], screen) )
+
+      out = np.zeros((84, 84, 3), dtype=np.uint8)
+      ret = env1.observe(out=out)
+      self.assertTrue( ret["screen"] is out )
+      self.assertTrue( np.array_equal(screen, out) )
+
+      env0.close()
+      env1.close()
+
+  def testMultiAgentStepWithoutRender(self):
+      env = rodentia.MultiAgentEnvironment(agent_size=2, width=32, height=32)
+      self.setup_stage(env)
+      obs = env.step([[0, 0, 0], [0, 0, 0]], render=False)
+      self.assertEqual( 2, len(obs["collided"]) )
+      self.assertFalse( "screen" in obs )
+
+      screen = env.observe()["screen"]
+      self.assertEqual( (2, 32, 32, 3), screen.shape )
+      env.close()
+
+  def testBatchStepWithoutRender(self):
+      env = rodentia.BatchEnvironment(env_size=2, width=32, height=32)
+      self.setup_stage(env)
+      actions = np.zeros((2, 3), dtype=np.int32)
+      
+      obs = env.step(actions, render=False)
+      self.assertEqual( (2, 0), obs["collided"].shape )
+      self.assertFalse( "screen" in obs )
+
+      screen = env.observe()["screen"]
+      self.assertEqual( (2, 32, 32, 3), screen.shape )
+
+      # observe() renders the agent view of each environment.
+      for i in range(2):
+          info = env.get_agent_info(i)
+          expected = env.render(env.main_camera_id, info["pos"], info["rot"],
+                                ignore_ids=[env.agent_id], env_index=i)["screen"]
+          self.assertTrue( np.array_equal(expected, screen[i]) )
+
+      out = np.zeros((2, 32, 32, 3), dtype=np.uint8)
+      ret = env.observe(out=out)
+      self.assertTrue( ret["screen"] is out )
+      self.assertTrue( np.array_equal(screen, out) )
+      env.close()
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -24,6 +24,10 @@ class RodentiaModuleTest(unittest.TestCase):
       version = rodentia.rodentia_module.version()
       self.assertEqual(version, rodentia.__version__)
       
+  def testInvalidGLBackend(self):
+      with self.assertRaises(ValueError):
+          rodentia.rodentia_module.Env(gl_backend="unknown")
+      
   def testEnv(self):
       width  = 84 * 4
       height = 84 * 4
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+import unittest
+import numpy as np
+import os, sys
+sys.path.insert(0, os.getcwd())
+import rodentia
+from rodentia.test import stage
+
+
+class ShadowCacheTest(unittest.TestCase):
+  def create_env(self):
+      env = stage.create_env()
+
+      # Add box casting shadow on the floor
+      box_id = env.add_box(texture_path="",
+                           color=[1.0, 0.0, 0.0],
+                           half_extent=[1.0, 1.0, 1.0],
+                           pos=[0.0, 1.0, -5.0],
+                           rot=0.0,
+                           detect_collision=False)
+      return env, box_id
+
+  def render(self, env, pos=[0.0, 1.0, 0.0]):
+      screen = env.render(env.main_camera_id, pos, [0.0, 0.0, 0.0, 1.0],
+                          ignore_ids=[env.agent_id])["screen"]
+      return screen.copy(), env.get_render_stats()
+
+  def testCache(self):
+      env, box_id = self.create_env()
+
+      screen0, stats0 = self.render(env)
+      self.assertEqual(0, stats0["shadow_cached"])
+      self.assertGreater(stats0["shadow_draw_calls"], 0)
+
+      # Same camera pose and unchanged objects reuse the shadow depth.
+      screen1, stats1 = self.render(env)
+      self.assertEqual(1, stats1["shadow_cached"])
+      self.assertEqual(0, stats1["shadow_draw_calls"])
+      self.assertTrue(np.array_equal(screen0, screen1))
+      env.close()
+
+  def testInvalidate(self):
+      env, box_id = self.create_env()
+      screen0, _ = self.render(env)
+
+      # Moving object
+      env.locate_object(box_id, pos=[1.0, 1.0, -5.0])
+      screen1, stats = self.render(env)
+      self.assertEqual(0, stats["shadow_cached"])
+      self.assertFalse(np.array_equal(screen0, screen1))
+
+      # Changing light direction
+      env.set_light(dir=[0.5, -1.0, -0.4])
+      _, stats = self.render(env)
+      self.assertEqual(0, stats["shadow_cached"])
+
+      # Changing camera pose
+      _, stats = self.render(env, pos=[0.0, 1.0, 1.0])
+      self.assertEqual(0, stats["shadow_cached"])
+
+      # Removing object
+      env.remove_obj(box_id)
+      _, stats = self.render(env, pos=[0.0, 1.0, 1.0])
+      self.assertEqual(0, stats["shadow_cached"])
+      env.close()
+
+  def testCachedScreen(self):
+      env, box_id = self.create_env()
+      self.render(env)
+      env.locate_object(box_id, pos=[1.0, 1.0, -5.0])
+      screen0, _ = self.render(env)
+      screen1, stats = self.render(env)
+      self.assertEqual(1, stats["shadow_cached"])
+
+      # Screen with the cached shadow depth is same as the one without cache.
+      env2, box_id2 = self.create_env()
+      env2.locate_object(box_id2, pos=[1.0, 1.0, -5.0])
+      screen2, stats2 = self.render(env2)
+      self.assertEqual(0, stats2["shadow_cached"])
+      self.assertTrue(np.array_equal(screen1, screen2))
+      env.close()
+      env2.close()
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""
+Stage setup shared by the tests.
+"""
+import os, sys
+sys.path.insert(0, os.getcwd())
+import rodentia
+
+
+def add_floor(env, size=20.0):
+    """Add the static floor box whose top surface is at y=0.
+    Args:
+      env: Environment, MultiAgentEnvironment or BatchEnvironment
+      size: Half extent of the floor along x and z axes. (default 20.0)
+    Returns:
+      Int value for the object id of the floor.
+    """
+    return env.add_box(texture_path="",
+                       half_extent=[size, 1.0, size],
+                       pos=[0.0, -1.0, 0.0],
+                       rot=0.0,
+                       detect_collision=False)
+
+
+def add_sphere(env, pos=[0.0, 1.0, -5.0], mass=0.0, detect_collision=True):
+    """Add the red sphere with radius 1.0 (in front of the agent by default).
+    Returns:
+      Int value for the object id of the sphere.
+    """
+    return env.add_sphere(texture_path="",
+                          color=[1.0, 0.0, 0.0],
+                          radius=1.0,
+                          pos=pos,
+                          rot=0.0,
+                          mass=mass,
+                          detect_collision=detect_collision)
+
+
+def create_env(width=84, height=84, floor_size=20.0, **kwargs):
+    """Create the environment with the floor.
+    Args:
+      width, height: Screen size
+      floor_size: Half extent of the floor. (default 20.0)
+      kwargs: Other arguments of rodentia.Environment
+    """
+    env = rodentia.Environment(width=width, height=height, **kwargs)
+    add_floor(env, floor_size)
+    return env
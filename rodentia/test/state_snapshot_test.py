@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+import unittest
+import numpy as np
+import os, sys
+sys.path.insert(0, os.getcwd())
+import rodentia
+from rodentia.test import stage
+
+
+class StateSnapshotTest(unittest.TestCase):
+  def create_env(self):
+      env = rodentia.Environment(width=84, height=84)
+      self.floor_id = stage.add_floor(env)
+      # Add spheres falling on the boxes
+      self.box_ids = env.add_boxes(half_extents=[0.5, 0.5, 0.5],
+                                   pos=[[-1.5, 0.5, -4.0], [1.5, 0.5, -4.0]],
+                                   color=[0.0, 0.0, 1.0])
+      self.sphere_ids = env.add_spheres(radiuses=0.5,
+                                        pos=[[-1.3, 3.0, -4.0], [1.2, 4.0, -4.2],
+                                             [0.0, 2.0, -3.0]],
+                                        color=[1.0, 0.0, 0.0],
+                                        mass=1.0,
+                                        detect_collision=True)
+      env.locate_agent([0.0, 1.0, 0.0], rot_y=0.3)
+      return env
+
+  def run_steps(self, env, step_size=30):
+      rng = np.random.RandomState(1)
+      positions = []
+      collided = []
+      for i in range(step_size):
+          action = [rng.randint(-20, 20), rng.randint(-1, 2), rng.randint(-1, 2)]
+          obs = env.step(action, render=False)
+          collided.append(obs["collided"])
+          positions.append(env.get_dynamic_objs_info()["pos"])
+      return np.array(positions), collided
+
+  def testRestore(self):
+      env = self.create_env()
+      env.step([0, 0, 0])
+      handle = env.save_state()
+      info0 = env.get_dynamic_objs_info()
+      agent_info0 = env.get_agent_info()
+      screen0 = env.observe()["screen"]
+      next_id = env.add_sphere(radius=0.1, pos=[0, 10, 0])
+      env.remove_obj(next_id)
+
+      # Change the stage
+      self.run_steps(env)
+      env.remove_obj(self.sphere_ids[0])
+      env.remove_objs(self.box_ids)
+      added_id = env.add_sphere(radius=0.5, pos=[0.0, 0.5, -2.0])
+      self.assertIsNone(env.get_obj_info(self.sphere_ids[0]))
+
+      env.restore_state(handle)
+      info1 = env.get_dynamic_objs_info()
+      agent_info1 = env.get_agent_info()
+      self.assertEqual(info0["ids"].tolist(), info1["ids"].tolist())
+      for key in ["pos", "rot", "velocity"]:
+          self.assertTrue(np.array_equal(info0[key], info1[key]))
+      self.assertAlmostEqual(agent_info0["rot_y"], agent_info1["rot_y"], places=5)
+      self.assertIsNone(env.get_obj_info(added_id))
+      self.assertIsNotNone(env.get_obj_info(self.box_ids[0]))
+      self.assertTrue(np.array_equal(screen0, env.observe()["screen"]))
+
+      # Ids are allocated in the same way after the restore.
+      self.assertEqual(next_id, env.add_sphere(radius=0.1, pos=[0, 10, 0]))
+      env.close()
+
+  def testReproducible(self):
+      env = self.create_env()
+      handle = env.save_state()
+      positions0, collided0 = self.run_steps(env)
+
+      env.restore_state(handle)
+      positions1, collided1 = self.run_steps(env)
+      self.assertTrue(np.array_equal(positions0, positions1))
+      env.remove_obj(self.sphere_ids[1])
+      env.add_box(half_extent=[1.0, 1.0, 1.0], pos=[0.0, 1.0, -3.0])
+
+      env.restore_state(handle)
+      positions2, collided2 = self.run_steps(env)
+      self.assertTrue(np.array_equal(positions1, positions2))
+      self.assertEqual(collided1, collided2)
+      # Objects moved
+      self.assertFalse(np.array_equal(positions1[0], positions1[-1]))
+      env.close()
+
+  def testReproducibleStacked(self):
+      env = self.create_env()
+      # Overlapping spheres pushing each other in the stacks with the same x
+      # positions.
+      stack_ids = env.add_spheres(radiuses=0.3,
+                                  pos=[[x * 0.55 - 1.5, 0.3 + y * 0.6, z * 0.55 + 2.0]
+                                       for x in range(4) for y in range(3)
+                                       for z in range(4)],
+                                  mass=1.0)
+      self.run_steps(env, step_size=10)
+      handle = env.save_state()
+
+      positions = []
+      for i in range(3):
+          env.restore_state(handle)
+          if i == 1:
+              env.remove_objs(stack_ids[::2])
+          elif i == 2:
+              env.add_spheres(radiuses=0.2, pos=[[0.0, 3.0, 2.0], [0.5, 3.0, 2.0]])
+          self.run_steps(env)
+          env.restore_state(handle)
+          positions.append(self.run_steps(env)[0])
+      self.assertTrue(np.array_equal(positions[0], positions[1]))
+      self.assertTrue(np.array_equal(positions[0], positions[2]))
+      env.close()
+
+  def testRelease(self):
+      env = self.create_env()
+      handle0 = env.save_state()
+      env.remove_obj(self.sphere_ids[0])
+      handle1 = env.save_state()
+      env.remove_obj(self.sphere_ids[1])
+
+      env.restore_state(handle0)
+      self.assertIsNotNone(env.get_obj_info(self.sphere_ids[0]))
+      env.restore_state(handle1)
+      self.assertIsNone(env.get_obj_info(self.sphere_ids[0]))
+      self.assertIsNotNone(env.get_obj_info(self.sphere_ids[1]))
+
+      env.release_state(handle0)
+      with self.assertRaises(ValueError):
+          env.restore_state(handle0)
+      env.restore_state(handle1)
+      self.assertIsNone(env.get_obj_info(self.sphere_ids[0]))
+      env.close()
+
+  def testSerialize(self):
+      env0 = self.create_env()
+      self.run_steps(env0, step_size=10)
+      env0.remove_obj(self.sphere_ids[0])
+      handle0 = env0.save_state()
+      data = env0.serialize_state(handle0)
+      self.assertIsInstance(data, bytes)
+      # Header and 88 bytes for each object (floor, 2 boxes, 2 spheres and agent)
+      self.assertEqual(20 + 88 * 6, len(data))
+
+      # Load in the other environment built with the same stage.
+      env1 = self.create_env()
+      handle1 = env1.load_state(data)
+      env1.restore_state(handle1)
+      self.assertIsNone(env1.get_obj_info(self.sphere_ids[0]))
+      info0 = env0.get_dynamic_objs_info()
+      info1 = env1.get_dynamic_objs_info()
+      for key in ["ids", "pos", "rot", "velocity"]:
+          self.assertTrue(np.array_equal(info0[key], info1[key]))
+      self.assertEqual(data, env1.serialize_state(handle1))
+
+      env0.restore_state(handle0)
+      positions0, collided0 = self.run_steps(env0)
+      positions1, collided1 = self.run_steps(env1)
+      self.assertTrue(np.array_equal(positions0, positions1))
+      self.assertEqual(collided0, collided1)
+      env0.close()
+      env1.close()
+
+  def testSerializeInvalid(self):
+      env = self.create_env()
+      handle = env.save_state()
+      data = env.serialize_state(handle)
+      with self.assertRaises(ValueError):
+          env.serialize_state(handle + 1)
+      with self.assertRaises(ValueError):
+          env.load_state(data[:-1])
+      with self.assertRaises(ValueError):
+          env.load_state(b"")
+
+      # Objects in the state don't exist.
+      other_env = rodentia.Environment(width=84, height=84)
+      with self.assertRaises(ValueError):
+          other_env.load_state(data)
+      other_env.close()
+      env.close()
+
+  def testBaked(self):
+      env = self.create_env()
+      handle = env.save_state()
+      screen0 = env.observe()["screen"]
+
+      env.locate_objects(self.box_ids, [[-2.0, 0.5, -3.0], [2.0, 0.5, -3.0]])
+      env.bake_static()
+      self.assertFalse(np.array_equal(screen0, env.observe()["screen"]))
+
+      env.restore_state(handle)
+      self.assertTrue(np.array_equal(screen0, env.observe()["screen"]))
+      env.close()
+
+  def testFrameStack(self):
+      env = rodentia.Environment(width=84, height=84, frame_stack=2)
+      handle = env.save_state()
+      env.step([10, 0, 0])
+      env.step([10, 0, 0])
+      env.restore_state(handle)
+      screen = env.observe()["screen"]
+      self.assertTrue(np.array_equal(screen[0], screen[1]))
+      env.close()
+
+
+if __name__ == '__main__':
+  unittest.main()
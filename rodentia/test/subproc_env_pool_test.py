@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+import unittest
+import numpy as np
+import os, sys
+sys.path.insert(0, os.getcwd())
+import rodentia
+from rodentia.vector import SubprocEnvPool
+from rodentia.test import stage
+
+
+def create_env():
+    env = stage.create_env(floor_size=10.0)
+    stage.add_sphere(env, pos=[0.0, 1.0, -3.0])
+    return env
+
+
+def create_stacked_env():
+    env = rodentia.Environment(width=32, height=24, frame_stack=4)
+    stage.add_sphere(env, pos=[0.0, 1.0, -3.0])
+    return env
+
+
+class FailingEnvironment(rodentia.Environment):
+  def step(self, action, **kwargs):
+      if action[0] < 0:
+          raise ValueError("bad action")
+      return super().step(action, **kwargs)
+
+
+def create_failing_env():
+    return FailingEnvironment(width=32, height=24)
+
+
+def create_bad_env():
+    raise ValueError("bad env")
+
+
+class SubprocEnvPoolTest(unittest.TestCase):
+  def testStep(self):
+      env = create_env()
+      with SubprocEnvPool(create_env, 2) as pool:
+          self.assertEqual((84, 84, 3), pool.screen_shape)
+          obs = pool.observe()
+          self.assertEqual((2, 84, 84, 3), obs["screen"].shape)
+          self.assertTrue(np.array_equal(env.observe()["screen"], obs["screen"][0]))
+
+          # Each environment gets its own action.
+          actions = np.array([[0, 0, 1], [1, 0, 0]], dtype=np.int32)
+          for i in range(10):
+              obs = pool.step(actions)
+          self.assertEqual(2, len(obs["collided"]))
+          self.assertFalse(np.array_equal(obs["screen"][0], obs["screen"][1]))
+
+          # Moved forward and hit the sphere.
+          collided = []
+          for i in range(30):
+              collided += pool.step(actions, repeat=2)["collided"][0]
+          self.assertGreater(len(collided), 0)
+
+          # Async step
+          pool.step_async(actions)
+          with self.assertRaises(RuntimeError):
+              pool.step_async(actions)
+          obs = pool.step_wait()
+          self.assertEqual((2, 84, 84, 3), obs["screen"].shape)
+      env.close()
+
+  def testSameAsEnvironment(self):
+      env = create_env()
+      with SubprocEnvPool(create_env, 1) as pool:
+          action = [1, 0, 1]
+          for i in range(5):
+              expected = env.step(action)["screen"]
+              screen = pool.step([action])["screen"][0]
+              self.assertTrue(np.array_equal(expected, screen))
+      env.close()
+
+  def testFrameStack(self):
+      env = create_stacked_env()
+      with SubprocEnvPool(create_stacked_env, 2) as pool:
+          self.assertEqual((4, 32, 24, 3), pool.screen_shape)
+          obs = pool.observe()
+          self.assertTrue(np.array_equal(env.observe()["screen"], obs["screen"][0]))
+
+          actions = np.array([[10, 0, 0], [10, 0, 0]], dtype=np.int32)
+          for i in range(3):
+              expected = env.step(actions[0])["screen"]
+              obs = pool.step(actions)
+          self.assertEqual((2, 4, 32, 24, 3), obs["screen"].shape)
+          self.assertTrue(np.array_equal(expected, obs["screen"][0]))
+          self.assertTrue(np.array_equal(expected, obs["screen"][1]))
+      env.close()
+
+  def testStepError(self):
+      with SubprocEnvPool(create_failing_env, 3) as pool:
+          actions = np.array([[-1, 0, 0], [0, 0, 0], [-1, 0, 0]], dtype=np.int32)
+          with self.assertRaises(RuntimeError) as cm:
+              pool.step(actions)
+          # Errors of all the failed workers are reported.
+          message = str(cm.exception)
+          self.assertIn("Worker process 0 failed", message)
+          self.assertIn("Worker process 2 failed", message)
+          self.assertNotIn("Worker process 1", message)
+
+          # The pool is still usable.
+          obs = pool.step(np.zeros((3, 3), dtype=np.int32))
+          self.assertEqual((3, 32, 24, 3), obs["screen"].shape)
+          obs = pool.observe()
+          self.assertEqual((3, 32, 24, 3), obs["screen"].shape)
+
+  def testWorkerError(self):
+      with self.assertRaises(RuntimeError):
+          SubprocEnvPool(create_bad_env, 2)
+
+
+if __name__ == '__main__':
+  unittest.main()
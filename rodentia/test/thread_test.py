@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+import unittest
+import numpy as np
+import threading
+import os, sys
+sys.path.insert(0, os.getcwd())
+import rodentia
+from rodentia.test import stage
+
+
+STEP_SIZE = 20
+
+
+def worker(results, index):
+    # The environment has to be created and stepped on the same thread,
+    # because the GL context is bound to the thread which created it.
+    env = stage.create_env(floor_size=10.0)
+
+    # Add sphere
+    env.add_sphere(texture_path="",
+                   radius=1.0,
+                   pos=[0.0, 2.0, -5.0],
+                   rot=0.0,
+                   detect_collision=True)
+
+    action = np.array([0, 0, 1], dtype=np.int32)
+    screens = []
+    for i in range(STEP_SIZE):
+        obs = env.step(action)
+        screens.append(obs["screen"])
+    results[index] = screens
+    env.close()
+
+
+class RodentiaThreadTest(unittest.TestCase):
+  def testThreads(self):
+      thread_size = 2
+      results = [None] * thread_size
+      threads = [threading.Thread(target=worker, args=(results, i))
+                 for i in range(thread_size)]
+      for thread in threads:
+          thread.start()
+      for thread in threads:
+          thread.join()
+
+      for screens in results:
+          self.assertEqual(STEP_SIZE, len(screens))
+          for screen in screens:
+              self.assertEqual( (84,84,3), screen.shape )
+
+      # Both threads ran the same deterministic sequence.
+      self.assertTrue( np.array_equal(results[0][-1], results[1][-1]) )
+
+  def testAccessDuringStep(self):
+      env = stage.create_env(floor_size=10.0)
+
+      finished = threading.Event()
+
+      def read_info():
+          # Reading agent info while the main thread is stepping is serialized
+          # by the environment lock.
+          while not finished.is_set():
+              info = env.get_agent_info()
+              self.assertEqual( (3,), info["pos"].shape )
+
+      thread = threading.Thread(target=read_info)
+      thread.start()
+
+      action = np.array([0, 0, 1], dtype=np.int32)
+      for i in range(STEP_SIZE):
+          env.step(action)
+      finished.set()
+      thread.join()
+      env.close()
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+import traceback
+import multiprocessing
+from multiprocessing import shared_memory, resource_tracker
+import numpy as np
+
+
+COMMAND_STEP      = 0
+COMMAND_OBSERVE   = 1
+COMMAND_TERMINATE = 2
+
+STATUS_OK    = 0
+STATUS_ERROR = 1
+
+
+def _get_int_shapes(num_envs, max_collided):
+    return [
+        ("command", (num_envs,)),
+        ("status", (num_envs,)),
+        ("action", (num_envs, 3)),
+        ("repeat", (num_envs,)),
+        ("collided_size", (num_envs,)),
+        ("collided", (num_envs, max_collided)),
+    ]
+
+
+def _get_shared_size(num_envs, screen_shape, max_collided):
+    """ Get the byte size of the shared memory block for the pool. """
+    int_size = sum(int(np.prod(shape))
+                   for _, shape in _get_int_shapes(num_envs, max_collided))
+    return int_size * 4 + num_envs * int(np.prod(screen_shape))
+
+
+def _create_arrays(buf, num_envs, screen_shape, max_collided):
+    """ Create numpy views of the shared memory block for the pool. """
+    arrays = {}
+    offset = 0
+    for name, shape in _get_int_shapes(num_envs, max_collided):
+        array = np.ndarray(shape, dtype=np.int32, buffer=buf, offset=offset)
+        arrays[name] = array
+        offset += array.nbytes
+    arrays["screen"] = np.ndarray((num_envs,) + tuple(screen_shape),
+                                  dtype=np.uint8, buffer=buf, offset=offset)
+    return arrays
+
+
+def _worker(index, env_fn, conn, step_event, done_event, max_collided):
+    try:
+        env = env_fn()
+        screen_shape = env.observe()["screen"].shape
+    except Exception:
+        conn.send(("error", traceback.format_exc()))
+        conn.close()
+        return
+    conn.send(("shape", screen_shape))
+    # The stacked screens are kept by the environment, and copied to the shared
+    # memory after each step.
+    stacked = getattr(env, "frame_stack", None) is not None
+
+    # Attach the shared memory created by the pool.
+    shm_name, num_envs = conn.recv()
+    shm = shared_memory.SharedMemory(name=shm_name)
+    arrays = _create_arrays(shm.buf, num_envs, screen_shape, max_collided)
+    conn.send(("ready", None))
+
+    while True:
+        step_event.wait()
+        step_event.clear()
+        command = arrays["command"][index]
+        if command == COMMAND_TERMINATE:
+            break
+
+        try:
+            out = arrays["screen"][index]
+            render_out = None if stacked else out
+            if command == COMMAND_STEP:
+                ret = env.step(arrays["action"][index],
+                               out=render_out,
+                               repeat=int(arrays["repeat"][index]))
+                collided = ret["collided"][:max_collided]
+                arrays["collided_size"][index] = len(collided)
+                arrays["collided"][index,:len(collided)] = collided
+            else:
+                ret = env.observe(out=render_out)
+                arrays["collided_size"][index] = 0
+            if stacked:
+                out[:] = ret["screen"]
+            arrays["status"][index] = STATUS_OK
+        except Exception:
+            arrays["status"][index] = STATUS_ERROR
+            conn.send(("error", traceback.format_exc()))
+        done_event.set()
+
+    env.close()
+    del arrays
+    shm.close()
+    conn.close()
+
+
+class SubprocEnvPool:
+    """
+    Pool of environments running on the worker processes.
+
+    Each worker process owns one Environment created by env_fn. Actions and
+    screens are exchanged through one shared memory block, and the workers are
+    signaled with events, so nothing is pickled per step. Screens are rendered
+    by the workers directly into the shared memory.
+    """
+
+    def __init__(self, env_fn, num_envs, max_collided=32, context=None):
+        """Start the worker processes.
+        Args:
+          env_fn: Picklable callable which creates a rodentia.Environment with its
+                  stage. Called once on each worker process. With frame_stack, the
+                  stacked screens are returned.
+          num_envs: Number of the worker processes.
+          max_collided: Max number of the collided object ids reported for each
+                        environment per step. (default 32)
+          context: multiprocessing start method, "fork", "spawn" or "forkserver".
+                   If None, the default start method is used. (default None)
+        """
+        ctx = multiprocessing.get_context(context)
+        # Share the resource tracker with the workers, otherwise the tracker of each
+        # worker unlinks the shared memory when the worker exits.
+        resource_tracker.ensure_running()
+        self.num_envs = num_envs
+        self.max_collided = max_collided
+        self.shm = None
+        self.arrays = None
+        self.conns = []
+        self.procs = []
+        self.step_events = []
+        self.done_events = []
+        self.waiting = False
+
+        for i in range(num_envs):
+            conn, child_conn = ctx.Pipe()
+            step_event = ctx.Event()
+            done_event = ctx.Event()
+            proc = ctx.Process(target=_worker,
+                               args=(i, env_fn, child_conn, step_event, done_event,
+                                     max_collided),
+                               daemon=True)
+            proc.start()
+            child_conn.close()
+            self.conns.append(conn)
+            self.procs.append(proc)
+            self.step_events.append(step_event)
+            self.done_events.append(done_event)
+
+        try:
+            screen_shapes = [self._recv(i, "shape") for i in range(num_envs)]
+            if len(set(screen_shapes)) != 1:
+                raise ValueError(
+                    "All the environments must have the same screen shape: {}".format(
+                        screen_shapes))
+            self.screen_shape = screen_shapes[0]
+
+            size = _get_shared_size(num_envs, self.screen_shape, max_collided)
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+            self.arrays = _create_arrays(self.shm.buf, num_envs, self.screen_shape,
+                                         max_collided)
+            for conn in self.conns:
+                conn.send((self.shm.name, num_envs))
+            for i in range(num_envs):
+                self._recv(i, "ready")
+        except:
+            self.close()
+            raise
+
+    def _recv(self, index, expected):
+        try:
+            message, value = self.conns[index].recv()
+        except EOFError:
+            raise RuntimeError("Worker process {} exited".format(index))
+        if message == "error":
+            raise RuntimeError("Worker process {} failed:\n{}".format(index, value))
+        assert message == expected
+        return value
+
+    def _check_not_waiting(self):
+        if self.waiting:
+            raise RuntimeError("step_wait() has to be called before the next command")
+
+    def _send_command(self, command):
+        self._check_not_waiting()
+        self.arrays["command"][:] = command
+        for step_event in self.step_events:
+            step_event.set()
+        self.waiting = True
+
+    def _wait(self):
+        for i, done_event in enumerate(self.done_events):
+            while not done_event.wait(1.0):
+                if not self.procs[i].is_alive():
+                    self.waiting = False
+                    raise RuntimeError("Worker process {} exited".format(i))
+            done_event.clear()
+        self.waiting = False
+
+        # Read the errors of all the failed workers, so that no message is left in
+        # the pipes.
+        errors = [self._recv_error(i)
+                  for i in np.flatnonzero(self.arrays["status"] != STATUS_OK)]
+        if errors:
+            raise RuntimeError("\n".join(errors))
+
+    def _recv_error(self, index):
+        try:
+            message, value = self.conns[index].recv()
+        except EOFError:
+            return "Worker process {} exited".format(index)
+        assert message == "error"
+        return "Worker process {} failed:\n{}".format(index, value)
+
+    def step_async(self, actions, repeat=1):
+        """Start stepping all the environments without waiting for the result.
+        Args:
+          actions: Int array with (num_envs, 3) elements.
+          repeat: Number of physics steps to advance with the same action.
+                  (default 1)
+        """
+        # Workers may still be reading the actions of the previous step.
+        self._check_not_waiting()
+        self.arrays["action"][:] = actions
+        self.arrays["repeat"][:] = repeat
+        self._send_command(COMMAND_STEP)
+
+    def step_wait(self):
+        """Wait for the result of step_async().
+        Returns:
+          Dictionary which contains the result of this step calculation.
+            "collided": List of the collided object id lists of the environments.
+                        (At most max_collided ids for each environment)
+            "screen": numpy nd_array of (num_envs, width, height, channels) (uint8)
+                      ((num_envs, frame_stack, width, height, channels) with
+                      frame_stack)
+                      (screen[i] has the same layout as Environment.step())
+                      The view of the shared memory, which is overwritten by the
+                      next step.
+        """
+        self._wait()
+        sizes = self.arrays["collided_size"]
+        collided = [self.arrays["collided"][i,:sizes[i]].tolist()
+                    for i in range(self.num_envs)]
+        return {
+            "collided": collided,
+            "screen": self.arrays["screen"],
+        }
+
+    def step(self, actions, repeat=1):
+        """Step all the environments and returns the result.
+        Args:
+          actions: Int array with (num_envs, 3) elements.
+          repeat: Number of physics steps to advance with the same action.
+                  (default 1)
+        Returns:
+          Same as step_wait().
+        """
+        self.step_async(actions, repeat)
+        return self.step_wait()
+
+    def observe(self):
+        """Render the agent views without advancing the environments.
+        Returns:
+          Dictionary which contains the result of the rendering.
+            "screen": numpy nd_array of (num_envs, width, height, channels) (uint8)
+                      ((num_envs, frame_stack, width, height, channels) with
+                      frame_stack)
+                      (screen[i] has the same layout as Environment.step())
+                      The view of the shared memory, which is overwritten by the
+                      next step.
+        """
+        self._send_command(COMMAND_OBSERVE)
+        self._wait()
+        return {
+            "screen": self.arrays["screen"],
+        }
+
+    def close(self):
+        """ Terminate the worker processes and release the shared memory. """
+        if self.arrays is not None:
+            self.arrays["command"][:] = COMMAND_TERMINATE
+            for step_event in self.step_events:
+                step_event.set()
+        for proc in self.procs:
+            if self.arrays is not None:
+                proc.join(timeout=5.0)
+            if proc.is_alive():
+                # Failed in setup, or not responding.
+                proc.terminate()
+                proc.join()
+        for conn in self.conns:
+            conn.close()
+        self.procs = []
+        self.conns = []
+        self.step_events = []
+        self.done_events = []
+
+        self.arrays = None
+        if self.shm is not None:
+            try:
+                self.shm.close()
+            except BufferError:
+                # Returned screens still refer to the memory.
+                pass
+            self.shm.unlink()
+            self.shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
@@ -0,0 +1,105 @@
+#include "BatchEnvironment.h"
+#include <string.h>
+
+#include "Environment.h"
+#include "EnvironmentObject.h"
+#include "Action.h"
+
+
+/**
+ * <!--  init():  -->
+ */
+bool BatchEnvironment::init(int environmentSize, GLBackend glBackend) {
+    // Linux environment requres GLContext with at least width=1, height=1 size pbuffer.
+    bool ret = glContext.init(1, 1, glBackend);
+    if( !ret ) {
+        return false;
+    }
+
+    for(int i=0; i<environmentSize; ++i) {
+        Environment* environment = new Environment();
+        environment->initShared(&meshManager, &textureManager, &shaderManager);
+        environments.push_back(environment);
+    }
+    return true;
+}
+
+/**
+ * <!--  release():  -->
+ */
+void BatchEnvironment::release() {
+    // Release environments first, because their objects refer to the shared managers.
+    for(auto itr=environments.begin(); itr!=environments.end(); ++itr) {
+        Environment* environment = *itr;
+        environment->release();
+        delete environment;
+    }
+    environments.clear();
+
+    meshManager.release();
+    textureManager.release();
+    shaderManager.release();
+    glContext.release();
+}
+
+/**
+ * <!--  getEnvironment():  -->
+ */
+Environment* BatchEnvironment::getEnvironment(int index) {
+    if( index < 0 || index >= (int)environments.size() ) {
+        return nullptr;
+    }
+    return environments[index];
+}
+
+/**
+ * <!--  step():  -->
+ *
+ * Control the agent of each environment with the corresponding action, advance all the
+ * environments repeat times and render the agent views into screenBuffer one after another.
+ * Rendering is skipped when screenBuffer is null.
+ */
+void BatchEnvironment::step(int agentId, int cameraId, const Action* actions,
+                            vector<CollisionResult>& collisionResults,
+                            void* screenBuffer,
+                            int repeat) {
+    int environmentSize = (int)environments.size();
+    collisionResults.resize(environmentSize);
+
+    for(int i=0; i<environmentSize; ++i) {
+        Environment* environment = environments[i];
+        environment->control(agentId, actions[i]);
+        environment->step(collisionResults[i], repeat);
+    }
+
+    if( screenBuffer != nullptr ) {
+        render(agentId, cameraId, screenBuffer);
+    }
+}
+
+/**
+ * <!--  render():  -->
+ *
+ * Render the agent views of all the environments into screenBuffer one after another.
+ */
+void BatchEnvironment::render(int agentId, int cameraId, void* screenBuffer) {
+    set<int> ignoreIds;
+    ignoreIds.insert(agentId);
+
+    unsigned char* screen = (unsigned char*)screenBuffer;
+
+    int environmentSize = (int)environments.size();
+    for(int i=0; i<environmentSize; ++i) {
+        Environment* environment = environments[i];
+        int frameBufferSize = environment->getFrameBufferSize(cameraId);
+
+        EnvironmentObjectInfo info;
+        if( environment->getObjectInfo(agentId, info) ) {
+            // Read pixels directly into the screen slot.
+            environment->render(cameraId, info.pos, info.rot, ignoreIds, screen);
+        } else {
+            memset(screen, 0, frameBufferSize);
+        }
+        screen += frameBufferSize;
+    }
+}
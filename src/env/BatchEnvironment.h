@@ -0,0 +1,50 @@
+// -*- C++ -*-
+#ifndef BATCHENVIRONMENT_HEADER
+#define BATCHENVIRONMENT_HEADER
+
+#include <vector>
+using namespace std;
+
+#include "MeshManager.h"
+#include "TextureManager.h"
+#include "ShaderManager.h"
+#include "GLContext.h"
+
+class Environment;
+class CollisionResult;
+class Action;
+
+
+class BatchEnvironment {
+private:
+    // Managers and GL context shared by all the environments.
+    MeshManager meshManager;
+    TextureManager textureManager;
+    ShaderManager shaderManager;
+    GLContext glContext;
+
+    vector<Environment*> environments;
+
+public:
+    BatchEnvironment() {
+    }
+
+    ~BatchEnvironment() {
+    }
+
+    bool init(int environmentSize, GLBackend glBackend=GL_BACKEND_AUTO);
+    void release();
+
+    int getEnvironmentSize() const {
+        return (int)environments.size();
+    }
+    Environment* getEnvironment(int index);
+
+    void step(int agentId, int cameraId, const Action* actions,
+              vector<CollisionResult>& collisionResults,
+              void* screenBuffer,
+              int repeat=1);
+    void render(int agentId, int cameraId, void* screenBuffer);
+};
+
+#endif
@@ -0,0 +1,96 @@
+#include "BroadPhase.h"
+#include <vector>
+#include <algorithm>
+using namespace std;
+
+
+void BroadPhase::destroyProxy(btBroadphaseProxy* proxy, btDispatcher* dispatcher) {
+    btAxisSweep3::destroyProxy(proxy, dispatcher);
+    freedHandleSize += 1;
+}
+
+void BroadPhase::resetPool(btDispatcher* dispatcher) {
+    btAxisSweep3::resetPool(dispatcher);
+    if( m_numHandles == 0 ) {
+        // The free list is initialized in the ascending order.
+        freedHandleSize = 0;
+    }
+}
+
+/**
+ * Relink the free handles in the ascending order, as in the initial pool.
+ * Only the handles freed since the last sort are sorted and merged into the
+ * rest of the list, which is still in the ascending order.
+ */
+void BroadPhase::sortFreeHandles() {
+    if( freedHandleSize == 0 ) {
+        return;
+    }
+
+    vector<unsigned short int> topHandles;
+    unsigned short int rest = m_firstFreeHandle;
+    for(int i=0; i<freedHandleSize && rest!=0; ++i) {
+        topHandles.push_back(rest);
+        rest = getHandle(rest)->GetNextFree();
+    }
+    sort(topHandles.begin(), topHandles.end());
+    freedHandleSize = 0;
+    if( topHandles.empty() ) {
+        // No free handle
+        return;
+    }
+
+    unsigned short int last = 0;
+    auto append = [&](unsigned short int handle) {
+        if( last == 0 ) {
+            m_firstFreeHandle = handle;
+        } else {
+            getHandle(last)->SetNextFree(handle);
+        }
+        last = handle;
+    };
+
+    unsigned int index = 0;
+    while( index < topHandles.size() ) {
+        if( rest != 0 && rest < topHandles[index] ) {
+            unsigned short int next = getHandle(rest)->GetNextFree();
+            append(rest);
+            rest = next;
+        } else {
+            append(topHandles[index]);
+            index += 1;
+        }
+    }
+    getHandle(last)->SetNextFree(rest);
+}
+
+static bool compareEdge(const btAxisSweep3::Edge& edge0,
+                        const btAxisSweep3::Edge& edge1) {
+    if( edge0.m_pos != edge1.m_pos ) {
+        return edge0.m_pos < edge1.m_pos;
+    }
+    return edge0.m_handle < edge1.m_handle;
+}
+
+/**
+ * Sort the edges of each axis in the position and handle order. Min and max
+ * edges never share a position, so the overlapping pairs are not changed, but
+ * the order of the pairs found by the later updates depends on the order of the
+ * edges with the same position.
+ */
+void BroadPhase::sortEdges() {
+    int size = m_numHandles * 2;
+    for(int axis=0; axis<3; ++axis) {
+        // Skip the sentinel edges at both ends.
+        Edge* edges = m_pEdges[axis] + 1;
+        sort(edges, edges + size, compareEdge);
+        for(int i=0; i<size; ++i) {
+            Handle* handle = getHandle(edges[i].m_handle);
+            if( edges[i].IsMax() ) {
+                handle->m_maxEdges[axis] = i + 1;
+            } else {
+                handle->m_minEdges[axis] = i + 1;
+            }
+        }
+    }
+}
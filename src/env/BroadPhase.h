@@ -0,0 +1,29 @@
+// -*- C++ -*-
+#ifndef BROADPHASE_HEADER
+#define BROADPHASE_HEADER
+
+#include "btBulletDynamicsCommon.h"
+
+
+// Sweep and prune broadphase which can put its free handle list and the edges
+// with the same position in the canonical order regardless of the history.
+class BroadPhase : public btAxisSweep3 {
+private:
+    // Number of the handles freed since the free list was sorted. Freed handles are
+    // pushed on the top of the list, so the list is sorted except the top ones.
+    int freedHandleSize;
+
+public:
+    BroadPhase(const btVector3& worldAabbMin, const btVector3& worldAabbMax)
+        :
+        btAxisSweep3(worldAabbMin, worldAabbMax),
+        freedHandleSize(0) {
+    }
+
+    void destroyProxy(btBroadphaseProxy* proxy, btDispatcher* dispatcher) override;
+    void resetPool(btDispatcher* dispatcher) override;
+    void sortFreeHandles();
+    void sortEdges();
+};
+
+#endif
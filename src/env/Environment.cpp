@@ -1,6 +1,9 @@
 #include "Environment.h"
 #include <stdio.h>
+#include <string.h>
 #include <functional>
+#include <limits>
+#include <algorithm>
 
 #include "DrawComponent.h"
 #include "Mesh.h"
@@ -16,7 +19,174 @@
 #include "CollisionMeshData.h"
 
 
-bool Environment::init() {
+// FNV-1a hash used to detect changes of the shadow casters and to compare states
+static const uint64_t FNV_OFFSET_BASIS = 14695981039346656037ULL;
+static const uint64_t FNV_PRIME = 1099511628211ULL;
+
+static uint64_t hashBytes(uint64_t hash, const void* data, int size) {
+    const unsigned char* bytes = (const unsigned char*)data;
+    for(int i=0; i<size; ++i) {
+        hash ^= bytes[i];
+        hash *= FNV_PRIME;
+    }
+    return hash;
+}
+
+static bool compareProxyId(const btCollisionObject* obj0, const btCollisionObject* obj1) {
+    return obj0->getBroadphaseHandle()->m_uniqueId <
+        obj1->getBroadphaseHandle()->m_uniqueId;
+}
+
+template<class T>
+static bool isSortedByProxyId(const btAlignedObjectArray<T*>& objects) {
+    for(int i=1; i<objects.size(); ++i) {
+        if( compareProxyId(objects[i], objects[i-1]) ) {
+            return false;
+        }
+    }
+    return true;
+}
+
+/**
+ * Sort the collision objects and the non static rigid bodies in the order of
+ * their broadphase proxy ids, which is the order to solve the constraints.
+ */
+void DynamicsWorld::sortCollisionObjects() {
+    m_collisionObjects.quickSort(compareProxyId);
+    m_nonStaticRigidBodies.resize(0);
+    for(int i=0; i<m_collisionObjects.size(); ++i) {
+        btCollisionObject* obj = m_collisionObjects[i];
+        obj->setWorldArrayIndex(i);
+        btRigidBody* body = btRigidBody::upcast(obj);
+        if( body != nullptr && !body->isStaticObject() ) {
+            m_nonStaticRigidBodies.push_back(body);
+        }
+    }
+}
+
+static bool compareOverlappingPair(const btBroadphasePair& pair0,
+                                   const btBroadphasePair& pair1) {
+    if( pair0.m_pProxy0->m_uniqueId != pair1.m_pProxy0->m_uniqueId ) {
+        return pair0.m_pProxy0->m_uniqueId < pair1.m_pProxy0->m_uniqueId;
+    }
+    return pair0.m_pProxy1->m_uniqueId < pair1.m_pProxy1->m_uniqueId;
+}
+
+static bool isSortedOverlappingPairs(const btBroadphasePairArray& pairs) {
+    for(int i=1; i<pairs.size(); ++i) {
+        if( compareOverlappingPair(pairs[i], pairs[i-1]) ) {
+            return false;
+        }
+    }
+    return true;
+}
+
+static std::pair<int, int> getManifoldKey(const btPersistentManifold* manifold) {
+    int id0 = manifold->getBody0()->getBroadphaseHandle()->m_uniqueId;
+    int id1 = manifold->getBody1()->getBroadphaseHandle()->m_uniqueId;
+    return std::make_pair(std::min(id0, id1), std::max(id0, id1));
+}
+
+static bool compareManifold(const btPersistentManifold* manifold0,
+                            const btPersistentManifold* manifold1) {
+    return getManifoldKey(manifold0) < getManifoldKey(manifold1);
+}
+
+/**
+ * Sort the overlapping pairs in the order of the proxy ids. The contact manifolds
+ * of the pairs are released when clearContacts is true, and kept otherwise.
+ */
+void DynamicsWorld::sortOverlappingPairs(bool clearContacts) {
+    btOverlappingPairCache* pairCache = m_broadphasePairCache->getOverlappingPairCache();
+    if( !clearContacts && isSortedOverlappingPairs(pairCache->getOverlappingPairArray()) ) {
+        return;
+    }
+
+    btBroadphasePairArray pairs = pairCache->getOverlappingPairArray();
+    pairs.quickSort(compareOverlappingPair);
+    // Removing the pairs with the dispatcher also releases their contact manifolds.
+    btDispatcher* pairDispatcher = clearContacts ? m_dispatcher1 : nullptr;
+    for(int i=0; i<pairs.size(); ++i) {
+        pairCache->removeOverlappingPair(pairs[i].m_pProxy0, pairs[i].m_pProxy1,
+                                         pairDispatcher);
+    }
+    for(int i=0; i<pairs.size(); ++i) {
+        btBroadphasePair* pair = pairCache->addOverlappingPair(pairs[i].m_pProxy0,
+                                                               pairs[i].m_pProxy1);
+        if( clearContacts ) {
+            continue;
+        }
+        if( pair != nullptr ) {
+            // Keep the collision algorithm and its contact manifold.
+            pair->m_algorithm = pairs[i].m_algorithm;
+            pair->m_internalInfo1 = pairs[i].m_internalInfo1;
+        } else if( pairs[i].m_algorithm != nullptr ) {
+            // Filtered out
+            pairs[i].m_algorithm->~btCollisionAlgorithm();
+            m_dispatcher1->freeCollisionAlgorithm(pairs[i].m_algorithm);
+        }
+    }
+}
+
+/**
+ * Sort the contact manifolds in the order of the proxy ids of their bodies, which
+ * is the order to solve the contact constraints.
+ */
+void DynamicsWorld::sortManifolds() {
+    int numManifolds = m_dispatcher1->getNumManifolds();
+    if( numManifolds == 0 ) {
+        return;
+    }
+    btPersistentManifold** manifolds = m_dispatcher1->getInternalManifoldPointer();
+    if( std::is_sorted(manifolds, manifolds + numManifolds, compareManifold) ) {
+        return;
+    }
+    // Manifolds of the same pair (e.g. of the compound shapes) keep their order.
+    std::stable_sort(manifolds, manifolds + numManifolds, compareManifold);
+    for(int i=0; i<numManifolds; ++i) {
+        manifolds[i]->m_index1a = i;
+    }
+}
+
+/**
+ * Enable or disable the deterministic mode. In the deterministic mode, the
+ * constraints are solved in the order which depends only on the proxy ids of the
+ * bodies, so that the same steps from the same state give the same result
+ * regardless of the history of the world.
+ */
+void DynamicsWorld::setDeterministic(bool deterministic_) {
+    deterministic = deterministic_;
+    if( deterministic ) {
+        getSolverInfo().m_solverMode &= ~SOLVER_RANDMIZE_ORDER;
+    }
+}
+
+void DynamicsWorld::performDiscreteCollisionDetection() {
+    if( !deterministic ) {
+        btDiscreteDynamicsWorld::performDiscreteCollisionDetection();
+        return;
+    }
+
+    m_constraintSolver->reset();
+    // Objects are removed by swapping with the last one.
+    if( !isSortedByProxyId(m_collisionObjects) ||
+        !isSortedByProxyId(m_nonStaticRigidBodies) ) {
+        sortCollisionObjects();
+    }
+
+    updateAabbs();
+    computeOverlappingPairs();
+    // The pairs are dispatched in this order, and new manifolds are appended.
+    sortOverlappingPairs(false);
+    if( m_dispatcher1 != nullptr ) {
+        m_dispatcher1->dispatchAllCollisionPairs(
+            m_broadphasePairCache->getOverlappingPairCache(),
+            getDispatchInfo(), m_dispatcher1);
+        sortManifolds();
+    }
+}
+
+void Environment::initWorld() {
     // Setup the basic world
     configuration = new btDefaultCollisionConfiguration();
 
@@ -24,30 +194,62 @@ bool Environment::init() {
 
     btVector3 worldAabbMin(-10000,-10000,-10000);
     btVector3 worldAabbMax( 10000, 10000, 10000);
-    broadPhase = new btAxisSweep3(worldAabbMin, worldAabbMax);
+    broadPhase = new BroadPhase(worldAabbMin, worldAabbMax);
 
     solver = new btSequentialImpulseConstraintSolver;
 
-    world = new btDiscreteDynamicsWorld(dispatcher,
-                                        broadPhase,
-                                        solver,
-                                        configuration);
+    world = new DynamicsWorld(dispatcher,
+                              broadPhase,
+                              solver,
+                              configuration);
 
     nextObjId = 0;
 
     world->setGravity(btVector3(0, -10, 0));
+}
+
+bool Environment::init(GLBackend glBackend) {
+    initWorld();
+
+    meshManager = new MeshManager();
+    textureManager = new TextureManager();
+    shaderManager = new ShaderManager();
+    glContext = new GLContext();
+    sharingResources = false;
 
     // Linux environment requres GLContext with at least width=1, height=1 size pbuffer.
-    bool ret = glContext.init(1, 1);
+    bool ret = glContext->init(1, 1, glBackend);
     return ret;
 }
 
+/**
+ * Initialize environment with managers shared with other environments.
+ * GL context should be already created and current by the owner of the managers.
+ */
+bool Environment::initShared(MeshManager* meshManager_,
+                             TextureManager* textureManager_,
+                             ShaderManager* shaderManager_) {
+    initWorld();
+
+    meshManager = meshManager_;
+    textureManager = textureManager_;
+    shaderManager = shaderManager_;
+    glContext = nullptr;
+    sharingResources = true;
+    return true;
+}
+
 int Environment::addCameraView(int width, int height, const Vector3f& bgColor,
                                float nearClip, float farClip, float focalLength,
-                               int shadowBufferWidth) {
+                               int shadowBufferWidth, bool shadow,
+                               RenderTarget::DepthType depthType,
+                               bool segmentation,
+                               RenderTarget::OutputFormat outputFormat,
+                               int supersampling) {
     CameraView* cameraView = new CameraView();
     bool ret = cameraView->init(width, height, bgColor, nearClip, farClip, focalLength,
-                                shadowBufferWidth);
+                                shadowBufferWidth, shadow, depthType, segmentation,
+                                outputFormat, supersampling);
     if( !ret ) {
         delete cameraView;
         return -1;
@@ -66,11 +268,11 @@ int Environment::addAgent(float radius,
     int objectId = nextObjId;
     nextObjId += 1;
 
-    Texture* texture = textureManager.getColorTexture(color.x, color.y, color.z);
-    Shader* shader = shaderManager.getDiffuseShader();
-    Shader* shadowDepthShader = shaderManager.getShadowDepthShader();
+    Texture* texture = textureManager->getColorTexture(color.x, color.y, color.z);
+    Shader* shader = shaderManager->getDiffuseShader();
+    Shader* shadowDepthShader = shaderManager->getShadowDepthShader();
     Material* material = new Material(texture, shader, shadowDepthShader);
-    Mesh* mesh = meshManager.getSphereMesh(material);
+    Mesh* mesh = meshManager->getSphereMesh(material);
     
     btCollisionShape* shape = collisionShapeManager.getSphereShape(radius);
 
@@ -94,10 +296,39 @@ void Environment::release() {
         delete object;
     }
     objectMap.clear();
-    
-    meshManager.release();
-    textureManager.release();
-    shaderManager.release();
+
+    for(auto itr=detachedObjectMap.begin(); itr!=detachedObjectMap.end(); ++itr) {
+        delete itr->second;
+    }
+    detachedObjectMap.clear();
+
+    for(auto itr=snapshots.begin(); itr!=snapshots.end(); ++itr) {
+        delete itr->second;
+    }
+    snapshots.clear();
+
+    if( staticBatch != nullptr ) {
+        delete staticBatch;
+        staticBatch = nullptr;
+    }
+
+    if( !sharingResources ) {
+        if( meshManager != nullptr ) {
+            meshManager->release();
+            delete meshManager;
+        }
+        if( textureManager != nullptr ) {
+            textureManager->release();
+            delete textureManager;
+        }
+        if( shaderManager != nullptr ) {
+            shaderManager->release();
+            delete shaderManager;
+        }
+    }
+    meshManager = nullptr;
+    textureManager = nullptr;
+    shaderManager = nullptr;
 
     delete world;
     delete solver;
@@ -111,7 +342,14 @@ void Environment::release() {
         delete cameraView;
     }
     cameraViews.clear();
-    glContext.release();
+
+    drawBatchList.release();
+
+    if( glContext != nullptr ) {
+        glContext->release();
+        delete glContext;
+        glContext = nullptr;
+    }
     
     nextObjId = 0;
 }
@@ -170,12 +408,22 @@ void Environment::checkCollision(CollisionResult& collisionResult) {
 
 void Environment::prepareShadow() {
     // Calculate bouding box
+    // (World bounding box of each object is also used for culling in drawObjects().)
     BoundingBox stageBoundingBox;
+    shadowCasterHash = FNV_OFFSET_BASIS;
+    
     for(auto itr=objectMap.begin(); itr!=objectMap.end(); ++itr) {
         EnvironmentObject* object = itr->second;
-        BoundingBox boundingBox;
-        if( object->calcBoundingBox(boundingBox) ) {
-            stageBoundingBox.merge(boundingBox);
+        if( object->updateBoundingBox() ) {
+            stageBoundingBox.merge(object->getBoundingBox());
+
+            // Shadow depth is re-rendered when any object is added, removed or moved.
+            int objectId = object->getObjectId();
+            Matrix4f mat;
+            object->getMat(mat);
+            shadowCasterHash = hashBytes(shadowCasterHash, &objectId, sizeof(int));
+            shadowCasterHash = hashBytes(shadowCasterHash, mat.getPointer(),
+                                         sizeof(float) * 16);
         }
     }
 
@@ -194,6 +442,7 @@ void Environment::control(int id, const Action& action) {
     if( envObj != nullptr && envObj->isAgent() ) {
         AgentObject* agentObj = (AgentObject*)envObj;
         agentObj->control(action);
+        controlledActions[id] = action;
     }
 }
 
@@ -210,49 +459,79 @@ void Environment::applyImpulse(int id, const Vector3f& impulse) {
     }
 }
 
-void Environment::step(CollisionResult& collisionResult) {
+/**
+ * <!--  step():  -->
+ *
+ * Advance the simulation repeat times. Actions applied with control() are re-applied
+ * before each sub-step after the first one, and collisions are accumulated over all
+ * the sub-steps.
+ */
+void Environment::step(CollisionResult& collisionResult, int repeat) {
     if(!world) {
         return;
     }
-    
-    const float deltaTime = 1.0f / 60.0f;
-    
-    world->stepSimulation(deltaTime);
 
-    // Collision check
-    checkCollision(collisionResult);
+    for(int i=0; i<repeat; ++i) {
+        if( i > 0 ) {
+            // Repeat the action
+            for(auto itr=controlledActions.begin(); itr!=controlledActions.end(); ++itr) {
+                EnvironmentObject* envObj = findObject(itr->first);
+                if( envObj != nullptr && envObj->isAgent() ) {
+                    ((AgentObject*)envObj)->control(itr->second);
+                }
+            }
+        }
+        
+        world->stepSimulation(timeStep, maxSubSteps, fixedTimeStep);
 
+        // Collision check
+        checkCollision(collisionResult);
+    }
+    
+    controlledActions.clear();
+}
+
+/**
+ * <!--  prepareDiffuseShader():  -->
+ *
+ * Prepare the diffuse shader with or without shadow used in the camera view.
+ */
+void Environment::prepareDiffuseShader(bool useShadow) {
     // Set stage bounding box to rendering context. (currently not used)
     // (LSPSMにbounding boxを設定する予定だが未使用)
+    // This is done at rendering instead of step() so that step() without rendering
+    // only advances the physics.
     prepareShadow();
-}
 
-void Environment::render(int cameraId,
-                         const Vector3f& pos,
-                         const Quat4f& rot,
-                         const set<int> ignoreIds) {
+    renderingStats.reset();
 
     // Set light direction, ambient color and shadow color rate to the shader
     // TODO: 本来はrender()毎ではなく、step()時に1回だけで良いはず.
-    Shader* shader = shaderManager.getDiffuseShader();
+    renderingContext.setShadowEnabled(useShadow);
+    
+    Shader* shader = shaderManager->getDiffuseShader(useShadow);
     shader->use();
     shader->prepare(renderingContext);
 
+    Shader* instancedShader = shaderManager->getInstancedShader(shader);
+    if( instancedShader != nullptr ) {
+        instancedShader->use();
+        instancedShader->prepare(renderingContext);
+    }
+}
+
+/**
+ * <!--  setCameraPose():  -->
+ */
+void Environment::setCameraPose(CameraView* cameraView,
+                                const Vector3f& pos,
+                                const Quat4f& rot) {
     // Matの計算
     Matrix4f mat;
     mat.set(rot);
     Vector4f pos_(pos.x, pos.y, pos.z, 1.0f);
     mat.setColumn(3, pos_);
     
-    // Start shadow rendering path
-    // Make depth frame buffer as current
-    if( cameraId < 0 || cameraId >= (int)cameraViews.size() ) {
-        // TODO: レンダリング失敗の時の対応
-        printf("Invaid camera id: %d\n", cameraId);
-        return;
-    }
-
-    CameraView* cameraView = cameraViews[cameraId];
     cameraView->setCameraMat(mat);
 
     // Set camera mat to rendering context and and calculate shadow matrix
@@ -260,75 +539,274 @@ void Environment::render(int cameraId,
     renderingContext.setCamera(cameraView->getCameraMat(),
                                cameraView->getCameraInvMat(),
                                cameraView->getCameraProjectionMat());
+}
 
-    cameraView->prepareShadowDepthRendering();
-    renderingContext.setPath(RenderingContext::SHADOW);
+/**
+ * <!--  drawObjects():  -->
+ */
+void Environment::drawObjects(RenderingContext::Path path, const set<int>& ignoreIds) {
+    renderingContext.setPath(path);
+    drawBatchList.clear();
 
-    // Draw objects
+    // Collect objects to draw
     for(auto itr=objectMap.begin(); itr!=objectMap.end(); ++itr) {
         EnvironmentObject* object = itr->second;
         
-        if( ignoreIds.find(object->getObjectId()) != ignoreIds.end() ) {
+        if( !object->isVisible() || object->isBaked() ||
+            ignoreIds.find(object->getObjectId()) != ignoreIds.end() ) {
             // Skip drawing
             continue;
         }
+
+        // Cull with the camera frustum or the light frustum
+        bool visible = renderingContext.isVisible(object->getBoundingBox());
+        renderingStats.countObject(path, visible);
+        if( !visible ) {
+            continue;
+        }
         
-        // Draw with shadow depth shader
-        object->draw(renderingContext);
+        object->addToBatch(drawBatchList, renderingContext);
+    }
+
+    // Static objects merged with bakeStatic() are counted as one object
+    if( staticBatch != nullptr ) {
+        bool visible = renderingContext.isVisible(staticBatch->getBoundingBox());
+        renderingStats.countObject(path, visible);
+        if( visible ) {
+            staticBatch->addToBatch(drawBatchList, renderingContext);
+        }
+    }
+
+    // Draw with shadow depth shader or normal shader. Objects sharing the same mesh
+    // and texture are drawn with one instanced draw call.
+    int drawCallSize = drawBatchList.draw(renderingContext, *shaderManager);
+    renderingStats.countDrawCalls(path, drawCallSize);
+    renderingStats.stateChangeSize += renderingContext.getStateChangeSize();
+}
+
+/**
+ * <!--  drawShadowDepth():  -->
+ *
+ * Draw shadow depth of the camera view. The depth drawn in the previous rendering is
+ * reused when the light matrix and the shadow casters are unchanged. (The LSPSM light
+ * matrix depends on the camera pose, so the camera must be also at the same pose.)
+ */
+void Environment::drawShadowDepth(CameraView* cameraView, const set<int>& ignoreIds) {
+    uint64_t hash = shadowCasterHash;
+    for(auto itr=ignoreIds.begin(); itr!=ignoreIds.end(); ++itr) {
+        int ignoreId = *itr;
+        hash = hashBytes(hash, &ignoreId, sizeof(int));
+    }
+
+    const Matrix4f& depthViewProjectionMat = renderingContext.getDepthViewProjectionMat();
+    if( cameraView->isShadowDepthCached(depthViewProjectionMat, hash) ) {
+        renderingStats.shadowCachedSize += 1;
+        return;
+    }
+
+    // Make depth frame buffer as current
+    cameraView->prepareShadowDepthRendering();
+    drawObjects(RenderingContext::SHADOW, ignoreIds);
+    cameraView->setShadowDepthCached(depthViewProjectionMat, hash);
+}
+
+/**
+ * <!--  drawView():  -->
+ *
+ * Draw shadow depth and color of the camera view. Returns nullptr when the camera id
+ * is invalid.
+ */
+CameraView* Environment::drawView(int cameraId,
+                                  const Vector3f& pos,
+                                  const Quat4f& rot,
+                                  const set<int>& ignoreIds) {
+    if( cameraId < 0 || cameraId >= (int)cameraViews.size() ) {
+        // TODO: レンダリング失敗の時の対応
+        printf("Invaid camera id: %d\n", cameraId);
+        return nullptr;
+    }
+
+    CameraView* cameraView = cameraViews[cameraId];
+    prepareDiffuseShader(cameraView->isShadowEnabled());
+    renderingContext.setSegmentationEnabled(cameraView->isSegmentationEnabled());
+    
+    setCameraPose(cameraView, pos, rot);
+
+    // Start shadow rendering path
+    if( cameraView->isShadowEnabled() ) {
+        drawShadowDepth(cameraView, ignoreIds);
     }
 
     // Start normal rendering path
     // Make normal frame buffer as current
     cameraView->prepareRendering();
+    drawObjects(RenderingContext::NORMAL, ignoreIds);
 
-    renderingContext.setPath(RenderingContext::NORMAL);
+    // Downsample and convert the pixels on GPU before the readback
+    if( cameraView->needsResolve() ) {
+        cameraView->resolve(shaderManager->getResolveShader());
+    }
+
+    return cameraView;
+}
+
+void Environment::render(int cameraId,
+                         const Vector3f& pos,
+                         const Quat4f& rot,
+                         const set<int> ignoreIds,
+                         void* screenBuffer,
+                         void* depthBuffer,
+                         int* objectIdBuffer) {
+    CameraView* cameraView = drawView(cameraId, pos, rot, ignoreIds);
+    if( cameraView == nullptr ) {
+        return;
+    }
+
+    // Read pixels to framebuffer (or directly to screenBuffer if specified)
+    // Depth and object ids are read from the same rendering.
+    cameraView->finishRendering(screenBuffer, depthBuffer, objectIdBuffer);
+}
+
+/**
+ * <!--  renderAgents():  -->
+ *
+ * Render the views of the agents into one atlas frame buffer and read all of them
+ * with one readback. screenBuffer must have getFrameBufferSize() * agentIds.size() bytes.
+ * Each agent is not drawn in its own view. The shadow depth is rendered for each view,
+ * because the LSPSM shadow matrix depends on the camera.
+ */
+bool Environment::renderAgents(int cameraId,
+                               const vector<int>& agentIds,
+                               void* screenBuffer) {
+    if( cameraId < 0 || cameraId >= (int)cameraViews.size() ) {
+        printf("Invaid camera id: %d\n", cameraId);
+        return false;
+    }
     
-    // Draw objects
-    for(auto itr=objectMap.begin(); itr!=objectMap.end(); ++itr) {
-        EnvironmentObject* object = itr->second;
-        
-        if( ignoreIds.find(object->getObjectId()) != ignoreIds.end() ) {
-            // Skip drawing
-            continue;
+    int atlasSize = (int)agentIds.size();
+    if( atlasSize == 0 ) {
+        return true;
+    }
+    
+    CameraView* cameraView = cameraViews[cameraId];
+    prepareDiffuseShader(cameraView->isShadowEnabled());
+    // Atlas frame buffer has only the color
+    renderingContext.setSegmentationEnabled(false);
+
+    for(int i=0; i<atlasSize; ++i) {
+        int agentId = agentIds[i];
+        set<int> ignoreIds;
+        ignoreIds.insert(agentId);
+
+        // Slot of the missing agent is filled with background color.
+        EnvironmentObjectInfo info;
+        bool found = getObjectInfo(agentId, info);
+
+        if( found ) {
+            setCameraPose(cameraView, info.pos, info.rot);
+            if( cameraView->isShadowEnabled() ) {
+                drawShadowDepth(cameraView, ignoreIds);
+            }
+        }
+
+        if( !cameraView->prepareAtlasRendering(i, atlasSize) ) {
+            return false;
+        }
+
+        if( found ) {
+            drawObjects(RenderingContext::NORMAL, ignoreIds);
         }
-        
-        // Draw with normal shader
-        object->draw(renderingContext);
     }
 
-    // Read pixels to framebuffer
-    cameraView->finishRendering();
+    // Read pixels of all the agent views at once
+    cameraView->finishAtlasRendering(screenBuffer);
+    return true;
 }
 
-int Environment::addBox(const char* texturePath,
-                        const Vector3f& color,
-                        const Vector3f& halfExtent,
-                        const Vector3f& pos,
-                        const Quat4f& rot,
-                        float mass,
-                        bool detectCollision,
-                        bool visible) {
+/**
+ * <!--  renderAsync():  -->
+ *
+ * Render the camera view and start reading pixels into a pixel buffer object without
+ * waiting. The pixels are obtained later with fetchAsync(). Returns false when the
+ * camera id is invalid or all the pixel buffers are waiting to be fetched.
+ */
+bool Environment::renderAsync(int cameraId,
+                              const Vector3f& pos,
+                              const Quat4f& rot,
+                              const set<int> ignoreIds) {
+    if( cameraId < 0 || cameraId >= (int)cameraViews.size() ) {
+        printf("Invaid camera id: %d\n", cameraId);
+        return false;
+    }
+    if( !cameraViews[cameraId]->canFinishRenderingAsync() ) {
+        return false;
+    }
+    
+    CameraView* cameraView = drawView(cameraId, pos, rot, ignoreIds);
+    return cameraView->finishRenderingAsync();
+}
+
+/**
+ * <!--  fetchAsync():  -->
+ *
+ * Copy pixels of the oldest renderAsync() call into screenBuffer (or into the frame
+ * buffer copy if screenBuffer is null). Returns false when there is no pending result.
+ */
+bool Environment::fetchAsync(int cameraId, void* screenBuffer) {
+    if( cameraId < 0 || cameraId >= (int)cameraViews.size() ) {
+        printf("Invaid camera id: %d\n", cameraId);
+        return false;
+    }
+
+    return cameraViews[cameraId]->fetchAsync(screenBuffer);
+}
+
+int Environment::getPendingAsyncSize(int cameraId) const {
+    if( cameraId < 0 || cameraId >= (int)cameraViews.size() ) {
+        printf("Invalid camera id: camera_id=%d\n", cameraId);
+        return -1;
+    }
+
+    return cameraViews[cameraId]->getPendingAsyncSize();
+}
+
+/**
+ * Get the texture of the box or the sphere. The color texture is used when the
+ * texture path is not specified.
+ */
+Texture* Environment::getObjectTexture(const char* texturePath, const Vector3f& color) {
+    Texture* texture = nullptr;
+    const string texturePathStr(texturePath);
+    if( texturePathStr != "" ) {
+        texture = textureManager->loadTexture(texturePath);
+        if( texture == nullptr ) {
+            texture = textureManager->getColorTexture(1.0f, 1.0f, 1.0f);
+        }
+    } else {
+        texture = textureManager->getColorTexture(color.x, color.y, color.z);
+    }
+    return texture;
+}
+
+/**
+ * Add the box object. If the texture is nullptr, the box is invisible.
+ */
+int Environment::addBoxObject(Texture* texture,
+                              const Vector3f& halfExtent,
+                              const Vector3f& pos,
+                              const Quat4f& rot,
+                              float mass,
+                              bool detectCollision) {
     btCollisionShape* shape = collisionShapeManager.getBoxShape(halfExtent.x,
                                                                 halfExtent.y,
                                                                 halfExtent.z);
     Mesh* mesh = nullptr;
     
-    if( visible ) {
-        Texture* texture = nullptr;
-        const string texturePathStr(texturePath);
-        if( texturePathStr != "" ) {
-            texture = textureManager.loadTexture(texturePath);
-            if( texture == nullptr ) {
-                texture = textureManager.getColorTexture(1.0f, 1.0f, 1.0f);
-            }
-        } else {
-            texture = textureManager.getColorTexture(color.x, color.y, color.z);
-        }
-        
-        Shader* shader = shaderManager.getDiffuseShader();
-        Shader* shadowDepthShader = shaderManager.getShadowDepthShader();
+    if( texture != nullptr ) {
+        Shader* shader = shaderManager->getDiffuseShader();
+        Shader* shadowDepthShader = shaderManager->getShadowDepthShader();
         Material* material = new Material(texture, shader, shadowDepthShader);
-        mesh = meshManager.getBoxMesh(material, halfExtent);
+        mesh = meshManager->getBoxMesh(material, halfExtent);
     }
     
     Vector3f scale(halfExtent.x, halfExtent.y, halfExtent.z);
@@ -337,33 +815,23 @@ int Environment::addBox(const char* texturePath,
                      detectCollision, mesh, scale);
 }
 
-int Environment::addSphere(const char* texturePath,
-                           const Vector3f& color,
-                           float radius,
-                           const Vector3f& pos,
-                           const Quat4f& rot,
-                           float mass,
-                           bool detectCollision,
-                           bool visible) {
+/**
+ * Add the sphere object. If the texture is nullptr, the sphere is invisible.
+ */
+int Environment::addSphereObject(Texture* texture,
+                                 float radius,
+                                 const Vector3f& pos,
+                                 const Quat4f& rot,
+                                 float mass,
+                                 bool detectCollision) {
     btCollisionShape* shape = collisionShapeManager.getSphereShape(radius);
     Mesh* mesh = nullptr;
     
-    if( visible ) {
-        Texture* texture = nullptr;
-        const string texturePathStr(texturePath);
-        if( texturePathStr != "" ) {
-            texture = textureManager.loadTexture(texturePath);
-            if( texture == nullptr ) {
-                texture = textureManager.getColorTexture(1.0f, 1.0f, 1.0f);
-            }
-        } else {
-            texture = textureManager.getColorTexture(color.x, color.y, color.z);
-        }
-        
-        Shader* shader = shaderManager.getDiffuseShader();
-        Shader* shadowDepthShader = shaderManager.getShadowDepthShader();
+    if( texture != nullptr ) {
+        Shader* shader = shaderManager->getDiffuseShader();
+        Shader* shadowDepthShader = shaderManager->getShadowDepthShader();
         Material* material = new Material(texture, shader, shadowDepthShader);
-        mesh = meshManager.getSphereMesh(material);
+        mesh = meshManager->getSphereMesh(material);
     }
     
     Vector3f scale(radius, radius, radius);
@@ -372,6 +840,112 @@ int Environment::addSphere(const char* texturePath,
                      detectCollision, mesh, scale);
 }
 
+int Environment::addBox(const char* texturePath,
+                        const Vector3f& color,
+                        const Vector3f& halfExtent,
+                        const Vector3f& pos,
+                        const Quat4f& rot,
+                        float mass,
+                        bool detectCollision,
+                        bool visible) {
+    Texture* texture = visible ? getObjectTexture(texturePath, color) : nullptr;
+    return addBoxObject(texture, halfExtent, pos, rot, mass, detectCollision);
+}
+
+int Environment::addSphere(const char* texturePath,
+                           const Vector3f& color,
+                           float radius,
+                           const Vector3f& pos,
+                           const Quat4f& rot,
+                           float mass,
+                           bool detectCollision,
+                           bool visible) {
+    Texture* texture = visible ? getObjectTexture(texturePath, color) : nullptr;
+    return addSphereObject(texture, radius, pos, rot, mass, detectCollision);
+}
+
+/**
+ * <!--  addBoxes():  -->
+ *
+ * Add boxes with (size,3) colors, half extents, positions and (size,4) rotations.
+ * The ids of the boxes are written into ids. When the texture path is specified,
+ * the texture is loaded once and shared among the boxes.
+ */
+void Environment::addBoxes(const char* texturePath,
+                           const float* colors,
+                           const float* halfExtents,
+                           const float* positions,
+                           const float* rots,
+                           int size,
+                           float mass,
+                           bool detectCollision,
+                           bool visible,
+                           int* ids) {
+    const bool hasTexturePath = string(texturePath) != "";
+    Texture* pathTexture = nullptr;
+    if( visible && hasTexturePath ) {
+        pathTexture = getObjectTexture(texturePath, Vector3f(1.0f, 1.0f, 1.0f));
+    }
+
+    for(int i=0; i<size; ++i) {
+        const float* color = colors + i*3;
+        const float* halfExtent = halfExtents + i*3;
+        const float* pos = positions + i*3;
+        const float* rot = rots + i*4;
+
+        Texture* texture = pathTexture;
+        if( visible && !hasTexturePath ) {
+            texture = textureManager->getColorTexture(color[0], color[1], color[2]);
+        }
+        ids[i] = addBoxObject(texture,
+                              Vector3f(halfExtent[0], halfExtent[1], halfExtent[2]),
+                              Vector3f(pos[0], pos[1], pos[2]),
+                              Quat4f(rot[0], rot[1], rot[2], rot[3]),
+                              mass,
+                              detectCollision);
+    }
+}
+
+/**
+ * <!--  addSpheres():  -->
+ *
+ * Add spheres with (size,3) colors, (size) radiuses, (size,3) positions and
+ * (size,4) rotations. The ids of the spheres are written into ids.
+ */
+void Environment::addSpheres(const char* texturePath,
+                             const float* colors,
+                             const float* radiuses,
+                             const float* positions,
+                             const float* rots,
+                             int size,
+                             float mass,
+                             bool detectCollision,
+                             bool visible,
+                             int* ids) {
+    const bool hasTexturePath = string(texturePath) != "";
+    Texture* pathTexture = nullptr;
+    if( visible && hasTexturePath ) {
+        pathTexture = getObjectTexture(texturePath, Vector3f(1.0f, 1.0f, 1.0f));
+    }
+
+    for(int i=0; i<size; ++i) {
+        const float* color = colors + i*3;
+        const float* pos = positions + i*3;
+        const float* rot = rots + i*4;
+
+        Texture* texture = pathTexture;
+        if( visible && !hasTexturePath ) {
+            texture = textureManager->getColorTexture(color[0], color[1], color[2]);
+        }
+        ids[i] = addSphereObject(texture,
+                                 radiuses[i],
+                                 Vector3f(pos[0], pos[1], pos[2]),
+                                 Quat4f(rot[0], rot[1], rot[2], rot[3]),
+                                 mass,
+                                 detectCollision);
+    }
+}
+
 int Environment::addModel(const char* path,
                           const Vector3f& color,
                           const Vector3f& scale,
@@ -388,21 +962,21 @@ int Environment::addModel(const char* path,
     // Load mesh from .obj data file
     if( color.x < 0 || color.y < 0 || color.z < 0 ) {
         // When replacing texture was not specified
-        mesh = meshManager.getModelMesh(path, textureManager, nullptr, shaderManager);
+        mesh = meshManager->getModelMesh(path, *textureManager, nullptr, *shaderManager);
     } else {
         // When replacing texture was specified
-        Texture* texture = textureManager.getColorTexture(color.x, color.y, color.z);
-        Shader* shader = shaderManager.getDiffuseShader();
-        Shader* shadowDepthShader = shaderManager.getShadowDepthShader();
+        Texture* texture = textureManager->getColorTexture(color.x, color.y, color.z);
+        Shader* shader = shaderManager->getDiffuseShader();
+        Shader* shadowDepthShader = shaderManager->getShadowDepthShader();
         Material* replacingMaterial = new Material(texture, shader, shadowDepthShader);
-        mesh = meshManager.getModelMesh(path, textureManager, replacingMaterial, shaderManager);
+        mesh = meshManager->getModelMesh(path, *textureManager, replacingMaterial, *shaderManager);
     }
     
     if( mesh == nullptr ) {
         return -1;
     }
 
-    const CollisionMeshData* collisionMeshData = meshManager.getCollisionMeshData(path);
+    const CollisionMeshData* collisionMeshData = meshManager->getCollisionMeshData(path);
     if( collisionMeshData == nullptr ) {
         return -1;
     }
@@ -492,7 +1066,16 @@ void Environment::removeObject(int id) {
     auto itr = objectMap.find(id);
     if( itr != objectMap.end() ) {
         EnvironmentObject* object = objectMap[id];
-        delete object;
+        if( object->isBaked() ) {
+            unbakeStatic();
+        }
+        if( isInSnapshots(id) ) {
+            // Keep the object to restore it with the snapshot.
+            object->detach();
+            detachedObjectMap[id] = object;
+        } else {
+            delete object;
+        }
         objectMap.erase(itr);
     }
 }
@@ -501,14 +1084,417 @@ void Environment::locateObject(int id, const Vector3f& pos, const Quat4f& rot) {
     auto itr = objectMap.find(id);
     if( itr != objectMap.end() ) {
         EnvironmentObject* object = objectMap[id];
+        if( object->isBaked() ) {
+            unbakeStatic();
+        }
         object->locate(pos, rot);
     }
 }
 
+void Environment::removeObjects(const vector<int>& ids) {
+    for(unsigned int i=0; i<ids.size(); ++i) {
+        removeObject(ids[i]);
+    }
+}
+
+/**
+ * Locate the objects with (N,3) positions and (N,4) rotations.
+ */
+void Environment::locateObjects(const vector<int>& ids,
+                                const float* positions, const float* rots) {
+    for(unsigned int i=0; i<ids.size(); ++i) {
+        const float* pos = positions + i*3;
+        const float* rot = rots + i*4;
+        locateObject(ids[i],
+                     Vector3f(pos[0], pos[1], pos[2]),
+                     Quat4f(rot[0], rot[1], rot[2], rot[3]));
+    }
+}
+
+bool Environment::isInSnapshots(int id) const {
+    for(auto itr=snapshots.begin(); itr!=snapshots.end(); ++itr) {
+        if( itr->second->contains(id) ) {
+            return true;
+        }
+    }
+    return false;
+}
+
+void Environment::deleteUnusedDetachedObjects() {
+    for(auto itr=detachedObjectMap.begin(); itr!=detachedObjectMap.end();) {
+        if( !isInSnapshots(itr->first) ) {
+            delete itr->second;
+            itr = detachedObjectMap.erase(itr);
+        } else {
+            ++itr;
+        }
+    }
+}
+
+/**
+ * Put the world in the canonical state for the current object set, where the
+ * simulation depends only on the object states and not on the history.
+ * The broadphase proxy ids follow the object id order, the bodies are sorted
+ * in that order, and the overlapping pairs are created again in the sorted
+ * order without the cached contact points.
+ */
+void Environment::canonicalizeWorld() {
+    bool canonical = true;
+    int proxyId = 1;
+    for(auto itr=objectMap.begin(); itr!=objectMap.end(); ++itr, ++proxyId) {
+        if( itr->second->getProxyId() != proxyId ) {
+            canonical = false;
+            break;
+        }
+    }
+
+    if( !canonical ) {
+        // Add all the bodies to the reset broadphase in the id order.
+        for(auto itr=objectMap.begin(); itr!=objectMap.end(); ++itr) {
+            itr->second->detach();
+        }
+        broadPhase->resetPool(dispatcher);
+        for(auto itr=objectMap.begin(); itr!=objectMap.end(); ++itr) {
+            itr->second->attach();
+        }
+    }
+    broadPhase->sortFreeHandles();
+    world->sortCollisionObjects();
+    solver->reset();
+
+    world->updateAabbs();
+    broadPhase->calculateOverlappingPairs(dispatcher);
+    broadPhase->sortEdges();
+
+    world->sortOverlappingPairs(true);
+}
+
+void Environment::fillSnapshot(EnvironmentSnapshot& snapshot) const {
+    snapshot.ids.reserve(objectMap.size());
+    snapshot.states.resize(objectMap.size());
+
+    int index = 0;
+    for(auto itr=objectMap.begin(); itr!=objectMap.end(); ++itr, ++index) {
+        snapshot.ids.push_back(itr->first);
+        itr->second->getState(snapshot.states[index]);
+    }
+    snapshot.nextObjId = nextObjId;
+    snapshot.localTime = world->getLocalTime();
+}
+
+/**
+ * <!--  saveState():  -->
+ *
+ * Save the object set and the states of the rigid bodies (transforms, velocities
+ * and head angles of the agents). Returns the snapshot id to restore with
+ * restoreState(). The world is canonicalized before saving, which clears the
+ * cached contact points.
+ */
+int Environment::saveState() {
+    canonicalizeWorld();
+
+    EnvironmentSnapshot* snapshot = new EnvironmentSnapshot();
+    fillSnapshot(*snapshot);
+
+    int snapshotId = nextSnapshotId;
+    nextSnapshotId += 1;
+    snapshots[snapshotId] = snapshot;
+    return snapshotId;
+}
+
+/**
+ * <!--  restoreState():  -->
+ *
+ * Restore the environment to the snapshot. Objects added after the snapshot are
+ * removed, and the objects removed after the snapshot are added again.
+ * The world is canonicalized as in saveState(), so that the simulation after
+ * the restore is reproducible.
+ */
+bool Environment::restoreState(int snapshotId) {
+    auto snapshotItr = snapshots.find(snapshotId);
+    if( snapshotItr == snapshots.end() ) {
+        printf("Invalid snapshot id: snapshot_id=%d\n", snapshotId);
+        return false;
+    }
+    const EnvironmentSnapshot* snapshot = snapshotItr->second;
+
+    // Remove the objects added after the snapshot
+    vector<int> addedIds;
+    for(auto itr=objectMap.begin(); itr!=objectMap.end(); ++itr) {
+        if( !snapshot->contains(itr->first) ) {
+            addedIds.push_back(itr->first);
+        }
+    }
+    for(unsigned int i=0; i<addedIds.size(); ++i) {
+        removeObject(addedIds[i]);
+    }
+
+    bool needsUnbake = false;
+    vector<EnvironmentObject*> detachedObjects;
+    for(unsigned int i=0; i<snapshot->ids.size(); ++i) {
+        int id = snapshot->ids[i];
+        const RigidBodyState& state = snapshot->states[i];
+
+        EnvironmentObject* object = findObject(id);
+        if( object == nullptr ) {
+            // Removed after the snapshot
+            auto detachedItr = detachedObjectMap.find(id);
+            if( detachedItr == detachedObjectMap.end() ) {
+                continue;
+            }
+            object = detachedItr->second;
+            detachedObjectMap.erase(detachedItr);
+            objectMap[id] = object;
+            detachedObjects.push_back(object);
+        } else if( object->isBaked() ) {
+            RigidBodyState currentState;
+            object->getState(currentState);
+            if( !(currentState.transform == state.transform) ) {
+                // Merged mesh is baked at the other pose.
+                needsUnbake = true;
+            }
+        }
+        object->setState(state);
+    }
+
+    // The removed objects get back their proxy ids, which are the smallest free
+    // ones, when they are added in the id order.
+    broadPhase->sortFreeHandles();
+    for(unsigned int i=0; i<detachedObjects.size(); ++i) {
+        detachedObjects[i]->attach();
+    }
+    canonicalizeWorld();
+
+    if( needsUnbake ) {
+        unbakeStatic();
+    }
+
+    // Object ids are not reused while the removed objects are kept.
+    nextObjId = snapshot->nextObjId;
+    if( !detachedObjectMap.empty() ) {
+        nextObjId = std::max(nextObjId, detachedObjectMap.rbegin()->first + 1);
+    }
+    world->setLocalTime(snapshot->localTime);
+    controlledActions.clear();
+    return true;
+}
+
+/**
+ * Release the snapshot and the removed objects kept only for the snapshot.
+ */
+void Environment::releaseState(int snapshotId) {
+    auto itr = snapshots.find(snapshotId);
+    if( itr == snapshots.end() ) {
+        return;
+    }
+    delete itr->second;
+    snapshots.erase(itr);
+    deleteUnusedDetachedObjects();
+}
+
+// Header of the serialized snapshot
+static const uint32_t SNAPSHOT_MAGIC   = 0x53534452; // "RDSS"
+static const uint32_t SNAPSHOT_VERSION = 1;
+static const int SNAPSHOT_HEADER_SIZE = 4 * 5;
+// id, basis(9), origin(3), linear velocity(3), angular velocity(3), rotY,
+// activation state and deactivation time
+static const int SNAPSHOT_OBJECT_SIZE = 4 * 22;
+
+template<typename T>
+static void writeValue(char*& p, T value) {
+    memcpy(p, &value, sizeof(T));
+    p += sizeof(T);
+}
+
+template<typename T>
+static T readValue(const char*& p) {
+    T value;
+    memcpy(&value, p, sizeof(T));
+    p += sizeof(T);
+    return value;
+}
+
+static void writeVector(char*& p, const btVector3& v) {
+    for(int i=0; i<3; ++i) {
+        writeValue<float>(p, v[i]);
+    }
+}
+
+static btVector3 readVector(const char*& p) {
+    float x = readValue<float>(p);
+    float y = readValue<float>(p);
+    float z = readValue<float>(p);
+    return btVector3(x, y, z);
+}
+
+/**
+ * Serialize the snapshot into the compact binary. Values are written in the
+ * native byte order (little endian on the supported platforms), and the
+ * transforms are written as the basis matrices without the conversion to
+ * quaternions, so that the restored states are exactly the same.
+ */
+void EnvironmentSnapshot::serialize(vector<char>& data) const {
+    data.resize(SNAPSHOT_HEADER_SIZE + SNAPSHOT_OBJECT_SIZE * ids.size());
+    char* p = data.data();
+    writeValue<uint32_t>(p, SNAPSHOT_MAGIC);
+    writeValue<uint32_t>(p, SNAPSHOT_VERSION);
+    writeValue<int32_t>(p, (int32_t)ids.size());
+    writeValue<int32_t>(p, nextObjId);
+    writeValue<float>(p, localTime);
+
+    for(unsigned int i=0; i<ids.size(); ++i) {
+        const RigidBodyState& state = states[i];
+        writeValue<int32_t>(p, ids[i]);
+        const btMatrix3x3& basis = state.transform.getBasis();
+        for(int j=0; j<3; ++j) {
+            writeVector(p, basis[j]);
+        }
+        writeVector(p, state.transform.getOrigin());
+        writeVector(p, state.linearVelocity);
+        writeVector(p, state.angularVelocity);
+        writeValue<float>(p, state.rotY);
+        writeValue<int32_t>(p, state.activationState);
+        writeValue<float>(p, state.deactivationTime);
+    }
+}
+
+/**
+ * Read the snapshot serialized with serialize(). Returns false if the data is
+ * broken.
+ */
+bool EnvironmentSnapshot::deserialize(const char* data, int size) {
+    if( size < SNAPSHOT_HEADER_SIZE ) {
+        return false;
+    }
+    const char* p = data;
+    uint32_t magic = readValue<uint32_t>(p);
+    uint32_t version = readValue<uint32_t>(p);
+    int objectSize = readValue<int32_t>(p);
+    if( magic != SNAPSHOT_MAGIC || version != SNAPSHOT_VERSION || objectSize < 0 ||
+        size != SNAPSHOT_HEADER_SIZE + SNAPSHOT_OBJECT_SIZE * objectSize ) {
+        return false;
+    }
+    nextObjId = readValue<int32_t>(p);
+    localTime = readValue<float>(p);
+
+    ids.resize(objectSize);
+    states.resize(objectSize);
+    for(int i=0; i<objectSize; ++i) {
+        RigidBodyState& state = states[i];
+        ids[i] = readValue<int32_t>(p);
+        btVector3 row0 = readVector(p);
+        btVector3 row1 = readVector(p);
+        btVector3 row2 = readVector(p);
+        state.transform.setBasis(btMatrix3x3(row0[0], row0[1], row0[2],
+                                             row1[0], row1[1], row1[2],
+                                             row2[0], row2[1], row2[2]));
+        state.transform.setOrigin(readVector(p));
+        state.linearVelocity = readVector(p);
+        state.angularVelocity = readVector(p);
+        state.rotY = readValue<float>(p);
+        state.activationState = readValue<int32_t>(p);
+        state.deactivationTime = readValue<float>(p);
+
+        if( i > 0 && ids[i] <= ids[i-1] ) {
+            // Ids have to be in ascending order.
+            return false;
+        }
+    }
+    return true;
+}
+
+/**
+ * <!--  serializeState():  -->
+ *
+ * Serialize the snapshot saved with saveState() into the binary data, which can
+ * be loaded with loadState() in the other environment built with the same stage.
+ */
+bool Environment::serializeState(int snapshotId, vector<char>& data) const {
+    auto itr = snapshots.find(snapshotId);
+    if( itr == snapshots.end() ) {
+        printf("Invalid snapshot id: snapshot_id=%d\n", snapshotId);
+        return false;
+    }
+    itr->second->serialize(data);
+    return true;
+}
+
+/**
+ * <!--  getStateHash():  -->
+ *
+ * Hash of the current object set and rigid body states, the same data as the
+ * serialized snapshot. Used to compare the simulations step by step.
+ */
+uint64_t Environment::getStateHash() const {
+    EnvironmentSnapshot snapshot;
+    fillSnapshot(snapshot);
+    vector<char> data;
+    snapshot.serialize(data);
+    return hashBytes(FNV_OFFSET_BASIS, data.data(), (int)data.size());
+}
+
+/**
+ * <!--  loadState():  -->
+ *
+ * Load the snapshot serialized with serializeState() as the new snapshot of this
+ * environment. All the objects in the snapshot have to exist in this environment
+ * (or be kept for the other snapshots). Returns the snapshot id to restore with
+ * restoreState(), or -1 if the data is invalid.
+ */
+int Environment::loadState(const char* data, int size) {
+    EnvironmentSnapshot* snapshot = new EnvironmentSnapshot();
+    if( !snapshot->deserialize(data, size) ) {
+        printf("Invalid snapshot data\n");
+        delete snapshot;
+        return -1;
+    }
+    for(unsigned int i=0; i<snapshot->ids.size(); ++i) {
+        int id = snapshot->ids[i];
+        if( objectMap.find(id) == objectMap.end() &&
+            detachedObjectMap.find(id) == detachedObjectMap.end() ) {
+            printf("Object in the snapshot not found: id=%d\n", id);
+            delete snapshot;
+            return -1;
+        }
+    }
+
+    int snapshotId = nextSnapshotId;
+    nextSnapshotId += 1;
+    snapshots[snapshotId] = snapshot;
+    return snapshotId;
+}
+
 void Environment::locateAgent(int id, const Vector3f& pos, float rotY) {
     locateObject(id, pos, Quat4f(0.0f, sin(rotY * 0.5f), 0.0f, cos(rotY * 0.5f)));
 }
 
+/**
+ * <!--  setPhysics():  -->
+ *
+ * Set time step parameters of the physics simulation. Each step advances timeStep
+ * seconds with at most maxSubSteps internal steps of fixedTimeStep. The remainder is
+ * accumulated to the next step. When maxSubSteps is 0, timeStep is simulated as it is
+ * with one variable internal step.
+ */
+void Environment::setPhysics(float timeStep_, int maxSubSteps_, float fixedTimeStep_) {
+    timeStep = timeStep_;
+    maxSubSteps = maxSubSteps_;
+    fixedTimeStep = fixedTimeStep_;
+}
+
+/**
+ * <!--  setDeterministic():  -->
+ *
+ * Enable or disable the deterministic mode of the physics simulation. The result
+ * of step() depends only on the current state and the actions, not on the order
+ * in which the objects and the contacts were added or removed before.
+ */
+void Environment::setDeterministic(bool deterministic) {
+    if( world ) {
+        world->setDeterministic(deterministic);
+    }
+}
+
 void Environment::setLight(const Vector3f& lightDir,
                            const Vector3f& lightColor,
                            const Vector3f& ambientColor,
@@ -530,6 +1516,46 @@ bool Environment::getObjectInfo(int id, EnvironmentObjectInfo& info) const {
     }
 }
 
+/**
+ * Write the states of the objects into (N,3) pos, (N,4) rot and (N,3) velocity
+ * arrays. Rows of the objects not found are filled with NaN.
+ * Returns the number of the objects found.
+ */
+int Environment::getObjectsInfo(const vector<int>& ids,
+                                float* pos, float* rot, float* velocity) const {
+    const float nan = std::numeric_limits<float>::quiet_NaN();
+    int foundSize = 0;
+    EnvironmentObjectInfo info;
+
+    for(unsigned int i=0; i<ids.size(); ++i) {
+        auto itr = objectMap.find(ids[i]);
+        if( itr != objectMap.end() ) {
+            itr->second->getInfo(info);
+            memcpy(pos + i*3, info.pos.getPointer(), sizeof(float) * 3);
+            memcpy(rot + i*4, info.rot.getPointer(), sizeof(float) * 4);
+            memcpy(velocity + i*3, info.velocity.getPointer(), sizeof(float) * 3);
+            foundSize++;
+        } else {
+            std::fill(pos + i*3, pos + i*3 + 3, nan);
+            std::fill(rot + i*4, rot + i*4 + 4, nan);
+            std::fill(velocity + i*3, velocity + i*3 + 3, nan);
+        }
+    }
+    return foundSize;
+}
+
+/**
+ * Get the ids of the objects moved by the physics (agents and objects with mass).
+ */
+void Environment::getDynamicObjectIds(vector<int>& ids) const {
+    ids.clear();
+    for(auto itr=objectMap.begin(); itr!=objectMap.end(); ++itr) {
+        if( !itr->second->isStatic() ) {
+            ids.push_back(itr->first);
+        }
+    }
+}
+
 void Environment::replaceObjectTextures(int id, const vector<string>& texturePathes) {
     auto itr = objectMap.find(id);
     if( itr == objectMap.end() ) {
@@ -538,14 +1564,17 @@ void Environment::replaceObjectTextures(int id, const vector<string>& texturePat
     }
 
     EnvironmentObject* object = objectMap[id];
+    if( object->isBaked() ) {
+        unbakeStatic();
+    }
     
     vector<Material*> materials;
 
     for(unsigned int i=0; i<texturePathes.size(); ++i) {
-        Texture* texture = textureManager.loadTexture(texturePathes[i].c_str());
+        Texture* texture = textureManager->loadTexture(texturePathes[i].c_str());
         if( texture != nullptr ) {
-            Shader* shader = shaderManager.getDiffuseShader();
-            Shader* shadowDepthShader = shaderManager.getShadowDepthShader();
+            Shader* shader = shaderManager->getDiffuseShader();
+            Shader* shadowDepthShader = shaderManager->getShadowDepthShader();
             Material* material = new Material(texture, shader, shadowDepthShader);
             materials.push_back(material);
         }
@@ -554,6 +1583,59 @@ void Environment::replaceObjectTextures(int id, const vector<string>& texturePat
     object->replaceMaterials(materials);
 }
 
+/**
+ * <!--  bakeStatic():  -->
+ *
+ * Merge the meshes of the visible static objects (zero mass stage objects) into
+ * pre-transformed mesh data for each material, so that the static stage is drawn with
+ * a few draw calls. Baked objects are drawn even if they are in the ignore ids. Moving,
+ * removing or replacing textures of a baked object discards the baked meshes, and the
+ * objects are drawn individually again until the next bakeStatic(). Returns the number
+ * of baked objects.
+ */
+int Environment::bakeStatic() {
+    unbakeStatic();
+
+    StaticBatch* batch = new StaticBatch();
+    vector<EnvironmentObject*> bakedObjects;
+    
+    for(auto itr=objectMap.begin(); itr!=objectMap.end(); ++itr) {
+        EnvironmentObject* object = itr->second;
+        if( object->isVisible() && !object->isAgent() && object->isStatic() ) {
+            object->addToStaticBatch(*batch);
+            bakedObjects.push_back(object);
+        }
+    }
+
+    if( bakedObjects.size() == 0 || !batch->build() ) {
+        delete batch;
+        return 0;
+    }
+
+    for(auto itr=bakedObjects.begin(); itr!=bakedObjects.end(); ++itr) {
+        (*itr)->setBaked(true);
+    }
+    staticBatch = batch;
+    return (int)bakedObjects.size();
+}
+
+/**
+ * <!--  unbakeStatic():  -->
+ *
+ * Discard the baked meshes and draw the static objects individually.
+ */
+void Environment::unbakeStatic() {
+    if( staticBatch == nullptr ) {
+        return;
+    }
+    
+    for(auto itr=objectMap.begin(); itr!=objectMap.end(); ++itr) {
+        itr->second->setBaked(false);
+    }
+    delete staticBatch;
+    staticBatch = nullptr;
+}
+
 const void* Environment::getFrameBuffer(int cameraId) const {
     if( cameraId < 0 || cameraId >= (int)cameraViews.size() ) {
         printf("Invalid camera id: camera_id=%d\n", cameraId);
@@ -593,3 +1675,33 @@ int Environment::getFrameBufferSize(int cameraId) const {
     const CameraView* cameraView = cameraViews[cameraId];
     return cameraView->getFrameBufferSize();
 }
+
+int Environment::getFrameBufferChannelSize(int cameraId) const {
+    if( cameraId < 0 || cameraId >= (int)cameraViews.size() ) {
+        printf("Invalid camera id: camera_id=%d\n", cameraId);
+        return -1;
+    }
+    
+    const CameraView* cameraView = cameraViews[cameraId];
+    return cameraView->getChannelSize();
+}
+
+RenderTarget::DepthType Environment::getDepthType(int cameraId) const {
+    if( cameraId < 0 || cameraId >= (int)cameraViews.size() ) {
+        printf("Invalid camera id: camera_id=%d\n", cameraId);
+        return RenderTarget::DEPTH_NONE;
+    }
+    
+    const CameraView* cameraView = cameraViews[cameraId];
+    return cameraView->getDepthType();
+}
+
+bool Environment::isSegmentationEnabled(int cameraId) const {
+    if( cameraId < 0 || cameraId >= (int)cameraViews.size() ) {
+        printf("Invalid camera id: camera_id=%d\n", cameraId);
+        return false;
+    }
+    
+    const CameraView* cameraView = cameraViews[cameraId];
+    return cameraView->isSegmentationEnabled();
+}
@@ -8,6 +8,8 @@
 #include <set>
 #include <vector>
 #include <string>
+#include <stdint.h>
+#include <algorithm>
 using namespace std;
 
 #include "MeshManager.h"
@@ -15,11 +17,15 @@ using namespace std;
 #include "ShaderManager.h"
 #include "RigidBodyComponent.h"
 #include "RenderingContext.h"
+#include "DrawBatch.h"
+#include "StaticBatch.h"
+#include "RenderTarget.h"
 #include "glinc.h"
 #include "GLContext.h"
 #include "CollisionShapeManager.h"
+#include "BroadPhase.h"
+#include "Action.h"
 
-class Action;
 class Matrix4f;
 class Vector3f;
 class Camera;
@@ -27,6 +33,7 @@ class EnvironmentObject;
 class EnvironmentObjectInfo;
 class AgentObject;
 class CameraView;
+class Texture;
 
 
 
@@ -64,27 +71,159 @@ public:
 };
 
 
+class RenderingStats {
+public:
+    int drawnObjectSize;        // Objects drawn in normal rendering path
+    int culledObjectSize;       // Objects culled in normal rendering path
+    int drawnShadowObjectSize;  // Objects drawn in shadow rendering path
+    int culledShadowObjectSize; // Objects culled in shadow rendering path
+    int drawCallSize;           // Draw calls in normal rendering path
+    int shadowDrawCallSize;     // Draw calls in shadow rendering path
+    int stateChangeSize;        // Shader, texture and vertex array changes
+    int shadowCachedSize;       // Shadow depth renderings skipped with the cache
+
+    RenderingStats() {
+        reset();
+    }
+
+    void reset() {
+        drawnObjectSize = 0;
+        culledObjectSize = 0;
+        drawnShadowObjectSize = 0;
+        culledShadowObjectSize = 0;
+        drawCallSize = 0;
+        shadowDrawCallSize = 0;
+        stateChangeSize = 0;
+        shadowCachedSize = 0;
+    }
+
+    void countObject(RenderingContext::Path path, bool drawn) {
+        if( path == RenderingContext::SHADOW ) {
+            if( drawn ) {
+                drawnShadowObjectSize += 1;
+            } else {
+                culledShadowObjectSize += 1;
+            }
+        } else {
+            if( drawn ) {
+                drawnObjectSize += 1;
+            } else {
+                culledObjectSize += 1;
+            }
+        }
+    }
+
+    void countDrawCalls(RenderingContext::Path path, int size) {
+        if( path == RenderingContext::SHADOW ) {
+            shadowDrawCallSize += size;
+        } else {
+            drawCallSize += size;
+        }
+    }
+};
+
+
+// Dynamics world which exposes the time accumulated for the fixed internal steps,
+// so that it can be saved in the snapshot.
+class DynamicsWorld : public btDiscreteDynamicsWorld {
+public:
+    DynamicsWorld(btDispatcher* dispatcher,
+                  btBroadphaseInterface* pairCache,
+                  btConstraintSolver* constraintSolver,
+                  btCollisionConfiguration* collisionConfiguration)
+        :
+        btDiscreteDynamicsWorld(dispatcher,
+                                pairCache,
+                                constraintSolver,
+                                collisionConfiguration),
+        deterministic(false) {
+    }
+
+    btScalar getLocalTime() const        { return m_localTime;       }
+    void setLocalTime(btScalar localTime) { m_localTime = localTime; }
+
+    bool isDeterministic() const { return deterministic; }
+    void setDeterministic(bool deterministic_);
+
+    void sortCollisionObjects();
+    void sortOverlappingPairs(bool clearContacts);
+    void sortManifolds();
+
+    void performDiscreteCollisionDetection() override;
+
+private:
+    // Whether the collision objects, the overlapping pairs and the contact
+    // manifolds are kept in the proxy id order in each step.
+    bool deterministic;
+};
+
+
+// Object set and rigid body states saved with Environment::saveState()
+class EnvironmentSnapshot {
+public:
+    vector<int> ids;               // Object ids in ascending order
+    vector<RigidBodyState> states; // States of the objects
+    int nextObjId;
+    btScalar localTime;
+
+    bool contains(int id) const {
+        return binary_search(ids.begin(), ids.end(), id);
+    }
+
+    void serialize(vector<char>& data) const;
+    bool deserialize(const char* data, int size);
+};
+
+
 class Environment {
 private:
     CollisionShapeManager collisionShapeManager;
-    btBroadphaseInterface* broadPhase;
+    BroadPhase* broadPhase;
     btCollisionDispatcher* dispatcher;
     btConstraintSolver* solver;
     btDefaultCollisionConfiguration* configuration;
-    btDiscreteDynamicsWorld* world;
+    DynamicsWorld* world;
 
     int nextObjId;
     map<int, EnvironmentObject*> objectMap; // <obj-id, EnvironmentObject>
 
-    MeshManager meshManager;
-    TextureManager textureManager;
-    ShaderManager shaderManager;
-    GLContext glContext;
+    // Physics time step parameters passed to stepSimulation()
+    float timeStep;      // Time advanced by one step
+    int maxSubSteps;     // Max number of internal fixed time steps in one step
+    float fixedTimeStep; // Internal fixed time step
+
+    // Managers and GL context are owned by this environment, or shared between
+    // the environments of a BatchEnvironment.
+    MeshManager* meshManager;
+    TextureManager* textureManager;
+    ShaderManager* shaderManager;
+    GLContext* glContext;
+    bool sharingResources;
+
     RenderingContext renderingContext;
     vector<CameraView*> cameraViews;
+    // Drawn and culled object counts of the last render call
+    RenderingStats renderingStats;
+    // Mesh faces to draw grouped by mesh data, texture and shader
+    DrawBatchList drawBatchList;
+    // Merged meshes of the static objects baked with bakeStatic()
+    StaticBatch* staticBatch;
+    // Hash of the ids and poses of the drawn objects updated in prepareShadow()
+    uint64_t shadowCasterHash;
+
+    // Actions applied with control() since the last step, re-applied for each sub-step.
+    map<int, Action> controlledActions; // <agent-id, Action>
+
+    // Snapshots saved with saveState()
+    map<int, EnvironmentSnapshot*> snapshots; // <snapshot-id, EnvironmentSnapshot>
+    int nextSnapshotId;
+    // Objects removed while they are in the snapshots. They are detached from the
+    // world and kept to be restored.
+    map<int, EnvironmentObject*> detachedObjectMap; // <obj-id, EnvironmentObject>
 
     void checkCollision(CollisionResult& collisionResult);
     void prepareShadow();
+    void unbakeStatic();
     int addObject(btCollisionShape* shape,
                   const Vector3f& pos,
                   const Quat4f& rot,
@@ -94,6 +233,30 @@ private:
                   Mesh* mesh,
                   const Vector3f& scale);
     EnvironmentObject* findObject(int id);
+    bool isInSnapshots(int id) const;
+    void deleteUnusedDetachedObjects();
+    void canonicalizeWorld();
+    void fillSnapshot(EnvironmentSnapshot& snapshot) const;
+    Texture* getObjectTexture(const char* texturePath, const Vector3f& color);
+    int addBoxObject(Texture* texture,
+                     const Vector3f& halfExtent,
+                     const Vector3f& pos,
+                     const Quat4f& rot,
+                     float mass,
+                     bool detectCollision);
+    int addSphereObject(Texture* texture,
+                        float radius,
+                        const Vector3f& pos,
+                        const Quat4f& rot,
+                        float mass,
+                        bool detectCollision);
+    void initWorld();
+    void prepareDiffuseShader(bool useShadow);
+    void setCameraPose(CameraView* cameraView, const Vector3f& pos, const Quat4f& rot);
+    void drawObjects(RenderingContext::Path path, const set<int>& ignoreIds);
+    void drawShadowDepth(CameraView* cameraView, const set<int>& ignoreIds);
+    CameraView* drawView(int cameraId, const Vector3f& pos, const Quat4f& rot,
+                         const set<int>& ignoreIds);
 
 public:
     Environment()
@@ -103,16 +266,34 @@ public:
         solver(nullptr),
         configuration(nullptr),
         world(nullptr),
-        nextObjId(0) {
+        nextObjId(0),
+        timeStep(1.0f / 60.0f),
+        maxSubSteps(1),
+        fixedTimeStep(1.0f / 60.0f),
+        meshManager(nullptr),
+        textureManager(nullptr),
+        shaderManager(nullptr),
+        glContext(nullptr),
+        sharingResources(false),
+        staticBatch(nullptr),
+        shadowCasterHash(0),
+        nextSnapshotId(0) {
     }
 
     ~Environment() {
     }
 
-    bool init();
+    bool init(GLBackend glBackend=GL_BACKEND_AUTO);
+    bool initShared(MeshManager* meshManager_,
+                    TextureManager* textureManager_,
+                    ShaderManager* shaderManager_);
     int addCameraView(int width, int height, const Vector3f& bgColor,
                       float nearClip, float farClip, float focalLength,
-                      int shadowBufferWidth);
+                      int shadowBufferWidth, bool shadow=true,
+                      RenderTarget::DepthType depthType=RenderTarget::DEPTH_NONE,
+                      bool segmentation=false,
+                      RenderTarget::OutputFormat outputFormat=RenderTarget::OUTPUT_RGB,
+                      int supersampling=1);
     int addAgent(float radius,
                  const Vector3f& pos,
                  float rotY,
@@ -122,7 +303,7 @@ public:
     void release();
     void control(int id, const Action& action);
     void applyImpulse(int id, const Vector3f& impulse);
-    void step(CollisionResult& collisionResult);
+    void step(CollisionResult& collisionResult, int repeat=1);
     int addBox(const char* texturePath,
                const Vector3f& color,
                const Vector3f& halfExtent,
@@ -139,6 +320,26 @@ public:
                   float mass,
                   bool detectCollision,
                   bool visible);
+    void addBoxes(const char* texturePath,
+                  const float* colors,
+                  const float* halfExtents,
+                  const float* positions,
+                  const float* rots,
+                  int size,
+                  float mass,
+                  bool detectCollision,
+                  bool visible,
+                  int* ids);
+    void addSpheres(const char* texturePath,
+                    const float* colors,
+                    const float* radiuses,
+                    const float* positions,
+                    const float* rots,
+                    int size,
+                    float mass,
+                    bool detectCollision,
+                    bool visible,
+                    int* ids);
     int addModel(const char* path,
                  const Vector3f& color,
                  const Vector3f& sale,
@@ -151,20 +352,46 @@ public:
                  bool visible);
     void removeObject(int id);
     void locateObject(int id, const Vector3f& pos, const Quat4f& rot);
+    void removeObjects(const vector<int>& ids);
+    void locateObjects(const vector<int>& ids, const float* positions, const float* rots);
     void locateAgent(int id, const Vector3f& pos, float rotY);
     void setLight(const Vector3f& lightDir,
                   const Vector3f& lightColor,
                   const Vector3f& ambientColor,
                   float shadowColorRate);
+    void setPhysics(float timeStep_, int maxSubSteps_, float fixedTimeStep_);
+    void setDeterministic(bool deterministic);
     bool getObjectInfo(int id, EnvironmentObjectInfo& info) const;
+    int getObjectsInfo(const vector<int>& ids,
+                       float* pos, float* rot, float* velocity) const;
+    void getDynamicObjectIds(vector<int>& ids) const;
     void replaceObjectTextures(int id, const vector<string>& texturePathes);
+    int bakeStatic();
+    int saveState();
+    bool restoreState(int snapshotId);
+    void releaseState(int snapshotId);
+    bool serializeState(int snapshotId, vector<char>& data) const;
+    int loadState(const char* data, int size);
+    uint64_t getStateHash() const;
 
     void render(int cameraId, const Vector3f& pos, const Quat4f& rot,
-                const set<int> ignoreIds);
+                const set<int> ignoreIds, void* screenBuffer=nullptr,
+                void* depthBuffer=nullptr, int* objectIdBuffer=nullptr);
+    bool renderAgents(int cameraId, const vector<int>& agentIds, void* screenBuffer);
+    bool renderAsync(int cameraId, const Vector3f& pos, const Quat4f& rot,
+                     const set<int> ignoreIds);
+    bool fetchAsync(int cameraId, void* screenBuffer=nullptr);
+    int getPendingAsyncSize(int cameraId) const;
     const void* getFrameBuffer(int cameraId) const;
     int getFrameBufferWidth(int cameraId) const;
     int getFrameBufferHeight(int cameraId) const;
     int getFrameBufferSize(int cameraId) const;
+    int getFrameBufferChannelSize(int cameraId) const;
+    RenderTarget::DepthType getDepthType(int cameraId) const;
+    bool isSegmentationEnabled(int cameraId) const;
+    const RenderingStats& getRenderingStats() const {
+        return renderingStats;
+    }
 };
 
 #endif
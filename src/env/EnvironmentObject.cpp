@@ -25,7 +25,8 @@ EnvironmentObject::EnvironmentObject(int objectId_,
     :
     objectId(objectId_),
     ignoreCollision(ignoreCollision_),
-    drawComponent(nullptr) {
+    drawComponent(nullptr),
+    baked(false) {
 }
 
 EnvironmentObject::~EnvironmentObject() {
@@ -48,6 +49,23 @@ void EnvironmentObject::draw(RenderingContext& context) const {
     }
 }
 
+void EnvironmentObject::addToBatch(DrawBatchList& batchList,
+                                   const RenderingContext& context) const {
+    if( drawComponent != nullptr ) {
+        Matrix4f rigidBodyMat;
+        getMat(rigidBodyMat);
+        drawComponent->addToBatch(batchList, rigidBodyMat, objectId, context);
+    }
+}
+
+void EnvironmentObject::addToStaticBatch(StaticBatch& staticBatch) {
+    if( drawComponent != nullptr ) {
+        Matrix4f rigidBodyMat;
+        getMat(rigidBodyMat);
+        drawComponent->addToStaticBatch(staticBatch, rigidBodyMat, objectId);
+    }
+}
+
 bool EnvironmentObject::calcBoundingBox(BoundingBox& boundingBox) {
     if( drawComponent != nullptr ) {
         Matrix4f rigidBodyMat;
@@ -59,6 +77,12 @@ bool EnvironmentObject::calcBoundingBox(BoundingBox& boundingBox) {
     }
 }
 
+// Update the world bounding box with the current pose. Returns false if the object
+// is not drawn.
+bool EnvironmentObject::updateBoundingBox() {
+    return calcBoundingBox(boundingBox);
+}
+
 void EnvironmentObject::getInfo(EnvironmentObjectInfo& info) const {
     Matrix4f mat;
     getMat(mat);
@@ -73,6 +97,26 @@ void EnvironmentObject::locate(const Vector3f& pos, const Quat4f& rot) {
     rigidBodyComponent->locate(pos, rot);
 }
 
+void EnvironmentObject::getState(RigidBodyState& state) const {
+    rigidBodyComponent->getState(state);
+}
+
+void EnvironmentObject::setState(const RigidBodyState& state) {
+    rigidBodyComponent->setState(state);
+}
+
+void EnvironmentObject::detach() {
+    rigidBodyComponent->detach();
+}
+
+void EnvironmentObject::attach() {
+    rigidBodyComponent->attach();
+}
+
+int EnvironmentObject::getProxyId() const {
+    return rigidBodyComponent->getProxyId();
+}
+
 void EnvironmentObject::replaceMaterials(const vector<Material*>& materials) {
     if( drawComponent != nullptr ) {
         drawComponent->replaceMaterials(materials);
@@ -8,14 +8,16 @@ using namespace std;
 #include "btBulletDynamicsCommon.h"
 #include "Matrix4f.h"
 #include "RigidBodyComponent.h"
+#include "BoundingBox.h"
 
 class RigidBodyComponent;
 class DrawComponent;
 class Action;
 class Mesh;
 class RenderingContext;
-class BoundingBox;
 class Material;
+class DrawBatchList;
+class StaticBatch;
 
 //---------------------------
 // [EnvironmentObjectInfo]
@@ -40,17 +42,34 @@ protected:
     bool ignoreCollision;
     RigidBodyComponent* rigidBodyComponent;
     DrawComponent* drawComponent;
+    // World bounding box updated with updateBoundingBox()
+    BoundingBox boundingBox;
+    // Whether the mesh is merged in the static batch
+    bool baked;
 
 public:
     EnvironmentObject(int objectId_, bool ignoreCollision_);
     virtual ~EnvironmentObject();
     void getMat(Matrix4f& mat) const;
     void draw(RenderingContext& context) const;
+    void addToBatch(DrawBatchList& batchList, const RenderingContext& context) const;
+    void addToStaticBatch(StaticBatch& staticBatch);
     bool calcBoundingBox(BoundingBox& boundingBox);
+    bool updateBoundingBox();
     void getInfo(EnvironmentObjectInfo& info) const;
     void locate(const Vector3f& pos, const Quat4f& rot);
+    void getState(RigidBodyState& state) const;
+    void setState(const RigidBodyState& state);
+    void detach();
+    void attach();
+    int getProxyId() const;
     void replaceMaterials(const vector<Material*>& materials);
 
+    const BoundingBox& getBoundingBox() const { return boundingBox; }
+    bool isVisible()        const { return drawComponent != nullptr; }
+    bool isStatic()         const { return rigidBodyComponent->isStatic(); }
+    bool isBaked()          const { return baked; }
+    void setBaked(bool baked_)    { baked = baked_; }
     int getObjectId()       const { return objectId;        }
     bool ignoresCollision() const { return ignoreCollision; }
     virtual bool isAgent() const = 0;
@@ -113,6 +113,52 @@ void RigidBodyComponent::applyImpulse(const Vector3f& impulse) {
     body->applyImpulse(impulse_, btVector3(0.0f, 0.0f, 0.0f));
 }
 
+void RigidBodyComponent::getState(RigidBodyState& state) const {
+    state.transform = body->getWorldTransform();
+    state.linearVelocity = body->getLinearVelocity();
+    state.angularVelocity = body->getAngularVelocity();
+    state.rotY = 0.0f;
+    state.activationState = body->getActivationState();
+    state.deactivationTime = body->getDeactivationTime();
+}
+
+void RigidBodyComponent::setState(const RigidBodyState& state) {
+    body->setWorldTransform(state.transform);
+    body->setInterpolationWorldTransform(state.transform);
+    body->updateInertiaTensor();
+    if( body->getMotionState() ) {
+        body->getMotionState()->setWorldTransform(state.transform);
+    }
+    body->setLinearVelocity(state.linearVelocity);
+    body->setAngularVelocity(state.angularVelocity);
+    body->setInterpolationLinearVelocity(state.linearVelocity);
+    body->setInterpolationAngularVelocity(state.angularVelocity);
+    body->clearForces();
+    body->forceActivationState(state.activationState);
+    body->setDeactivationTime(state.deactivationTime);
+}
+
+/**
+ * Remove the body from the world without deleting it.
+ */
+void RigidBodyComponent::detach() {
+    world->removeRigidBody(body);
+}
+
+/**
+ * Add the body removed with detach() to the world again.
+ */
+void RigidBodyComponent::attach() {
+    world->addRigidBody(body);
+}
+
+/**
+ * Get the id of the broadphase proxy of the body.
+ */
+int RigidBodyComponent::getProxyId() const {
+    return body->getBroadphaseHandle()->m_uniqueId;
+}
+
 
 //---------------------------
 // [AgentRigidBodyComponent]
@@ -226,3 +272,13 @@ void AgentRigidBodyComponent::getMat(Matrix4f& mat) const {
     
     mat.mul(rigidBodyMat, invRelativeCenterMat);
 }
+
+void AgentRigidBodyComponent::getState(RigidBodyState& state) const {
+    RigidBodyComponent::getState(state);
+    state.rotY = rotY;
+}
+
+void AgentRigidBodyComponent::setState(const RigidBodyState& state) {
+    RigidBodyComponent::setState(state);
+    rotY = state.rotY;
+}
@@ -11,6 +11,18 @@ class Action;
 class EnvironmentObject;
 
 
+// Dynamic state of the rigid body saved in the environment snapshot
+class RigidBodyState {
+public:
+    btTransform transform;
+    btVector3 linearVelocity;
+    btVector3 angularVelocity;
+    // Head angle of the agent
+    float rotY;
+    int activationState;
+    btScalar deactivationTime;
+};
+
 class RigidBodyComponent {
 protected:
     btDynamicsWorld* world;
@@ -31,6 +43,13 @@ public:
     void getVeclocity(Vector3f& velocity) const;
     virtual void locate(const Vector3f& pos, const Quat4f& rot);
     void applyImpulse(const Vector3f& impulse);
+    virtual void getState(RigidBodyState& state) const;
+    virtual void setState(const RigidBodyState& state);
+    void detach();
+    void attach();
+    int getProxyId() const;
+    // Whether the body has zero mass and is not moved by the simulation
+    bool isStatic() const { return body->isStaticObject(); }
 };
 
 class AgentRigidBodyComponent : public RigidBodyComponent {
@@ -47,6 +66,8 @@ public:
     virtual void control(const Action& action) override;
     void locate(const Vector3f& pos, const Quat4f& rot) override;
     void getMat(Matrix4f& mat) const override;
+    void getState(RigidBodyState& state) const override;
+    void setState(const RigidBodyState& state) override;
 };
 
 #endif
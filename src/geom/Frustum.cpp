@@ -0,0 +1,63 @@
+#include "Frustum.h"
+
+#include "Matrix4f.h"
+#include "BoundingBox.h"
+
+
+/**
+ * <!--  Frustum():  -->
+ */
+Frustum::Frustum() {
+    // Visible everywhere until set.
+    for(int i=0; i<PLANE_SIZE; ++i) {
+        planes[i].set(0.0f, 0.0f, 0.0f, 1.0f);
+    }
+}
+
+/**
+ * <!--  set():  -->
+ *
+ * Extract the clip planes from the view projection matrix. (OpenGL clip space where
+ * -w <= x,y,z <= w)
+ */
+void Frustum::set(const Matrix4f& viewProjectionMat) {
+    Vector4f row0;
+    Vector4f row1;
+    Vector4f row2;
+    Vector4f row3;
+    viewProjectionMat.getRow(0, row0);
+    viewProjectionMat.getRow(1, row1);
+    viewProjectionMat.getRow(2, row2);
+    viewProjectionMat.getRow(3, row3);
+
+    planes[0].add(row3, row0); // left
+    planes[1].sub(row3, row0); // right
+    planes[2].add(row3, row1); // bottom
+    planes[3].sub(row3, row1); // top
+    planes[4].add(row3, row2); // near
+    planes[5].sub(row3, row2); // far
+}
+
+/**
+ * <!--  isVisible():  -->
+ *
+ * Returns false when the bounding box is completely outside of any plane.
+ * (Conservative test, the box near the frustum corners may be treated as visible.)
+ */
+bool Frustum::isVisible(const BoundingBox& boundingBox) const {
+    const Vector3f& minPos = boundingBox.getMinPos();
+    const Vector3f& maxPos = boundingBox.getMaxPos();
+    
+    for(int i=0; i<PLANE_SIZE; ++i) {
+        const Vector4f& plane = planes[i];
+        // The corner furthest along the plane normal
+        float x = (plane.x >= 0.0f) ? maxPos.x : minPos.x;
+        float y = (plane.y >= 0.0f) ? maxPos.y : minPos.y;
+        float z = (plane.z >= 0.0f) ? maxPos.z : minPos.z;
+        
+        if( plane.x * x + plane.y * y + plane.z * z + plane.w < 0.0f ) {
+            return false;
+        }
+    }
+    return true;
+}
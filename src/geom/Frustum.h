@@ -0,0 +1,24 @@
+// -*- C++ -*-
+#ifndef FRUSTUM_HEADER
+#define FRUSTUM_HEADER
+
+#include "Vector4f.h"
+
+class Matrix4f;
+class BoundingBox;
+
+
+class Frustum {
+private:
+    static const int PLANE_SIZE = 6;
+    // Planes (a,b,c,d) with normals pointing inside. (ax+by+cz+d >= 0 for inside)
+    Vector4f planes[PLANE_SIZE];
+
+public:
+    Frustum();
+
+    void set(const Matrix4f& viewProjectionMat);
+    bool isVisible(const BoundingBox& boundingBox) const;
+};
+
+#endif
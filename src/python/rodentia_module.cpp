@@ -3,12 +3,14 @@
 #include <vector>
 #include <set>
 #include <string>
+#include <string.h>
 using namespace std;
 
 #define NPY_NO_DEPRECATED_API NPY_1_7_API_VERSION
 #include <numpy/arrayobject.h>
 
 #include "Environment.h"
+#include "BatchEnvironment.h"
 #include "Action.h"
 #include "Vector3f.h"
 #include "Matrix4f.h"
@@ -26,8 +28,8 @@ static Environment* createEnvironment() {
     return environment;
 }
 
-static bool initEnvironment(Environment* environment) {
-    if( !environment->init() ) {
+static bool initEnvironment(Environment* environment, GLBackend glBackend) {
+    if( !environment->init(glBackend) ) {
         return false;
     }
     
@@ -37,10 +39,19 @@ static bool initEnvironment(Environment* environment) {
 static int addCameraView(Environment* environment, int width, int height,
                          const Vector3f& bgColor,
                          float nearClip, float farClip, float focalLength,
-                         int shadowBufferWidth) {
+                         int shadowBufferWidth,
+                         bool shadow,
+                         int depthType,
+                         bool segmentation,
+                         int outputFormat,
+                         int supersampling) {
     int cameraId = environment->addCameraView(width, height, bgColor,
                                               nearClip, farClip, focalLength,
-                                              shadowBufferWidth);
+                                              shadowBufferWidth, shadow,
+                                              (RenderTarget::DepthType)depthType,
+                                              segmentation,
+                                              (RenderTarget::OutputFormat)outputFormat,
+                                              supersampling);
     return cameraId;
 }
 
@@ -71,15 +82,36 @@ static void applyImpulse(Environment* environment, int id, const Vector3f& impul
     environment->applyImpulse(id, impulse);
 }
 
-static void step(Environment* environment, CollisionResult& collisionResult) {
-    environment->step(collisionResult);
+static void step(Environment* environment, CollisionResult& collisionResult, int repeat) {
+    environment->step(collisionResult, repeat);
 }
 
 static void render(Environment* environment, int cameraId,
                    const Vector3f& pos,
                    const Quat4f& rot,
-                   const set<int> ignoreIds) {
-    environment->render(cameraId, pos, rot, ignoreIds);
+                   const set<int> ignoreIds,
+                   void* screenBuffer,
+                   void* depthBuffer,
+                   int* objectIdBuffer) {
+    environment->render(cameraId, pos, rot, ignoreIds, screenBuffer,
+                        depthBuffer, objectIdBuffer);
+}
+
+static bool renderAgents(Environment* environment, int cameraId,
+                         const vector<int>& agentIds,
+                         void* screenBuffer) {
+    return environment->renderAgents(cameraId, agentIds, screenBuffer);
+}
+
+static bool renderAsync(Environment* environment, int cameraId,
+                        const Vector3f& pos,
+                        const Quat4f& rot,
+                        const set<int> ignoreIds) {
+    return environment->renderAsync(cameraId, pos, rot, ignoreIds);
+}
+
+static bool fetchAsync(Environment* environment, int cameraId, void* screenBuffer) {
+    return environment->fetchAsync(cameraId, screenBuffer);
 }
 
 static int addBox(Environment* environment,
@@ -143,6 +175,56 @@ static void removeObj(Environment* environment,
     environment->removeObject(id);
 }
 
+static void addBoxes(Environment* environment,
+                     const char* texturePath,
+                     const float* colors,
+                     const float* halfExtents,
+                     const float* positions,
+                     const float* rots,
+                     int size,
+                     float mass,
+                     bool detectCollision,
+                     bool visible,
+                     int* ids) {
+    environment->addBoxes(texturePath,
+                          colors, halfExtents, positions, rots, size,
+                          mass,
+                          detectCollision,
+                          visible,
+                          ids);
+}
+
+static void addSpheres(Environment* environment,
+                       const char* texturePath,
+                       const float* colors,
+                       const float* radiuses,
+                       const float* positions,
+                       const float* rots,
+                       int size,
+                       float mass,
+                       bool detectCollision,
+                       bool visible,
+                       int* ids) {
+    environment->addSpheres(texturePath,
+                            colors, radiuses, positions, rots, size,
+                            mass,
+                            detectCollision,
+                            visible,
+                            ids);
+}
+
+static void removeObjs(Environment* environment,
+                       const vector<int>& ids) {
+    environment->removeObjects(ids);
+}
+
+static void locateObjects(Environment* environment,
+                          const vector<int>& ids,
+                          const float* positions,
+                          const float* rots) {
+    environment->locateObjects(ids, positions, rots);
+}
+
 static void locateObject(Environment* environment,
                          int id,
                          const Vector3f& pos,
@@ -162,6 +244,44 @@ static bool getObjectInfo(Environment* environment,
     return environment->getObjectInfo(id, info);
 }
 
+static int getObjectsInfo(Environment* environment,
+                          const vector<int>& ids,
+                          float* pos, float* rot, float* velocity) {
+    return environment->getObjectsInfo(ids, pos, rot, velocity);
+}
+
+static void getDynamicObjectIds(Environment* environment, vector<int>& ids) {
+    environment->getDynamicObjectIds(ids);
+}
+
+static int saveState(Environment* environment) {
+    return environment->saveState();
+}
+
+static bool restoreState(Environment* environment, int snapshotId) {
+    return environment->restoreState(snapshotId);
+}
+
+static void releaseState(Environment* environment, int snapshotId) {
+    environment->releaseState(snapshotId);
+}
+
+static bool serializeState(Environment* environment, int snapshotId, vector<char>& data) {
+    return environment->serializeState(snapshotId, data);
+}
+
+static int loadState(Environment* environment, const char* data, int size) {
+    return environment->loadState(data, size);
+}
+
+static uint64_t getStateHash(Environment* environment) {
+    return environment->getStateHash();
+}
+
+static const RenderingStats& getRenderingStats(Environment* environment) {
+    return environment->getRenderingStats();
+}
+
 static void setLight(Environment* environment,
                      const Vector3f& dir,
                      const Vector3f& color,
@@ -170,6 +290,17 @@ static void setLight(Environment* environment,
     environment->setLight(dir, color, ambinetColor, shadowColorRate);
 }
 
+static void setPhysics(Environment* environment,
+                       float timeStep,
+                       int maxSubSteps,
+                       float fixedTimeStep) {
+    environment->setPhysics(timeStep, maxSubSteps, fixedTimeStep);
+}
+
+static void setDeterministic(Environment* environment, bool deterministic) {
+    environment->setDeterministic(deterministic);
+}
+
 static int getActionSize(Environment* environment) {
     return Action::getActionSize();
 }
@@ -179,6 +310,44 @@ static void replaceObjectTextures(Environment* environment,
     environment->replaceObjectTextures(id, texturePathes);
 }
 
+static int bakeStatic(Environment* environment) {
+    return environment->bakeStatic();
+}
+
+static BatchEnvironment* createBatchEnvironment() {
+    BatchEnvironment* batchEnvironment = new BatchEnvironment();
+    return batchEnvironment;
+}
+
+static bool initBatchEnvironment(BatchEnvironment* batchEnvironment, int environmentSize,
+                                 GLBackend glBackend) {
+    if( !batchEnvironment->init(environmentSize, glBackend) ) {
+        return false;
+    }
+    
+    return true;
+}
+
+static void releaseBatchEnvironment(BatchEnvironment* batchEnvironment) {
+    batchEnvironment->release();
+    delete batchEnvironment;
+}
+
+static void stepBatch(BatchEnvironment* batchEnvironment,
+                      int agentId, int cameraId, const Action* actions,
+                      vector<CollisionResult>& collisionResults,
+                      void* screenBuffer,
+                      int repeat) {
+    batchEnvironment->step(agentId, cameraId, actions, collisionResults, screenBuffer,
+                           repeat);
+}
+
+static void renderBatch(BatchEnvironment* batchEnvironment,
+                        int agentId, int cameraId,
+                        void* screenBuffer) {
+    batchEnvironment->render(agentId, cameraId, screenBuffer);
+}
+
 //---------------------------------------------------------
 //                     [Python funcs]
 //---------------------------------------------------------
@@ -222,17 +391,157 @@ static const int* getIntArrayData(PyObject* obj, int dim, const char* name) {
     return (const int*)PyArray_DATA(array);
 }
 
+/**
+ * Get the data of C-contiguous float32 array with shape (rows, cols).
+ * If cols is 0, the array has to be 1-dimensional with shape (rows).
+ */
+static const float* getFloatMatrixData(PyObject* obj, int rows, int cols,
+                                       const char* name) {
+    PyArrayObject* array = (PyArrayObject*)obj;
+
+    if (cols == 0) {
+        if( !checkArrayDim(array, rows, name) ) {
+            return nullptr;
+        }
+    } else if (PyArray_NDIM(array) != 2 ||
+               PyArray_DIM(array, 0) != rows ||
+               PyArray_DIM(array, 1) != cols) {
+        PyErr_Format(PyExc_ValueError, "%s must have shape (%d,%d)", name, rows, cols);
+        return nullptr;
+    }
+
+    if (PyArray_TYPE(array) != NPY_FLOAT) {
+        PyErr_Format(PyExc_ValueError, "%s must have dtype np.float32", name);
+        return nullptr;
+    }
+
+    if (!PyArray_IS_C_CONTIGUOUS(array)) {
+        PyErr_Format(PyExc_ValueError, "%s must be C-contiguous", name);
+        return nullptr;
+    }
+
+    return (const float*)PyArray_DATA(array);
+}
+
+/**
+ * Get the object ids from 1-dimensional int32 array.
+ */
+static bool getIds(PyObject* obj, vector<int>& ids, const char* name) {
+    PyArrayObject* array = (PyArrayObject*)obj;
+    if (PyArray_NDIM(array) != 1) {
+        PyErr_Format(PyExc_ValueError, "%s must have shape (%d)", name, 1);
+        return false;
+    }
+    int size = PyArray_DIM(array, 0);
+    const int* ids_ = getIntArrayData(obj, size, name);
+    if (ids_ == nullptr) {
+        return false;
+    }
+    ids.assign(ids_, ids_ + size);
+    return true;
+}
+
+/**
+ * Get GL backend from its name. ("auto", "glx" or "egl". nullptr is treated as "auto")
+ */
+static bool getGLBackend(const char* name, GLBackend& backend) {
+    if (name == nullptr || strcmp(name, "auto") == 0) {
+        backend = GL_BACKEND_AUTO;
+    } else if (strcmp(name, "glx") == 0) {
+        backend = GL_BACKEND_GLX;
+    } else if (strcmp(name, "egl") == 0) {
+        backend = GL_BACKEND_EGL;
+    } else {
+        PyErr_Format(PyExc_ValueError, "gl_backend must be \"auto\", \"glx\" or \"egl\": %s",
+                     name);
+        return false;
+    }
+    return true;
+}
+
+/**
+ * Check that obj is a writeable C-contiguous uint8 array with the given size in bytes,
+ * so that pixels can be read into it directly.
+ */
+static bool checkOutputArray(PyObject* obj, npy_intp size, const char* name) {
+    if (!PyArray_Check(obj)) {
+        PyErr_Format(PyExc_ValueError, "%s must be numpy ndarray", name);
+        return false;
+    }
+    
+    PyArrayObject* array = (PyArrayObject*)obj;
+
+    if (PyArray_TYPE(array) != NPY_UINT8) {
+        PyErr_Format(PyExc_ValueError, "%s must have dtype np.uint8", name);
+        return false;
+    }
+
+    if (!PyArray_IS_C_CONTIGUOUS(array) || !PyArray_ISWRITEABLE(array)) {
+        PyErr_Format(PyExc_ValueError, "%s must be writeable and C-contiguous", name);
+        return false;
+    }
+
+    if (PyArray_NBYTES(array) != size) {
+        PyErr_Format(PyExc_ValueError, "%s must have %ld elements", name, (long)size);
+        return false;
+    }
+
+    return true;
+}
+
 typedef struct {
     PyObject_HEAD
     Environment* environment;
+    // True when the environment is owned by BatchEnv object.
+    bool borrowed;
+    // Lock to serialize native calls to the environment while the GIL is released.
+    PyThread_type_lock lock;
 } EnvObject;
 
+/**
+ * Acquire the environment lock. The GIL is released while waiting so that the
+ * thread holding the lock can re-acquire the GIL and finish its call.
+ */
+static void acquireEnvLock(PyThread_type_lock lock) {
+    if( !PyThread_acquire_lock(lock, NOWAIT_LOCK) ) {
+        Py_BEGIN_ALLOW_THREADS
+        PyThread_acquire_lock(lock, WAIT_LOCK);
+        Py_END_ALLOW_THREADS
+    }
+}
+
+/**
+ * Holds the environment lock during the scope.
+ */
+class EnvLock {
+private:
+    PyThread_type_lock lock;
+
+public:
+    EnvLock(EnvObject* envObj)
+        :
+        lock(envObj->lock) {
+        acquireEnvLock(lock);
+    }
+
+    ~EnvLock() {
+        PyThread_release_lock(lock);
+    }
+};
+
 static void EnvObject_dealloc(EnvObject* self) {
     if( self->environment != nullptr ) {
-        releaseEnvironment(self->environment);
+        if( !self->borrowed ) {
+            releaseEnvironment(self->environment);
+        }
         self->environment = nullptr;
     }
 
+    if( self->lock != nullptr ) {
+        PyThread_free_lock(self->lock);
+        self->lock = nullptr;
+    }
+
     (((PyObject*)(self))->ob_type)->tp_free((PyObject*)self);
 }
 
@@ -251,20 +560,46 @@ static PyObject* EnvObject_new(PyTypeObject* type,
             return nullptr;
         }
         
+        self->lock = PyThread_allocate_lock();
+        if (self->lock == nullptr) {
+            releaseEnvironment(environment);
+            PyErr_NoMemory();
+            Py_DECREF(self);
+            return nullptr;
+        }
+        
         self->environment = environment;
+        self->borrowed = false;
     }
     
     return (PyObject*)self;
 }
 
 static int Env_init(EnvObject* self, PyObject* args, PyObject* kwds) {
+    const char* glBackendName = nullptr;
+
+    // Get argument
+    const char* kwlist[] = {"gl_backend", nullptr};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "|z", const_cast<char**>(kwlist),
+                                     &glBackendName)) {
+        return -1;
+    }
+
+    GLBackend glBackend;
+    if (!getGLBackend(glBackendName, glBackend)) {
+        return -1;
+    }
+    
+    EnvLock envLock(self);
+
     if (self->environment == nullptr) {
         PyErr_SetString(PyExc_RuntimeError, "rodentia environment not setup");
         return -1;
     }
 
     // Initialize environment
-    if ( !initEnvironment(self->environment) ) {
+    if ( !initEnvironment(self->environment, glBackend) ) {
         PyErr_Format(PyExc_RuntimeError, "Failed to init environment.");
         return -1;
     }
@@ -273,13 +608,17 @@ static int Env_init(EnvObject* self, PyObject* args, PyObject* kwds) {
 }
 
 static PyObject* Env_release(EnvObject* self, PyObject* args, PyObject* kwds) {
+    EnvLock envLock(self);
+
     if (self->environment == nullptr) {
         PyErr_SetString(PyExc_RuntimeError, "rodentia environment not setup");
         return nullptr;
     }
 
-    // Release environment
-    releaseEnvironment(self->environment);
+    // Release environment (Environment owned by BatchEnv is released with BatchEnv)
+    if( !self->borrowed ) {
+        releaseEnvironment(self->environment);
+    }
 
     // Set self environment null
     self->environment = nullptr;
@@ -296,6 +635,11 @@ static PyObject* Env_add_camera_view(EnvObject* self, PyObject* args, PyObject*
                              "far",
                              "focal_length",
                              "shadow_buffer_width",
+                             "shadow",
+                             "depth",
+                             "segmentation",
+                             "output_format",
+                             "supersampling",
                              nullptr };
 
     // Get argument
@@ -306,19 +650,31 @@ static PyObject* Env_add_camera_view(EnvObject* self, PyObject* args, PyObject*
     float farClip;
     float focalLength;
     int shadowBufferWidth;
+    int shadow = 1;
+    int depthType = RenderTarget::DEPTH_NONE;
+    int segmentation = 0;
+    int outputFormat = RenderTarget::OUTPUT_RGB;
+    int supersampling = 1;
 
-    if (!PyArg_ParseTupleAndKeywords(args, kwds, "iiO!fffi", const_cast<char**>(kwlist),
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "iiO!fffi|pipii", const_cast<char**>(kwlist),
                                      &width,
                                      &height,
                                      &PyArray_Type, &bgColorObj,
                                      &nearClip,
                                      &farClip,
                                      &focalLength,
-                                     &shadowBufferWidth)) {
+                                     &shadowBufferWidth,
+                                     &shadow,
+                                     &depthType,
+                                     &segmentation,
+                                     &outputFormat,
+                                     &supersampling)) {
         PyErr_SetString(PyExc_RuntimeError, "init argument shortage");
         return nullptr;
     }
 
+    EnvLock envLock(self);
+
     if (self->environment == nullptr) {
         PyErr_SetString(PyExc_RuntimeError, "rodentia environment not setup");
         return nullptr;
@@ -331,10 +687,25 @@ static PyObject* Env_add_camera_view(EnvObject* self, PyObject* args, PyObject*
 
     Vector3f bgColor = Vector3f(bgColorArr[0], bgColorArr[1], bgColorArr[2]);
 
+    if( depthType < RenderTarget::DEPTH_NONE || depthType > RenderTarget::DEPTH_UINT16 ) {
+        PyErr_Format(PyExc_ValueError, "Invalid depth type: %d", depthType);
+        return nullptr;
+    }
+    if( outputFormat < RenderTarget::OUTPUT_RGB || outputFormat > RenderTarget::OUTPUT_RGBA ) {
+        PyErr_Format(PyExc_ValueError, "Invalid output format: %d", outputFormat);
+        return nullptr;
+    }
+    if( supersampling < 1 ) {
+        PyErr_Format(PyExc_ValueError, "Invalid supersampling: %d", supersampling);
+        return nullptr;
+    }
+
     // Initialize environment
     int cameraId = addCameraView(self->environment, width, height, bgColor,
                                  nearClip, farClip, focalLength,
-                                 shadowBufferWidth);
+                                 shadowBufferWidth, shadow != 0,
+                                 depthType, segmentation != 0,
+                                 outputFormat, supersampling);
     if (cameraId < 0) {
         PyErr_Format(PyExc_RuntimeError, "Failed to init environment.");
         return nullptr;
@@ -368,6 +739,8 @@ static PyObject* Env_add_agent(EnvObject* self, PyObject* args, PyObject* kwds)
         return nullptr;
     }
     
+    EnvLock envLock(self);
+
     if (self->environment == nullptr) {
         PyErr_SetString(PyExc_RuntimeError, "rodentia environment not setup");
         return nullptr;
@@ -413,6 +786,8 @@ static PyObject* Env_control(EnvObject* self, PyObject* args, PyObject* kwds) {
         return nullptr;
     }
     
+    EnvLock envLock(self);
+
     if (self->environment == nullptr) {
         PyErr_SetString(PyExc_RuntimeError, "rodentia environment not setup");
         return nullptr;
@@ -447,6 +822,8 @@ static PyObject* Env_apply_impulse(EnvObject* self, PyObject* args, PyObject* kw
         return nullptr;
     }
     
+    EnvLock envLock(self);
+
     if (self->environment == nullptr) {
         PyErr_SetString(PyExc_RuntimeError, "rodentia environment not setup");
         return nullptr;
@@ -467,6 +844,23 @@ static PyObject* Env_apply_impulse(EnvObject* self, PyObject* args, PyObject* kw
 }
 
 static PyObject* Env_step(EnvObject* self, PyObject* args, PyObject* kwds) {
+    int repeat = 1;
+
+    // Get argument
+    const char* kwlist[] = {"repeat", nullptr};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "|i", const_cast<char**>(kwlist),
+                                     &repeat)) {
+        return nullptr;
+    }
+
+    if (repeat < 1) {
+        PyErr_Format(PyExc_ValueError, "repeat must be positive");
+        return nullptr;
+    }
+    
+    EnvLock envLock(self);
+
     if (self->environment == nullptr) {
         PyErr_SetString(PyExc_RuntimeError, "rodentia environment not setup");
         return nullptr;
@@ -474,8 +868,10 @@ static PyObject* Env_step(EnvObject* self, PyObject* args, PyObject* kwds) {
 
     // Process step
     CollisionResult collisionResult;
-    
-    step(self->environment, collisionResult);
+
+    Py_BEGIN_ALLOW_THREADS
+    step(self->environment, collisionResult, repeat);
+    Py_END_ALLOW_THREADS
     
     // Create output dictionary
     PyObject* resultDic = PyDict_New();
@@ -514,23 +910,147 @@ static PyObject* Env_step(EnvObject* self, PyObject* args, PyObject* kwds) {
     return resultDic;
 }
 
+/**
+ * Get the set of object ids to skip drawing.
+ */
+static bool getIgnoreIds(PyObject* ignoreIdsObj, set<int>& ignoreIds) {
+    PyArrayObject* ignoreIdsArray = (PyArrayObject*)ignoreIdsObj;
+    if (PyArray_NDIM(ignoreIdsArray) != 1 ) {
+        PyErr_Format(PyExc_ValueError, "%s must have shape (%d)", "ignore_ids", 1);
+        return false;
+    }
+    int ignoreIdsLength = PyArray_DIM(ignoreIdsArray, 0);
+    const int* ignoreIds_ = getIntArrayData(ignoreIdsObj, ignoreIdsLength, "ignore_ids");
+    if (ignoreIds_ == nullptr) {
+        return false;
+    }
+    for(int i=0; i<ignoreIdsLength; ++i) {
+        ignoreIds.insert(ignoreIds_[i]);
+    }
+    return true;
+}
+
+/**
+ * Get the array to read the camera view pixels into. Returns the given out array
+ * if specified, otherwise creates a new array. (Returns a new reference)
+ */
+static PyArrayObject* getScreenArray(Environment* environment, int cameraId,
+                                     PyObject* outObj) {
+    int frameBufferWidth  = environment->getFrameBufferWidth(cameraId);
+    int frameBufferHeight = environment->getFrameBufferHeight(cameraId);
+    if (frameBufferWidth < 0 || frameBufferHeight < 0) {
+        PyErr_Format(PyExc_ValueError, "Invalid camera id: %d", cameraId);
+        return nullptr;
+    }
+
+    if (outObj != nullptr && outObj != Py_None) {
+        // Read pixels directly into the given array.
+        if (!checkOutputArray(outObj, environment->getFrameBufferSize(cameraId), "out")) {
+            return nullptr;
+        }
+        Py_INCREF(outObj);
+        return (PyArrayObject*)outObj;
+    }
+    
+    // Create screen output array
+    npy_intp screenDims[3];
+    screenDims[0] = frameBufferWidth;
+    screenDims[1] = frameBufferHeight;
+    screenDims[2] = environment->getFrameBufferChannelSize(cameraId);
+
+    return (PyArrayObject*)PyArray_SimpleNew(
+        3, // int nd
+        screenDims, // screenDims
+        NPY_UINT8); // int typenum
+}
+
+/**
+ * Create the arrays to read the depth and the object ids of the camera view into.
+ * Arrays are set to nullptr when they are not enabled for the camera view.
+ * (Returns new references)
+ */
+static bool getChannelArrays(Environment* environment, int cameraId,
+                             PyArrayObject** depthArray,
+                             PyArrayObject** segmentationArray) {
+    *depthArray = nullptr;
+    *segmentationArray = nullptr;
+    
+    npy_intp dims[2];
+    dims[0] = environment->getFrameBufferWidth(cameraId);
+    dims[1] = environment->getFrameBufferHeight(cameraId);
+
+    RenderTarget::DepthType depthType = environment->getDepthType(cameraId);
+    if( depthType != RenderTarget::DEPTH_NONE ) {
+        int typenum = (depthType == RenderTarget::DEPTH_FLOAT32) ? NPY_FLOAT32 : NPY_UINT16;
+        *depthArray = (PyArrayObject*)PyArray_SimpleNew(2, dims, typenum);
+        if (*depthArray == nullptr) {
+            return false;
+        }
+    }
+
+    if( environment->isSegmentationEnabled(cameraId) ) {
+        *segmentationArray = (PyArrayObject*)PyArray_SimpleNew(2, dims, NPY_INT32);
+        if (*segmentationArray == nullptr) {
+            Py_XDECREF((PyObject*)*depthArray);
+            *depthArray = nullptr;
+            return false;
+        }
+    }
+    return true;
+}
+
+/**
+ * Add the array to the result dictionary if not null. (Steals the reference of array)
+ */
+static void addChannelResult(PyObject* resultDic, const char* key, PyArrayObject* array) {
+    if (array != nullptr) {
+        PyDict_SetItemString(resultDic, key, (PyObject*)array);
+        Py_DECREF((PyObject*)array);
+    }
+}
+
+/**
+ * Create result dictionary with "screen" entry. (Steals the reference of screenArray)
+ */
+static PyObject* createScreenResult(PyArrayObject* screenArray) {
+    // Create output dictionary
+    PyObject* resultDic = PyDict_New();
+    if (resultDic == nullptr) {
+        Py_DECREF((PyObject*)screenArray);
+        PyErr_NoMemory();
+        return nullptr;
+    }
+
+    // Put list to dictionary
+    PyDict_SetItemString(resultDic, "screen", (PyObject*)screenArray);
+
+    // Decrease ref count of array
+    Py_DECREF((PyObject*)screenArray);
+
+    return resultDic;
+}
+
 static PyObject* Env_render(EnvObject* self, PyObject* args, PyObject* kwds) {
     int cameraId;
     PyObject* posObj = nullptr;
     PyObject* rotObj = nullptr;
     PyObject* ignoreIdsObj = nullptr;
+    PyObject* outObj = nullptr;
 
     // Get argument
-    const char* kwlist[] = {"camera_id", "pos", "rot", "ignore_ids", nullptr};
+    const char* kwlist[] = {"camera_id", "pos", "rot", "ignore_ids", "out", nullptr};
 
-    if (!PyArg_ParseTupleAndKeywords(args, kwds, "iO!O!O!", const_cast<char**>(kwlist),
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "iO!O!O!|O", const_cast<char**>(kwlist),
                                      &cameraId,
                                      &PyArray_Type, &posObj,
                                      &PyArray_Type, &rotObj,
-                                     &PyArray_Type, &ignoreIdsObj)) {
+                                     &PyArray_Type, &ignoreIdsObj,
+                                     &outObj)) {
         return nullptr;
     }
 
+    EnvLock envLock(self);
+
     if (self->environment == nullptr) {
         PyErr_SetString(PyExc_RuntimeError, "rodentia environment not setup");
         return nullptr;
@@ -553,54 +1073,258 @@ static PyObject* Env_render(EnvObject* self, PyObject* args, PyObject* kwds) {
     Quat4f rot(rotArr[0], rotArr[1], rotArr[2], rotArr[3]);
 
     // ignore_ids
-    PyArrayObject* ignoreIdsArray = (PyArrayObject*)ignoreIdsObj;
-    if (PyArray_NDIM(ignoreIdsArray) != 1 ) {
-        PyErr_Format(PyExc_ValueError, "%s must have shape (%d)", "ignore_ids", 1);
+    set<int> ignoreIds;
+    if( !getIgnoreIds(ignoreIdsObj, ignoreIds) ) {
         return nullptr;
     }
-    int ignoreIdsLength = PyArray_DIM(ignoreIdsArray, 0);
-    const int* ignoreIds_ = getIntArrayData(ignoreIdsObj, ignoreIdsLength, "ignore_ids");
-    set<int> ignoreIds;
-    for(int i=0; i<ignoreIdsLength; ++i) {
-        ignoreIds.insert(ignoreIds_[i]);
+
+    PyArrayObject* screenArray = getScreenArray(self->environment, cameraId, outObj);
+    if (screenArray == nullptr) {
+        return nullptr;
+    }
+    void* screenBuffer = PyArray_DATA(screenArray);
+
+    // Depth and object id arrays when enabled for the camera view
+    PyArrayObject* depthArray;
+    PyArrayObject* segmentationArray;
+    if (!getChannelArrays(self->environment, cameraId, &depthArray, &segmentationArray)) {
+        Py_DECREF((PyObject*)screenArray);
+        return nullptr;
     }
+    void* depthBuffer = (depthArray != nullptr) ? PyArray_DATA(depthArray) : nullptr;
+    int* objectIdBuffer = (segmentationArray != nullptr) ?
+        (int*)PyArray_DATA(segmentationArray) : nullptr;
 
     // do render
-    render(self->environment, cameraId, pos, rot, ignoreIds);
-    
+    Py_BEGIN_ALLOW_THREADS
+    render(self->environment, cameraId, pos, rot, ignoreIds, screenBuffer,
+           depthBuffer, objectIdBuffer);
+    Py_END_ALLOW_THREADS
+
+    PyObject* resultDic = createScreenResult(screenArray);
+    if (resultDic == nullptr) {
+        Py_XDECREF((PyObject*)depthArray);
+        Py_XDECREF((PyObject*)segmentationArray);
+        return nullptr;
+    }
+    addChannelResult(resultDic, "depth", depthArray);
+    addChannelResult(resultDic, "segmentation", segmentationArray);
+    return resultDic;
+}
+
+static PyObject* Env_render_agents(EnvObject* self, PyObject* args, PyObject* kwds) {
+    int cameraId;
+    PyObject* agentIdsObj = nullptr;
+    PyObject* outObj = nullptr;
+
+    // Get argument
+    const char* kwlist[] = {"camera_id", "agent_ids", "out", nullptr};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "iO!|O", const_cast<char**>(kwlist),
+                                     &cameraId,
+                                     &PyArray_Type, &agentIdsObj,
+                                     &outObj)) {
+        return nullptr;
+    }
+
+    EnvLock envLock(self);
+
+    if (self->environment == nullptr) {
+        PyErr_SetString(PyExc_RuntimeError, "rodentia environment not setup");
+        return nullptr;
+    }
+
+    // agent_ids
+    PyArrayObject* agentIdsArray = (PyArrayObject*)agentIdsObj;
+    if (PyArray_NDIM(agentIdsArray) != 1 ) {
+        PyErr_Format(PyExc_ValueError, "%s must have shape (%d)", "agent_ids", 1);
+        return nullptr;
+    }
+    int agentSize = PyArray_DIM(agentIdsArray, 0);
+    const int* agentIds_ = getIntArrayData(agentIdsObj, agentSize, "agent_ids");
+    if (agentIds_ == nullptr) {
+        return nullptr;
+    }
+    vector<int> agentIds(agentIds_, agentIds_ + agentSize);
+
     int frameBufferWidth  = self->environment->getFrameBufferWidth(cameraId);
     int frameBufferHeight = self->environment->getFrameBufferHeight(cameraId);
-    const void* frameBuffer = self->environment->getFrameBuffer(cameraId);
+    if (frameBufferWidth < 0 || frameBufferHeight < 0) {
+        PyErr_Format(PyExc_ValueError, "Invalid camera id: %d", cameraId);
+        return nullptr;
+    }
+    int channelSize = self->environment->getFrameBufferChannelSize(cameraId);
 
-    // Create output dictionary
-    PyObject* resultDic = PyDict_New();
-    if (resultDic == nullptr) {
-        PyErr_NoMemory();
+    PyArrayObject* screenArray;
+    if (outObj != nullptr && outObj != Py_None) {
+        // Read pixels directly into the given array.
+        npy_intp screenSize = (npy_intp)agentSize * frameBufferWidth * frameBufferHeight *
+            channelSize;
+        if (!checkOutputArray(outObj, screenSize, "out")) {
+            return nullptr;
+        }
+        screenArray = (PyArrayObject*)outObj;
+        Py_INCREF(outObj);
+    } else {
+        // Create screen output array
+        npy_intp screenDims[4];
+        // Each view has the same layout as render(), since the views are stacked
+        // vertically in the atlas.
+        screenDims[0] = agentSize;
+        screenDims[1] = frameBufferWidth;
+        screenDims[2] = frameBufferHeight;
+        screenDims[3] = channelSize;
+
+        screenArray = (PyArrayObject*)PyArray_SimpleNew(
+            4, // int nd
+            screenDims, // screenDims
+            NPY_UINT8); // int typenum
+        if (screenArray == nullptr) {
+            return nullptr;
+        }
+    }
+    void* screenBuffer = PyArray_DATA(screenArray);
+    bool ret;
+
+    // Render all agent views with one readback
+    Py_BEGIN_ALLOW_THREADS
+    ret = renderAgents(self->environment, cameraId, agentIds, screenBuffer);
+    Py_END_ALLOW_THREADS
+
+    if (!ret) {
+        Py_DECREF((PyObject*)screenArray);
+        PyErr_SetString(PyExc_RuntimeError, "Failed to render agent views");
+        return nullptr;
+    }
+
+    return createScreenResult(screenArray);
+}
+
+static PyObject* Env_render_async(EnvObject* self, PyObject* args, PyObject* kwds) {
+    int cameraId;
+    PyObject* posObj = nullptr;
+    PyObject* rotObj = nullptr;
+    PyObject* ignoreIdsObj = nullptr;
+
+    // Get argument
+    const char* kwlist[] = {"camera_id", "pos", "rot", "ignore_ids", nullptr};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "iO!O!O!", const_cast<char**>(kwlist),
+                                     &cameraId,
+                                     &PyArray_Type, &posObj,
+                                     &PyArray_Type, &rotObj,
+                                     &PyArray_Type, &ignoreIdsObj)) {
+        return nullptr;
+    }
+
+    EnvLock envLock(self);
+
+    if (self->environment == nullptr) {
+        PyErr_SetString(PyExc_RuntimeError, "rodentia environment not setup");
         return nullptr;
     }
     
-    // Create screen output array
-    long* screenDims = new long[3];
-    screenDims[0] = frameBufferWidth;
-    screenDims[1] = frameBufferHeight;
-    screenDims[2] = 3;
+    // pos
+    const float* posArr = getFloatArrayData(posObj, 3, "pos");
+    if( posArr == nullptr ) {
+        return nullptr;
+    }
+    
+    Vector3f pos(posArr[0], posArr[1], posArr[2]);
 
-    PyArrayObject* screenArray = (PyArrayObject*)PyArray_SimpleNew(
-        3, // int nd
-        screenDims, // screenDims
-        NPY_UINT8); // int typenum
-    delete [] screenDims;
+    // rot
+    const float* rotArr = getFloatArrayData(rotObj, 4, "rot");
+    if( rotArr == nullptr ) {
+        return nullptr;
+    }
 
-    // Set buffer memory to array
-    memcpy(PyArray_BYTES(screenArray), frameBuffer, PyArray_NBYTES(screenArray));
+    Quat4f rot(rotArr[0], rotArr[1], rotArr[2], rotArr[3]);
 
-    // Put list to dictionary
-    PyDict_SetItemString(resultDic, "screen", (PyObject*)screenArray);
+    // ignore_ids
+    set<int> ignoreIds;
+    if( !getIgnoreIds(ignoreIdsObj, ignoreIds) ) {
+        return nullptr;
+    }
 
-    // Decrease ref count of array
-    Py_DECREF((PyObject*)screenArray);
+    int pendingSize = self->environment->getPendingAsyncSize(cameraId);
+    if (pendingSize < 0) {
+        PyErr_Format(PyExc_ValueError, "Invalid camera id: %d", cameraId);
+        return nullptr;
+    }
 
-    return resultDic;
+    // The pixel buffers hold only the screen.
+    if (self->environment->getDepthType(cameraId) != RenderTarget::DEPTH_NONE ||
+        self->environment->isSegmentationEnabled(cameraId)) {
+        PyErr_SetString(PyExc_ValueError,
+                        "render_async() is not available for the camera view with "
+                        "depth or segmentation");
+        return nullptr;
+    }
+
+    bool ret;
+    
+    // do render without waiting for the pixels
+    Py_BEGIN_ALLOW_THREADS
+    ret = renderAsync(self->environment, cameraId, pos, rot, ignoreIds);
+    Py_END_ALLOW_THREADS
+
+    if (!ret) {
+        PyErr_Format(PyExc_RuntimeError,
+                     "Failed to render asynchronously. (%d results are pending)",
+                     pendingSize);
+        return nullptr;
+    }
+
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+static PyObject* Env_fetch(EnvObject* self, PyObject* args, PyObject* kwds) {
+    int cameraId;
+    PyObject* outObj = nullptr;
+
+    // Get argument
+    const char* kwlist[] = {"camera_id", "out", nullptr};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "i|O", const_cast<char**>(kwlist),
+                                     &cameraId,
+                                     &outObj)) {
+        return nullptr;
+    }
+
+    EnvLock envLock(self);
+
+    if (self->environment == nullptr) {
+        PyErr_SetString(PyExc_RuntimeError, "rodentia environment not setup");
+        return nullptr;
+    }
+
+    PyArrayObject* screenArray = getScreenArray(self->environment, cameraId, outObj);
+    if (screenArray == nullptr) {
+        return nullptr;
+    }
+    
+    if (self->environment->getPendingAsyncSize(cameraId) == 0) {
+        Py_DECREF((PyObject*)screenArray);
+        PyErr_SetString(PyExc_RuntimeError, "No pending render_async() result to fetch");
+        return nullptr;
+    }
+    
+    void* screenBuffer = PyArray_DATA(screenArray);
+    bool ret;
+
+    // Wait for the oldest pending pixels and copy them
+    Py_BEGIN_ALLOW_THREADS
+    ret = fetchAsync(self->environment, cameraId, screenBuffer);
+    Py_END_ALLOW_THREADS
+
+    if (!ret) {
+        Py_DECREF((PyObject*)screenArray);
+        PyErr_SetString(PyExc_RuntimeError, "Failed to fetch pixels");
+        return nullptr;
+    }
+
+    return createScreenResult(screenArray);
 }
 
 static PyObject* Env_add_box(EnvObject* self, PyObject* args, PyObject* kwds) {
@@ -631,6 +1355,8 @@ static PyObject* Env_add_box(EnvObject* self, PyObject* args, PyObject* kwds) {
         return nullptr;
     }
     
+    EnvLock envLock(self);
+
     if (self->environment == nullptr) {
         PyErr_SetString(PyExc_RuntimeError, "rodentia environment not setup");
         return nullptr;
@@ -710,6 +1436,8 @@ static PyObject* Env_add_sphere(EnvObject* self, PyObject* args, PyObject* kwds)
         return nullptr;
     }
     
+    EnvLock envLock(self);
+
     if (self->environment == nullptr) {
         PyErr_SetString(PyExc_RuntimeError, "rodentia environment not setup");
         return nullptr;
@@ -785,6 +1513,8 @@ static PyObject* Env_add_model(EnvObject* self, PyObject* args, PyObject* kwds)
         return nullptr;
     }
     
+    EnvLock envLock(self);
+
     if (self->environment == nullptr) {
         PyErr_SetString(PyExc_RuntimeError, "rodentia environment not setup");
         return nullptr;
@@ -837,6 +1567,161 @@ static PyObject* Env_add_model(EnvObject* self, PyObject* args, PyObject* kwds)
     return idObj;
 }
 
+/**
+ * Common implementation of add_boxes() and add_spheres().
+ * sizeName is "half_extents" for the boxes and "radiuses" for the spheres.
+ */
+static PyObject* addPrimitives(EnvObject* self, PyObject* args, PyObject* kwds,
+                               const char* sizeName) {
+    const char* texturePath = "";
+    PyObject* colorsObj = nullptr;
+    PyObject* sizesObj = nullptr;
+    PyObject* posObj = nullptr;
+    PyObject* rotObj = nullptr;
+    float mass;
+    int detectCollision;
+    int visible;
+
+    // Get argument
+    const char* kwlist[] = {"texture_path", "colors",
+                            sizeName, "pos", "rot", "mass",
+                            "detect_collision", "visible",
+                            nullptr};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "sO!O!O!O!fii", const_cast<char**>(kwlist),
+                                     &texturePath,
+                                     &PyArray_Type, &colorsObj,
+                                     &PyArray_Type, &sizesObj,
+                                     &PyArray_Type, &posObj,
+                                     &PyArray_Type, &rotObj,
+                                     &mass,
+                                     &detectCollision,
+                                     &visible)) {
+        return nullptr;
+    }
+    
+    EnvLock envLock(self);
+
+    if (self->environment == nullptr) {
+        PyErr_SetString(PyExc_RuntimeError, "rodentia environment not setup");
+        return nullptr;
+    }
+
+    // Number of the objects
+    PyArrayObject* posArray = (PyArrayObject*)posObj;
+    if (PyArray_NDIM(posArray) != 2) {
+        PyErr_Format(PyExc_ValueError, "%s must have shape (N,%d)", "pos", 3);
+        return nullptr;
+    }
+    int size = PyArray_DIM(posArray, 0);
+
+    bool isBox = strcmp(sizeName, "half_extents") == 0;
+    const float* colors = getFloatMatrixData(colorsObj, size, 3, "colors");
+    const float* sizes = getFloatMatrixData(sizesObj, size, isBox ? 3 : 0, sizeName);
+    const float* positions = getFloatMatrixData(posObj, size, 3, "pos");
+    const float* rots = getFloatMatrixData(rotObj, size, 4, "rot");
+    if (colors == nullptr || sizes == nullptr || positions == nullptr || rots == nullptr) {
+        return nullptr;
+    }
+
+    npy_intp idDims[1] = { size };
+    PyArrayObject* idsArray = (PyArrayObject*)PyArray_SimpleNew(1, idDims, NPY_INT32);
+    if (idsArray == nullptr) {
+        return nullptr;
+    }
+    int* ids = (int*)PyArray_DATA(idsArray);
+
+    if (isBox) {
+        addBoxes(self->environment, texturePath,
+                 colors, sizes, positions, rots, size,
+                 mass, detectCollision != 0, visible != 0, ids);
+    } else {
+        addSpheres(self->environment, texturePath,
+                   colors, sizes, positions, rots, size,
+                   mass, detectCollision != 0, visible != 0, ids);
+    }
+
+    // Returning object IDs
+    return (PyObject*)idsArray;
+}
+
+static PyObject* Env_add_boxes(EnvObject* self, PyObject* args, PyObject* kwds) {
+    return addPrimitives(self, args, kwds, "half_extents");
+}
+
+static PyObject* Env_add_spheres(EnvObject* self, PyObject* args, PyObject* kwds) {
+    return addPrimitives(self, args, kwds, "radiuses");
+}
+
+static PyObject* Env_remove_objs(EnvObject* self, PyObject* args, PyObject* kwds) {
+    PyObject* idsObj = nullptr;
+
+    // Get argument
+    const char* kwlist[] = {"ids", nullptr};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O!", const_cast<char**>(kwlist),
+                                     &PyArray_Type, &idsObj)) {
+        return nullptr;
+    }
+    
+    EnvLock envLock(self);
+
+    if (self->environment == nullptr) {
+        PyErr_SetString(PyExc_RuntimeError, "rodentia environment not setup");
+        return nullptr;
+    }
+
+    vector<int> ids;
+    if (!getIds(idsObj, ids, "ids")) {
+        return nullptr;
+    }
+
+    removeObjs(self->environment, ids);
+
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+static PyObject* Env_locate_objects(EnvObject* self, PyObject* args, PyObject* kwds) {
+    PyObject* idsObj = nullptr;
+    PyObject* posObj = nullptr;
+    PyObject* rotObj = nullptr;
+
+    // Get argument
+    const char* kwlist[] = {"ids", "pos", "rot", nullptr};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O!O!O!", const_cast<char**>(kwlist),
+                                     &PyArray_Type, &idsObj,
+                                     &PyArray_Type, &posObj,
+                                     &PyArray_Type, &rotObj)) {
+        return nullptr;
+    }
+    
+    EnvLock envLock(self);
+
+    if (self->environment == nullptr) {
+        PyErr_SetString(PyExc_RuntimeError, "rodentia environment not setup");
+        return nullptr;
+    }
+
+    vector<int> ids;
+    if (!getIds(idsObj, ids, "ids")) {
+        return nullptr;
+    }
+
+    int size = (int)ids.size();
+    const float* positions = getFloatMatrixData(posObj, size, 3, "pos");
+    const float* rots = getFloatMatrixData(rotObj, size, 4, "rot");
+    if (positions == nullptr || rots == nullptr) {
+        return nullptr;
+    }
+
+    locateObjects(self->environment, ids, positions, rots);
+
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
 static PyObject* Env_remove_obj(EnvObject* self, PyObject* args, PyObject* kwds) {
     int id;
 
@@ -848,6 +1733,8 @@ static PyObject* Env_remove_obj(EnvObject* self, PyObject* args, PyObject* kwds)
         return nullptr;
     }
     
+    EnvLock envLock(self);
+
     if (self->environment == nullptr) {
         PyErr_SetString(PyExc_RuntimeError, "rodentia environment not setup");
         return nullptr;
@@ -874,6 +1761,8 @@ static PyObject* Env_locate_object(EnvObject* self, PyObject* args, PyObject* kw
         return nullptr;
     }
     
+    EnvLock envLock(self);
+
     if (self->environment == nullptr) {
         PyErr_SetString(PyExc_RuntimeError, "rodentia environment not setup");
         return nullptr;
@@ -918,6 +1807,8 @@ static PyObject* Env_locate_agent(EnvObject* self, PyObject* args, PyObject* kwd
         return nullptr;
     }
     
+    EnvLock envLock(self);
+
     if (self->environment == nullptr) {
         PyErr_SetString(PyExc_RuntimeError, "rodentia environment not setup");
         return nullptr;
@@ -1004,6 +1895,8 @@ static PyObject* Env_get_obj_info(EnvObject* self, PyObject* args, PyObject* kwd
         return nullptr;
     }
     
+    EnvLock envLock(self);
+
     if (self->environment == nullptr) {
         PyErr_SetString(PyExc_RuntimeError, "rodentia environment not setup");
         return nullptr;
@@ -1020,36 +1913,288 @@ static PyObject* Env_get_obj_info(EnvObject* self, PyObject* args, PyObject* kwd
     return get_info_dic_obj(info);
 }
 
-static PyObject* Env_set_light(EnvObject* self, PyObject* args, PyObject* kwds) {
-    PyObject* dirObj = nullptr;
-    PyObject* colorObj = nullptr;
-    PyObject* ambientColorObj = nullptr;
-    float shadowRate;
+static PyObject* Env_get_objs_info(EnvObject* self, PyObject* args, PyObject* kwds) {
+    PyObject* idsObj = nullptr;
 
     // Get argument
-    const char* kwlist[] = {"dir", "color", "ambient_color", "shadow_rate", nullptr};
+    const char* kwlist[] = {"ids", nullptr};
 
-    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O!O!O!f", const_cast<char**>(kwlist),
-                                     &PyArray_Type, &dirObj,
-                                     &PyArray_Type, &colorObj,
-                                     &PyArray_Type, &ambientColorObj,
-                                     &shadowRate) ) {
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "|O", const_cast<char**>(kwlist),
+                                     &idsObj)) {
         return nullptr;
     }
-    
+
+    EnvLock envLock(self);
+
     if (self->environment == nullptr) {
         PyErr_SetString(PyExc_RuntimeError, "rodentia environment not setup");
         return nullptr;
     }
 
-    // dir
-    const float* dirArr = getFloatArrayData(dirObj, 3, "dir");
-    if( dirArr == nullptr ) {
-        return nullptr;
-    }
-    const float* colorArr = getFloatArrayData(colorObj, 3, "color");
-    if( colorArr == nullptr ) {
-        return nullptr;
+    vector<int> ids;
+    if (idsObj == nullptr || idsObj == Py_None) {
+        // All the dynamic objects
+        getDynamicObjectIds(self->environment, ids);
+    } else {
+        if (!PyArray_Check(idsObj) || PyArray_NDIM((PyArrayObject*)idsObj) != 1) {
+            PyErr_Format(PyExc_ValueError, "%s must have shape (%d)", "ids", 1);
+            return nullptr;
+        }
+        int idSize = PyArray_DIM((PyArrayObject*)idsObj, 0);
+        const int* ids_ = getIntArrayData(idsObj, idSize, "ids");
+        if (ids_ == nullptr) {
+            return nullptr;
+        }
+        ids.assign(ids_, ids_ + idSize);
+    }
+
+    npy_intp idDims[1] = { (npy_intp)ids.size() };
+    npy_intp vecDims[2] = { (npy_intp)ids.size(), 3 };
+    npy_intp rotDims[2] = { (npy_intp)ids.size(), 4 };
+
+    PyArrayObject* idsArray = (PyArrayObject*)PyArray_SimpleNew(1, idDims, NPY_INT32);
+    PyArrayObject* posArray = (PyArrayObject*)PyArray_SimpleNew(2, vecDims, NPY_FLOAT32);
+    PyArrayObject* rotArray = (PyArrayObject*)PyArray_SimpleNew(2, rotDims, NPY_FLOAT32);
+    PyArrayObject* velocityArray = (PyArrayObject*)PyArray_SimpleNew(2, vecDims,
+                                                                     NPY_FLOAT32);
+    PyObject* resultDic = PyDict_New();
+    if (idsArray == nullptr || posArray == nullptr || rotArray == nullptr ||
+        velocityArray == nullptr || resultDic == nullptr) {
+        Py_XDECREF((PyObject*)idsArray);
+        Py_XDECREF((PyObject*)posArray);
+        Py_XDECREF((PyObject*)rotArray);
+        Py_XDECREF((PyObject*)velocityArray);
+        Py_XDECREF(resultDic);
+        return PyErr_NoMemory();
+    }
+
+    if (!ids.empty()) {
+        memcpy(PyArray_DATA(idsArray), ids.data(), sizeof(int) * ids.size());
+    }
+    getObjectsInfo(self->environment, ids,
+                   (float*)PyArray_DATA(posArray),
+                   (float*)PyArray_DATA(rotArray),
+                   (float*)PyArray_DATA(velocityArray));
+
+    // Put arrays to dictionary
+    PyDict_SetItemString(resultDic, "ids", (PyObject*)idsArray);
+    PyDict_SetItemString(resultDic, "pos", (PyObject*)posArray);
+    PyDict_SetItemString(resultDic, "velocity", (PyObject*)velocityArray);
+    PyDict_SetItemString(resultDic, "rot", (PyObject*)rotArray);
+
+    // Decrease ref count of array
+    Py_DECREF((PyObject*)idsArray);
+    Py_DECREF((PyObject*)posArray);
+    Py_DECREF((PyObject*)velocityArray);
+    Py_DECREF((PyObject*)rotArray);
+
+    return resultDic;
+}
+
+static PyObject* Env_save_state(EnvObject* self, PyObject* args, PyObject* kwds) {
+    EnvLock envLock(self);
+
+    if (self->environment == nullptr) {
+        PyErr_SetString(PyExc_RuntimeError, "rodentia environment not setup");
+        return nullptr;
+    }
+
+    int snapshotId = saveState(self->environment);
+    return PyLong_FromLong(snapshotId);
+}
+
+static PyObject* Env_restore_state(EnvObject* self, PyObject* args, PyObject* kwds) {
+    int snapshotId;
+
+    // Get argument
+    const char* kwlist[] = {"snapshot_id", nullptr};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "i", const_cast<char**>(kwlist),
+                                     &snapshotId)) {
+        return nullptr;
+    }
+
+    EnvLock envLock(self);
+
+    if (self->environment == nullptr) {
+        PyErr_SetString(PyExc_RuntimeError, "rodentia environment not setup");
+        return nullptr;
+    }
+
+    if (!restoreState(self->environment, snapshotId)) {
+        PyErr_Format(PyExc_ValueError, "Invalid snapshot id: %d", snapshotId);
+        return nullptr;
+    }
+
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+static PyObject* Env_release_state(EnvObject* self, PyObject* args, PyObject* kwds) {
+    int snapshotId;
+
+    // Get argument
+    const char* kwlist[] = {"snapshot_id", nullptr};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "i", const_cast<char**>(kwlist),
+                                     &snapshotId)) {
+        return nullptr;
+    }
+
+    EnvLock envLock(self);
+
+    if (self->environment == nullptr) {
+        PyErr_SetString(PyExc_RuntimeError, "rodentia environment not setup");
+        return nullptr;
+    }
+
+    releaseState(self->environment, snapshotId);
+
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+static PyObject* Env_serialize_state(EnvObject* self, PyObject* args, PyObject* kwds) {
+    int snapshotId;
+
+    // Get argument
+    const char* kwlist[] = {"snapshot_id", nullptr};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "i", const_cast<char**>(kwlist),
+                                     &snapshotId)) {
+        return nullptr;
+    }
+
+    EnvLock envLock(self);
+
+    if (self->environment == nullptr) {
+        PyErr_SetString(PyExc_RuntimeError, "rodentia environment not setup");
+        return nullptr;
+    }
+
+    vector<char> data;
+    if (!serializeState(self->environment, snapshotId, data)) {
+        PyErr_Format(PyExc_ValueError, "Invalid snapshot id: %d", snapshotId);
+        return nullptr;
+    }
+
+    return PyBytes_FromStringAndSize(data.data(), data.size());
+}
+
+static PyObject* Env_load_state(EnvObject* self, PyObject* args, PyObject* kwds) {
+    Py_buffer buffer;
+
+    // Get argument
+    const char* kwlist[] = {"data", nullptr};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "y*", const_cast<char**>(kwlist),
+                                     &buffer)) {
+        return nullptr;
+    }
+
+    EnvLock envLock(self);
+
+    if (self->environment == nullptr) {
+        PyBuffer_Release(&buffer);
+        PyErr_SetString(PyExc_RuntimeError, "rodentia environment not setup");
+        return nullptr;
+    }
+
+    int snapshotId = loadState(self->environment, (const char*)buffer.buf, buffer.len);
+    PyBuffer_Release(&buffer);
+
+    if (snapshotId < 0) {
+        PyErr_SetString(PyExc_ValueError, "Invalid snapshot data");
+        return nullptr;
+    }
+    return PyLong_FromLong(snapshotId);
+}
+
+static PyObject* Env_get_state_hash(EnvObject* self, PyObject* args, PyObject* kwds) {
+    EnvLock envLock(self);
+
+    if (self->environment == nullptr) {
+        PyErr_SetString(PyExc_RuntimeError, "rodentia environment not setup");
+        return nullptr;
+    }
+
+    uint64_t hash = getStateHash(self->environment);
+    return PyLong_FromUnsignedLongLong(hash);
+}
+
+static PyObject* Env_get_render_stats(EnvObject* self, PyObject* args, PyObject* kwds) {
+    EnvLock envLock(self);
+
+    if (self->environment == nullptr) {
+        PyErr_SetString(PyExc_RuntimeError, "rodentia environment not setup");
+        return nullptr;
+    }
+
+    const RenderingStats& stats = getRenderingStats(self->environment);
+
+    // Create output dictionary
+    PyObject* resultDic = PyDict_New();
+    if (resultDic == nullptr) {
+        PyErr_NoMemory();
+        return nullptr;
+    }
+
+    const char* keys[] = {"drawn", "culled", "shadow_drawn", "shadow_culled",
+                          "draw_calls", "shadow_draw_calls", "state_changes",
+                          "shadow_cached"};
+    int values[] = {
+        stats.drawnObjectSize,
+        stats.culledObjectSize,
+        stats.drawnShadowObjectSize,
+        stats.culledShadowObjectSize,
+        stats.drawCallSize,
+        stats.shadowDrawCallSize,
+        stats.stateChangeSize,
+        stats.shadowCachedSize
+    };
+    int valueSize = sizeof(values) / sizeof(int);
+
+    for(int i=0; i<valueSize; ++i) {
+        PyObject* valueObj = PyLong_FromLong(values[i]);
+        PyDict_SetItemString(resultDic, keys[i], valueObj);
+        Py_DECREF(valueObj);
+    }
+
+    return resultDic;
+}
+
+static PyObject* Env_set_light(EnvObject* self, PyObject* args, PyObject* kwds) {
+    PyObject* dirObj = nullptr;
+    PyObject* colorObj = nullptr;
+    PyObject* ambientColorObj = nullptr;
+    float shadowRate;
+
+    // Get argument
+    const char* kwlist[] = {"dir", "color", "ambient_color", "shadow_rate", nullptr};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O!O!O!f", const_cast<char**>(kwlist),
+                                     &PyArray_Type, &dirObj,
+                                     &PyArray_Type, &colorObj,
+                                     &PyArray_Type, &ambientColorObj,
+                                     &shadowRate) ) {
+        return nullptr;
+    }
+    
+    EnvLock envLock(self);
+
+    if (self->environment == nullptr) {
+        PyErr_SetString(PyExc_RuntimeError, "rodentia environment not setup");
+        return nullptr;
+    }
+
+    // dir
+    const float* dirArr = getFloatArrayData(dirObj, 3, "dir");
+    if( dirArr == nullptr ) {
+        return nullptr;
+    }
+    const float* colorArr = getFloatArrayData(colorObj, 3, "color");
+    if( colorArr == nullptr ) {
+        return nullptr;
     }
     const float* ambientColorArr = getFloatArrayData(ambientColorObj, 3, "ambient_color");
     if( ambientColorArr == nullptr ) {
@@ -1068,6 +2213,67 @@ static PyObject* Env_set_light(EnvObject* self, PyObject* args, PyObject* kwds)
     return Py_None;
 }
 
+static PyObject* Env_set_physics(EnvObject* self, PyObject* args, PyObject* kwds) {
+    float timeStep;
+    int maxSubSteps;
+    float fixedTimeStep;
+
+    // Get argument
+    const char* kwlist[] = {"time_step", "max_sub_steps", "fixed_time_step", nullptr};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "fif", const_cast<char**>(kwlist),
+                                     &timeStep,
+                                     &maxSubSteps,
+                                     &fixedTimeStep) ) {
+        return nullptr;
+    }
+
+    if (timeStep <= 0.0f || fixedTimeStep <= 0.0f) {
+        PyErr_Format(PyExc_ValueError, "time_step and fixed_time_step must be positive");
+        return nullptr;
+    }
+    if (maxSubSteps < 0) {
+        PyErr_Format(PyExc_ValueError, "max_sub_steps must not be negative");
+        return nullptr;
+    }
+    
+    EnvLock envLock(self);
+
+    if (self->environment == nullptr) {
+        PyErr_SetString(PyExc_RuntimeError, "rodentia environment not setup");
+        return nullptr;
+    }
+
+    setPhysics(self->environment, timeStep, maxSubSteps, fixedTimeStep);
+
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+static PyObject* Env_set_deterministic(EnvObject* self, PyObject* args, PyObject* kwds) {
+    int deterministic;
+
+    // Get argument
+    const char* kwlist[] = {"enabled", nullptr};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "p", const_cast<char**>(kwlist),
+                                     &deterministic)) {
+        return nullptr;
+    }
+
+    EnvLock envLock(self);
+
+    if (self->environment == nullptr) {
+        PyErr_SetString(PyExc_RuntimeError, "rodentia environment not setup");
+        return nullptr;
+    }
+
+    setDeterministic(self->environment, deterministic != 0);
+
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
 static PyObject* Env_replace_obj_texture(EnvObject* self, PyObject* args, PyObject* kwds) {
     const char *kwlist[] = { "id",
                              "texture_path",
@@ -1083,6 +2289,8 @@ static PyObject* Env_replace_obj_texture(EnvObject* self, PyObject* args, PyObje
         return nullptr;
     }
 
+    EnvLock envLock(self);
+
     if (self->environment == nullptr) {
         PyErr_SetString(PyExc_RuntimeError, "rodentia environment not setup");
         return nullptr;
@@ -1118,21 +2326,51 @@ static PyObject* Env_replace_obj_texture(EnvObject* self, PyObject* args, PyObje
     return Py_None;
 }
 
-// int add_camera_view(width, height, bg_color, near, far, focal_length, shadow_buffer_width)
+static PyObject* Env_bake_static(EnvObject* self, PyObject* args, PyObject* kwds) {
+    EnvLock envLock(self);
+
+    if (self->environment == nullptr) {
+        PyErr_SetString(PyExc_RuntimeError, "rodentia environment not setup");
+        return nullptr;
+    }
+
+    int bakedSize = bakeStatic(self->environment);
+    return PyLong_FromLong(bakedSize);
+}
+
+// int add_camera_view(width, height, bg_color, near, far, focal_length, shadow_buffer_width, shadow)
 // int add_agent(radius, pos, rot_y, mass, detect_collision, color)
 // void control(id, action)
 // void applyImpulse(id, impulse)
-// dic step()
-// dic render(camera_id, pos, rot)
+// dic step(repeat)
+// dic render(camera_id, pos, rot, ignore_ids, out)
+// dic render_agents(camera_id, agent_ids, out)
+// void render_async(camera_id, pos, rot, ignore_ids)
+// dic fetch(camera_id, out)
 // int add_box(half_extent, pos, rot, detect_collision)
 // int add_sphere(radius, pos, rot, detect_collision)
 // int add_model(path, scale, pos, rot, detect_collision)
+// ids add_boxes(texture_path, colors, half_extents, pos, rot, mass, detect_collision, visible)
+// ids add_spheres(texture_path, colors, radiuses, pos, rot, mass, detect_collision, visible)
 // void remove_obj(id)
+// void remove_objs(ids)
 // void locate_object(id, pos, rot)
+// void locate_objects(ids, pos, rot)
 // void locate_agent(id, pos, rot_y)
 // dic get_object_info(id)
+// dic get_objs_info(ids)
+// dic get_render_stats()
 // void set_light(dir, color, ambient_color, shadow_rate)
+// void set_physics(time_step, max_sub_steps, fixed_time_step)
+// void set_deterministic(enabled)
 // void replace_obj_texture(id, string[])
+// int bake_static()
+// int save_state()
+// void restore_state(snapshot_id)
+// void release_state(snapshot_id)
+// bytes serialize_state(snapshot_id)
+// int load_state(data)
+// int get_state_hash()
 // void release()
 
 static PyMethodDef EnvObject_methods[] = {
@@ -1148,24 +2386,60 @@ static PyMethodDef EnvObject_methods[] = {
      "Advance the environment"},
     {"render", (PyCFunction)Env_render, METH_VARARGS | METH_KEYWORDS,
      "render screen"},
+    {"render_agents", (PyCFunction)Env_render_agents, METH_VARARGS | METH_KEYWORDS,
+     "render views of the agents into one stacked screen"},
+    {"render_async", (PyCFunction)Env_render_async, METH_VARARGS | METH_KEYWORDS,
+     "render screen without waiting for pixel readback"},
+    {"fetch", (PyCFunction)Env_fetch, METH_VARARGS | METH_KEYWORDS,
+     "Fetch screen of the oldest render_async call"},
     {"add_box", (PyCFunction)Env_add_box, METH_VARARGS | METH_KEYWORDS,
      "Add box object"},
     {"add_sphere", (PyCFunction)Env_add_sphere, METH_VARARGS | METH_KEYWORDS,
      "Add sphere object"},
     {"add_model", (PyCFunction)Env_add_model, METH_VARARGS | METH_KEYWORDS,
      "Add model object"},
+    {"add_boxes", (PyCFunction)Env_add_boxes, METH_VARARGS | METH_KEYWORDS,
+     "Add box objects"},
+    {"add_spheres", (PyCFunction)Env_add_spheres, METH_VARARGS | METH_KEYWORDS,
+     "Add sphere objects"},
     {"remove_obj", (PyCFunction)Env_remove_obj, METH_VARARGS | METH_KEYWORDS,
      "Remove object"},
+    {"remove_objs", (PyCFunction)Env_remove_objs, METH_VARARGS | METH_KEYWORDS,
+     "Remove objects"},
     {"locate_object", (PyCFunction)Env_locate_object, METH_VARARGS | METH_KEYWORDS,
      "Locate object"},
+    {"locate_objects", (PyCFunction)Env_locate_objects, METH_VARARGS | METH_KEYWORDS,
+     "Locate objects"},
     {"locate_agent", (PyCFunction)Env_locate_agent, METH_VARARGS | METH_KEYWORDS,
      "Locate agent"},
     {"get_obj_info", (PyCFunction)Env_get_obj_info, METH_VARARGS | METH_KEYWORDS,
      "Get object information"},
+    {"get_objs_info", (PyCFunction)Env_get_objs_info, METH_VARARGS | METH_KEYWORDS,
+     "Get information of the objects as arrays"},
+    {"get_render_stats", (PyCFunction)Env_get_render_stats, METH_VARARGS | METH_KEYWORDS,
+     "Get drawn and culled object counts and draw calls of the last rendering"},
     {"set_light", (PyCFunction)Env_set_light, METH_VARARGS | METH_KEYWORDS,
      "Set light parameters"},
+    {"set_physics", (PyCFunction)Env_set_physics, METH_VARARGS | METH_KEYWORDS,
+     "Set physics time step parameters"},
+    {"set_deterministic", (PyCFunction)Env_set_deterministic, METH_VARARGS | METH_KEYWORDS,
+     "Enable or disable the deterministic physics simulation"},
     {"replace_obj_texture", (PyCFunction)Env_replace_obj_texture, METH_VARARGS | METH_KEYWORDS,
      "Replace object textures"},
+    {"bake_static", (PyCFunction)Env_bake_static, METH_VARARGS | METH_KEYWORDS,
+     "Merge static objects into pre-transformed meshes"},
+    {"save_state", (PyCFunction)Env_save_state, METH_VARARGS | METH_KEYWORDS,
+     "Save the object set and the rigid body states"},
+    {"restore_state", (PyCFunction)Env_restore_state, METH_VARARGS | METH_KEYWORDS,
+     "Restore the saved state"},
+    {"release_state", (PyCFunction)Env_release_state, METH_VARARGS | METH_KEYWORDS,
+     "Release the saved state"},
+    {"serialize_state", (PyCFunction)Env_serialize_state, METH_VARARGS | METH_KEYWORDS,
+     "Serialize the saved state into bytes"},
+    {"load_state", (PyCFunction)Env_load_state, METH_VARARGS | METH_KEYWORDS,
+     "Load the serialized state"},
+    {"get_state_hash", (PyCFunction)Env_get_state_hash, METH_VARARGS | METH_KEYWORDS,
+     "Get the hash of the current rigid body states"},
     {"release", (PyCFunction)Env_release, METH_VARARGS | METH_KEYWORDS,
      "Release environment"},
     {nullptr}
@@ -1214,6 +2488,510 @@ static PyTypeObject rodentia_EnvType = {
 };
 
 
+typedef struct {
+    PyObject_HEAD
+    BatchEnvironment* batchEnvironment;
+    // List of Env objects which wrap each environment in the batch.
+    PyObject* envList;
+} BatchEnvObject;
+
+/**
+ * Acquire locks of all Env objects in the batch in index order.
+ */
+static void lockBatchEnvList(PyObject* envList) {
+    Py_ssize_t size = PyList_Size(envList);
+    for(Py_ssize_t i=0; i<size; ++i) {
+        EnvObject* envObj = (EnvObject*)PyList_GetItem(envList, i);
+        acquireEnvLock(envObj->lock);
+    }
+}
+
+static void unlockBatchEnvList(PyObject* envList) {
+    Py_ssize_t size = PyList_Size(envList);
+    for(Py_ssize_t i=0; i<size; ++i) {
+        EnvObject* envObj = (EnvObject*)PyList_GetItem(envList, i);
+        PyThread_release_lock(envObj->lock);
+    }
+}
+
+/**
+ * Detach Env objects from the environments owned by the batch.
+ */
+static void detachBatchEnvList(BatchEnvObject* self) {
+    PyObject* envList = self->envList;
+    if( envList == nullptr ) {
+        return;
+    }
+    self->envList = nullptr;
+
+    // Wait for native calls running on other threads to finish.
+    lockBatchEnvList(envList);
+    
+    Py_ssize_t size = PyList_Size(envList);
+    for(Py_ssize_t i=0; i<size; ++i) {
+        EnvObject* envObj = (EnvObject*)PyList_GetItem(envList, i);
+        envObj->environment = nullptr;
+    }
+
+    unlockBatchEnvList(envList);
+    Py_DECREF(envList);
+}
+
+static void BatchEnvObject_dealloc(BatchEnvObject* self) {
+    detachBatchEnvList(self);
+    
+    if( self->batchEnvironment != nullptr ) {
+        releaseBatchEnvironment(self->batchEnvironment);
+        self->batchEnvironment = nullptr;
+    }
+
+    (((PyObject*)(self))->ob_type)->tp_free((PyObject*)self);
+}
+
+static PyObject* BatchEnvObject_new(PyTypeObject* type,
+                                    PyObject* args,
+                                    PyObject* kwds) {
+    BatchEnvObject* self;
+    
+    self = (BatchEnvObject*)type->tp_alloc(type, 0);
+    
+    if (self != nullptr) {
+        BatchEnvironment* batchEnvironment = createBatchEnvironment();
+        if (batchEnvironment == nullptr) {
+            PyErr_SetString(PyExc_RuntimeError, "Failed to create rodentia batch environment");
+            Py_DECREF(self);
+            return nullptr;
+        }
+        
+        self->batchEnvironment = batchEnvironment;
+        self->envList = nullptr;
+    }
+    
+    return (PyObject*)self;
+}
+
+static int BatchEnv_init(BatchEnvObject* self, PyObject* args, PyObject* kwds) {
+    int envSize;
+    const char* glBackendName = nullptr;
+
+    // Get argument
+    const char* kwlist[] = {"env_size", "gl_backend", nullptr};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "i|z", const_cast<char**>(kwlist),
+                                     &envSize,
+                                     &glBackendName)) {
+        return -1;
+    }
+
+    GLBackend glBackend;
+    if (!getGLBackend(glBackendName, glBackend)) {
+        return -1;
+    }
+    
+    if (self->batchEnvironment == nullptr) {
+        PyErr_SetString(PyExc_RuntimeError, "rodentia batch environment not setup");
+        return -1;
+    }
+
+    if (envSize <= 0) {
+        PyErr_Format(PyExc_ValueError, "env_size must be positive");
+        return -1;
+    }
+
+    // Initialize batch environment
+    if ( !initBatchEnvironment(self->batchEnvironment, envSize, glBackend) ) {
+        PyErr_Format(PyExc_RuntimeError, "Failed to init batch environment.");
+        return -1;
+    }
+
+    // Create Env objects for each environment.
+    self->envList = PyList_New(envSize);
+    if (self->envList == nullptr) {
+        return -1;
+    }
+    
+    for(int i=0; i<envSize; ++i) {
+        EnvObject* envObj = (EnvObject*)rodentia_EnvType.tp_alloc(&rodentia_EnvType, 0);
+        if (envObj == nullptr) {
+            return -1;
+        }
+        envObj->environment = self->batchEnvironment->getEnvironment(i);
+        envObj->borrowed = true;
+        envObj->lock = PyThread_allocate_lock();
+        PyList_SetItem(self->envList, i, (PyObject*)envObj);
+        // No need to decrease envObj's refcount.
+        if (envObj->lock == nullptr) {
+            PyErr_NoMemory();
+            return -1;
+        }
+    }
+
+    return 0;
+}
+
+static PyObject* BatchEnv_release(BatchEnvObject* self, PyObject* args, PyObject* kwds) {
+    if (self->batchEnvironment == nullptr) {
+        PyErr_SetString(PyExc_RuntimeError, "rodentia batch environment not setup");
+        return nullptr;
+    }
+
+    // Set self batch environment null before detaching, because detaching may
+    // wait for other threads.
+    BatchEnvironment* batchEnvironment = self->batchEnvironment;
+    self->batchEnvironment = nullptr;
+
+    detachBatchEnvList(self);
+
+    // Release batch environment
+    releaseBatchEnvironment(batchEnvironment);
+    
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+static PyObject* BatchEnv_get_env(BatchEnvObject* self, PyObject* args, PyObject* kwds) {
+    int index;
+
+    // Get argument
+    const char* kwlist[] = {"index", nullptr};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "i", const_cast<char**>(kwlist),
+                                     &index)) {
+        return nullptr;
+    }
+
+    if (self->batchEnvironment == nullptr || self->envList == nullptr) {
+        PyErr_SetString(PyExc_RuntimeError, "rodentia batch environment not setup");
+        return nullptr;
+    }
+
+    if (index < 0 || index >= PyList_Size(self->envList)) {
+        PyErr_Format(PyExc_IndexError, "Invalid env index: %d", index);
+        return nullptr;
+    }
+
+    PyObject* envObj = PyList_GetItem(self->envList, index);
+    Py_INCREF(envObj);
+    return envObj;
+}
+
+/**
+ * Get the output array for the agent views of all the environments. Returns new
+ * reference of the out array, or newly created array if out is null.
+ */
+static PyArrayObject* getBatchScreenArray(BatchEnvironment* batchEnvironment,
+                                          int cameraId,
+                                          PyObject* outObj) {
+    int envSize = batchEnvironment->getEnvironmentSize();
+    
+    // Check camera id with the first environment.
+    Environment* environment = batchEnvironment->getEnvironment(0);
+    int frameBufferWidth  = environment->getFrameBufferWidth(cameraId);
+    int frameBufferHeight = environment->getFrameBufferHeight(cameraId);
+    if (frameBufferWidth < 0 || frameBufferHeight < 0) {
+        PyErr_Format(PyExc_ValueError, "Invalid camera id: %d", cameraId);
+        return nullptr;
+    }
+    int channelSize = environment->getFrameBufferChannelSize(cameraId);
+
+    if (outObj != nullptr) {
+        // Read pixels directly into the given array.
+        npy_intp screenSize = (npy_intp)envSize * frameBufferWidth * frameBufferHeight *
+            channelSize;
+        if (!checkOutputArray(outObj, screenSize, "out")) {
+            return nullptr;
+        }
+        Py_INCREF(outObj);
+        return (PyArrayObject*)outObj;
+    }
+    
+    // Create screen output array
+    npy_intp screenDims[4];
+    // Each screen has the same layout as the screen of a single environment.
+    screenDims[0] = envSize;
+    screenDims[1] = frameBufferWidth;
+    screenDims[2] = frameBufferHeight;
+    screenDims[3] = channelSize;
+    
+    return (PyArrayObject*)PyArray_SimpleNew(
+        4, // int nd
+        screenDims, // screenDims
+        NPY_UINT8); // int typenum
+}
+
+static PyObject* BatchEnv_step(BatchEnvObject* self, PyObject* args, PyObject* kwds) {
+    int agentId;
+    int cameraId;
+    PyObject* actionsObj = nullptr;
+    PyObject* outObj = nullptr;
+    int repeat = 1;
+    int render = 1;
+
+    // Get argument
+    const char* kwlist[] = {"agent_id", "camera_id", "actions", "out", "repeat", "render",
+                            nullptr};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "iiO!|Oip", const_cast<char**>(kwlist),
+                                     &agentId,
+                                     &cameraId,
+                                     &PyArray_Type, &actionsObj,
+                                     &outObj,
+                                     &repeat,
+                                     &render)) {
+        return nullptr;
+    }
+
+    if (repeat < 1) {
+        PyErr_Format(PyExc_ValueError, "repeat must be positive");
+        return nullptr;
+    }
+
+    if (outObj == Py_None) {
+        outObj = nullptr;
+    }
+
+    if (self->batchEnvironment == nullptr || self->envList == nullptr) {
+        PyErr_SetString(PyExc_RuntimeError, "rodentia batch environment not setup");
+        return nullptr;
+    }
+
+    BatchEnvironment* batchEnvironment = self->batchEnvironment;
+    int envSize = batchEnvironment->getEnvironmentSize();
+    int actionSize = Action::getActionSize();
+
+    // actions
+    PyArrayObject* actionsArray = (PyArrayObject*)actionsObj;
+    if (PyArray_NDIM(actionsArray) != 2 ||
+        PyArray_DIM(actionsArray, 0) != envSize ||
+        PyArray_DIM(actionsArray, 1) != actionSize) {
+        PyErr_Format(PyExc_ValueError, "%s must have shape (%d, %d)", "actions",
+                     envSize, actionSize);
+        return nullptr;
+    }
+    if (PyArray_TYPE(actionsArray) != NPY_INT) {
+        PyErr_Format(PyExc_ValueError, "%s must have dtype np.int32", "actions");
+        return nullptr;
+    }
+    
+    vector<Action> actions;
+    for(int i=0; i<envSize; ++i) {
+        const int* actionArr = (const int*)PyArray_GETPTR2(actionsArray, i, 0);
+        actions.push_back(Action(actionArr[0], actionArr[1], actionArr[2]));
+    }
+
+    // Lock all environments until the step finishes.
+    PyObject* envList = self->envList;
+    Py_INCREF(envList);
+    lockBatchEnvList(envList);
+
+    // The batch may have been released while waiting for the locks.
+    if (self->envList != envList) {
+        unlockBatchEnvList(envList);
+        Py_DECREF(envList);
+        PyErr_SetString(PyExc_RuntimeError, "rodentia batch environment not setup");
+        return nullptr;
+    }
+
+    PyArrayObject* screenArray = nullptr;
+    if (render) {
+        screenArray = getBatchScreenArray(batchEnvironment, cameraId, outObj);
+        if (screenArray == nullptr) {
+            unlockBatchEnvList(envList);
+            Py_DECREF(envList);
+            return nullptr;
+        }
+    }
+
+    // Process step
+    vector<CollisionResult> collisionResults;
+    // Rendering is skipped with null screen buffer.
+    void* screenBuffer = (screenArray != nullptr) ? PyArray_DATA(screenArray) : nullptr;
+    
+    Py_BEGIN_ALLOW_THREADS
+    stepBatch(batchEnvironment, agentId, cameraId, actions.data(),
+              collisionResults, screenBuffer, repeat);
+    Py_END_ALLOW_THREADS
+    
+    unlockBatchEnvList(envList);
+    Py_DECREF(envList);
+
+    // Create collision output array padded with -1
+    vector< vector<int> > collisionIdsList(envSize);
+    int maxCollisionSize = 0;
+    for(int i=0; i<envSize; ++i) {
+        collisionResults[i].getCollisionIds(agentId, collisionIdsList[i]);
+        int collisionSize = (int)collisionIdsList[i].size();
+        if( collisionSize > maxCollisionSize ) {
+            maxCollisionSize = collisionSize;
+        }
+    }
+
+    npy_intp collidedDims[2];
+    collidedDims[0] = envSize;
+    collidedDims[1] = maxCollisionSize;
+    
+    PyArrayObject* collidedArray = (PyArrayObject*)PyArray_SimpleNew(
+        2, // int nd
+        collidedDims, // collidedDims
+        NPY_INT32); // int typenum
+    if (collidedArray == nullptr) {
+        Py_XDECREF((PyObject*)screenArray);
+        return nullptr;
+    }
+
+    for(int i=0; i<envSize; ++i) {
+        const vector<int>& collisionIds = collisionIdsList[i];
+        for(int j=0; j<maxCollisionSize; ++j) {
+            int* collided = (int*)PyArray_GETPTR2(collidedArray, i, j);
+            if( j < (int)collisionIds.size() ) {
+                *collided = collisionIds[j];
+            } else {
+                *collided = -1;
+            }
+        }
+    }
+
+    // Create output dictionary
+    PyObject* resultDic = PyDict_New();
+    if (resultDic == nullptr) {
+        Py_XDECREF((PyObject*)screenArray);
+        Py_DECREF((PyObject*)collidedArray);
+        PyErr_NoMemory();
+        return nullptr;
+    }
+
+    // Put arrays to dictionary
+    PyDict_SetItemString(resultDic, "collided", (PyObject*)collidedArray);
+    if (screenArray != nullptr) {
+        PyDict_SetItemString(resultDic, "screen", (PyObject*)screenArray);
+    }
+
+    // Decrease ref count of arrays
+    Py_DECREF((PyObject*)collidedArray);
+    Py_XDECREF((PyObject*)screenArray);
+
+    return resultDic;
+}
+
+static PyObject* BatchEnv_observe(BatchEnvObject* self, PyObject* args, PyObject* kwds) {
+    int agentId;
+    int cameraId;
+    PyObject* outObj = nullptr;
+
+    // Get argument
+    const char* kwlist[] = {"agent_id", "camera_id", "out", nullptr};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "ii|O", const_cast<char**>(kwlist),
+                                     &agentId,
+                                     &cameraId,
+                                     &outObj)) {
+        return nullptr;
+    }
+
+    if (outObj == Py_None) {
+        outObj = nullptr;
+    }
+
+    if (self->batchEnvironment == nullptr || self->envList == nullptr) {
+        PyErr_SetString(PyExc_RuntimeError, "rodentia batch environment not setup");
+        return nullptr;
+    }
+
+    BatchEnvironment* batchEnvironment = self->batchEnvironment;
+
+    // Lock all environments until the rendering finishes.
+    PyObject* envList = self->envList;
+    Py_INCREF(envList);
+    lockBatchEnvList(envList);
+
+    // The batch may have been released while waiting for the locks.
+    if (self->envList != envList) {
+        unlockBatchEnvList(envList);
+        Py_DECREF(envList);
+        PyErr_SetString(PyExc_RuntimeError, "rodentia batch environment not setup");
+        return nullptr;
+    }
+
+    PyArrayObject* screenArray = getBatchScreenArray(batchEnvironment, cameraId, outObj);
+    if (screenArray == nullptr) {
+        unlockBatchEnvList(envList);
+        Py_DECREF(envList);
+        return nullptr;
+    }
+
+    void* screenBuffer = PyArray_DATA(screenArray);
+
+    Py_BEGIN_ALLOW_THREADS
+    renderBatch(batchEnvironment, agentId, cameraId, screenBuffer);
+    Py_END_ALLOW_THREADS
+
+    unlockBatchEnvList(envList);
+    Py_DECREF(envList);
+
+    return createScreenResult(screenArray);
+}
+
+// void release()
+// Env get_env(index)
+// dic step(agent_id, camera_id, actions, out, repeat, render)
+// dic observe(agent_id, camera_id, out)
+
+static PyMethodDef BatchEnvObject_methods[] = {
+    {"get_env", (PyCFunction)BatchEnv_get_env, METH_VARARGS | METH_KEYWORDS,
+     "Get Env object of the indexed environment"},
+    {"step", (PyCFunction)BatchEnv_step, METH_VARARGS | METH_KEYWORDS,
+     "Advance all the environments"},
+    {"observe", (PyCFunction)BatchEnv_observe, METH_VARARGS | METH_KEYWORDS,
+     "Render the agent views of all the environments"},
+    {"release", (PyCFunction)BatchEnv_release, METH_VARARGS | METH_KEYWORDS,
+     "Release batch environment"},
+    {nullptr}
+};
+
+
+static PyTypeObject rodentia_BatchEnvType = {
+    PyVarObject_HEAD_INIT(nullptr, 0) // ob_size
+    "rodentia_module.BatchEnv",       // tp_name
+    sizeof(BatchEnvObject),        // tp_basicsize
+    0,                             // tp_itemsize
+    (destructor)BatchEnvObject_dealloc, // tp_dealloc
+    0,                             // tp_print
+    0,                             // tp_getattr
+    0,                             // tp_setattr
+    0,                             // tp_compare
+    0,                             // tp_repr
+    0,                             // tp_as_number
+    0,                             // tp_as_sequence
+    0,                             // tp_as_mapping
+    0,                             // tp_hash
+    0,                             // tp_call
+    0,                             // tp_str
+    0,                             // tp_getattro
+    0,                             // tp_setattro
+    0,                             // tp_as_buffer
+    Py_TPFLAGS_DEFAULT,            // tp_flags
+    "BatchEnv object",             // tp_doc
+    0,                             // tp_traverse
+    0,                             // tp_clear
+    0,                             // tp_richcompare
+    0,                             // tp_weaklistoffset
+    0,                             // tp_iter
+    0,                             // tp_iternext
+    BatchEnvObject_methods,        // tp_methods
+    0,                             // tp_members
+    0,                             // tp_getset
+    0,                             // tp_base
+    0,                             // tp_dict
+    0,                             // tp_descr_get
+    0,                             // tp_descr_set
+    0,                             // tp_dictoffset
+    (initproc)BatchEnv_init,       // tp_init
+    0,                             // tp_alloc
+    BatchEnvObject_new,            // tp_new
+};
+
+
+
 
 static PyObject* moduleVersion(PyObject* self) {
     return Py_BuildValue("s", RODENTIA_MODULE_VERSION);
@@ -1255,6 +3033,13 @@ PyMODINIT_FUNC PyInit_rodentia_module() {
     Py_INCREF(&rodentia_EnvType);
     PyModule_AddObject(m, "Env", (PyObject*)&rodentia_EnvType);
 
+    if (PyType_Ready(&rodentia_BatchEnvType) < 0) {
+        return m;
+    }
+    
+    Py_INCREF(&rodentia_BatchEnvType);
+    PyModule_AddObject(m, "BatchEnv", (PyObject*)&rodentia_BatchEnvType);
+
     import_array();
 
     return m;
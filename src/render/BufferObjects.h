@@ -81,6 +81,14 @@ public:
         glBufferSubData(GL_ARRAY_BUFFER, 0, sizeof(float) * arraySize, array);
     }
 
+    // Read back the buffer data. (Bound to the copy read target not to disturb the
+    // array buffer binding)
+    void read(float* array, int arraySize) const {
+        glBindBuffer(GL_COPY_READ_BUFFER, handle);
+        glGetBufferSubData(GL_COPY_READ_BUFFER, 0, sizeof(float) * arraySize, array);
+        glBindBuffer(GL_COPY_READ_BUFFER, 0);
+    }
+
     void bind() const {
         glBindBuffer(GL_ARRAY_BUFFER, handle);
     }
@@ -90,6 +98,69 @@ public:
     }
 };
 
+// Buffer accessed as texture in shaders. (samplerBuffer with RGBA32F texels)
+class TextureBuffer {
+private:
+    GLuint bufferHandle;
+    GLuint textureHandle;
+
+public:
+    TextureBuffer()
+        :
+        bufferHandle(0),
+        textureHandle(0) {
+    }
+    
+    ~TextureBuffer() {
+        release();
+    }
+
+    void release() {
+        if( textureHandle > 0 ) {
+            glDeleteTextures(1, &textureHandle);
+            textureHandle = 0;
+        }
+        if( bufferHandle > 0 ) {
+            glDeleteBuffers(1, &bufferHandle);
+            bufferHandle = 0;
+        }
+    }
+
+    bool isInitialized() const {
+        return bufferHandle > 0;
+    }
+    
+    // format is GL_RGBA32F (4 floats for each texel) or GL_R32F (1 float)
+    bool init(GLenum format=GL_RGBA32F) {
+        glGenBuffers(1, &bufferHandle);
+        glBindBuffer(GL_TEXTURE_BUFFER, bufferHandle);
+        glBufferData(GL_TEXTURE_BUFFER, 0, nullptr, GL_STREAM_DRAW);
+
+        glGenTextures(1, &textureHandle);
+        glBindTexture(GL_TEXTURE_BUFFER, textureHandle);
+        glTexBuffer(GL_TEXTURE_BUFFER, format, bufferHandle);
+        
+        glBindTexture(GL_TEXTURE_BUFFER, 0);
+        glBindBuffer(GL_TEXTURE_BUFFER, 0);
+        return glGetError() == GL_NO_ERROR;
+    }
+
+    // Replace the whole buffer data. (Orphan the previous storage)
+    void update(const float* array, int arraySize) {
+        glBindBuffer(GL_TEXTURE_BUFFER, bufferHandle);
+        glBufferData(GL_TEXTURE_BUFFER, sizeof(float) * arraySize, array, GL_STREAM_DRAW);
+        glBindBuffer(GL_TEXTURE_BUFFER, 0);
+    }
+
+    void bind() const {
+        glBindTexture(GL_TEXTURE_BUFFER, textureHandle);
+    }
+
+    void unbind() const {
+        glBindTexture(GL_TEXTURE_BUFFER, 0);
+    }
+};
+
 class IndexBuffer {
 private:
     GLuint handle;
@@ -119,6 +190,22 @@ public:
         return glGetError() == GL_NO_ERROR;
     }
 
+    bool init(const unsigned int* array, int arraySize) {
+        glGenBuffers(1, &handle);
+        bind();
+        glBufferData(GL_ELEMENT_ARRAY_BUFFER, sizeof(unsigned int) * arraySize,
+                     array, GL_STATIC_DRAW);
+        return glGetError() == GL_NO_ERROR;
+    }
+
+    // Read back the buffer data. (Bound to the copy read target, because the element
+    // array buffer binding belongs to the bound vertex array)
+    void read(void* array, int byteSize) const {
+        glBindBuffer(GL_COPY_READ_BUFFER, handle);
+        glGetBufferSubData(GL_COPY_READ_BUFFER, 0, byteSize, array);
+        glBindBuffer(GL_COPY_READ_BUFFER, 0);
+    }
+
     void bind() const{
         glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, handle);
     }
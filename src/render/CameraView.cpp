@@ -1,9 +1,15 @@
 #include "CameraView.h"
 
+#include <string.h>
+
 /**
  * <!--  CameraView():  -->
  */
-CameraView::CameraView() {
+CameraView::CameraView()
+    :
+    shadow(true),
+    shadowDepthCached(false),
+    cachedShadowCasterHash(0) {
 }
 
 /**
@@ -11,7 +17,11 @@ CameraView::CameraView() {
  */
 bool CameraView::init(int width, int height, const Vector3f& bgColor,
                       float nearClip, float farClip, float focalLength,
-                      int shadowBufferWidth) {
+                      int shadowBufferWidth, bool shadow_,
+                      RenderTarget::DepthType depthType, bool segmentation,
+                      RenderTarget::OutputFormat outputFormat, int supersampling) {
+    shadow = shadow_;
+    
     // Setup caemra
     float ratio = width / (float) height;
 
@@ -19,7 +29,9 @@ bool CameraView::init(int width, int height, const Vector3f& bgColor,
     camera.initPerspective(nearClip, farClip, focalLength, ratio, flipping);
 
     // Setup render target
-    bool ret = renderTarget.init(width, height, bgColor, shadowBufferWidth);
+    bool ret = renderTarget.init(width, height, bgColor, shadowBufferWidth,
+                                 depthType, segmentation, nearClip, farClip,
+                                 outputFormat, supersampling);
     return ret;
 }
 
@@ -27,6 +39,7 @@ bool CameraView::init(int width, int height, const Vector3f& bgColor,
  * <!--  release():  -->
  */
 void CameraView::release() {
+    shadowDepthCached = false;
     renderTarget.release();
 }
 
@@ -37,6 +50,31 @@ void CameraView::prepareShadowDepthRendering() {
     renderTarget.prepareShadowDepthRendering();
 }
 
+/**
+ * <!--  isShadowDepthCached():  -->
+ *
+ * Whether the shadow depth buffer already has the depth of the shadow casters drawn
+ * with the light matrix.
+ */
+bool CameraView::isShadowDepthCached(const Matrix4f& depthViewProjectionMat,
+                                     uint64_t shadowCasterHash) const {
+    return shadowDepthCached &&
+        shadowCasterHash == cachedShadowCasterHash &&
+        memcmp(depthViewProjectionMat.getPointer(),
+               cachedDepthViewProjectionMat.getPointer(),
+               sizeof(float) * 16) == 0;
+}
+
+/**
+ * <!--  setShadowDepthCached():  -->
+ */
+void CameraView::setShadowDepthCached(const Matrix4f& depthViewProjectionMat,
+                                      uint64_t shadowCasterHash) {
+    shadowDepthCached = true;
+    cachedDepthViewProjectionMat.set(depthViewProjectionMat);
+    cachedShadowCasterHash = shadowCasterHash;
+}
+
 /**
  * <!--  prepareRendering():  -->
  */
@@ -44,9 +82,46 @@ void CameraView::prepareRendering() {
     renderTarget.prepareRendering();
 }
 
+/**
+ * <!--  resolve():  -->
+ */
+void CameraView::resolve(const ResolveShader* resolveShader) {
+    renderTarget.resolve(resolveShader);
+}
+
 /**
  * <!--  finishRendering():  -->
  */
-void CameraView::finishRendering() {
-    renderTarget.finishRendering();
+void CameraView::finishRendering(void* dstBuffer,
+                                 void* depthBuffer,
+                                 int* objectIdBuffer) {
+    renderTarget.finishRendering(dstBuffer, depthBuffer, objectIdBuffer);
+}
+
+/**
+ * <!--  prepareAtlasRendering():  -->
+ */
+bool CameraView::prepareAtlasRendering(int index, int size) {
+    return renderTarget.prepareAtlasRendering(index, size);
+}
+
+/**
+ * <!--  finishAtlasRendering():  -->
+ */
+void CameraView::finishAtlasRendering(void* dstBuffer) {
+    renderTarget.finishAtlasRendering(dstBuffer);
+}
+
+/**
+ * <!--  finishRenderingAsync():  -->
+ */
+bool CameraView::finishRenderingAsync() {
+    return renderTarget.finishRenderingAsync();
+}
+
+/**
+ * <!--  fetchAsync():  -->
+ */
+bool CameraView::fetchAsync(void* dstBuffer) {
+    return renderTarget.fetchAsync(dstBuffer);
 }
@@ -2,6 +2,8 @@
 #ifndef CAMERAVIEW_HEADER
 #define CAMERAVIEW_HEADER
 
+#include <stdint.h>
+
 #include "Matrix4f.h"
 #include "Vector3f.h"
 #include "Camera.h"
@@ -12,12 +14,21 @@ class CameraView {
 private:
     Camera camera;
     RenderTarget renderTarget;
+    // Whether the shadow depth is rendered and used
+    bool shadow;
+
+    // Light matrix and shadow caster hash of the scene in the shadow depth buffer
+    bool shadowDepthCached;
+    Matrix4f cachedDepthViewProjectionMat;
+    uint64_t cachedShadowCasterHash;
 
 public:
     CameraView();
     bool init(int width, int height, const Vector3f& bgColor,
               float nearClip, float farClip, float focalLength,
-              int shadowBufferWidth);
+              int shadowBufferWidth, bool shadow_,
+              RenderTarget::DepthType depthType, bool segmentation,
+              RenderTarget::OutputFormat outputFormat, int supersampling);
     void release();
 
     void setCameraMat(const Matrix4f& mat) {
@@ -36,6 +47,12 @@ public:
         return camera.getProjectionMat();
     }
 
+    bool isShadowEnabled() const { return shadow; }
+    RenderTarget::DepthType getDepthType() const { return renderTarget.getDepthType(); }
+    bool isSegmentationEnabled() const { return renderTarget.isSegmentationEnabled(); }
+    int getChannelSize() const { return renderTarget.getChannelSize(); }
+    bool needsResolve() const { return renderTarget.needsResolve(); }
+
     int getFrameBufferWidth()  const { return renderTarget.getFrameBufferWidth();  }
     int getFrameBufferHeight() const { return renderTarget.getFrameBufferHeight(); }
     
@@ -48,8 +65,26 @@ public:
     }
     
     void prepareShadowDepthRendering();
+    bool isShadowDepthCached(const Matrix4f& depthViewProjectionMat,
+                             uint64_t shadowCasterHash) const;
+    void setShadowDepthCached(const Matrix4f& depthViewProjectionMat,
+                              uint64_t shadowCasterHash);
     void prepareRendering();
-    void finishRendering();
+    void resolve(const ResolveShader* resolveShader);
+    void finishRendering(void* dstBuffer=nullptr,
+                         void* depthBuffer=nullptr,
+                         int* objectIdBuffer=nullptr);
+    bool prepareAtlasRendering(int index, int size);
+    void finishAtlasRendering(void* dstBuffer);
+    bool finishRenderingAsync();
+    bool fetchAsync(void* dstBuffer=nullptr);
+
+    bool canFinishRenderingAsync() const {
+        return renderTarget.canFinishRenderingAsync();
+    }
+    int getPendingAsyncSize() const {
+        return renderTarget.getPendingAsyncSize();
+    }
 };
 
 #endif
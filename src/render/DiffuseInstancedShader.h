@@ -0,0 +1,25 @@
+// -*- C++ -*-
+#ifndef DIFFUSEINSTANCEDSHADER_HEADER
+#define DIFFUSEINSTANCEDSHADER_HEADER
+
+#include "Shader.h"
+
+// DiffuseShader drawing multiple instances with one draw call.
+// Model matrices of the instances are read from the texture buffer.
+class DiffuseInstancedShader : public Shader {
+private:
+    int vpMatrixHandle;
+    int invLightDirHandle;
+    int lightColorHandle;
+    int ambientColorHandle;
+    int textureHandle;
+    int instanceMatricesHandle;
+    int instanceObjectIdsHandle;
+    
+public:
+    virtual bool init() override;
+    virtual void prepare(const RenderingContext& context) const override;
+    virtual void setup(const RenderingContext& context) const override;
+};
+
+#endif
@@ -11,24 +11,31 @@ static const char* vertShaderSrc =
     "layout(location = 0) in vec4 vertexPosition; "
     "layout(location = 1) in vec3 vertexNormal; "
     "layout(location = 2) in vec2 vertexTexCoord; "
+    "layout(location = 3) in float vertexObjectId; "
     ""
     "out vec2 texCoord; "
+    "flat out int varyObjectId; "
     "out vec4 varyColor; "
     ""
     "uniform mat4 modelViewProjectionMatrix; "
     "uniform mat3 normalMatrix; "
     "uniform vec3 invLightDir; " // Already normalized
+    "uniform vec4 lightColor; "
+    "uniform vec4 ambientColor; "
     ""
     "void main() "
     "{ "
     "    vec3 normal = normalize(normalMatrix * vertexNormal); "
-    "    vec4 diffuseColor = vec4(1.0, 1.0, 1.0, 1.0); "
-    "    vec4 ambientColor = vec4(0.3, 0.3, 0.3, 1.0); "
+    "    float diffuse = dot(normal, normalize(invLightDir));"
+    "    "
+    "    varyColor = ambientColor; "
+    "    "
+    "    if(diffuse > 0.0) { "
+    "        varyColor += lightColor * diffuse; "
+    "    } "
     "    "
-    "    float nDotL = max(0.0, dot(normal, invLightDir));"
     "    texCoord = vertexTexCoord; "
-    "    varyColor = diffuseColor * nDotL + ambientColor; "
-    "    varyColor.w = 1.0; "
+    "    varyObjectId = int(vertexObjectId); "
     "    "
     "    gl_Position = modelViewProjectionMatrix * vertexPosition; "
     "} ";
@@ -38,7 +45,9 @@ static const char* fragShaderSrc =
     " "
     "in vec2 texCoord;  "
     "in vec4 varyColor; "
-    "out vec3 color; "  
+    "flat in int varyObjectId; "
+    "layout(location = 0) out vec3 color; "
+    "layout(location = 1) out int objectId; "
     " "
     "uniform sampler2D texSampler2D; "
     " "
@@ -46,6 +55,7 @@ static const char* fragShaderSrc =
     "{ "
     "    vec4 baseColor = texture(texSampler2D, texCoord); "
     "    color = (baseColor * varyColor).rgb; "
+    "    objectId = varyObjectId; "
     "} ";
 
 /**
@@ -105,4 +115,7 @@ void DiffuseShader::setup(const RenderingContext& context) const {
     // Set model view projection matrix
     glUniformMatrix4fv( mvpMatrixHandle, 1, GL_FALSE,
                         (const GLfloat*)modelViewProjectionMat.getPointer() );
+
+    // Object id for all the vertices (unless the vertex array has object ids)
+    glVertexAttrib1f(3, (float)context.getObjectId());
 }
@@ -0,0 +1,127 @@
+#include "DrawBatch.h"
+
+#include "MeshFace.h"
+#include "Material.h"
+#include "ShaderManager.h"
+#include "RenderingContext.h"
+
+
+/**
+ * <!--  release():  -->
+ */
+void DrawBatchList::release() {
+    batches.clear();
+    instanceBuffer.release();
+    instanceObjectIdBuffer.release();
+}
+
+/**
+ * <!--  clear():  -->
+ *
+ * Clear instances of the batches. (Batches are kept to reuse the allocated buffers.)
+ */
+void DrawBatchList::clear() {
+    for(auto itr=batches.begin(); itr!=batches.end(); ++itr) {
+        DrawBatch& batch = itr->second;
+        batch.material = nullptr;
+        batch.modelMats.clear();
+        batch.objectIds.clear();
+    }
+}
+
+/**
+ * <!--  add():  -->
+ */
+void DrawBatchList::add(MeshFace* meshFace, const Matrix4f& modelMat, int objectId,
+                        const RenderingContext& context) {
+    Material* material = meshFace->getMaterial();
+    const MeshFaceData* meshFaceData = &meshFace->getMeshFaceData();
+    
+    DrawBatchKey key(material->getShader(context), material->getTexture(), meshFaceData);
+    DrawBatch& batch = batches[key];
+    batch.meshFaceData = meshFaceData;
+    batch.material = material;
+    batch.modelMats.push_back(modelMat);
+    batch.objectIds.push_back(objectId);
+}
+
+/**
+ * <!--  draw():  -->
+ *
+ * Draw the batches. Batches with multiple instances are drawn with the instanced
+ * shader if available. Returns the number of draw calls.
+ */
+int DrawBatchList::draw(RenderingContext& context, ShaderManager& shaderManager) {
+    int drawCallSize = 0;
+
+    // GL state may have been changed since the last draw.
+    context.resetState();
+    
+    for(auto itr=batches.begin(); itr!=batches.end(); ++itr) {
+        DrawBatch& batch = itr->second;
+        int instanceSize = (int)batch.modelMats.size();
+        if( instanceSize == 0 ) {
+            continue;
+        }
+
+        // Material shader is replaced for the camera view without shadow.
+        const Shader* shader = batch.material->getShader(context);
+        if( !context.isShadowEnabled() ) {
+            shader = shaderManager.getNoShadowShader(shader);
+        }
+
+        Shader* instancedShader = nullptr;
+        if( instanceSize > 1 ) {
+            instancedShader = shaderManager.getInstancedShader(shader);
+        }
+
+        if( instancedShader == nullptr ) {
+            // Draw each instance with the model matrix uniforms.
+            for(int i=0; i<instanceSize; ++i) {
+                context.setModelMat(batch.modelMats[i]);
+                context.setObjectId(batch.objectIds[i]);
+                batch.material->draw(*batch.meshFaceData, context, shader);
+                drawCallSize += 1;
+            }
+            continue;
+        }
+
+        if( !instanceBuffer.isInitialized() ) {
+            instanceBuffer.init();
+        }
+        if( context.isSegmentationEnabled() && !instanceObjectIdBuffer.isInitialized() ) {
+            instanceObjectIdBuffer.init(GL_R32F);
+        }
+
+        for(int i=0; i<instanceSize; i+=MAX_INSTANCE_SIZE) {
+            int size = instanceSize - i;
+            if( size > MAX_INSTANCE_SIZE ) {
+                size = MAX_INSTANCE_SIZE;
+            }
+
+            // Matrix4f is 16 floats in column major order.
+            static_assert(sizeof(Matrix4f) == sizeof(float) * 16,
+                          "Matrix4f must be 16 floats");
+            instanceBuffer.update(batch.modelMats[i].getPointer(), size * 16);
+            glActiveTexture(GL_TEXTURE2);
+            instanceBuffer.bind();
+
+            if( context.isSegmentationEnabled() ) {
+                // Object ids are exact in float. (less than 2^24)
+                instanceObjectIds.assign(batch.objectIds.begin() + i,
+                                         batch.objectIds.begin() + i + size);
+                instanceObjectIdBuffer.update(instanceObjectIds.data(), size);
+                glActiveTexture(GL_TEXTURE3);
+                instanceObjectIdBuffer.bind();
+            }
+            glActiveTexture(GL_TEXTURE0);
+            
+            batch.material->drawInstanced(*batch.meshFaceData, context,
+                                          instancedShader, size);
+            drawCallSize += 1;
+        }
+    }
+
+    context.bindVertexArray(nullptr);
+    return drawCallSize;
+}
@@ -0,0 +1,70 @@
+// -*- C++ -*-
+#ifndef DRAWBATCH_HEADER
+#define DRAWBATCH_HEADER
+
+#include <vector>
+#include <map>
+#include <tuple>
+using namespace std;
+
+#include "Matrix4f.h"
+#include "BufferObjects.h"
+
+class MeshFace;
+class MeshFaceData;
+class Material;
+class Texture;
+class Shader;
+class ShaderManager;
+class RenderingContext;
+
+
+//---------------------------
+//       [DrawBatch]
+//---------------------------
+// Instances of a mesh face sharing the same mesh data, texture and shaders.
+class DrawBatch {
+public:
+    const MeshFaceData* meshFaceData;
+    Material* material;
+    vector<Matrix4f> modelMats;
+    vector<int> objectIds;
+
+    DrawBatch()
+        :
+        meshFaceData(nullptr),
+        material(nullptr) {
+    }
+};
+
+
+//---------------------------
+//     [DrawBatchList]
+//---------------------------
+class DrawBatchList {
+private:
+    // <shader, texture, meshFaceData>
+    // Batches are drawn in the order of the key, so that draws sharing shader and
+    // texture are consecutive and their binds are skipped.
+    typedef tuple<const Shader*, const Texture*, const MeshFaceData*> DrawBatchKey;
+
+    // Max instances in one instanced draw call. (4 texels for each instance
+    // must fit in GL_MAX_TEXTURE_BUFFER_SIZE, which is at least 65536)
+    static const int MAX_INSTANCE_SIZE = 4096;
+
+    map<DrawBatchKey, DrawBatch> batches;
+    // Model matrices of the instances bound to the texture unit 2
+    TextureBuffer instanceBuffer;
+    // Object ids of the instances bound to the texture unit 3 (for segmentation)
+    TextureBuffer instanceObjectIdBuffer;
+    vector<float> instanceObjectIds;
+
+public:
+    void release();
+    void clear();
+    void add(MeshFace* meshFace, const Matrix4f& modelMat, int objectId,
+             const RenderingContext& context);
+    int draw(RenderingContext& context, ShaderManager& shaderManager);
+};
+
+#endif
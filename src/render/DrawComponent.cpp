@@ -34,6 +34,29 @@ void DrawComponent::draw(RenderingContext& context, const Matrix4f& rigidBodyMat
     mesh->draw(context);
 }
 
+/**
+ * <!--  addToBatch():  -->
+ */
+void DrawComponent::addToBatch(DrawBatchList& batchList, const Matrix4f& rigidBodyMat,
+                               int objectId, const RenderingContext& context) const {
+    Matrix4f modelMat;
+    modelMat.mul(rigidBodyMat, scaleMat);
+
+    mesh->addToBatch(batchList, modelMat, objectId, context);
+}
+
+/**
+ * <!--  addToStaticBatch():  -->
+ */
+void DrawComponent::addToStaticBatch(StaticBatch& staticBatch,
+                                     const Matrix4f& rigidBodyMat,
+                                     int objectId) const {
+    Matrix4f modelMat;
+    modelMat.mul(rigidBodyMat, scaleMat);
+
+    mesh->addToStaticBatch(staticBatch, modelMat, objectId);
+}
+
 /**
  * <!--  calcBoundingBox():  -->
  */
@@ -12,6 +12,8 @@ class Mesh;
 class RenderingContext;
 class BoundingBox;
 class Material;
+class DrawBatchList;
+class StaticBatch;
 
 class DrawComponent {
 private:
@@ -22,6 +24,10 @@ public:
     DrawComponent(Mesh* mesh_, const Vector3f& scale);
     ~DrawComponent();
     void draw(RenderingContext& context, const Matrix4f& rigidBodyMat) const;
+    void addToBatch(DrawBatchList& batchList, const Matrix4f& rigidBodyMat, int objectId,
+                    const RenderingContext& context) const;
+    void addToStaticBatch(StaticBatch& staticBatch, const Matrix4f& rigidBodyMat,
+                          int objectId) const;
     void calcBoundingBox(const Matrix4f& rigidBodyMat,
                          BoundingBox& boundingBox) const;
     void replaceMaterials(const vector<Material*>& materials);
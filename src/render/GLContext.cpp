@@ -14,7 +14,7 @@ GLContext::GLContext()
 /**
  * <!--  init():  -->
  */
-bool GLContext::init(int /*width*/, int /*height*/) {
+bool GLContext::init(int /*width*/, int /*height*/, GLBackend /*backend*/) {
     CGLPixelFormatAttribute attributes[4] = {
         kCGLPFAAccelerated,
         kCGLPFAOpenGLProfile,       
@@ -71,28 +71,94 @@ void GLContext::release() {
 
 #else // defined(__APPLE__)
 
+#include <stdlib.h>
+#include <string.h>
+
+#if defined(USE_EGL)
+#include <EGL/eglext.h>
+
+#ifndef EGL_PLATFORM_SURFACELESS_MESA
+#define EGL_PLATFORM_SURFACELESS_MESA 0x31DD
+#endif
+#endif
+
 /**
  * <!--  GLContext():  -->
  */
 GLContext::GLContext()
     :
+    backend(GL_BACKEND_GLX),
     display(NULL),
     context(0),
     pbuffer(0),
+#if defined(USE_EGL)
+    eglDisplay(EGL_NO_DISPLAY),
+    eglContext(EGL_NO_CONTEXT),
+    eglSurface(EGL_NO_SURFACE),
+#endif
     contextInitialized(false) {
 }
 
-typedef GLXContext (*glXCreateContextAttribsARBProc)(Display*, GLXFBConfig, GLXContext, Bool, const int*);
+/**
+ * <!--  selectBackend():  -->
+ *
+ * Resolve GL_BACKEND_AUTO with RODENTIA_GL_BACKEND and DISPLAY environment variables.
+ */
+GLBackend GLContext::selectBackend(GLBackend backend_) const {
+    if( backend_ != GL_BACKEND_AUTO ) {
+        return backend_;
+    }
+
+    const char* backendName = getenv("RODENTIA_GL_BACKEND");
+    if( backendName != NULL ) {
+        if( strcmp(backendName, "egl") == 0 ) {
+            return GL_BACKEND_EGL;
+        } else if( strcmp(backendName, "glx") == 0 ) {
+            return GL_BACKEND_GLX;
+        } else if( strcmp(backendName, "") != 0 && strcmp(backendName, "auto") != 0 ) {
+            printf("Unknown RODENTIA_GL_BACKEND: %s\n", backendName);
+        }
+    }
+
+#if defined(USE_EGL)
+    // Use EGL when there is no X server.
+    const char* displayName = getenv("DISPLAY");
+    if( displayName == NULL || strcmp(displayName, "") == 0 ) {
+        return GL_BACKEND_EGL;
+    }
+#endif
+    
+    return GL_BACKEND_GLX;
+}
 
 /**
  * <!--  init():  -->
  */
-bool GLContext::init(int width, int height) {
+bool GLContext::init(int width, int height, GLBackend backend_) {
+    backend = selectBackend(backend_);
+    
+    if( backend == GL_BACKEND_EGL ) {
+        return initEGL(width, height);
+    } else {
+        return initGLX(width, height);
+    }
+}
+
+typedef GLXContext (*glXCreateContextAttribsARBProc)(Display*, GLXFBConfig, GLXContext, Bool, const int*);
+
+/**
+ * <!--  initGLX():  -->
+ */
+bool GLContext::initGLX(int width, int height) {
     glXCreateContextAttribsARBProc glXCreateContextAttribsARB =
         (glXCreateContextAttribsARBProc)glXGetProcAddressARB((const GLubyte*)"glXCreateContextAttribsARB");
 
     const char *displayName = NULL;
     display = XOpenDisplay(displayName);
+    if( display == NULL ) {
+        printf("Failed to open X display. (Set RODENTIA_GL_BACKEND=egl to run without X server)\n");
+        return false;
+    }
 
     static int visualAttribs[] = { None };
     int numberOfFramebufferConfigurations = 0;
@@ -141,22 +207,155 @@ bool GLContext::init(int width, int height) {
     
     return true;
 }
+
+#if defined(USE_EGL)
+
+/**
+ * <!--  initEGL():  -->
+ *
+ * Create EGL context without X server. Mesa surfaceless platform is used if available,
+ * so that it also works with the software rasterizer on machines without GPU.
+ */
+bool GLContext::initEGL(int width, int height) {
+    const char* clientExtensions = eglQueryString(EGL_NO_DISPLAY, EGL_EXTENSIONS);
+    
+    PFNEGLGETPLATFORMDISPLAYEXTPROC eglGetPlatformDisplayEXT =
+        (PFNEGLGETPLATFORMDISPLAYEXTPROC)eglGetProcAddress("eglGetPlatformDisplayEXT");
+    
+    if( eglGetPlatformDisplayEXT != NULL &&
+        clientExtensions != NULL &&
+        strstr(clientExtensions, "EGL_MESA_platform_surfaceless") != NULL ) {
+        eglDisplay = eglGetPlatformDisplayEXT(EGL_PLATFORM_SURFACELESS_MESA,
+                                              EGL_DEFAULT_DISPLAY,
+                                              NULL);
+    } else {
+        eglDisplay = eglGetDisplay(EGL_DEFAULT_DISPLAY);
+    }
+    
+    if( eglDisplay == EGL_NO_DISPLAY ) {
+        printf("Failed to get EGL display.\n");
+        return false;
+    }
+
+    EGLint majorVersion, minorVersion;
+    if( !eglInitialize(eglDisplay, &majorVersion, &minorVersion) ) {
+        printf("Failed to initialize EGL.\n");
+        return false;
+    }
+
+    if( !eglBindAPI(EGL_OPENGL_API) ) {
+        printf("Failed to bind OpenGL API to EGL.\n");
+        return false;
+    }
+
+    static const EGLint configAttribs[] = {
+        EGL_SURFACE_TYPE, EGL_PBUFFER_BIT,
+        EGL_RENDERABLE_TYPE, EGL_OPENGL_BIT,
+        EGL_RED_SIZE, 8,
+        EGL_GREEN_SIZE, 8,
+        EGL_BLUE_SIZE, 8,
+        EGL_DEPTH_SIZE, 24,
+        EGL_NONE
+    };
+
+    // Rendering is done with offscreen frame buffers, so the pbuffer surface is only
+    // created when the display provides a config for it. Otherwise the context is
+    // made current without surface.
+    EGLConfig config = (EGLConfig)0;
+    EGLint numConfigs = 0;
+    if( !eglChooseConfig(eglDisplay, configAttribs, &config, 1, &numConfigs) ) {
+        numConfigs = 0;
+    }
+
+    static const EGLint contextAttribs[] = {
+        EGL_CONTEXT_MAJOR_VERSION, 3,
+        EGL_CONTEXT_MINOR_VERSION, 2,
+        EGL_CONTEXT_OPENGL_PROFILE_MASK, EGL_CONTEXT_OPENGL_CORE_PROFILE_BIT,
+        EGL_NONE
+    };
+
+    eglContext = eglCreateContext(eglDisplay,
+                                  numConfigs > 0 ? config : (EGLConfig)0,
+                                  EGL_NO_CONTEXT,
+                                  contextAttribs);
+    if( eglContext == EGL_NO_CONTEXT ) {
+        printf("Failed to create EGL context.\n");
+        return false;
+    }
+
+    if( numConfigs > 0 ) {
+        const EGLint pbufferAttribs[] = {
+            EGL_WIDTH, width,
+            EGL_HEIGHT, height,
+            EGL_NONE,
+        };
+        eglSurface = eglCreatePbufferSurface(eglDisplay, config, pbufferAttribs);
+    }
+
+    contextInitialized = true;
+
+    if( !eglMakeCurrent(eglDisplay, eglSurface, eglSurface, eglContext) ) {
+        printf("Failed to EGL context make current.\n");
+        return false;
+    }
+
+    // Load glad
+    bool ret = gladLoadGLLoader((GLADloadproc)eglGetProcAddress);
+    if( !ret ) {
+        printf("Failed to init glad.\n");
+        return false;
+    }
+    
+    return true;
+}
+
+#else // defined(USE_EGL)
+
+/**
+ * <!--  initEGL():  -->
+ */
+bool GLContext::initEGL(int /*width*/, int /*height*/) {
+    printf("EGL backend is not available. (EGL library was not found at build time)\n");
+    return false;
+}
+
+#endif // defined(USE_EGL)
     
 /**
  * <!--  release():  -->
  */
 void GLContext::release() {
-    if( contextInitialized ) {
-        glXMakeContextCurrent(display, 0, 0, 0);
-        // TODO: glxDestroyPbuffer function not found?
-        //glxDestroyPbuffer(display, pbuffer);
-        glXDestroyContext(display, context);
-        XCloseDisplay(display);
+    if( !contextInitialized ) {
+        return;
+    }
+
+#if defined(USE_EGL)
+    if( backend == GL_BACKEND_EGL ) {
+        eglMakeCurrent(eglDisplay, EGL_NO_SURFACE, EGL_NO_SURFACE, EGL_NO_CONTEXT);
+        if( eglSurface != EGL_NO_SURFACE ) {
+            eglDestroySurface(eglDisplay, eglSurface);
+        }
+        eglDestroyContext(eglDisplay, eglContext);
+        // EGL display is shared in the process, so it is not terminated here.
 
-        display = NULL;
-        context = 0;        
-        pbuffer = 0;
+        eglDisplay = EGL_NO_DISPLAY;
+        eglContext = EGL_NO_CONTEXT;
+        eglSurface = EGL_NO_SURFACE;
+        contextInitialized = false;
+        return;
     }
+#endif
+    
+    glXMakeContextCurrent(display, 0, 0, 0);
+    // TODO: glxDestroyPbuffer function not found?
+    //glxDestroyPbuffer(display, pbuffer);
+    glXDestroyContext(display, context);
+    XCloseDisplay(display);
+
+    display = NULL;
+    context = 0;        
+    pbuffer = 0;
+    contextInitialized = false;
 }
 
 #endif // defined(__APPLE__)
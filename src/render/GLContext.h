@@ -4,6 +4,16 @@
 
 #include "glad/glad.h" // for glad
 
+// Backend to create GL context.
+// With GL_BACKEND_AUTO, the backend is selected with RODENTIA_GL_BACKEND environment
+// variable ("glx" or "egl"). If it is not set, GLX is used when DISPLAY is set and
+// EGL is used otherwise.
+enum GLBackend {
+    GL_BACKEND_AUTO,
+    GL_BACKEND_GLX,
+    GL_BACKEND_EGL,
+};
+
 #if defined(__APPLE__)
 
 #include <OpenGL/OpenGL.h>
@@ -17,7 +27,7 @@ private:
 
 public: 
     GLContext();
-    bool init(int width, int height);
+    bool init(int width, int height, GLBackend backend=GL_BACKEND_AUTO);
     void release();
 };
 
@@ -25,16 +35,35 @@ public:
 
 #include <GL/glx.h>
 
+#if defined(USE_EGL)
+#include <EGL/egl.h>
+#endif
+
 class GLContext {
 private:
+    GLBackend backend;
+    
+    // GLX
     Display* display;
     GLXContext context;
     GLXPbuffer pbuffer;
+
+#if defined(USE_EGL)
+    // EGL
+    EGLDisplay eglDisplay;
+    EGLContext eglContext;
+    EGLSurface eglSurface;
+#endif
+    
     bool contextInitialized;
 
+    GLBackend selectBackend(GLBackend backend_) const;
+    bool initGLX(int width, int height);
+    bool initEGL(int width, int height);
+
 public: 
     GLContext();
-    bool init(int width, int height);
+    bool init(int width, int height, GLBackend backend=GL_BACKEND_AUTO);
     void release();
 };
 
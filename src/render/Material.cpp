@@ -7,27 +7,71 @@
 
 /**
  * <!--  draw():  -->
+ *
+ * Shader, texture and vertex array are bound through the context, so that binds are
+ * skipped when they are same as the previous draw.
  */
 void Material::draw(const MeshFaceData& meshFaceData,
-                    const RenderingContext& context) {
+                    RenderingContext& context) {
+    draw(meshFaceData, context, getShader(context));
+}
 
+/**
+ * <!--  draw():  -->
+ *
+ * Draw with the shader replacing the shader of the material for the current path.
+ * (e.g. the shader without shadow)
+ */
+void Material::draw(const MeshFaceData& meshFaceData,
+                    RenderingContext& context,
+                    const Shader* shader_) {
     if( context.isRenderingShadow() ) {
-        glDisable(GL_TEXTURE_2D);
+        context.bindTexture(nullptr);
         
-        shadowDepthShader->use();
-        shadowDepthShader->setup(context);
-        meshFaceData.draw(true);
+        context.useShader(shader_);
+        shader_->setup(context);
+        meshFaceData.draw(context, true);
     } else {
-        if( texture != nullptr ) {
-            glEnable(GL_TEXTURE_2D);
-            glActiveTexture(GL_TEXTURE0);
-            texture->bind();
-        } else {
-            glDisable(GL_TEXTURE_2D);
-        }
+        context.bindTexture(texture);
         
-        shader->use();
-        shader->setup(context);
-        meshFaceData.draw(false);
+        context.useShader(shader_);
+        shader_->setup(context);
+        meshFaceData.draw(context, false);
+    }
+}
+
+/**
+ * <!--  drawInstanced():  -->
+ *
+ * Draw instances with the instanced version of the shader. Model matrices of the
+ * instances have to be bound to the texture unit 2 beforehand.
+ */
+void Material::drawInstanced(const MeshFaceData& meshFaceData,
+                             RenderingContext& context,
+                             const Shader* instancedShader,
+                             int instanceSize) {
+    if( context.isRenderingShadow() ) {
+        context.bindTexture(nullptr);
+        
+        context.useShader(instancedShader);
+        instancedShader->setup(context);
+        meshFaceData.drawInstanced(context, true, instanceSize);
+    } else {
+        context.bindTexture(texture);
+        
+        context.useShader(instancedShader);
+        instancedShader->setup(context);
+        meshFaceData.drawInstanced(context, false, instanceSize);
+    }
+}
+
+/**
+ * <!--  getShader():  -->
+ */
+const Shader* Material::getShader(const RenderingContext& context) const {
+    if( context.isRenderingShadow() ) {
+        return shadowDepthShader;
+    } else {
+        return shader;
     }
 }
@@ -26,7 +26,29 @@ public:
     }
 
     void draw(const MeshFaceData& meshFaceData,
-              const RenderingContext& context);
+              RenderingContext& context);
+    void draw(const MeshFaceData& meshFaceData,
+              RenderingContext& context,
+              const Shader* shader_);
+    void drawInstanced(const MeshFaceData& meshFaceData,
+                       RenderingContext& context,
+                       const Shader* instancedShader,
+                       int instanceSize);
+
+    const Texture* getTexture() const {
+        return texture;
+    }
+    // Material sharing the texture and shaders
+    Material* clone() const {
+        return new Material(texture, shader, shadowDepthShader);
+    }
+    bool isSame(const Material& material) const {
+        return texture == material.texture &&
+            shader == material.shader &&
+            shadowDepthShader == material.shadowDepthShader;
+    }
+    // Shader used in the current rendering path
+    const Shader* getShader(const RenderingContext& context) const;
 };
 
 #endif
@@ -4,6 +4,8 @@
 
 #include "MeshFace.h"
 #include "Matrix4f.h"
+#include "DrawBatch.h"
+#include "StaticBatch.h"
 
 
 Mesh::~Mesh() {
@@ -19,13 +21,29 @@ void Mesh::addMeshFace(MeshFace* meshFace) {
     boundingBox.merge(meshFace->getBoundingBox());
 }
 
-void Mesh::draw(const RenderingContext& context) const {
+void Mesh::draw(RenderingContext& context) const {
     int size = meshFaces.size();
     for(int i=0; i<size; ++i) {
         meshFaces[i]->draw(context);
     }   
 }
 
+void Mesh::addToBatch(DrawBatchList& batchList, const Matrix4f& modelMat, int objectId,
+                      const RenderingContext& context) const {
+    int size = meshFaces.size();
+    for(int i=0; i<size; ++i) {
+        batchList.add(meshFaces[i], modelMat, objectId, context);
+    }
+}
+
+void Mesh::addToStaticBatch(StaticBatch& staticBatch, const Matrix4f& modelMat,
+                            int objectId) const {
+    int size = meshFaces.size();
+    for(int i=0; i<size; ++i) {
+        staticBatch.add(meshFaces[i], modelMat, objectId);
+    }
+}
+
 void Mesh::replaceMaterials(const vector<Material*>& materials) {
     for(unsigned int i=0; i<materials.size(); ++i) {
         if( i < meshFaces.size() ) {
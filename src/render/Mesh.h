@@ -11,6 +11,8 @@ class MeshFace;
 class Matrix4f;
 class RenderingContext;
 class Material;
+class DrawBatchList;
+class StaticBatch;
 
 
 class Mesh {
@@ -22,7 +24,11 @@ public:
     Mesh() {}
     ~Mesh();
     void addMeshFace(MeshFace* meshFace);
-    void draw(const RenderingContext& context) const;
+    void draw(RenderingContext& context) const;
+    void addToBatch(DrawBatchList& batchList, const Matrix4f& modelMat, int objectId,
+                    const RenderingContext& context) const;
+    void addToStaticBatch(StaticBatch& staticBatch, const Matrix4f& modelMat,
+                          int objectId) const;
     const BoundingBox& getBoundingBox() const { return boundingBox; }
 
     void replaceMaterials(const vector<Material*>& materials);
@@ -24,7 +24,7 @@ MeshFace::~MeshFace() {
 /**
  * <!--  draw():  -->
  */
-void MeshFace::draw(const RenderingContext& context) {
+void MeshFace::draw(RenderingContext& context) {
     material->draw(meshFaceData, context);
 }
 
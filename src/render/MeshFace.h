@@ -19,9 +19,12 @@ public:
     MeshFace( Material* material_,
               const MeshFaceData& meshFaceData );
     ~MeshFace();
-    void draw(const RenderingContext& context);
+    void draw(RenderingContext& context);
     const BoundingBox& getBoundingBox() const;
     void replaceMaterial(Material* material_);
+
+    Material* getMaterial() { return material; }
+    const MeshFaceData& getMeshFaceData() const { return meshFaceData; }
 };
 
 #endif
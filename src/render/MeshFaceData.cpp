@@ -1,11 +1,16 @@
 #include "MeshFaceData.h"
+#include "RenderingContext.h"
 #include <string.h>
 #include <float.h>
 
 /**
  * <!--  MeshFaceData():  -->
  */
-MeshFaceData::MeshFaceData() {
+MeshFaceData::MeshFaceData()
+    :
+    verticesSize(0),
+    indicesSize(0),
+    indexType(GL_UNSIGNED_SHORT) {
 }
 
 /**
@@ -15,8 +20,50 @@ bool MeshFaceData::init( const float* vertices,
                          int verticesSize_,
                          const unsigned short* indices,
                          int indicesSize_ ) {
-    verticesSize = verticesSize_;
     indicesSize = indicesSize_;
+    indexType = GL_UNSIGNED_SHORT;
+
+    bool ret = indexBuffer.init(indices, indicesSize);
+    if(!ret) {
+        printf("Failed to init IndexBuffer\n");
+        return false;
+    }
+
+    return initVertices(vertices, verticesSize_);
+}
+
+/**
+ * <!--  init():  -->
+ *
+ * Init with 32bit indices. 16bit indices are used instead when all the vertices can
+ * be indexed with them.
+ */
+bool MeshFaceData::init( const float* vertices,
+                         int verticesSize_,
+                         const unsigned int* indices,
+                         int indicesSize_ ) {
+    if( verticesSize_ / 8 <= 65536 ) {
+        vector<unsigned short> shortIndices(indices, indices + indicesSize_);
+        return init(vertices, verticesSize_, shortIndices.data(), indicesSize_);
+    }
+    
+    indicesSize = indicesSize_;
+    indexType = GL_UNSIGNED_INT;
+
+    bool ret = indexBuffer.init(indices, indicesSize);
+    if(!ret) {
+        printf("Failed to init IndexBuffer\n");
+        return false;
+    }
+
+    return initVertices(vertices, verticesSize_);
+}
+
+/**
+ * <!--  initVertices():  -->
+ */
+bool MeshFaceData::initVertices(const float* vertices, int verticesSize_) {
+    verticesSize = verticesSize_;
 
     for(int i=0; i<verticesSize/8; ++i) {
         float vx = vertices[8*i+0];
@@ -28,12 +75,6 @@ bool MeshFaceData::init( const float* vertices,
     // Set GL buffer objects
     bool ret;
     
-    ret = indexBuffer.init(indices, indicesSize);
-    if(!ret) {
-        printf("Failed to init IndexBuffer\n");
-        return false;
-    }
-
     ret = vertexBuffer.init(vertices, verticesSize);
     if(!ret) {
         return false;
@@ -85,12 +126,36 @@ bool MeshFaceData::init( const float* vertices,
     return true;
 }
 
+/**
+ * <!--  initObjectIds():  -->
+ *
+ * Set the object id of each vertex to the vertex attribute 3. Without this, the object
+ * id of the drawing object is used for all the vertices.
+ */
+bool MeshFaceData::initObjectIds(const float* objectIds, int objectIdsSize) {
+    bool ret = objectIdBuffer.init(objectIds, objectIdsSize);
+    if(!ret) {
+        return false;
+    }
+
+    vertexArray.bind();
+    objectIdBuffer.bind();
+
+    glEnableVertexAttribArray(3);
+    glVertexAttribPointer(3, 1, GL_FLOAT, GL_FALSE, 4, (void*)0);
+
+    objectIdBuffer.unbind();
+    vertexArray.unbind();
+    return true;
+}
+
 /**
  * <!--  release():  -->
  */
 void MeshFaceData::release() {
     vertexBuffer.release();
     indexBuffer.release();
+    objectIdBuffer.release();
     vertexArray.release();
 
     depthVertexArray.release();
@@ -98,20 +163,47 @@ void MeshFaceData::release() {
 
 /**
  * <!--  draw():  -->
+ *
+ * The vertex array is left bound and unbound with the context after the drawing.
  */
-void MeshFaceData::draw(bool forShadow) const {
-    if( forShadow ) {
-        depthVertexArray.bind();
-    } else {
-        vertexArray.bind();
-    }
-    
-    glDrawElements( GL_TRIANGLES, indicesSize, GL_UNSIGNED_SHORT, 0 );
+void MeshFaceData::draw(RenderingContext& context, bool forShadow) const {
+    context.bindVertexArray(getVertexArray(forShadow));
+    glDrawElements( GL_TRIANGLES, indicesSize, indexType, 0 );
+}
 
-    if( forShadow ) {
-        depthVertexArray.unbind();
+/**
+ * <!--  drawInstanced():  -->
+ */
+void MeshFaceData::drawInstanced(RenderingContext& context, bool forShadow,
+                                 int instanceSize) const {
+    context.bindVertexArray(getVertexArray(forShadow));
+    glDrawElementsInstanced( GL_TRIANGLES, indicesSize, indexType, 0,
+                             instanceSize );
+}
+
+/**
+ * <!--  getVertices():  -->
+ *
+ * Read back the vertices. (x,y,z, nx,ny,nz, u,v for each vertex)
+ */
+void MeshFaceData::getVertices(vector<float>& vertices) const {
+    vertices.resize(verticesSize);
+    vertexBuffer.read(vertices.data(), verticesSize);
+}
+
+/**
+ * <!--  getIndices():  -->
+ *
+ * Read back the indices.
+ */
+void MeshFaceData::getIndices(vector<unsigned int>& indices) const {
+    if( indexType == GL_UNSIGNED_INT ) {
+        indices.resize(indicesSize);
+        indexBuffer.read(indices.data(), sizeof(unsigned int) * indicesSize);
     } else {
-        vertexArray.unbind();
+        vector<unsigned short> shortIndices(indicesSize);
+        indexBuffer.read(shortIndices.data(), sizeof(unsigned short) * indicesSize);
+        indices.assign(shortIndices.begin(), shortIndices.end());
     }
 }
 
@@ -2,25 +2,35 @@
 #ifndef MESHFACEDATA_HEADER
 #define MESHFACEDATA_HEADER
 
+#include <vector>
+using namespace std;
+
 #include "Vector3f.h"
 #include "BufferObjects.h"
 #include "BoundingBox.h"
 
+class RenderingContext;
+
 
 class MeshFaceData {
 private:
     int verticesSize;
     int indicesSize;
+    // GL_UNSIGNED_SHORT or GL_UNSIGNED_INT
+    GLenum indexType;
 
     BoundingBox boundingBox;
 
     VertexArray vertexArray;
     VertexBuffer vertexBuffer;
     IndexBuffer indexBuffer;
+    // Object id of each vertex (only for the merged static objects)
+    VertexBuffer objectIdBuffer;
 
     VertexArray depthVertexArray;
 
     void release();
+    bool initVertices(const float* vertices, int verticesSize_);
 
 public:
     MeshFaceData();
@@ -28,9 +38,23 @@ public:
               int verticesSize_,
               const unsigned short* indices,
               int indicesSize_ );
+    bool init(const float* vertices,
+              int verticesSize_,
+              const unsigned int* indices,
+              int indicesSize_ );
+    bool initObjectIds(const float* objectIds, int objectIdsSize);
     ~MeshFaceData();
-    void draw(bool forShadow) const;
+    void draw(RenderingContext& context, bool forShadow) const;
+    void drawInstanced(RenderingContext& context, bool forShadow, int instanceSize) const;
+    const VertexArray* getVertexArray(bool forShadow) const {
+        return forShadow ? &depthVertexArray : &vertexArray;
+    }
     const BoundingBox& getBoundingBox() const { return boundingBox; }
+    void getVertices(vector<float>& vertices) const;
+    void getIndices(vector<unsigned int>& indices) const;
+    int getVerticesSize() const { return verticesSize; }
+    int getIndicesSize()  const { return indicesSize;  }
+    GLenum getIndexType() const { return indexType;    }
 };
 
 #endif
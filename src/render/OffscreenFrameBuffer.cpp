@@ -9,7 +9,9 @@ OffscreenFrameBuffer::OffscreenFrameBuffer()
     :
     frameBufferId(0),
     colorRenderBufferId(0),
+    colorTextureId(0),
     depthRenderBufferId(0),
+    objectIdRenderBufferId(0),
     width(0),
     height(0) {
 }
@@ -23,17 +25,34 @@ OffscreenFrameBuffer::~OffscreenFrameBuffer() {
 
 /**
  * <!--  init():  -->
+ *
+ * When objectId is true, the object id render buffer is attached as the second color
+ * attachment and the fragment shaders write the object id into it.
+ * When colorTexture is true, the color is drawn into a texture to be sampled later.
  */
-bool OffscreenFrameBuffer::init(int width_, int height_) {
+bool OffscreenFrameBuffer::init(int width_, int height_, bool objectId,
+                                bool colorTexture) {
     width = width_;
     height = height_;
     
     release();
 
-    // Color render buffer
-    glGenRenderbuffers(1, &colorRenderBufferId);
-    glBindRenderbuffer(GL_RENDERBUFFER, colorRenderBufferId);
-    glRenderbufferStorage(GL_RENDERBUFFER, GL_RGB, width, height);
+    if( colorTexture ) {
+        // Color texture
+        glGenTextures(1, &colorTextureId);
+        glBindTexture(GL_TEXTURE_2D, colorTextureId);
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGB8, width, height, 0,
+                     GL_RGB, GL_UNSIGNED_BYTE, nullptr);
+        // Without mipmaps
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST);
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST);
+        glBindTexture(GL_TEXTURE_2D, 0);
+    } else {
+        // Color render buffer
+        glGenRenderbuffers(1, &colorRenderBufferId);
+        glBindRenderbuffer(GL_RENDERBUFFER, colorRenderBufferId);
+        glRenderbufferStorage(GL_RENDERBUFFER, GL_RGB, width, height);
+    }
 
     // Set depth buffer
     glGenRenderbuffers(1, &depthRenderBufferId);
@@ -44,13 +63,32 @@ bool OffscreenFrameBuffer::init(int width_, int height_) {
     glGenFramebuffers(1, &frameBufferId);   
     glBindFramebuffer(GL_FRAMEBUFFER, frameBufferId);
 
-    // Attach color render buffer to frame buffer
-    glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_RENDERBUFFER,
-                              colorRenderBufferId);
+    // Attach color render buffer (or texture) to frame buffer
+    if( colorTexture ) {
+        glFramebufferTexture2D(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_TEXTURE_2D,
+                               colorTextureId, 0);
+    } else {
+        glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_RENDERBUFFER,
+                                  colorRenderBufferId);
+    }
 
     // Attach depth render buffer to frame buffer
     glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_DEPTH_ATTACHMENT, GL_RENDERBUFFER,
                               depthRenderBufferId);
+
+    if( objectId ) {
+        // Object id render buffer
+        glGenRenderbuffers(1, &objectIdRenderBufferId);
+        glBindRenderbuffer(GL_RENDERBUFFER, objectIdRenderBufferId);
+        glRenderbufferStorage(GL_RENDERBUFFER, GL_R32I, width, height);
+
+        glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT1, GL_RENDERBUFFER,
+                                  objectIdRenderBufferId);
+
+        // Draw color and object id in the same rendering path
+        const GLenum drawBuffers[] = { GL_COLOR_ATTACHMENT0, GL_COLOR_ATTACHMENT1 };
+        glDrawBuffers(2, drawBuffers);
+    }
     
     // Always check that our framebuffer is ok
     if(glCheckFramebufferStatus(GL_FRAMEBUFFER) != GL_FRAMEBUFFER_COMPLETE) {
@@ -76,10 +114,18 @@ void OffscreenFrameBuffer::release() {
         glDeleteRenderbuffers(1, &colorRenderBufferId);
         colorRenderBufferId = 0;
     }
+    if(colorTextureId != 0) {
+        glDeleteTextures(1, &colorTextureId);
+        colorTextureId = 0;
+    }
     if(depthRenderBufferId != 0) {
         glDeleteRenderbuffers(1, &depthRenderBufferId);
         depthRenderBufferId = 0;
     }
+    if(objectIdRenderBufferId != 0) {
+        glDeleteRenderbuffers(1, &objectIdRenderBufferId);
+        objectIdRenderBufferId = 0;
+    }
 }
 
 // Start using as rendering target
@@ -95,3 +141,74 @@ void OffscreenFrameBuffer::unuse() {
 void OffscreenFrameBuffer::setViewport() {
     glViewport(0, 0, width, height);
 }
+
+/**
+ * <!--  clearObjectIds():  -->
+ *
+ * Clear the object id render buffer with -1. (glClear() can't clear integer buffers)
+ */
+void OffscreenFrameBuffer::clearObjectIds() {
+    if( objectIdRenderBufferId != 0 ) {
+        const GLint clearObjectId[] = { -1, -1, -1, -1 };
+        glClearBufferiv(GL_COLOR, 1, clearObjectId);
+    }
+}
+
+/**
+ * <!--  bindColorTexture():  -->
+ *
+ * Bind the color texture to the current texture unit.
+ */
+void OffscreenFrameBuffer::bindColorTexture() {
+    glBindTexture(GL_TEXTURE_2D, colorTextureId);
+}
+
+/**
+ * <!--  blitDepthAndObjectIds():  -->
+ *
+ * Copy the depth and the object ids into the smaller dst frame buffer. The nearest
+ * value is taken because they can't be averaged. dst frame buffer is left bound.
+ */
+void OffscreenFrameBuffer::blitDepthAndObjectIds(OffscreenFrameBuffer& dst) {
+    glBindFramebuffer(GL_READ_FRAMEBUFFER, frameBufferId);
+    glBindFramebuffer(GL_DRAW_FRAMEBUFFER, dst.frameBufferId);
+
+    glBlitFramebuffer(0, 0, width, height, 0, 0, dst.width, dst.height,
+                      GL_DEPTH_BUFFER_BIT, GL_NEAREST);
+
+    if( objectIdRenderBufferId != 0 && dst.objectIdRenderBufferId != 0 ) {
+        glReadBuffer(GL_COLOR_ATTACHMENT1);
+        glDrawBuffer(GL_COLOR_ATTACHMENT1);
+        glBlitFramebuffer(0, 0, width, height, 0, 0, dst.width, dst.height,
+                          GL_COLOR_BUFFER_BIT, GL_NEAREST);
+        
+        // Restore the read buffer of this and the draw buffers of dst
+        glReadBuffer(GL_COLOR_ATTACHMENT0);
+        const GLenum drawBuffers[] = { GL_COLOR_ATTACHMENT0, GL_COLOR_ATTACHMENT1 };
+        glDrawBuffers(2, drawBuffers);
+    }
+
+    glBindFramebuffer(GL_FRAMEBUFFER, dst.frameBufferId);
+}
+
+/**
+ * <!--  readDepth():  -->
+ *
+ * Read the depth buffer values. (0.0~1.0) dstBuffer must have width * height floats.
+ */
+void OffscreenFrameBuffer::readDepth(float* dstBuffer) {
+    glPixelStorei(GL_PACK_ALIGNMENT, 1);
+    glReadPixels(0, 0, width, height, GL_DEPTH_COMPONENT, GL_FLOAT, dstBuffer);
+}
+
+/**
+ * <!--  readObjectIds():  -->
+ *
+ * Read the object ids. dstBuffer must have width * height ints.
+ */
+void OffscreenFrameBuffer::readObjectIds(int* dstBuffer) {
+    glReadBuffer(GL_COLOR_ATTACHMENT1);
+    glPixelStorei(GL_PACK_ALIGNMENT, 1);
+    glReadPixels(0, 0, width, height, GL_RED_INTEGER, GL_INT, dstBuffer);
+    glReadBuffer(GL_COLOR_ATTACHMENT0);
+}
@@ -10,8 +10,12 @@ private:
     GLuint frameBufferId;
     // id of color render buffer
     GLuint colorRenderBufferId;
+    // id of color texture (used instead of the color render buffer when sampled)
+    GLuint colorTextureId;
     // id of depth render buffer
     GLuint depthRenderBufferId;
+    // id of object id render buffer (0 when not used)
+    GLuint objectIdRenderBufferId;
 
     int width;
     int height;
@@ -19,11 +23,16 @@ private:
 public:
     OffscreenFrameBuffer();
     ~OffscreenFrameBuffer();
-    bool init(int width_, int height_);
+    bool init(int width_, int height_, bool objectId=false, bool colorTexture=false);
     void release();
     void use();
     void unuse();
     void setViewport();
+    void clearObjectIds();
+    void bindColorTexture();
+    void blitDepthAndObjectIds(OffscreenFrameBuffer& dst);
+    void readDepth(float* dstBuffer);
+    void readObjectIds(int* dstBuffer);
 };
 
 #endif
@@ -2,8 +2,10 @@
 
 #include <stdlib.h>
 #include <stdio.h>
+#include <string.h>
 
 #include "glinc.h"
+#include "ResolveShader.h"
 
 /**
  * <!--  calcDepthFrameBufferSize():  -->
@@ -36,20 +38,42 @@ int RenderTarget::calcDepthFrameBufferSize(int width, int height) {
  * <!--  init():  -->
  */
 bool RenderTarget::init(int width, int height, const Vector3f& bgColor_,
-                        int shadowBufferWidth) {
+                        int shadowBufferWidth,
+                        DepthType depthType_, bool segmentation_,
+                        float nearClip_, float farClip_,
+                        OutputFormat outputFormat_, int supersampling_) {
     bgColor.set(bgColor_);
     
     frameBufferWidth = width;
     frameBufferHeight = height;
 
+    depthType = depthType_;
+    segmentation = segmentation_;
+    nearClip = nearClip_;
+    farClip = farClip_;
+
+    outputFormat = outputFormat_;
+    supersampling = supersampling_;
+
     // Setup rendering frame buffer
-    bool ret = frameBuffer.init(frameBufferWidth, frameBufferHeight);
+    bool ret = frameBuffer.init(frameBufferWidth * supersampling,
+                                frameBufferHeight * supersampling,
+                                segmentation,
+                                needsResolve());
     
     if( !ret ) {
         printf("Failed to init offscreen frame buffer.\n");
         return false;
     }
 
+    if( needsResolve() ) {
+        ret = resolveFrameBuffer.init(frameBufferWidth, frameBufferHeight, segmentation);
+        if( !ret ) {
+            printf("Failed to init resolve frame buffer.\n");
+            return false;
+        }
+    }
+
     // Setup shadow depth frame buffer
     int depthFrameBufferSize;
     if( shadowBufferWidth <= 0 ) {
@@ -78,6 +102,47 @@ void RenderTarget::release() {
         free(buffer);
         buffer = nullptr;
     }
+    depthValues.clear();
+    depthValues.shrink_to_fit();
+
+    resolveFrameBuffer.release();
+    atlasFrameBuffer.release();
+    atlasSize = 0;
+
+    releasePixelPackBuffers();
+}
+
+/**
+ * <!--  releasePixelPackBuffers():  -->
+ */
+void RenderTarget::releasePixelPackBuffers() {
+    if( pixelPackBufferIds[0] != 0 ) {
+        glDeleteBuffers(ASYNC_BUFFER_SIZE, pixelPackBufferIds);
+        for(int i=0; i<ASYNC_BUFFER_SIZE; ++i) {
+            pixelPackBufferIds[i] = 0;
+        }
+    }
+    asyncReadIndex = 0;
+    asyncPendingSize = 0;
+}
+
+/**
+ * <!--  initPixelPackBuffers():  -->
+ */
+bool RenderTarget::initPixelPackBuffers() {
+    glGenBuffers(ASYNC_BUFFER_SIZE, pixelPackBufferIds);
+    
+    for(int i=0; i<ASYNC_BUFFER_SIZE; ++i) {
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, pixelPackBufferIds[i]);
+        glBufferData(GL_PIXEL_PACK_BUFFER, getFrameBufferSize(), nullptr, GL_STREAM_READ);
+    }
+    glBindBuffer(GL_PIXEL_PACK_BUFFER, 0);
+
+    if( glGetError() != GL_NO_ERROR ) {
+        printf("Failed to init pixel pack buffers.\n");
+        return false;
+    }
+    return true;
 }
 
 /**
@@ -106,15 +171,68 @@ void RenderTarget::prepareRendering() {
     
     frameBuffer.setViewport();
 
+    setRenderingState();
+    
+    glClearColor(bgColor.x, bgColor.y, bgColor.z, 1.0f);
+    glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT);
+    frameBuffer.clearObjectIds();
+}
+
+/**
+ * <!--  resolve():  -->
+ *
+ * Average the supersampled colors (and convert them to gray) into the resolve frame
+ * buffer, so that only the output size is read back. Depth and object ids are copied
+ * with the nearest sampling. The resolve frame buffer is left bound for the readback.
+ */
+void RenderTarget::resolve(const ResolveShader* resolveShader) {
+    if( !needsResolve() ) {
+        return;
+    }
+
+    resolveFrameBuffer.use();
+    resolveFrameBuffer.setViewport();
+
+    glDisable(GL_DEPTH_TEST);
+    glDisable(GL_CULL_FACE);
+
+    glActiveTexture(GL_TEXTURE0);
+    frameBuffer.bindColorTexture();
+    resolveShader->resolve(supersampling, outputFormat == OUTPUT_GRAY);
+    glBindTexture(GL_TEXTURE_2D, 0);
+
+    glEnable(GL_DEPTH_TEST);
+    glEnable(GL_CULL_FACE);
+
+    if( depthType != DEPTH_NONE || segmentation ) {
+        frameBuffer.blitDepthAndObjectIds(resolveFrameBuffer);
+    }
+}
+
+/**
+ * <!--  getOutputPixelFormat():  -->
+ */
+GLenum RenderTarget::getOutputPixelFormat() const {
+    switch(outputFormat) {
+    case OUTPUT_GRAY:
+        return GL_RED;
+    case OUTPUT_RGBA:
+        return GL_RGBA;
+    default:
+        return GL_RGB;
+    }
+}
+
+/**
+ * <!--  setRenderingState():  -->
+ */
+void RenderTarget::setRenderingState() {
     glFrontFace(GL_CW); // Flipped because camera is inverted as upside down
     glEnable(GL_CULL_FACE);
     glCullFace(GL_BACK); // Cull back face
     
     glEnable(GL_DEPTH_TEST);
     glDepthFunc(GL_LESS);
-    
-    glClearColor(bgColor.x, bgColor.y, bgColor.z, 1.0f);
-    glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT);
 
     // Set depth frame buffer for texture slot 1
     glEnable(GL_TEXTURE_2D);
@@ -122,13 +240,209 @@ void RenderTarget::prepareRendering() {
     depthFrameBuffer.bind();
 }
 
+/**
+ * <!--  prepareAtlasRendering():  -->
+ *
+ * Prepare rendering into the index-th slot of the atlas frame buffer which has size
+ * views stacked vertically. The atlas frame buffer is (re)created when the size changes.
+ */
+bool RenderTarget::prepareAtlasRendering(int index, int size) {
+    if( needsResolve() ) {
+        printf("Atlas rendering doesn't support supersampling and gray output.\n");
+        return false;
+    }
+    
+    if( size != atlasSize ) {
+        bool ret = atlasFrameBuffer.init(frameBufferWidth, frameBufferHeight * size);
+        if( !ret ) {
+            printf("Failed to init atlas frame buffer.\n");
+            atlasFrameBuffer.release();
+            atlasSize = 0;
+            return false;
+        }
+        atlasSize = size;
+    }
+
+    atlasFrameBuffer.use();
+
+    int y = frameBufferHeight * index;
+    glViewport(0, y, frameBufferWidth, frameBufferHeight);
+
+    setRenderingState();
+
+    // Clear only the slot of this view.
+    glEnable(GL_SCISSOR_TEST);
+    glScissor(0, y, frameBufferWidth, frameBufferHeight);
+    glClearColor(bgColor.x, bgColor.y, bgColor.z, 1.0f);
+    glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT);
+    glDisable(GL_SCISSOR_TEST);
+    
+    return true;
+}
+
+/**
+ * <!--  finishAtlasRendering():  -->
+ *
+ * Read pixels of all the views in the atlas frame buffer with one readback.
+ * dstBuffer must have getFrameBufferSize() * size bytes.
+ */
+void RenderTarget::finishAtlasRendering(void* dstBuffer) {
+    glPixelStorei(GL_PACK_ALIGNMENT, 1);
+    glReadPixels(0, 0, frameBufferWidth, frameBufferHeight * atlasSize,
+                 getOutputPixelFormat(), GL_UNSIGNED_BYTE, dstBuffer);
+
+    // TODO: WORKAROUND
+    // Resetting gl error here
+    glGetError();
+}
+
+/**
+ * <!--  linearizeDepth():  -->
+ *
+ * Convert the depth buffer values into the distances from the camera plane.
+ * (Pixels without objects have the far clip distance)
+ */
+void RenderTarget::linearizeDepth(const float* values, float* depths) const {
+    int size = frameBufferWidth * frameBufferHeight;
+    // Calculated in double, because (far - value * (far - near)) loses precision
+    // around the far clip.
+    double a = (double)nearClip * farClip;
+    double c = (double)farClip - nearClip;
+    
+    for(int i=0; i<size; ++i) {
+        depths[i] = (float)(a / (farClip - values[i] * c));
+    }
+}
+
+/**
+ * <!--  linearizeDepth():  -->
+ *
+ * Convert the depth buffer values into the distances scaled from near clip (0) to
+ * far clip (65535).
+ */
+void RenderTarget::linearizeDepth(const float* values, unsigned short* depths) const {
+    int size = frameBufferWidth * frameBufferHeight;
+    double a = (double)nearClip * farClip;
+    double c = (double)farClip - nearClip;
+    
+    for(int i=0; i<size; ++i) {
+        double depth = a / (farClip - values[i] * c);
+        double rate = (depth - nearClip) / c;
+        if( rate < 0.0 ) {
+            rate = 0.0;
+        } else if( rate > 1.0 ) {
+            rate = 1.0;
+        }
+        depths[i] = (unsigned short)(rate * 65535.0 + 0.5);
+    }
+}
+
 /**
  * <!--  finishRendering():  -->
+ *
+ * Read pixels into dstBuffer. When dstBuffer is null, pixels are read into the
+ * internal buffer. dstBuffer must have getFrameBufferSize() bytes.
+ * Depth and object ids are read into depthBuffer and objectIdBuffer (width * height
+ * elements) when they are specified and enabled.
  */
-void RenderTarget::finishRendering() {
-    glReadPixels(0, 0, frameBufferWidth, frameBufferHeight, GL_RGB, GL_UNSIGNED_BYTE, buffer);
+void RenderTarget::finishRendering(void* dstBuffer,
+                                   void* depthBuffer,
+                                   int* objectIdBuffer) {
+    if( dstBuffer == nullptr ) {
+        dstBuffer = buffer;
+    }
+
+    // Rows are tightly packed without padding.
+    glPixelStorei(GL_PACK_ALIGNMENT, 1);
+    glReadPixels(0, 0, frameBufferWidth, frameBufferHeight, getOutputPixelFormat(),
+                 GL_UNSIGNED_BYTE, dstBuffer);
+
+    OffscreenFrameBuffer& outputFrameBuffer = getOutputFrameBuffer();
+
+    if( depthBuffer != nullptr ) {
+        if( depthType == DEPTH_FLOAT32 ) {
+            // Read and linearize in place
+            float* depths = (float*)depthBuffer;
+            outputFrameBuffer.readDepth(depths);
+            linearizeDepth(depths, depths);
+        } else if( depthType == DEPTH_UINT16 ) {
+            depthValues.resize(frameBufferWidth * frameBufferHeight);
+            outputFrameBuffer.readDepth(depthValues.data());
+            linearizeDepth(depthValues.data(), (unsigned short*)depthBuffer);
+        }
+    }
+
+    if( objectIdBuffer != nullptr && segmentation ) {
+        outputFrameBuffer.readObjectIds(objectIdBuffer);
+    }
 
     // TODO: WORKAROUND
     // Resetting gl error here
     /*int error = */glGetError();
 }
+
+/**
+ * <!--  finishRenderingAsync():  -->
+ *
+ * Start reading pixels into the next pixel buffer object. glReadPixels returns without
+ * waiting for the rendering to finish, and the pixels are mapped later in fetchAsync().
+ */
+bool RenderTarget::finishRenderingAsync() {
+    if( !canFinishRenderingAsync() ) {
+        return false;
+    }
+
+    if( pixelPackBufferIds[0] == 0 ) {
+        // Resetting gl error before checking buffer creation.
+        glGetError();
+        if( !initPixelPackBuffers() ) {
+            releasePixelPackBuffers();
+            return false;
+        }
+    }
+
+    int writeIndex = (asyncReadIndex + asyncPendingSize) % ASYNC_BUFFER_SIZE;
+    
+    glBindBuffer(GL_PIXEL_PACK_BUFFER, pixelPackBufferIds[writeIndex]);
+    glPixelStorei(GL_PACK_ALIGNMENT, 1);
+    // With pixel pack buffer bound, the last argument is an offset in the buffer.
+    glReadPixels(0, 0, frameBufferWidth, frameBufferHeight, getOutputPixelFormat(),
+                 GL_UNSIGNED_BYTE, 0);
+    glBindBuffer(GL_PIXEL_PACK_BUFFER, 0);
+
+    asyncPendingSize += 1;
+    return true;
+}
+
+/**
+ * <!--  fetchAsync():  -->
+ *
+ * Copy pixels of the oldest pending pixel buffer object into dstBuffer. When dstBuffer
+ * is null, pixels are copied into the internal buffer.
+ */
+bool RenderTarget::fetchAsync(void* dstBuffer) {
+    if( asyncPendingSize == 0 ) {
+        return false;
+    }
+    
+    if( dstBuffer == nullptr ) {
+        dstBuffer = buffer;
+    }
+
+    int frameBufferSize = getFrameBufferSize();
+
+    glBindBuffer(GL_PIXEL_PACK_BUFFER, pixelPackBufferIds[asyncReadIndex]);
+    const void* pixels = glMapBufferRange(GL_PIXEL_PACK_BUFFER, 0, frameBufferSize,
+                                          GL_MAP_READ_BIT);
+    bool ret = false;
+    if( pixels != nullptr ) {
+        memcpy(dstBuffer, pixels, frameBufferSize);
+        glUnmapBuffer(GL_PIXEL_PACK_BUFFER);
+        ret = true;
+    }
+    glBindBuffer(GL_PIXEL_PACK_BUFFER, 0);
+
+    asyncReadIndex = (asyncReadIndex + 1) % ASYNC_BUFFER_SIZE;
+    asyncPendingSize -= 1;
+    return ret;
+}
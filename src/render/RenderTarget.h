@@ -6,7 +6,30 @@
 #include "DepthFrameBuffer.h"
 #include "Vector3f.h"
 
+#include <vector>
+using namespace std;
+
+class ResolveShader;
+
 class RenderTarget {
+public:
+    // Number of pixel buffer objects for asynchronous readback
+    static const int ASYNC_BUFFER_SIZE = 3;
+
+    // Type of the depth output
+    enum DepthType {
+        DEPTH_NONE    = 0,
+        DEPTH_FLOAT32 = 1, // Distance from the camera plane (float)
+        DEPTH_UINT16  = 2, // Distance scaled from near clip (0) to far clip (65535)
+    };
+
+    // Pixel format of the screen output
+    enum OutputFormat {
+        OUTPUT_RGB  = 0,
+        OUTPUT_GRAY = 1,
+        OUTPUT_RGBA = 2,
+    };
+
 private:    
     int frameBufferWidth;
     int frameBufferHeight;
@@ -16,7 +39,39 @@ private:
     OffscreenFrameBuffer frameBuffer;
     DepthFrameBuffer depthFrameBuffer;
 
+    // frameBuffer is supersampling times larger than the output, and is resolved into
+    // resolveFrameBuffer when supersampled or converted to gray.
+    OutputFormat outputFormat;
+    int supersampling;
+    OffscreenFrameBuffer resolveFrameBuffer;
+
+    // Depth and object id outputs read in finishRendering()
+    DepthType depthType;
+    bool segmentation;
+    float nearClip;
+    float farClip;
+    // Depth buffer values before linearizing (for uint16 depth output)
+    vector<float> depthValues;
+
+    // Frame buffer with multiple views stacked vertically (created lazily)
+    OffscreenFrameBuffer atlasFrameBuffer;
+    int atlasSize;
+
+    // Ring of pixel buffer objects for asynchronous readback (created lazily)
+    GLuint pixelPackBufferIds[ASYNC_BUFFER_SIZE];
+    int asyncReadIndex;   // Index of the oldest pending buffer
+    int asyncPendingSize; // Number of buffers waiting to be fetched
+
     int calcDepthFrameBufferSize(int width, int height);
+    void setRenderingState();
+    OffscreenFrameBuffer& getOutputFrameBuffer() {
+        return needsResolve() ? resolveFrameBuffer : frameBuffer;
+    }
+    GLenum getOutputPixelFormat() const;
+    void linearizeDepth(const float* values, float* depths) const;
+    void linearizeDepth(const float* values, unsigned short* depths) const;
+    bool initPixelPackBuffers();
+    void releasePixelPackBuffers();
 
 public:    
     RenderTarget()
@@ -24,26 +79,64 @@ public:
         frameBufferWidth(0),
         frameBufferHeight(0),
         bgColor(0.0f, 0.0f, 0.0f),
-        buffer(nullptr) {
+        buffer(nullptr),
+        outputFormat(OUTPUT_RGB),
+        supersampling(1),
+        depthType(DEPTH_NONE),
+        segmentation(false),
+        nearClip(0.0f),
+        farClip(0.0f),
+        atlasSize(0),
+        asyncReadIndex(0),
+        asyncPendingSize(0) {
+        for(int i=0; i<ASYNC_BUFFER_SIZE; ++i) {
+            pixelPackBufferIds[i] = 0;
+        }
     }
 
     bool init(int width, int height, const Vector3f& bgColor_,
-              int shadowBufferWidth);
+              int shadowBufferWidth,
+              DepthType depthType_, bool segmentation_,
+              float nearClip_, float farClip_,
+              OutputFormat outputFormat_, int supersampling_);
 
     void release();
 
     void prepareShadowDepthRendering();
     void prepareRendering();
-    void finishRendering();
+    void resolve(const ResolveShader* resolveShader);
+    void finishRendering(void* dstBuffer=nullptr,
+                         void* depthBuffer=nullptr,
+                         int* objectIdBuffer=nullptr);
+    bool prepareAtlasRendering(int index, int size);
+    void finishAtlasRendering(void* dstBuffer);
+    bool finishRenderingAsync();
+    bool fetchAsync(void* dstBuffer=nullptr);
+
+    bool canFinishRenderingAsync() const {
+        return asyncPendingSize < ASYNC_BUFFER_SIZE;
+    }
+    int getPendingAsyncSize() const {
+        return asyncPendingSize;
+    }
 
     int getFrameBufferWidth()  const { return frameBufferWidth;  }
     int getFrameBufferHeight() const { return frameBufferHeight; }
 
+    bool needsResolve() const {
+        return supersampling > 1 || outputFormat == OUTPUT_GRAY;
+    }
+    int getChannelSize() const {
+        return (outputFormat == OUTPUT_GRAY) ? 1 : ((outputFormat == OUTPUT_RGBA) ? 4 : 3);
+    }
+    DepthType getDepthType() const { return depthType; }
+    bool isSegmentationEnabled() const { return segmentation; }
+
     const void* getBuffer() const {
         return buffer;
     }
     int getFrameBufferSize() const {
-        return frameBufferWidth * frameBufferHeight * 3;
+        return frameBufferWidth * frameBufferHeight * getChannelSize();
     }
 };
 
@@ -1,5 +1,8 @@
 #include "RenderingContext.h"
 #include "BoundingBox.h"
+#include "Shader.h"
+#include "Texture.h"
+#include "BufferObjects.h"
 
 
 /**
@@ -14,6 +17,9 @@ RenderingContext::RenderingContext()
         0.5f, 0.5f, 0.5f, 1.0f)
 {
     setPath(SHADOW);
+    setShadowEnabled(true);
+    setSegmentationEnabled(false);
+    setObjectId(-1);
     setLight(Vector3f(-0.5f, -1.0f, -0.4f), // lightDir
              Vector3f(1.0f, 1.0f, 1.0f), // lightColor
              Vector3f(0.4f, 0.4f, 0.4f), // ambientColor
@@ -21,6 +27,8 @@ RenderingContext::RenderingContext()
 
     cameraInvMat.setZero();
     cameraProjectionMat.setZero();
+
+    resetState();
 }
 
 /**
@@ -75,6 +83,14 @@ void RenderingContext::setCamera(const Matrix4f& cameraMat,
     lspsm.setEyePos(Vector3f(pos.x, pos.y, pos.z));
     lspsm.setEyeProjection(cameraProjectionMat);
     lspsm.updateShadowMatrix();
+
+    viewProjectionMat.mul(cameraProjectionMat, cameraInvMat);
+    depthViewProjectionMat.set(lspsm.getLightViewProjection());
+    depthBiasViewProjectionMat.mul(depthBiasMat, depthViewProjectionMat);
+
+    // Update frustums for culling
+    cameraFrustum.set(viewProjectionMat);
+    lightFrustum.set(depthViewProjectionMat);
 }
 
 /**
@@ -98,3 +114,85 @@ void RenderingContext::setLight(const Vector3f& lightDir_,
 void RenderingContext::setBoundingBoxForShadow(const BoundingBox& boundingBox) {
     // TODO: リネームして、LiSPSMのBvolumeのclippingに使う.
 }
+
+/**
+ * <!--  isVisible():  -->
+ *
+ * Check whether the object with the bounding box can be drawn in the current path.
+ * The shadow rendering path is culled with the light frustum and the normal rendering
+ * path is culled with the camera frustum.
+ */
+bool RenderingContext::isVisible(const BoundingBox& boundingBox) const {
+    if( isRenderingShadow() ) {
+        return lightFrustum.isVisible(boundingBox);
+    } else {
+        return cameraFrustum.isVisible(boundingBox);
+    }
+}
+
+/**
+ * <!--  resetState():  -->
+ *
+ * Forget the cached GL state. Must be called before drawing when the GL state may have
+ * been changed outside of the context. (e.g. shader->use() for prepare())
+ */
+void RenderingContext::resetState() {
+    currentShader = nullptr;
+    currentTexture = nullptr;
+    textureStateValid = false;
+    currentVertexArray = nullptr;
+    stateChangeSize = 0;
+}
+
+/**
+ * <!--  useShader():  -->
+ */
+void RenderingContext::useShader(const Shader* shader) {
+    if( shader == currentShader ) {
+        return;
+    }
+    shader->use();
+    currentShader = shader;
+    stateChangeSize += 1;
+}
+
+/**
+ * <!--  bindTexture():  -->
+ *
+ * Bind texture to the texture unit 0. Texture is disabled if texture is nullptr.
+ */
+void RenderingContext::bindTexture(const Texture* texture) {
+    if( textureStateValid && texture == currentTexture ) {
+        return;
+    }
+    
+    if( texture != nullptr ) {
+        glEnable(GL_TEXTURE_2D);
+        glActiveTexture(GL_TEXTURE0);
+        texture->bind();
+    } else {
+        glDisable(GL_TEXTURE_2D);
+    }
+    currentTexture = texture;
+    textureStateValid = true;
+    stateChangeSize += 1;
+}
+
+/**
+ * <!--  bindVertexArray():  -->
+ *
+ * Bind vertex array. Vertex array is unbound if vertexArray is nullptr.
+ */
+void RenderingContext::bindVertexArray(const VertexArray* vertexArray) {
+    if( vertexArray == currentVertexArray ) {
+        return;
+    }
+    
+    if( vertexArray != nullptr ) {
+        vertexArray->bind();
+        stateChangeSize += 1;
+    } else {
+        glBindVertexArray(0);
+    }
+    currentVertexArray = vertexArray;
+}
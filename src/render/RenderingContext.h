@@ -7,8 +7,12 @@
 #include "Vector3f.h"
 
 #include "LSPSM.h"
+#include "Frustum.h"
 
 class BoundingBox;
+class Shader;
+class Texture;
+class VertexArray;
 
 
 class RenderingContext {
@@ -20,9 +24,15 @@ public:
     
 private:
     Path path;
+    // Whether the normal rendering path uses the shadow depth
+    bool shadowEnabled;
+    // Whether the normal rendering path writes the object ids
+    bool segmentationEnabled;
 
     Matrix4f cameraInvMat;
     Matrix4f cameraProjectionMat;
+    // Cached view projection matrix (for instanced drawing)
+    Matrix4f viewProjectionMat;
     
     // Directional light direction.
     Vector3f lightDir;
@@ -33,6 +43,8 @@ private:
     // Shadow color rate
     float shadowColorRate;
     
+    // Object id for current drawing object. (-1 for the merged static objects)
+    int objectId;
     // Model matrix for current drawing object.
     Matrix4f modelMat;
     // Cached model view matrix
@@ -46,10 +58,27 @@ private:
     Matrix4f depthModelViewProjectionMat;
     // Matrix of (depthBiasMat * depthModelViewProjectionMat)
     Matrix4f depthBiasModelViewProjectionMat;
+    // View projection matrix for depth from light view. (for instanced drawing)
+    Matrix4f depthViewProjectionMat;
+    // Matrix of (depthBiasMat * depthViewProjectionMat)
+    Matrix4f depthBiasViewProjectionMat;
 
     LSPSM lspsm;
     void updateLSPSM();
 
+    // Cached GL state to skip redundant binds
+    const Shader* currentShader;
+    const Texture* currentTexture; // nullptr when texture is disabled
+    bool textureStateValid;
+    const VertexArray* currentVertexArray;
+    // Number of shader, texture and vertex array changes since resetState()
+    int stateChangeSize;
+
+    // Frustum of the camera for culling in normal rendering path.
+    Frustum cameraFrustum;
+    // Frustum of the light view projection for culling in shadow rendering path.
+    Frustum lightFrustum;
+
 public:
     RenderingContext();
     void setCamera(const Matrix4f& cameraMat,
@@ -63,7 +92,24 @@ public:
 
     void setPath(Path path_);
     bool isRenderingShadow() const { return path == SHADOW; }
+    void setShadowEnabled(bool shadowEnabled_) { shadowEnabled = shadowEnabled_; }
+    bool isShadowEnabled() const { return shadowEnabled; }
+    void setSegmentationEnabled(bool segmentationEnabled_) {
+        segmentationEnabled = segmentationEnabled_;
+    }
+    bool isSegmentationEnabled() const { return segmentationEnabled; }
+    void setObjectId(int objectId_) { objectId = objectId_; }
+    int getObjectId() const { return objectId; }
     void setBoundingBoxForShadow(const BoundingBox& boundingBox);
+    bool isVisible(const BoundingBox& boundingBox) const;
+
+    void resetState();
+    void useShader(const Shader* shader);
+    void bindTexture(const Texture* texture);
+    void bindVertexArray(const VertexArray* vertexArray);
+    int getStateChangeSize() const {
+        return stateChangeSize;
+    }
 
     const Vector3f& getLightDir() const {
         return lightDir;
@@ -92,6 +138,15 @@ public:
     const Matrix4f& getDepthBiasModelViewProjectionMat() const {
         return depthBiasModelViewProjectionMat;
     }
+    const Matrix4f& getViewProjectionMat() const {
+        return viewProjectionMat;
+    }
+    const Matrix4f& getDepthViewProjectionMat() const {
+        return depthViewProjectionMat;
+    }
+    const Matrix4f& getDepthBiasViewProjectionMat() const {
+        return depthBiasViewProjectionMat;
+    }
 };
 
 #endif
@@ -0,0 +1,71 @@
+#include "ResolveShader.h"
+
+static const char* vertShaderSrc =
+    "#version 330 core\n"
+    " "
+    "void main() "
+    "{ "
+    "    vec2 pos = vec2((gl_VertexID << 1) & 2, gl_VertexID & 2); " // Covers (0,0)~(1,1)
+    "    gl_Position = vec4(pos * 2.0 - 1.0, 0.0, 1.0); "
+    "} ";
+
+static const char* fragShaderSrc =
+    "#version 330 core\n"
+    " "
+    "layout(location = 0) out vec3 color; "
+    " "
+    "uniform sampler2D colorTexture; "
+    "uniform int supersampling; "
+    "uniform bool gray; "
+    " "
+    "void main() "
+    "{ "
+    "    ivec2 base = ivec2(gl_FragCoord.xy) * supersampling; "
+    "    vec3 sum = vec3(0.0); "
+    "    for(int y=0; y<supersampling; ++y) { "
+    "        for(int x=0; x<supersampling; ++x) { "
+    "            sum += texelFetch(colorTexture, base + ivec2(x, y), 0).rgb; "
+    "        } "
+    "    } "
+    "    color = sum / float(supersampling * supersampling); "
+    "    if(gray) { "
+    "        color = vec3(dot(color, vec3(0.299, 0.587, 0.114))); " // ITU-R BT.601
+    "    } "
+    "} ";
+
+/**
+ * <!--  init():  -->
+ */
+bool ResolveShader::init() {
+    bool ret = Shader::load(vertShaderSrc, fragShaderSrc);
+    if( !ret ) {
+        return false;
+    }
+
+    colorTextureHandle  = getUniformLocation("colorTexture");
+    supersamplingHandle = getUniformLocation("supersampling");
+    grayHandle          = getUniformLocation("gray");
+
+    // Resetting gl error before checking vertex array creation.
+    glGetError();
+    ret = vertexArray.init();
+    vertexArray.unbind();
+    return ret;
+}
+
+/**
+ * <!--  resolve():  -->
+ *
+ * Draw the output frame buffer with the color texture bound to the texture unit 0.
+ */
+void ResolveShader::resolve(int supersampling, bool gray) const {
+    use();
+    
+    glUniform1i(colorTextureHandle, 0);
+    glUniform1i(supersamplingHandle, supersampling);
+    glUniform1i(grayHandle, gray ? 1 : 0);
+
+    vertexArray.bind();
+    glDrawArrays(GL_TRIANGLES, 0, 3);
+    vertexArray.unbind();
+}
@@ -0,0 +1,25 @@
+// -*- C++ -*-
+#ifndef RESOLVESHADER_HEADER
+#define RESOLVESHADER_HEADER
+
+#include "Shader.h"
+#include "BufferObjects.h"
+
+// Shader to resolve the supersampled color texture into the output frame buffer.
+// Each output pixel is the average of the supersampling x supersampling texels,
+// converted to the gray scale if specified.
+class ResolveShader : public Shader {
+private:
+    int colorTextureHandle;
+    int supersamplingHandle;
+    int grayHandle;
+
+    // Full screen triangle is generated from the vertex ids without vertex buffers.
+    VertexArray vertexArray;
+    
+public:
+    virtual bool init() override;
+    void resolve(int supersampling, bool gray) const;
+};
+
+#endif
@@ -7,6 +7,10 @@
 #include "LineShader.h"
 #include "ShadowDiffuseShader.h"
 #include "ShadowDepthShader.h"
+#include "ShadowDiffuseInstancedShader.h"
+#include "ShadowDepthInstancedShader.h"
+#include "DiffuseInstancedShader.h"
+#include "ResolveShader.h"
 
 /**
  * <!--  ShaderManager():  -->
@@ -16,7 +20,11 @@ ShaderManager::ShaderManager()
     diffuseShader(nullptr),
     lineShader(nullptr),
     shadowDiffuseShader(nullptr),
-    shadowDepthShader(nullptr)
+    shadowDepthShader(nullptr),
+    shadowDiffuseInstancedShader(nullptr),
+    shadowDepthInstancedShader(nullptr),
+    diffuseInstancedShader(nullptr),
+    resolveShader(nullptr)
 {
 }
 
@@ -47,6 +55,22 @@ void ShaderManager::release() {
         delete shadowDepthShader;
         shadowDepthShader = nullptr;
     }   
+    if( shadowDiffuseInstancedShader != nullptr ) {
+        delete shadowDiffuseInstancedShader;
+        shadowDiffuseInstancedShader = nullptr;
+    }
+    if( shadowDepthInstancedShader != nullptr ) {
+        delete shadowDepthInstancedShader;
+        shadowDepthInstancedShader = nullptr;
+    }
+    if( diffuseInstancedShader != nullptr ) {
+        delete diffuseInstancedShader;
+        diffuseInstancedShader = nullptr;
+    }
+    if( resolveShader != nullptr ) {
+        delete resolveShader;
+        resolveShader = nullptr;
+    }
 }
 
 /**
@@ -68,6 +92,18 @@ Shader* ShaderManager::createShader(ShaderType shaderType) {
     case SHADOW_DEPTH:
         shader = new ShadowDepthShader();
         break;
+    case SHADOW_DIFFUSE_INSTANCED:
+        shader = new ShadowDiffuseInstancedShader();
+        break;
+    case SHADOW_DEPTH_INSTANCED:
+        shader = new ShadowDepthInstancedShader();
+        break;
+    case DIFFUSE_INSTANCED:
+        shader = new DiffuseInstancedShader();
+        break;
+    case RESOLVE:
+        shader = new ResolveShader();
+        break;
     default:
         return nullptr;
     }
@@ -121,3 +157,58 @@ Shader* ShaderManager::getShadowDepthShader(bool useShadow) {
         return nullptr;
     }
 }
+
+/**
+ * <!--  getInstancedShader():  -->
+ *
+ * Get the instanced version of the shader. Returns nullptr if the shader doesn't have
+ * the instanced version.
+ */
+Shader* ShaderManager::getInstancedShader(const Shader* shader) {
+    if( shader == nullptr ) {
+        return nullptr;
+    }
+    
+    if( shader == shadowDiffuseShader ) {
+        if( shadowDiffuseInstancedShader == nullptr ) {
+            shadowDiffuseInstancedShader = createShader(SHADOW_DIFFUSE_INSTANCED);
+        }
+        return shadowDiffuseInstancedShader;
+    } else if( shader == shadowDepthShader ) {
+        if( shadowDepthInstancedShader == nullptr ) {
+            shadowDepthInstancedShader = createShader(SHADOW_DEPTH_INSTANCED);
+        }
+        return shadowDepthInstancedShader;
+    } else if( shader == diffuseShader ) {
+        if( diffuseInstancedShader == nullptr ) {
+            diffuseInstancedShader = createShader(DIFFUSE_INSTANCED);
+        }
+        return diffuseInstancedShader;
+    } else {
+        return nullptr;
+    }
+}
+
+/**
+ * <!--  getNoShadowShader():  -->
+ *
+ * Get the version of the shader without the shadow map, used for the camera views
+ * without shadow. Returns the shader itself if it doesn't use the shadow map.
+ */
+const Shader* ShaderManager::getNoShadowShader(const Shader* shader) {
+    if( shader != nullptr && shader == shadowDiffuseShader ) {
+        return getDiffuseShader(false);
+    } else {
+        return shader;
+    }
+}
+
+/**
+ * <!--  getResolveShader():  -->
+ */
+ResolveShader* ShaderManager::getResolveShader() {
+    if( resolveShader == nullptr ) {
+        resolveShader = (ResolveShader*)createShader(RESOLVE);
+    }
+    return resolveShader;
+}
@@ -8,6 +8,7 @@
 using namespace std;
 
 class Shader;
+class ResolveShader;
 
 class ShaderManager {
 private:
@@ -16,12 +17,20 @@ private:
         LINE,
         SHADOW_DIFFUSE,
         SHADOW_DEPTH,
+        SHADOW_DIFFUSE_INSTANCED,
+        SHADOW_DEPTH_INSTANCED,
+        DIFFUSE_INSTANCED,
+        RESOLVE,
     };
     
     Shader* diffuseShader;  
     Shader* lineShader;
     Shader* shadowDiffuseShader;
     Shader* shadowDepthShader;
+    Shader* shadowDiffuseInstancedShader;
+    Shader* shadowDepthInstancedShader;
+    Shader* diffuseInstancedShader;
+    ResolveShader* resolveShader;
 
     Shader* createShader(ShaderType shaderType);
 
@@ -32,6 +41,9 @@ public:
     Shader* getDiffuseShader(bool useShadow=true);
     Shader* getLineShader();
     Shader* getShadowDepthShader(bool useShadow=true);
+    Shader* getInstancedShader(const Shader* shader);
+    const Shader* getNoShadowShader(const Shader* shader);
+    ResolveShader* getResolveShader();
 };
 
 #endif
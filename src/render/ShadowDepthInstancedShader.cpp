@@ -0,0 +1,62 @@
+#include "ShadowDepthInstancedShader.h"
+
+#include "Matrix4f.h"
+#include "RenderingContext.h"
+
+static const char* vertShaderSrc =
+    "#version 330 core\n"
+    "layout(location = 0) in vec3 vertexPosition; "
+    ""
+    "uniform mat4 viewProjectionMatrix; "
+    "uniform samplerBuffer instanceMatrices; " // 4 texels (columns) for each instance
+    ""
+    "void main() "
+    "{ "
+    "    int base = gl_InstanceID * 4; "
+    "    mat4 modelMatrix = mat4(texelFetch(instanceMatrices, base), "
+    "                            texelFetch(instanceMatrices, base+1), "
+    "                            texelFetch(instanceMatrices, base+2), "
+    "                            texelFetch(instanceMatrices, base+3)); "
+    "    gl_Position = viewProjectionMatrix * modelMatrix * vec4(vertexPosition,1); "
+    "} ";
+
+static const char* fragShaderSrc =
+    "#version 330 core\n"
+    "layout(location = 0) out float fragmentDepth; "
+    " "
+    "void main() "
+    "{ "
+    "    fragmentDepth = gl_FragCoord.z; "
+    "} ";
+
+/**
+ * <!--  init():  -->
+ */
+bool ShadowDepthInstancedShader::init() {
+    bool ret = Shader::load(vertShaderSrc, fragShaderSrc);
+    if( !ret ) {
+        return false;
+    }
+    
+    vpMatrixHandle = getUniformLocation("viewProjectionMatrix");
+    instanceMatricesHandle = getUniformLocation("instanceMatrices");
+    return true;
+}
+
+/**
+ * <!--  prepare():  -->
+ */
+void ShadowDepthInstancedShader::prepare(const RenderingContext& context) const {
+}
+
+/**
+ * <!--  setup():  -->
+ */
+void ShadowDepthInstancedShader::setup(const RenderingContext& context) const {
+    const Matrix4f& depthViewProjectionMat = context.getDepthViewProjectionMat();
+    
+    // Set light view projection matrix
+    glUniformMatrix4fv( vpMatrixHandle, 1, GL_FALSE,
+                        (const GLfloat*)depthViewProjectionMat.getPointer() );
+    glUniform1i(instanceMatricesHandle, 2);
+}
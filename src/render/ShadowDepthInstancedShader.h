@@ -0,0 +1,20 @@
+// -*- C++ -*-
+#ifndef SHADOWDEPTHINSTANCEDSHADER_HEADER
+#define SHADOWDEPTHINSTANCEDSHADER_HEADER
+
+#include "Shader.h"
+
+// ShadowDepthShader drawing multiple instances with one draw call.
+// Model matrices of the instances are read from the texture buffer.
+class ShadowDepthInstancedShader : public Shader {
+private:
+    int vpMatrixHandle;
+    int instanceMatricesHandle;
+    
+public:
+    virtual bool init() override;
+    virtual void prepare(const RenderingContext& context) const override;
+    virtual void setup(const RenderingContext& context) const override;
+};
+
+#endif
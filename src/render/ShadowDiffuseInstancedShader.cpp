@@ -0,0 +1,143 @@
+#include "ShadowDiffuseInstancedShader.h"
+
+#include "Matrix4f.h"
+#include "Vector3f.h"
+#include "RenderingContext.h"
+
+
+static const char* vertShaderSrc =
+    "#version 330 core\n"
+    "layout(location = 0) in vec3 vertexPosition; "
+    "layout(location = 1) in vec3 vertexNormal; "
+    "layout(location = 2) in vec2 vertexTexCoord; "
+    " "
+    "out vec2 texCoord; "
+    "flat out int varyObjectId; "
+    "out vec4 shadowTexCoord; "
+    "out vec4 varyColor; "
+    "out vec4 shadowColor; "
+    " "
+    "uniform mat4 viewProjectionMatrix; "
+    "uniform mat4 depthBiasViewProjectionMatrix; "
+    "uniform samplerBuffer instanceMatrices; " // 4 texels (columns) for each instance
+    "uniform samplerBuffer instanceObjectIds; "
+    "uniform vec3 invLightDir; " // Already normalized
+    "uniform vec4 lightColor; "
+    "uniform vec4 ambientColor; "
+    "uniform float shadowColorRate; "
+    " "
+    "void main() "
+    "{ "
+    "    int base = gl_InstanceID * 4; "
+    "    mat4 modelMatrix = mat4(texelFetch(instanceMatrices, base), "
+    "                            texelFetch(instanceMatrices, base+1), "
+    "                            texelFetch(instanceMatrices, base+2), "
+    "                            texelFetch(instanceMatrices, base+3)); "
+    "    "
+    "    vec3 worldNormal = normalize(mat3(modelMatrix) * vertexNormal); "
+    "    float diffuse = dot(worldNormal, normalize(invLightDir));"
+    "    "
+    "    varyColor = ambientColor; "
+    "    shadowColor = ambientColor; "
+    "    "
+    "    if(diffuse > 0.0) { "
+    "        vec4 temp = lightColor * diffuse; "
+    "        shadowColor += temp * shadowColorRate; "
+    "        varyColor += temp; "
+    "    } "
+    "    "
+    "    texCoord = vertexTexCoord; "
+    "    varyObjectId = int(texelFetch(instanceObjectIds, gl_InstanceID).r); "
+    "    "
+    "    vec4 worldPosition = modelMatrix * vec4(vertexPosition,1); "
+    "    gl_Position = viewProjectionMatrix * worldPosition; "
+    "    shadowTexCoord = depthBiasViewProjectionMatrix * worldPosition; "
+    "} ";
+
+static const char* fragShaderSrc =
+    "#version 330 core\n"
+    " "
+    "in vec2 texCoord;  "
+    "in vec4 shadowTexCoord; "
+    "in vec4 varyColor; "
+    "in vec4 shadowColor; "
+    "flat in int varyObjectId; "
+    "layout(location = 0) out vec3 color; "
+    "layout(location = 1) out int objectId; "
+    " "
+    "uniform sampler2D texSampler2D; "
+    "uniform sampler2DShadow shadowMap; "
+    " "
+    "void main() "
+    "{ "
+    "    vec4 baseColor = texture(texSampler2D, texCoord); "
+    "    float visibility = texture( shadowMap, vec3(shadowTexCoord.xy/shadowTexCoord.w, shadowTexCoord.z/shadowTexCoord.w) ); "
+    "    vec4 tmpColor = shadowColor + (varyColor - shadowColor) * visibility; "
+    "    color = (baseColor * tmpColor).rgb; "
+    "    objectId = varyObjectId; "
+    "} ";
+
+/**
+ * <!--  init():  -->
+ */
+bool ShadowDiffuseInstancedShader::init() {
+    bool ret = Shader::load(vertShaderSrc, fragShaderSrc);
+    if( !ret ) {
+        return false;
+    }
+    
+    vpMatrixHandle     = getUniformLocation("viewProjectionMatrix");
+    depthBiasVpMatrixHandle = getUniformLocation("depthBiasViewProjectionMatrix");
+    invLightDirHandle  = getUniformLocation("invLightDir");
+    lightColorHandle   = getUniformLocation("lightColor");
+    ambientColorHandle = getUniformLocation("ambientColor");
+    shadowColorRateHandle   = getUniformLocation("shadowColorRate");
+
+    textureHandle      = getUniformLocation("texSampler2D");
+    shadowMapHandle    = getUniformLocation("shadowMap");
+    instanceMatricesHandle = getUniformLocation("instanceMatrices");
+    instanceObjectIdsHandle = getUniformLocation("instanceObjectIds");
+    return true;
+}
+
+/**
+ * <!--  prepare():  -->
+ */
+void ShadowDiffuseInstancedShader::prepare(const RenderingContext& context) const {
+    const Vector3f& lightDir = context.getLightDir();
+    Vector3f invLightDir(lightDir);
+    invLightDir *= -1.0f;   
+    glUniform3fv( invLightDirHandle, 1,
+                  (const GLfloat*)invLightDir.getPointer() );
+
+    const Vector4f& lightColor = context.getLightColor();
+    const Vector4f& ambientColor = context.getAmbientColor();
+    float shadowColorRate = context.getShadowColorRate();
+
+    glUniform4fv( lightColorHandle, 1,
+                  (const GLfloat*)lightColor.getPointer() );
+    glUniform4fv( ambientColorHandle, 1,
+                  (const GLfloat*)ambientColor.getPointer() );
+    glUniform1f( shadowColorRateHandle, shadowColorRate );
+}
+
+/**
+ * <!--  setup():  -->
+ */
+void ShadowDiffuseInstancedShader::setup(const RenderingContext& context) const {
+    const Matrix4f& viewProjectionMat = context.getViewProjectionMat();
+    const Matrix4f& depthBiasViewProjectionMat = context.getDepthBiasViewProjectionMat();
+
+    // Set view projection matrix
+    glUniformMatrix4fv( vpMatrixHandle, 1, GL_FALSE,
+                        (const GLfloat*)viewProjectionMat.getPointer() );
+
+    // Set shadow depth matrix
+    glUniformMatrix4fv( depthBiasVpMatrixHandle, 1, GL_FALSE,
+                        (const GLfloat*)depthBiasViewProjectionMat.getPointer() );
+
+    glUniform1i(textureHandle, 0);
+    glUniform1i(shadowMapHandle, 1);
+    glUniform1i(instanceMatricesHandle, 2);
+    glUniform1i(instanceObjectIdsHandle, 3);
+}
@@ -0,0 +1,28 @@
+// -*- C++ -*-
+#ifndef SHADOWDIFFUSEINSTANCEDSHADER_HEADER
+#define SHADOWDIFFUSEINSTANCEDSHADER_HEADER
+
+#include "Shader.h"
+
+// ShadowDiffuseShader drawing multiple instances with one draw call.
+// Model matrices of the instances are read from the texture buffer.
+class ShadowDiffuseInstancedShader : public Shader {
+private:
+    int vpMatrixHandle;
+    int depthBiasVpMatrixHandle;
+    int invLightDirHandle;
+    int lightColorHandle;
+    int ambientColorHandle;
+    int shadowColorRateHandle;
+    int textureHandle;
+    int shadowMapHandle;
+    int instanceMatricesHandle;
+    int instanceObjectIdsHandle;
+    
+public:
+    virtual bool init() override;
+    virtual void prepare(const RenderingContext& context) const override;
+    virtual void setup(const RenderingContext& context) const override;
+};
+
+#endif
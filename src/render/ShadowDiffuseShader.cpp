@@ -11,8 +11,10 @@ static const char* vertShaderSrc =
     "layout(location = 0) in vec3 vertexPosition; "
     "layout(location = 1) in vec3 vertexNormal; "
     "layout(location = 2) in vec2 vertexTexCoord; "
+    "layout(location = 3) in float vertexObjectId; "
     " "
     "out vec2 texCoord; "
+    "flat out int varyObjectId; "
     "out vec4 shadowTexCoord; "
     "out vec4 varyColor; "
     "out vec4 shadowColor; "
@@ -40,6 +42,7 @@ static const char* vertShaderSrc =
     "    } "
     "    "
     "    texCoord = vertexTexCoord; "
+    "    varyObjectId = int(vertexObjectId); "
     "    "
     "    gl_Position = modelViewProjectionMatrix * vec4(vertexPosition,1); "
     "    shadowTexCoord = depthBiasModelViewProjectionMatrix * vec4(vertexPosition,1); "
@@ -52,7 +55,9 @@ static const char* fragShaderSrc =
     "in vec4 shadowTexCoord; "
     "in vec4 varyColor; "
     "in vec4 shadowColor; "
-    "out vec3 color; "
+    "flat in int varyObjectId; "
+    "layout(location = 0) out vec3 color; "
+    "layout(location = 1) out int objectId; "
     " "
     "uniform sampler2D texSampler2D; "
     "uniform sampler2DShadow shadowMap; "
@@ -65,6 +70,7 @@ static const char* fragShaderSrc =
     "    float visibility = texture( shadowMap, vec3(shadowTexCoord.xy/shadowTexCoord.w, shadowTexCoord.z/shadowTexCoord.w) ); "
     "    vec4 tmpColor = shadowColor + (varyColor - shadowColor) * visibility; "
     "    color = (baseColor * tmpColor).rgb; "
+    "    objectId = varyObjectId; "
     "} ";
 
 /**
@@ -136,4 +142,7 @@ void ShadowDiffuseShader::setup(const RenderingContext& context) const {
 
     glUniform1i(textureHandle, 0);
     glUniform1i(shadowMapHandle, 1);
+
+    // Object id for all the vertices (unless the vertex array has object ids)
+    glVertexAttrib1f(3, (float)context.getObjectId());
 }
@@ -0,0 +1,183 @@
+#include "StaticBatch.h"
+
+#include "Mesh.h"
+#include "MeshFace.h"
+#include "MeshFaceData.h"
+#include "Material.h"
+#include "BoundingBox.h"
+#include "Vector4f.h"
+#include "DrawBatch.h"
+
+/**
+ * <!--  StaticBatch():  -->
+ */
+StaticBatch::StaticBatch()
+    :
+    mesh(nullptr) {
+}
+
+/**
+ * <!--  ~StaticBatch():  -->
+ */
+StaticBatch::~StaticBatch() {
+    release();
+}
+
+/**
+ * <!--  release():  -->
+ */
+void StaticBatch::release() {
+    for(auto itr=mergedFaces.begin(); itr!=mergedFaces.end(); ++itr) {
+        delete itr->material;
+    }
+    mergedFaces.clear();
+    sourceFaces.clear();
+
+    // Mesh faces refer the mesh face data
+    if( mesh != nullptr ) {
+        delete mesh;
+        mesh = nullptr;
+    }
+    for(auto itr=meshFaceDatas.begin(); itr!=meshFaceDatas.end(); ++itr) {
+        delete *itr;
+    }
+    meshFaceDatas.clear();
+}
+
+/**
+ * <!--  getSourceFace():  -->
+ *
+ * Read back vertices and indices of the mesh face data. They are cached because many
+ * objects share the same mesh.
+ */
+const StaticBatch::SourceFace& StaticBatch::getSourceFace(const MeshFaceData& meshFaceData) {
+    auto itr = sourceFaces.find(&meshFaceData);
+    if( itr != sourceFaces.end() ) {
+        return itr->second;
+    }
+
+    SourceFace& sourceFace = sourceFaces[&meshFaceData];
+    meshFaceData.getVertices(sourceFace.vertices);
+    meshFaceData.getIndices(sourceFace.indices);
+    return sourceFace;
+}
+
+/**
+ * <!--  add():  -->
+ *
+ * Add the mesh face transformed with the model matrix. The object id is kept for each
+ * vertex for the segmentation.
+ */
+void StaticBatch::add(MeshFace* meshFace, const Matrix4f& modelMat, int objectId) {
+    const Material* material = meshFace->getMaterial();
+
+    MergedFace* mergedFace = nullptr;
+    for(auto itr=mergedFaces.begin(); itr!=mergedFaces.end(); ++itr) {
+        if( itr->material->isSame(*material) ) {
+            mergedFace = &(*itr);
+            break;
+        }
+    }
+    if( mergedFace == nullptr ) {
+        mergedFaces.push_back(MergedFace());
+        mergedFace = &mergedFaces.back();
+        mergedFace->material = material->clone();
+    }
+
+    const SourceFace& sourceFace = getSourceFace(meshFace->getMeshFaceData());
+
+    vector<float>& vertices = mergedFace->vertices;
+    vector<unsigned int>& indices = mergedFace->indices;
+
+    unsigned int baseIndex = (unsigned int)(vertices.size() / 8);
+    
+    int vertexSize = (int)sourceFace.vertices.size() / 8;
+    for(int i=0; i<vertexSize; ++i) {
+        const float* vertex = &sourceFace.vertices[8*i];
+        
+        Vector4f pos(vertex[0], vertex[1], vertex[2], 1.0f);
+        Vector4f worldPos;
+        modelMat.transform(pos, worldPos);
+
+        // Normal is transformed without the translation as the shader does, and is
+        // normalized in the shader.
+        Vector4f normal(vertex[3], vertex[4], vertex[5], 0.0f);
+        Vector4f worldNormal;
+        modelMat.transform(normal, worldNormal);
+
+        vertices.push_back(worldPos.x);
+        vertices.push_back(worldPos.y);
+        vertices.push_back(worldPos.z);
+        vertices.push_back(worldNormal.x);
+        vertices.push_back(worldNormal.y);
+        vertices.push_back(worldNormal.z);
+        vertices.push_back(vertex[6]);
+        vertices.push_back(vertex[7]);
+
+        mergedFace->objectIds.push_back((float)objectId);
+    }
+
+    for(auto itr=sourceFace.indices.begin(); itr!=sourceFace.indices.end(); ++itr) {
+        indices.push_back(baseIndex + *itr);
+    }
+}
+
+/**
+ * <!--  build():  -->
+ *
+ * Create the mesh face data of the added faces. The vertices are already in world
+ * coordinate, so the mesh is drawn with the identity model matrix.
+ */
+bool StaticBatch::build() {
+    mesh = new Mesh();
+
+    for(auto itr=mergedFaces.begin(); itr!=mergedFaces.end(); ++itr) {
+        MergedFace& mergedFace = *itr;
+        
+        MeshFaceData* meshFaceData = new MeshFaceData();
+        bool ret = meshFaceData->init(mergedFace.vertices.data(),
+                                      (int)mergedFace.vertices.size(),
+                                      mergedFace.indices.data(),
+                                      (int)mergedFace.indices.size());
+        if( ret ) {
+            ret = meshFaceData->initObjectIds(mergedFace.objectIds.data(),
+                                              (int)mergedFace.objectIds.size());
+        }
+        if( !ret ) {
+            delete meshFaceData;
+            return false;
+        }
+        meshFaceDatas.push_back(meshFaceData);
+
+        // Material is owned by the mesh face
+        mesh->addMeshFace(new MeshFace(mergedFace.material, *meshFaceData));
+        mergedFace.material = nullptr;
+    }
+
+    // Source data is not necessary any more
+    mergedFaces.clear();
+    sourceFaces.clear();
+    return true;
+}
+
+/**
+ * <!--  addToBatch():  -->
+ */
+void StaticBatch::addToBatch(DrawBatchList& batchList,
+                             const RenderingContext& context) const {
+    if( mesh != nullptr ) {
+        Matrix4f modelMat;
+        modelMat.setIdentity();
+        // Object ids are given with the vertices
+        mesh->addToBatch(batchList, modelMat, -1, context);
+    }
+}
+
+/**
+ * <!--  getBoundingBox():  -->
+ *
+ * World bounding box of the merged faces.
+ */
+const BoundingBox& StaticBatch::getBoundingBox() const {
+    return mesh->getBoundingBox();
+}
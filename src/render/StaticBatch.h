@@ -0,0 +1,63 @@
+// -*- C++ -*-
+#ifndef STATICBATCH_HEADER
+#define STATICBATCH_HEADER
+
+#include <vector>
+#include <map>
+using namespace std;
+
+#include "Matrix4f.h"
+
+class Mesh;
+class MeshFace;
+class MeshFaceData;
+class Material;
+class BoundingBox;
+class RenderingContext;
+class DrawBatchList;
+
+
+//---------------------------
+//      [StaticBatch]
+//---------------------------
+// Mesh faces of static objects merged into one pre-transformed mesh face data for
+// each material, so that they are drawn with a few draw calls.
+class StaticBatch {
+private:
+    // Vertices and indices of the faces sharing the same material
+    class MergedFace {
+    public:
+        Material* material;
+        vector<float> vertices;
+        vector<unsigned int> indices;
+        // Object id of each vertex
+        vector<float> objectIds;
+    };
+
+    // Vertices and indices read back from the source mesh face data
+    class SourceFace {
+    public:
+        vector<float> vertices;
+        vector<unsigned int> indices;
+    };
+
+    vector<MergedFace> mergedFaces;
+    map<const MeshFaceData*, SourceFace> sourceFaces;
+
+    vector<MeshFaceData*> meshFaceDatas;
+    Mesh* mesh;
+
+    const SourceFace& getSourceFace(const MeshFaceData& meshFaceData);
+
+public:
+    StaticBatch();
+    ~StaticBatch();
+    void release();
+    void add(MeshFace* meshFace, const Matrix4f& modelMat, int objectId);
+    bool build();
+    void addToBatch(DrawBatchList& batchList, const RenderingContext& context) const;
+    const BoundingBox& getBoundingBox() const;
+    int getMeshFaceSize() const { return (int)meshFaceDatas.size(); }
+};
+
+#endif
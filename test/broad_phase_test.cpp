@@ -0,0 +1,71 @@
+#include "BroadPhase.h"
+
+#include <gtest/gtest.h>
+
+namespace {
+    class BroadPhaseTest : public ::testing::Test {
+    protected:
+        btDefaultCollisionConfiguration* configuration;
+        btCollisionDispatcher* dispatcher;
+        BroadPhase* broadPhase;
+        btBroadphaseProxy* proxies[16];
+
+        void SetUp() override {
+            configuration = new btDefaultCollisionConfiguration();
+            dispatcher = new btCollisionDispatcher(configuration);
+            broadPhase = new BroadPhase(btVector3(-100, -100, -100),
+                                        btVector3( 100,  100,  100));
+        }
+
+        void TearDown() override {
+            delete broadPhase;
+            delete dispatcher;
+            delete configuration;
+        }
+
+        int create(int index) {
+            btVector3 pos(index * 3.0f, 0.0f, 0.0f);
+            proxies[index] = broadPhase->createProxy(pos - btVector3(1, 1, 1),
+                                                     pos + btVector3(1, 1, 1),
+                                                     SPHERE_SHAPE_PROXYTYPE,
+                                                     nullptr,
+                                                     btBroadphaseProxy::DefaultFilter,
+                                                     btBroadphaseProxy::AllFilter,
+                                                     dispatcher);
+            return proxies[index]->m_uniqueId;
+        }
+
+        void destroy(int index) {
+            broadPhase->destroyProxy(proxies[index], dispatcher);
+        }
+    };
+
+    TEST_F(BroadPhaseTest, sortFreeHandles) {
+        for(int i=0; i<10; ++i) {
+            EXPECT_EQ(i+1, create(i));
+        }
+
+        destroy(6);
+        destroy(1);
+        destroy(8);
+        destroy(3);
+        broadPhase->sortFreeHandles();
+
+        // Freed handles are allocated in the ascending order.
+        EXPECT_EQ(2, create(1));
+        EXPECT_EQ(4, create(3));
+        EXPECT_EQ(7, create(6));
+        EXPECT_EQ(9, create(8));
+        EXPECT_EQ(11, create(10));
+
+        // Allocated again before the sort
+        destroy(4);
+        EXPECT_EQ(5, create(4));
+        destroy(7);
+        destroy(2);
+        broadPhase->sortFreeHandles();
+        EXPECT_EQ(3, create(2));
+        EXPECT_EQ(8, create(7));
+        EXPECT_EQ(12, create(11));
+    }
+}
@@ -0,0 +1,89 @@
+#include <gtest/gtest.h>
+
+#include "Frustum.h"
+#include "BoundingBox.h"
+#include "Camera.h"
+#include "Vector3f.h"
+
+namespace {
+    class FrustumTest : public ::testing::Test {
+    protected:
+        void setBox(const Vector3f& center, float halfExtent, BoundingBox& boundingBox) {
+            boundingBox.set(Vector3f(center.x - halfExtent,
+                                     center.y - halfExtent,
+                                     center.z - halfExtent),
+                            Vector3f(center.x + halfExtent,
+                                     center.y + halfExtent,
+                                     center.z + halfExtent));
+        }
+        
+        void setFrustum(const Camera& camera, Frustum& frustum) {
+            Matrix4f viewProjectionMat;
+            viewProjectionMat.mul(camera.getProjectionMat(), camera.getInvMat());
+            frustum.set(viewProjectionMat);
+        }
+    };
+
+    TEST_F(FrustumTest, perspective) {
+        Camera camera;
+        camera.initPerspective(1.0f, 10.0f, 35.0f, 1.0f, false);
+        // Looking at -Z direction from the origin.
+        Matrix4f mat;
+        mat.setIdentity();
+        camera.setMat(mat);
+        
+        Frustum frustum;
+        setFrustum(camera, frustum);
+
+        BoundingBox boundingBox;
+
+        // In front of the camera
+        setBox(Vector3f(0.0f, 0.0f, -5.0f), 0.5f, boundingBox);
+        EXPECT_TRUE(frustum.isVisible(boundingBox));
+
+        // Behind the camera
+        setBox(Vector3f(0.0f, 0.0f, 5.0f), 0.5f, boundingBox);
+        EXPECT_FALSE(frustum.isVisible(boundingBox));
+
+        // Beyond the far clip
+        setBox(Vector3f(0.0f, 0.0f, -20.0f), 0.5f, boundingBox);
+        EXPECT_FALSE(frustum.isVisible(boundingBox));
+
+        // Outside of the left and the top planes
+        setBox(Vector3f(-10.0f, 0.0f, -5.0f), 0.5f, boundingBox);
+        EXPECT_FALSE(frustum.isVisible(boundingBox));
+        setBox(Vector3f(0.0f, 10.0f, -5.0f), 0.5f, boundingBox);
+        EXPECT_FALSE(frustum.isVisible(boundingBox));
+
+        // Crossing the near plane
+        setBox(Vector3f(0.0f, 0.0f, 0.0f), 2.0f, boundingBox);
+        EXPECT_TRUE(frustum.isVisible(boundingBox));
+    }
+
+    TEST_F(FrustumTest, rotatedCamera) {
+        Camera camera;
+        camera.initPerspective(1.0f, 10.0f, 35.0f, 1.0f, false);
+        // Looking at +X direction.
+        camera.lookAt(Vector3f(0.0f, 0.0f, 0.0f),
+                      Vector3f(1.0f, 0.0f, 0.0f),
+                      Vector3f(0.0f, 1.0f, 0.0f));
+        
+        Frustum frustum;
+        setFrustum(camera, frustum);
+
+        BoundingBox boundingBox;
+        setBox(Vector3f(5.0f, 0.0f, 0.0f), 0.5f, boundingBox);
+        EXPECT_TRUE(frustum.isVisible(boundingBox));
+        
+        setBox(Vector3f(0.0f, 0.0f, -5.0f), 0.5f, boundingBox);
+        EXPECT_FALSE(frustum.isVisible(boundingBox));
+    }
+
+    TEST_F(FrustumTest, notSet) {
+        // Everything is visible before set() is called.
+        Frustum frustum;
+        BoundingBox boundingBox;
+        setBox(Vector3f(100.0f, 0.0f, 100.0f), 0.5f, boundingBox);
+        EXPECT_TRUE(frustum.isVisible(boundingBox));
+    }
+}